@@ -1,4 +1,5 @@
-from .dependencies import get_cv_service
+from .dependencies import get_container, get_cv_service
 from .router import router
+from .middleware import UploadSizeLimitMiddleware
 
-__all__=["get_cv_service", "router"]
+__all__=["get_container", "get_cv_service", "router", "UploadSizeLimitMiddleware"]
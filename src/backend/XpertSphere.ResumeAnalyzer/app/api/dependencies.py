@@ -1,16 +1,38 @@
-from app.services import CVService
-from app.infrastructure.extractors import PDFExtractor
-from app.infrastructure.analyzers import OpenAIAnalyzer
+from fastapi import Depends, Request
+from app.services import CVService, ServiceContainer
 
 
-def get_cv_service() -> CVService:
+async def get_container(request: Request) -> ServiceContainer:
     """
-    Dependency for CV service
+    Dependency for the application service container
+
+    The container is normally built by the application lifespan, in which
+    case requests wait for its warm-up to finish; it is created on first
+    use when the lifespan did not run, and built off the event loop either way.
+
+    Args:
+        request: Current request
 
     Returns:
-        Configured CV service
+        Started service container
+    """
+    container = getattr(request.app.state, "container", None)
+    if container is None:
+        container = ServiceContainer()
+        request.app.state.container = container
+    if not container.ready:
+        await container.start()
+    return container
+
+
+def get_cv_service(container: ServiceContainer = Depends(get_container)) -> CVService:
     """
-    extractors = [PDFExtractor()]
-    analyzer = OpenAIAnalyzer()
+    Dependency for CV service
+
+    Args:
+        container: Application service container
 
-    return CVService(extractors=extractors, analyzer=analyzer)
+    Returns:
+        Shared CV service
+    """
+    return container.cv_service
@@ -0,0 +1,51 @@
+from fastapi import APIRouter, Depends, HTTPException, Path
+from app.api import get_container
+from app.services import ServiceContainer
+from typing import Dict, Any, List
+
+router = APIRouter()
+
+
+def _get_caches(container: ServiceContainer) -> List:
+    """Get the enabled cache layers or fail when caching is disabled"""
+    caches = container.caches()
+    if not caches:
+        raise HTTPException(status_code=404, detail="Result cache is disabled")
+    return caches
+
+
+@router.get("/cache/stats", response_model=Dict[str, Any])
+async def get_cache_stats(container: ServiceContainer = Depends(get_container)):
+    """
+    Get hit and miss counters of each result cache layer
+    """
+    return {cache.name: cache.stats() for cache in _get_caches(container)}
+
+
+@router.delete("/cache/{digest}", response_model=Dict[str, Any])
+async def invalidate_cached_file(
+    digest: str = Path(..., pattern="^[0-9a-f]{64}$", description="SHA-256 of the file"),
+    container: ServiceContainer = Depends(get_container),
+):
+    """
+    Remove every cached result derived from a file
+
+    Args:
+        digest: Hex SHA-256 of the file content
+        container: Application service container
+
+    Returns:
+        Number of entries removed per cache layer
+    """
+    removed = {cache.name: await cache.invalidate(digest) for cache in _get_caches(container)}
+    return {"digest": digest, "removed": removed}
+
+
+@router.delete("/cache", response_model=Dict[str, Any])
+async def clear_cache(container: ServiceContainer = Depends(get_container)):
+    """
+    Remove every cached result from every layer
+    """
+    for cache in _get_caches(container):
+        await cache.clear()
+    return {"status": "cleared"}
@@ -1,64 +1,14 @@
-from fastapi import APIRouter, HTTPException, status
+from fastapi import APIRouter, HTTPException, Request, status
 from fastapi.responses import JSONResponse
 from datetime import datetime, timezone
-from typing import Dict, Any
 import sys
 import os
-import asyncio
+import time
 from app.core.config import settings
-from app.utils import get_llm
 
 router = APIRouter()
 
 
-async def check_azure_openai() -> Dict[str, Any]:
-    """Check Azure OpenAI connectivity"""
-    try:
-        if not settings.AZURE_OPENAI_ENDPOINT or not settings.AZURE_OPENAI_API_KEY:
-            return {
-                "status": "error",
-                "message": "Azure OpenAI credentials not configured"
-            }
-        
-        # Simple connection test (no actual request to save tokens)
-        client = get_llm()
-        return {
-            "status": "ok",
-            "endpoint": settings.AZURE_OPENAI_ENDPOINT[:30] + "..." if settings.AZURE_OPENAI_ENDPOINT else "Not set",
-            "deployment": settings.current_deployment,
-            "api_version": settings.AZURE_OPENAI_API_VERSION
-        }
-    except Exception as e:
-        return {
-            "status": "error", 
-            "message": str(e)
-        }
-
-
-def get_system_info() -> Dict[str, Any]:
-    """Get system information"""
-    try:
-        # System information
-        memory = psutil.virtual_memory()
-        disk = psutil.disk_usage('/')
-        
-        return {
-            "cpu_percent": psutil.cpu_percent(interval=1),
-            "memory": {
-                "total_gb": round(memory.total / (1024**3), 2),
-                "available_gb": round(memory.available / (1024**3), 2),
-                "percent_used": memory.percent
-            },
-            "disk": {
-                "total_gb": round(disk.total / (1024**3), 2),
-                "free_gb": round(disk.free / (1024**3), 2),
-                "percent_used": round((disk.used / disk.total) * 100, 1)
-            }
-        }
-    except Exception as e:
-        return {"error": str(e)}
-
-
 @router.get("/health")
 async def health_check():
     """
@@ -74,32 +24,51 @@ async def health_check():
 
 
 @router.get("/health/detailed")
-async def detailed_health_check():
+async def detailed_health_check(request: Request):
     """
     Detailed health check with dependency verification
+
+    System usage, event loop lag and the Azure OpenAI probe are read from
+    the health monitor's latest background sample, so this check does no
+    I/O of its own.
     """
-    start_time = datetime.now(timezone.utc)
-    
-    # Parallel checks
-    azure_openai_task = asyncio.create_task(check_azure_openai())
+    container = getattr(request.app.state, "container", None)
+    monitor = getattr(request.app.state, "health_monitor", None)
+    started = time.perf_counter()
+    sample = monitor.snapshot() if monitor else {"status": "not started"}
     
     # Basic information
     health_data = {
         "status": "healthy",
         "service": "XpertSphere Resume Analyzer", 
-        "timestamp": start_time.isoformat(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
         "version": "1.0.0",
         "environment": settings.ENVIRONMENT,
         "python_version": f"{sys.version_info.major}.{sys.version_info.minor}.{sys.version_info.micro}",
-        "uptime": "runtime info not available",  # Could be improved with global variable
-        "system": get_system_info(),
+        "uptime_seconds": sample.get("uptime_seconds"),
+        "system": sample.get("system", sample),
+        "event_loop": {
+            "lag_ms": sample.get("event_loop_lag_ms"),
+            "requests_in_flight": sample.get("requests_in_flight"),
+            "sample_age_seconds": sample.get("age_seconds")
+        },
         "configuration": {
             "key_vault_url": settings.KEY_VAULT_URL,
             "azure_client_id": "***SET***" if settings.AZURE_CLIENT_ID else "NOT SET",
             "max_file_size_mb": settings.MAX_FILE_SIZE_MB
         },
         "dependencies": {
-            "azure_openai": await azure_openai_task
+            "azure_openai": sample.get("azure_openai", sample)
+        },
+        "llm_connection_pool": container.stats() if container else {"status": "not started"},
+        "extraction_pool": container.extraction_stats() if container else {"status": "not started"},
+        "llm_hedging": container.hedging_stats() if container else {"status": "not started"},
+        "llm_rate_limit": container.rate_limit_stats() if container else {"status": "not started"},
+        "llm_circuit_breaker": container.circuit_stats() if container else {"status": "not started"},
+        "key_vault": container.secrets_stats() if container else {"status": "not started"},
+        "pipeline": {
+            "ready": container.ready if container else False,
+            "warm_up_seconds": container.warm_up_seconds if container else None
         }
     }
     
@@ -107,9 +76,11 @@ async def detailed_health_check():
     overall_status = "healthy"
     if health_data["dependencies"]["azure_openai"]["status"] == "error":
         overall_status = "degraded"
+    if health_data["llm_circuit_breaker"].get("state") == "open":
+        overall_status = "degraded"
     
     health_data["status"] = overall_status
-    health_data["response_time_ms"] = int((datetime.now(timezone.utc) - start_time).total_seconds() * 1000)
+    health_data["response_time_ms"] = round((time.perf_counter() - started) * 1000, 3)
     
     # Return appropriate HTTP status code
     status_code = status.HTTP_200_OK if overall_status == "healthy" else status.HTTP_503_SERVICE_UNAVAILABLE
@@ -121,17 +92,34 @@ async def detailed_health_check():
 
 
 @router.get("/health/readiness")
-async def readiness_check():
+async def readiness_check(request: Request):
     """
     Readiness check for Azure Container Apps - verifies app can handle requests
+
+    Not ready while the CV pipeline is warming up, or while the Azure
+    OpenAI circuit breaker is open and there is no local fallback, so
+    traffic shifts to other replicas until probes succeed. With the
+    fallback enabled, the replica keeps answering in degraded mode.
     """
+    container = getattr(request.app.state, "container", None)
     try:
+        if container is not None and not container.ready:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Service not ready: CV pipeline warming up"
+            )
         # Minimal check: Azure OpenAI configuration
         if not settings.AZURE_OPENAI_ENDPOINT or not settings.AZURE_OPENAI_API_KEY:
             raise HTTPException(
                 status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                 detail="Service not ready: Azure OpenAI not configured"
             )
+        circuit = container.circuit_stats() if container else {"enabled": False}
+        if circuit.get("state") == "open" and not settings.LOCAL_FALLBACK_ENABLED:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Service not ready: Azure OpenAI circuit open, retry in {circuit['retry_after_ms'] / 1000:.0f}s"
+            )
         
         return {
             "status": "ready",
@@ -139,6 +127,8 @@ async def readiness_check():
             "timestamp": datetime.now(timezone.utc).isoformat(),
             "checks": {
                 "azure_openai_config": "ok",
+                "azure_openai_circuit": circuit.get("state", "disabled"),
+                "warm_up_seconds": container.warm_up_seconds if container else None,
                 "environment": settings.ENVIRONMENT
             }
         }
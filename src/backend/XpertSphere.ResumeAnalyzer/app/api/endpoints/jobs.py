@@ -0,0 +1,138 @@
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Query, Request, status
+from fastapi.responses import StreamingResponse
+from app.api import get_container
+from app.services import ServiceContainer
+from app.services.job_queue import JobQueue, TERMINAL_STATUSES
+from app.core import FileTooLargeError, settings
+from app.utils import read_upload
+from typing import Dict, Any
+import asyncio
+import json
+
+router = APIRouter()
+
+# Seconds between SSE keep-alive comments while a job is pending
+SSE_KEEPALIVE_SECONDS = 15
+
+
+def _get_job_queue(container: ServiceContainer) -> JobQueue:
+    """Get the job queue or fail when asynchronous jobs are disabled"""
+    if container.job_queue is None:
+        raise HTTPException(status_code=404, detail="Asynchronous jobs are disabled")
+    return container.job_queue
+
+
+@router.post("/jobs", status_code=status.HTTP_202_ACCEPTED, response_model=Dict[str, Any])
+async def submit_extraction_job(
+    request: Request,
+    file: UploadFile = File(...),
+    container: ServiceContainer = Depends(get_container),
+    include_raw_text: bool = Query(
+        False, description="Include extracted raw text in response"
+    ),
+):
+    """
+    Queue a CV for extraction and return immediately
+
+    Args:
+        request: Current request
+        file: CV file (PDF supported)
+        container: Application service container
+        include_raw_text: Whether to include raw extracted text in response
+
+    Returns:
+        Job ID and the URLs to poll its status or subscribe to its events
+    """
+    job_queue = _get_job_queue(container)
+    if not container.cv_service.can_process(file.filename):
+        raise HTTPException(
+            status_code=400, detail=f"Unsupported file format: {file.filename}"
+        )
+
+    try:
+        contents = await read_upload(file, settings.MAX_FILE_SIZE_MB * 1024 * 1024)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    job_id = await job_queue.submit(
+        file.filename, contents, {"include_raw_text": include_raw_text}
+    )
+    return {
+        "job_id": job_id,
+        "status": "queued",
+        "status_url": str(request.url_for("get_extraction_job", job_id=job_id)),
+        "events_url": str(request.url_for("stream_extraction_job_events", job_id=job_id)),
+    }
+
+
+@router.get("/jobs/stats", response_model=Dict[str, Any])
+async def get_job_queue_stats(container: ServiceContainer = Depends(get_container)):
+    """
+    Get queue depth per status and worker counts
+    """
+    return await _get_job_queue(container).stats()
+
+
+@router.get("/jobs/{job_id}", response_model=Dict[str, Any])
+async def get_extraction_job(job_id: str, container: ServiceContainer = Depends(get_container)):
+    """
+    Get the status of a job, with its result once completed
+
+    Args:
+        job_id: Job ID returned on submission
+        container: Application service container
+
+    Returns:
+        Job status, timestamps and result or error
+    """
+    job = await _get_job_queue(container).get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+    return job
+
+
+@router.get("/jobs/{job_id}/events")
+async def stream_extraction_job_events(
+    job_id: str, container: ServiceContainer = Depends(get_container)
+):
+    """
+    Subscribe to a job's status changes as Server-Sent Events
+
+    The current state is sent first; the stream ends once the job has
+    completed or failed.
+
+    Args:
+        job_id: Job ID returned on submission
+        container: Application service container
+
+    Returns:
+        text/event-stream of job states
+    """
+    job_queue = _get_job_queue(container)
+    listener = job_queue.subscribe(job_id)
+    job = await job_queue.get(job_id)
+    if job is None:
+        job_queue.unsubscribe(job_id, listener)
+        raise HTTPException(status_code=404, detail=f"Job not found: {job_id}")
+
+    async def stream_events():
+        current = job
+        try:
+            while True:
+                yield f"event: status\ndata: {json.dumps(current)}\n\n"
+                if current["status"] in TERMINAL_STATUSES:
+                    return
+                while True:
+                    try:
+                        current = await asyncio.wait_for(listener.get(), SSE_KEEPALIVE_SECONDS)
+                        break
+                    except asyncio.TimeoutError:
+                        yield ": keep-alive\n\n"
+        finally:
+            job_queue.unsubscribe(job_id, listener)
+
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -0,0 +1,17 @@
+from fastapi import APIRouter, HTTPException, Response
+from app.core import settings
+from app.utils import render_metrics
+
+router = APIRouter()
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Prometheus metrics: per-stage pipeline histograms, extracted pages and
+    characters, LLM tokens, errors by type and CV analyses in flight
+    """
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(status_code=404, detail="Not Found")
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
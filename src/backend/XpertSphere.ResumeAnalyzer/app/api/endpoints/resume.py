@@ -1,8 +1,12 @@
-from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Query
-from app.services import CVService
+from fastapi import APIRouter, File, UploadFile, HTTPException, Depends, Query, Response
+from fastapi.responses import StreamingResponse
+from app.services import BatchPipeline, CVService, build_batch_items
 from app.api import get_cv_service
-from app.core import settings
-from typing import Dict, Any
+from app.core import FileTooLargeError, settings
+from app.utils import read_upload, tracer
+from typing import Dict, Any, List, Literal
+import json
+import time
 
 router = APIRouter()
 
@@ -14,34 +18,173 @@ async def extract_data_from_cv(
     include_raw_text: bool = Query(
         False, description="Include extracted raw text in response"
     ),
+    mode: Literal["full", "fast"] = Query(
+        "full", description="Full LLM analysis, or fast local extraction of contact details and dates"
+    ),
 ):
     """
     Extract structured information from a CV
 
+    The CV model is encoded straight to JSON bytes, skipping FastAPI's
+    generic encoding of the response. The X-Tokens-Saved header is set
+    when the extracted text was compacted, and X-Analysis-Mode when the
+    analyzer reports it.
+
     Args:
         file: CV file (PDF supported)
         cv_service: CV processing service
         include_raw_text: Whether to include raw extracted text in response
+        mode: "full" for LLM analysis, "fast" for local extraction only
 
     Returns:
         Structured CV information
     """
-    # Check file size
+    # Check file size without reading it; the body size was already
+    # bounded while streaming by UploadSizeLimitMiddleware
     max_size_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
-    file_size = 0
-    contents = await file.read()
-    file_size = len(contents)
-    await file.seek(0)
-
-    if file_size > max_size_bytes:
+    if file.size is not None and file.size > max_size_bytes:
         raise HTTPException(
             status_code=400,
             detail=f"File too large. Maximum allowed size is {settings.MAX_FILE_SIZE_MB} MB.",
         )
 
     # Process CV
-    options = {"include_raw_text": include_raw_text}
-    cv_model = await cv_service.process_cv(file, options)
+    options = {"include_raw_text": include_raw_text, "mode": mode}
+    token_usage: Dict[str, int] = {}
+    analysis: Dict[str, str] = {}
+    with tracer.start_span("extract_data_from_cv", {"mode": mode}):
+        cv_model = await cv_service.process_cv(
+            file, options, token_usage=token_usage, analysis=analysis
+        )
+    headers = {}
+    if token_usage:
+        headers["X-Tokens-Saved"] = str(token_usage["saved"])
+    if analysis:
+        headers["X-Analysis-Mode"] = analysis["mode"]
+
+    # Return response, the same body as {"extracted_data": cv_model}
+    return Response(
+        content=b'{"extracted_data":' + cv_model.to_json() + b"}",
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+@router.post("/extract/stream")
+async def stream_data_from_cv(
+    file: UploadFile = File(...),
+    cv_service: CVService = Depends(get_cv_service),
+    format: Literal["sse", "ndjson"] = Query(
+        "sse", description="Stream as Server-Sent Events or NDJSON"
+    ),
+    include_raw_text: bool = Query(
+        False, description="Include extracted raw text in response"
+    ),
+    mode: Literal["full", "fast"] = Query(
+        "full", description="Full LLM analysis, or fast local extraction of contact details and dates"
+    ),
+):
+    """
+    Extract structured information from a CV, streaming fields as they complete
+
+    The LLM response is parsed while it is generated: each top-level field
+    is sent as soon as it is complete, experiences and trainings one entry
+    at a time, followed by a ``result`` event with the complete CV. A
+    failure after the stream has started is sent as an ``error`` event.
+
+    Args:
+        file: CV file (PDF supported)
+        cv_service: CV processing service
+        format: "sse" for text/event-stream, "ndjson" for application/x-ndjson
+        include_raw_text: Whether to include raw extracted text in response
+        mode: "full" for LLM analysis, "fast" for local extraction only
+
+    Returns:
+        Stream of CV field events
+    """
+    if not cv_service.can_process(file.filename):
+        raise HTTPException(
+            status_code=400, detail=f"Unsupported file format: {file.filename}"
+        )
+    try:
+        content = await read_upload(file, settings.MAX_FILE_SIZE_MB * 1024 * 1024)
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    options = {"include_raw_text": include_raw_text, "mode": mode}
+
+    async def stream_events():
+        try:
+            async for event in cv_service.stream_content(content, file.filename, options):
+                yield _encode_event(event.to_dict(), format)
+        except Exception as e:
+            error = {"event": "error", "error": {"type": e.__class__.__name__, "detail": str(e)}}
+            yield _encode_event(error, format)
+
+    if format == "ndjson":
+        return StreamingResponse(stream_events(), media_type="application/x-ndjson")
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _encode_event(payload: Dict[str, Any], format: str) -> str:
+    """Encode a streamed event as an SSE message or an NDJSON line"""
+    if format == "ndjson":
+        return json.dumps(payload) + "\n"
+    data = {key: value for key, value in payload.items() if key != "event"}
+    return f"event: {payload['event']}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/extract/batch")
+async def extract_data_from_cv_batch(
+    files: List[UploadFile] = File(..., description="CV files and/or ZIP archives of CV files"),
+    cv_service: CVService = Depends(get_cv_service),
+):
+    """
+    Extract structured information from many CVs at once
+
+    CVs run through a staged pipeline with separate concurrency limits for
+    reading, extraction and analysis. One NDJSON line is streamed per CV
+    as soon as it completes, followed by a summary line.
+
+    Args:
+        files: CV files and/or ZIP archives of CV files
+        cv_service: CV processing service
+
+    Returns:
+        NDJSON stream of per-CV results
+    """
+    max_size_bytes = settings.MAX_FILE_SIZE_MB * 1024 * 1024
+    items = build_batch_items(files, max_size_bytes)
+    if len(items) > settings.BATCH_MAX_FILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many files. Maximum allowed per batch is {settings.BATCH_MAX_FILES}.",
+        )
+
+    pipeline = BatchPipeline(
+        cv_service,
+        read_concurrency=settings.BATCH_READ_CONCURRENCY,
+        extract_concurrency=settings.BATCH_EXTRACT_CONCURRENCY,
+        analyze_concurrency=settings.BATCH_ANALYZE_CONCURRENCY,
+        max_file_size=max_size_bytes,
+    )
+
+    async def stream_results():
+        started = time.perf_counter()
+        succeeded = 0
+        async for result in pipeline.run(items):
+            succeeded += result["status"] == "ok"
+            yield json.dumps(result) + "\n"
+        summary = {
+            "total": len(items),
+            "succeeded": succeeded,
+            "failed": len(items) - succeeded,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        }
+        yield json.dumps({"summary": summary}) + "\n"
 
-    # Return response
-    return {"extracted_data": cv_model}
+    return StreamingResponse(stream_results(), media_type="application/x-ndjson")
@@ -0,0 +1,152 @@
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from app.utils.tracing import TRACEPARENT_HEADER, TRACESTATE_HEADER, parse_traceparent, tracer
+
+# Allowance for multipart boundaries and part headers around a single file
+MULTIPART_OVERHEAD_BYTES = 64 * 1024
+
+
+class _BodyTooLarge(Exception):
+    """Raised from receive() once a request body passes its limit"""
+
+
+class UploadSizeLimitMiddleware:
+    """
+    ASGI middleware rejecting oversized upload bodies while they stream in
+
+    Requests announcing a larger Content-Length are rejected before any
+    body is read; otherwise the received bytes are counted and the
+    request is aborted as soon as the limit is passed, so an oversized
+    upload is never fully buffered or spooled.
+    """
+
+    def __init__(self, app: ASGIApp, limits: Callable[[], Dict[str, Tuple[int, str]]]):
+        """
+        Initialize the middleware
+
+        Args:
+            app: Wrapped ASGI application
+            limits: Builds the maximum body size in bytes and error detail,
+                by request path; called on the first request, so that
+                settings are not read when the application is imported
+        """
+        self.app = app
+        self._build_limits = limits
+        self.limits: Optional[Dict[str, Tuple[int, str]]] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        if self.limits is None:
+            self.limits = self._build_limits()
+        limit = self.limits.get(scope["path"])
+        if limit is None:
+            await self.app(scope, receive, send)
+            return
+
+        max_bytes, detail = limit
+        content_length = self._get_content_length(scope)
+        if content_length is not None and content_length > max_bytes:
+            await self._reject(scope, receive, send, detail)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > max_bytes:
+                    exceeded = True
+                    raise _BodyTooLarge()
+            return message
+
+        async def guarded_send(message: Message) -> None:
+            nonlocal response_started
+            # Drop the app's own error response for the aborted body
+            if exceeded:
+                return
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            if not exceeded:
+                raise
+
+        if exceeded and not response_started:
+            await self._reject(scope, receive, send, detail)
+
+    @staticmethod
+    def _get_content_length(scope: Scope) -> Optional[int]:
+        """Get the declared body size, if any"""
+        for name, value in scope["headers"]:
+            if name == b"content-length":
+                try:
+                    return int(value)
+                except ValueError:
+                    return None
+        return None
+
+    @staticmethod
+    async def _reject(scope: Scope, receive: Receive, send: Send, detail: str) -> None:
+        """Send the error response for an oversized body"""
+        response = JSONResponse(
+            status_code=400, content={"detail": detail}, headers={"Connection": "close"}
+        )
+        await response(scope, receive, send)
+
+
+class TracingMiddleware:
+    """
+    ASGI middleware running each HTTP request in a server span
+
+    The W3C ``traceparent`` and ``tracestate`` headers sent by the calling
+    service make the request span a child of the caller's span, so spans
+    of the CV pipeline join the caller's trace. The span's own context is
+    returned in the ``traceresponse`` header.
+    """
+
+    def __init__(self, app: ASGIApp, excluded_paths: Iterable[str] = ()):
+        """
+        Initialize the middleware
+
+        Args:
+            app: Wrapped ASGI application
+            excluded_paths: Path prefixes not traced, such as health probes
+        """
+        self.app = app
+        self.excluded_paths = tuple(excluded_paths)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or not tracer.enabled or scope["path"].startswith(self.excluded_paths):
+            await self.app(scope, receive, send)
+            return
+
+        headers = dict(scope["headers"])
+        parent = parse_traceparent(
+            headers.get(TRACEPARENT_HEADER.encode(), b"").decode("latin-1"),
+            headers.get(TRACESTATE_HEADER.encode(), b"").decode("latin-1") or None,
+        )
+        attributes = {"http.method": scope["method"], "http.target": scope["path"]}
+        with tracer.start_span(f"{scope['method']} {scope['path']}", attributes, parent) as span:
+
+            async def traced_send(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    span.set_attribute("http.status_code", message["status"])
+                    if message["status"] >= 500:
+                        span.status = "error"
+                    message["headers"] = list(message.get("headers", [])) + [
+                        (b"traceresponse", span.context.traceparent.encode())
+                    ]
+                await send(message)
+
+            await self.app(scope, receive, traced_send)
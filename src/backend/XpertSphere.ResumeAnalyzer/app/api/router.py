@@ -1,8 +1,10 @@
 from fastapi import APIRouter
-from app.api.endpoints import resume, health
+from app.api.endpoints import cache, jobs, resume, health
 
 router = APIRouter()
 
 # Include all API routers
 router.include_router(health.router, tags=["Health"])
 router.include_router(resume.router, tags=["CV Extraction"])
+router.include_router(jobs.router, tags=["Extraction Jobs"])
+router.include_router(cache.router, tags=["Cache"])
@@ -1,8 +1,8 @@
 from .config import settings
 import logging
-from .exceptions import AnalysisError, BaseApplicationError, ExtractionError, ValidationError
+from .exceptions import AnalysisError, BaseApplicationError, CircuitOpenError, ExtractionError, FileTooLargeError, ServiceOverloadedError, ValidationError, retry_after_headers
 
-__all__ = ["settings", "AnalysisError", "BaseApplicationError", "ExtractionError", "ValidationError"]
+__all__ = ["settings", "AnalysisError", "BaseApplicationError", "CircuitOpenError", "ExtractionError", "FileTooLargeError", "ServiceOverloadedError", "ValidationError", "retry_after_headers"]
 
 
 def __init__(self, **kwargs):
@@ -1,9 +1,9 @@
-from typing import Optional
+from typing import Any, Callable, Dict, List, Optional
 from pydantic_settings import BaseSettings
-from pydantic import ConfigDict
-from azure.keyvault.secrets import SecretClient
-from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
+from pydantic import ConfigDict, PrivateAttr
+from app.core.secrets import KeyVaultSecrets
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 class Settings(BaseSettings):
@@ -28,8 +28,134 @@ class Settings(BaseSettings):
     
     AZURE_OPENAI_TEMPERATURE: float = 0.1
 
+    # Azure OpenAI connection pool
+    AZURE_OPENAI_MAX_CONNECTIONS: int = 20
+    AZURE_OPENAI_MAX_KEEPALIVE_CONNECTIONS: int = 10
+    AZURE_OPENAI_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    AZURE_OPENAI_TIMEOUT_SECONDS: float = 60.0
+    AZURE_OPENAI_CONNECT_TIMEOUT_SECONDS: float = 5.0
+
+    # Client-side rate limiting against the deployment quota (0 disables a
+    # limit): calls queue instead of hitting 429s, and throttled, timed out
+    # or failed calls are retried with jittered exponential backoff
+    AZURE_OPENAI_RATE_LIMIT_RPM: int = 0
+    AZURE_OPENAI_RATE_LIMIT_TPM: int = 0
+    AZURE_OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS: float = 30.0
+    AZURE_OPENAI_COMPLETION_TOKENS_ESTIMATE: int = 1000
+    AZURE_OPENAI_MAX_RETRIES: int = 3
+    AZURE_OPENAI_RETRY_BASE_DELAY_SECONDS: float = 0.5
+    AZURE_OPENAI_RETRY_MAX_DELAY_SECONDS: float = 20.0
+
+    # Hedged requests: a request without a response after a percentile of
+    # recent latencies is also sent to a second deployment or endpoint
+    AZURE_OPENAI_HEDGING_ENABLED: bool = False
+    AZURE_OPENAI_HEDGE_DEPLOYMENT: Optional[str] = None
+    AZURE_OPENAI_HEDGE_MODEL_VERSION: Optional[str] = None
+    AZURE_OPENAI_HEDGE_ENDPOINT: Optional[str] = None
+    AZURE_OPENAI_HEDGE_API_KEY: Optional[str] = None
+    AZURE_OPENAI_HEDGE_PERCENTILE: float = 95.0
+    AZURE_OPENAI_HEDGE_INITIAL_DELAY_SECONDS: float = 8.0
+    AZURE_OPENAI_HEDGE_MIN_DELAY_SECONDS: float = 1.0
+    AZURE_OPENAI_HEDGE_MAX_DELAY_SECONDS: float = 20.0
+
+    # Circuit breaker around the LLM: opens when the failure rate or the
+    # slow call rate of recent calls crosses its threshold, rejects calls
+    # (or falls back locally) while open, then lets a few probes through
+    LLM_CIRCUIT_BREAKER_ENABLED: bool = True
+    LLM_CIRCUIT_WINDOW: int = 20
+    LLM_CIRCUIT_MIN_CALLS: int = 10
+    LLM_CIRCUIT_FAILURE_RATE: float = 0.5
+    LLM_CIRCUIT_SLOW_CALL_SECONDS: float = 30.0
+    LLM_CIRCUIT_SLOW_CALL_RATE: float = 0.8
+    LLM_CIRCUIT_OPEN_SECONDS: float = 30.0
+    LLM_CIRCUIT_HALF_OPEN_PROBES: int = 3
+
+    # PDF extraction worker pool (0 workers runs extraction in-process)
+    EXTRACTION_POOL_WORKERS: int = 2
+    EXTRACTION_QUEUE_SIZE: int = 16
+    EXTRACTION_TIMEOUT_SECONDS: float = 30.0
+    EXTRACTION_MAX_TASKS_PER_WORKER: int = 50
+    EXTRACTION_MAX_WORKER_RSS_MB: int = 512
+    EXTRACTION_PAGES_PER_SHARD: int = 8
+
+    # Read the text layer first, running layout analysis only on pages that need it
+    EXTRACTION_TIERED: bool = True
+
+    # Bounds on the work spent on a single document (0 disables a limit)
+    EXTRACTION_MAX_PAGES: int = 30
+    EXTRACTION_MAX_CHARS: int = 100_000
+
+    # Result cache keyed by file content (disk tier disabled without a path)
+    RESULT_CACHE_ENABLED: bool = True
+    RESULT_CACHE_MAX_ENTRIES: int = 512
+    RESULT_CACHE_TTL_SECONDS: int = 7 * 24 * 3600
+    RESULT_CACHE_DB_PATH: Optional[str] = None
+
+    # Result cache keyed by normalized extracted text (shares TTL and DB path)
+    TEXT_CACHE_ENABLED: bool = True
+    TEXT_CACHE_MAX_ENTRIES: int = 512
+
+    # Compaction of extracted text before analysis
+    TEXT_COMPACTION_ENABLED: bool = True
+    TEXT_COMPACTION_MAX_TOKENS: int = 6000
+
+    # Deterministic extraction of contact details, dates and languages: merged
+    # into LLM results, served alone in fast mode and as a degraded fallback
+    LOCAL_PREEXTRACTION_ENABLED: bool = True
+    LOCAL_FALLBACK_ENABLED: bool = True
+
+    # Batch extraction
+    BATCH_MAX_FILES: int = 500
+    BATCH_MAX_UPLOAD_MB: int = 200
+    BATCH_READ_CONCURRENCY: int = 8
+    BATCH_EXTRACT_CONCURRENCY: int = 2
+    BATCH_ANALYZE_CONCURRENCY: int = 8
+
+    # Asynchronous extraction jobs
+    JOB_QUEUE_ENABLED: bool = True
+    JOB_QUEUE_DB_PATH: str = "jobs.db"
+    JOB_QUEUE_WORKERS: int = 4
+    JOB_QUEUE_MAX_ATTEMPTS: int = 3
+    # Finished jobs and their results are deleted after this many hours
+    JOB_QUEUE_RETENTION_HOURS: float = 24.0
+
+    # Prometheus metrics endpoint
+    METRICS_ENABLED: bool = True
+
+    # Request tracing, joined to the caller's trace through the W3C
+    # traceparent header. Spans go to "none", "console", "file" (JSON lines
+    # at TRACING_FILE_PATH) or a "package.module:SpanExporter" import path
+    TRACING_EXPORTER: str = "none"
+    TRACING_FILE_PATH: str = "traces.jsonl"
+
+    # Build the CV pipeline (openai SDK and PDF libraries imports, Key Vault
+    # secrets, worker pools) in a background task once the server accepts
+    # health probes; extraction requests wait for it, readiness fails until
+    # it is done. When disabled, startup completes only once it is built
+    STARTUP_BACKGROUND_WARM_UP: bool = True
+
+    # Key Vault secrets (production and staging): reloaded every
+    # KEY_VAULT_REFRESH_SECONDS (0 disables), with rotated Azure OpenAI
+    # credentials and deployments applied to the running analyzers. A
+    # restart within KEY_VAULT_SNAPSHOT_MAX_AGE_SECONDS of the last fetch
+    # reads the snapshot file (owner-only) instead of Key Vault
+    KEY_VAULT_REFRESH_SECONDS: int = 3600
+    KEY_VAULT_SNAPSHOT_PATH: Optional[str] = None
+    KEY_VAULT_SNAPSHOT_MAX_AGE_SECONDS: int = 300
+
+    # Detailed health check, served from a snapshot: system usage, event
+    # loop lag and in-flight analyses are sampled in the background every
+    # HEALTH_SAMPLE_INTERVAL_SECONDS, and Azure OpenAI is probed at most
+    # every HEALTH_OPENAI_PROBE_TTL_SECONDS (0 disables the probe)
+    HEALTH_SAMPLE_INTERVAL_SECONDS: float = 5.0
+    HEALTH_OPENAI_PROBE_TTL_SECONDS: float = 60.0
+    HEALTH_OPENAI_PROBE_TIMEOUT_SECONDS: float = 5.0
+
     # File size limits
     MAX_FILE_SIZE_MB: int = 10
+
+    _secrets_loaded: bool = PrivateAttr(default=False)
+    _key_vault: Optional[KeyVaultSecrets] = PrivateAttr(default=None)
     
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
@@ -38,68 +164,70 @@ class Settings(BaseSettings):
         logger.info(f"🔧 Settings initialization - AZURE_OPENAI_ENDPOINT: {'***SET***' if self.AZURE_OPENAI_ENDPOINT else 'NOT SET'}")
         logger.info(f"🔧 Settings initialization - AZURE_OPENAI_API_KEY: {'***SET***' if self.AZURE_OPENAI_API_KEY else 'NOT SET'}")
 
-        if self.ENVIRONMENT in ["production", "staging"] and self.KEY_VAULT_URL:
-                self._load_from_keyvault()
+    def load_secrets(self) -> None:
+        """
+        Load the Azure OpenAI secrets from Key Vault in production and staging
+
+        Called when the CV pipeline is built rather than on initialization,
+        so reading settings never waits for Key Vault. Secrets are loaded once.
+        """
+        if self._secrets_loaded:
+            return
+        self._secrets_loaded = True
+        if self.secrets_enabled:
+            self._load_from_keyvault()
                 
     def _load_from_keyvault(self):
-        """Load secrets from Azure Key Vault"""
+        """Load secrets from Azure Key Vault, or from its recent snapshot"""
         try:
-            
-            if self.AZURE_CLIENT_ID:
-                credential = ManagedIdentityCredential(client_id=self.AZURE_CLIENT_ID)
-            else:
-                credential = DefaultAzureCredential()
-            
-            
-            client = SecretClient(vault_url=self.KEY_VAULT_URL, credential=credential)
-            
-            # Load secrets with fallback to current values
-            try:
-                self.AZURE_OPENAI_ENDPOINT = client.get_secret("azure-openai-endpoint").value
-            except Exception:
-                logger.info("Warning: Could not load azure-openai-endpoint from Key Vault")
-                
-            try:
-                self.AZURE_OPENAI_API_KEY = client.get_secret("azure-openai-api-key").value
-            except Exception:
-                logger.info("Warning: Could not load azure-openai-api-key from Key Vault")
-                
-            try:
-                self.AZURE_OPENAI_API_VERSION = client.get_secret("azure-openai-api-version").value
-            except Exception:
-                logger.info("Warning: Could not load azure-openai-api-version from Key Vault")
-                
-            try:
-                self.AZURE_OPENAI_DEPLOYMENT_GPT_35_TURBO = client.get_secret("azure-openai-deployment-gpt35").value
-            except Exception:
-                logger.info("Warning: Could not load azure-openai-deployment-gpt35 from Key Vault")
-                
-            try:
-                self.AZURE_OPENAI_MODEL_VERSION_GPT_35_TURBO = client.get_secret("azure-openai-model-version-gpt35").value
-            except Exception:
-                logger.info("Warning: Could not load azure-openai-model-version-gpt35 from Key Vault")
-                
-            try:
-                self.AZURE_OPENAI_DEPLOYMENT_GPT_4O_MINI_PROD = client.get_secret("azure-openai-deployment-gpt4o-mini").value
-            except Exception:
-                logger.info("Warning: Could not load azure-openai-deployment-gpt4o-mini from Key Vault")
-                
-            try:
-                self.AZURE_OPENAI_MODEL_VERSION_GPT_4O_MINI_PROD = client.get_secret("azure-openai-model-version-gpt4o-mini").value
-            except Exception:
-                logger.info("Warning: Could not load azure-openai-model-version-gpt4o-mini from Key Vault")
-                
-            try:
-                self.AZURE_OPENAI_TEMPERATURE = float(client.get_secret("azure-openai-temperature").value)
-            except Exception:
-                logger.info("Warning: Could not load azure-openai-temperature from Key Vault")
-            
-            logger.info("Secrets loaded from Azure Key Vault")
+            vault = self.key_vault()
+            self._apply_secrets(vault.load())
+            logger.info(f"Secrets loaded from {'Key Vault snapshot' if vault.source == 'snapshot' else 'Azure Key Vault'}")
             logger.info(f"🔧 After Key Vault - AZURE_OPENAI_ENDPOINT: {'***SET***' if self.AZURE_OPENAI_ENDPOINT else 'NOT SET'}")
             logger.info(f"🔧 After Key Vault - AZURE_OPENAI_API_KEY: {'***SET***' if self.AZURE_OPENAI_API_KEY else 'NOT SET'}")
         except Exception as e:
             logger.info(f"Failed to load secrets from Key Vault: {e}")
             logger.info("Falling back to environment variables")
+
+    @property
+    def secrets_enabled(self) -> bool:
+        """Whether the Azure OpenAI secrets come from Key Vault"""
+        return self.ENVIRONMENT in ["production", "staging"] and bool(self.KEY_VAULT_URL)
+
+    def key_vault(self) -> KeyVaultSecrets:
+        """Get the Key Vault secret source, created on first use"""
+        if self._key_vault is None:
+            self._key_vault = KeyVaultSecrets(
+                self.KEY_VAULT_URL,
+                client_id=self.AZURE_CLIENT_ID,
+                snapshot_path=self.KEY_VAULT_SNAPSHOT_PATH,
+                snapshot_max_age=self.KEY_VAULT_SNAPSHOT_MAX_AGE_SECONDS,
+            )
+        return self._key_vault
+
+    def refresh_secrets(self) -> List[str]:
+        """
+        Fetch the secrets from Key Vault again, picking up rotated values
+
+        Returns:
+            Names of the settings whose value changed
+        """
+        return self._apply_secrets(self.key_vault().fetch())
+
+    def _apply_secrets(self, values: Dict[str, Any]) -> List[str]:
+        """
+        Set settings from secret values
+
+        Args:
+            values: Settings field values
+
+        Returns:
+            Names of the settings whose value changed
+        """
+        changed = [name for name, value in values.items() if getattr(self, name) != value]
+        for name in changed:
+            setattr(self, name, values[name])
+        return changed
    
     @property
     def current_deployment(self) -> str:
@@ -124,5 +252,43 @@ class Settings(BaseSettings):
     )
 
 
+class LazySettings:
+    """
+    Settings built on first use
+
+    Stands in for the Settings instance so that importing the application
+    does not read the environment and .env file; attribute reads and writes
+    go to the instance, built once on the first of them.
+    """
+
+    def __init__(self, factory: Callable[[], Settings] = Settings):
+        """
+        Initialize the proxy
+
+        Args:
+            factory: Builds the settings instance
+        """
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_settings", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _get(self) -> Settings:
+        """Get the settings instance, building it on first use"""
+        if self._settings is None:
+            with self._lock:
+                if self._settings is None:
+                    object.__setattr__(self, "_settings", self._factory())
+        return self._settings
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._get(), name)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        setattr(self._get(), name, value)
+
+    def __delattr__(self, name: str) -> None:
+        delattr(self._get(), name)
+
+
 # Create settings instance
-settings = Settings()
+settings = LazySettings()
@@ -1,3 +1,7 @@
+import math
+from typing import Dict, Optional, Union
+
+
 class BaseApplicationError(Exception):
     """Base class for application errors"""
 
@@ -16,7 +20,54 @@ class AnalysisError(BaseApplicationError):
     pass
 
 
+class CircuitOpenError(AnalysisError):
+    """Raised without calling the analyzer while its circuit breaker is open"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        """
+        Args:
+            message: Error message
+            retry_after: Seconds until the breaker lets calls through, if known
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
 class ValidationError(BaseApplicationError):
     """Raised when data validation fails"""
 
     pass
+
+
+class FileTooLargeError(ValidationError):
+    """Raised when an uploaded file exceeds the size limit"""
+
+    pass
+
+
+class ServiceOverloadedError(BaseApplicationError):
+    """Raised when a bounded work queue cannot accept more jobs"""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        """
+        Args:
+            message: Error message
+            retry_after: Seconds after which the queue may accept the job, if known
+        """
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def retry_after_headers(error: Union[ServiceOverloadedError, CircuitOpenError]) -> Optional[Dict[str, str]]:
+    """
+    Response headers telling clients when to retry after a temporary error
+
+    Args:
+        error: Overload or open circuit error
+
+    Returns:
+        A Retry-After header in whole seconds, or None if the delay is unknown
+    """
+    if error.retry_after is None:
+        return None
+    return {"Retry-After": str(max(1, math.ceil(error.retry_after)))}
@@ -0,0 +1,182 @@
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional, Tuple
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+# Key Vault secret name: settings field it sets and conversion of its value
+SECRET_FIELDS: Dict[str, Tuple[str, Callable[[str], Any]]] = {
+    "azure-openai-endpoint": ("AZURE_OPENAI_ENDPOINT", str),
+    "azure-openai-api-key": ("AZURE_OPENAI_API_KEY", str),
+    "azure-openai-api-version": ("AZURE_OPENAI_API_VERSION", str),
+    "azure-openai-deployment-gpt35": ("AZURE_OPENAI_DEPLOYMENT_GPT_35_TURBO", str),
+    "azure-openai-model-version-gpt35": ("AZURE_OPENAI_MODEL_VERSION_GPT_35_TURBO", str),
+    "azure-openai-deployment-gpt4o-mini": ("AZURE_OPENAI_DEPLOYMENT_GPT_4O_MINI_PROD", str),
+    "azure-openai-model-version-gpt4o-mini": ("AZURE_OPENAI_MODEL_VERSION_GPT_4O_MINI_PROD", str),
+    "azure-openai-temperature": ("AZURE_OPENAI_TEMPERATURE", float),
+}
+
+
+class KeyVaultSecrets:
+    """
+    Azure OpenAI configuration secrets read from Azure Key Vault
+
+    All secrets are fetched concurrently, so a load costs one round trip
+    rather than one per secret. Each successful fetch can be written to a
+    snapshot file, readable only by its owner, which a restart within
+    the snapshot's maximum age uses instead of calling Key Vault.
+    """
+
+    def __init__(
+        self,
+        vault_url: str,
+        client_id: Optional[str] = None,
+        snapshot_path: Optional[str] = None,
+        snapshot_max_age: float = 0,
+        client: Any = None,
+    ):
+        """
+        Initialize the secret source
+
+        Args:
+            vault_url: URL of the Key Vault
+            client_id: Optional client id of the user-assigned managed identity
+            snapshot_path: Optional file keeping the last fetched secrets
+            snapshot_max_age: Seconds during which a snapshot is used on load
+            client: Optional secret client, defaults to a SecretClient
+                authenticated with the managed identity
+        """
+        self.vault_url = vault_url
+        self.client_id = client_id
+        self.snapshot_path = snapshot_path
+        self.snapshot_max_age = snapshot_max_age
+        self._client = client
+        self._lock = threading.Lock()
+        self.source: Optional[str] = None
+        self.loaded_at: Optional[float] = None
+        self.fetches = 0
+        self.failed_secrets = 0
+        self.last_fetch_ms: Optional[float] = None
+
+    def _get_client(self) -> Any:
+        """Get the secret client, created once so its access token is reused"""
+        with self._lock:
+            if self._client is None:
+                from azure.keyvault.secrets import SecretClient
+                from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
+
+                if self.client_id:
+                    credential = ManagedIdentityCredential(client_id=self.client_id)
+                else:
+                    credential = DefaultAzureCredential()
+                self._client = SecretClient(vault_url=self.vault_url, credential=credential)
+            return self._client
+
+    def load(self) -> Dict[str, Any]:
+        """
+        Get the secrets from a fresh snapshot, or else from Key Vault
+
+        Returns:
+            Settings field values
+        """
+        values = self.read_snapshot()
+        if values is not None:
+            self.source = "snapshot"
+            self.loaded_at = time.time()
+            return values
+        return self.fetch()
+
+    def fetch(self) -> Dict[str, Any]:
+        """
+        Fetch all secrets from Key Vault concurrently
+
+        Secrets that cannot be read are left out, so their settings keep
+        their current value.
+
+        Returns:
+            Settings field values of the secrets read
+        """
+        client = self._get_client()
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=len(SECRET_FIELDS), thread_name_prefix="keyvault") as pool:
+            results = list(pool.map(lambda name: (name, self._fetch_secret(client, name)), SECRET_FIELDS))
+        self.last_fetch_ms = round((time.perf_counter() - started) * 1000, 1)
+        self.fetches += 1
+
+        values = {SECRET_FIELDS[name][0]: value for name, value in results if value is not None}
+        self.failed_secrets = len(SECRET_FIELDS) - len(values)
+        if values:
+            self.source = "key_vault"
+            self.loaded_at = time.time()
+            self.save_snapshot(values)
+        return values
+
+    def _fetch_secret(self, client: Any, name: str) -> Optional[Any]:
+        """Read and convert one secret, or None when it cannot be read"""
+        try:
+            return SECRET_FIELDS[name][1](client.get_secret(name).value)
+        except Exception:
+            logger.info(f"Warning: Could not load {name} from Key Vault")
+            return None
+
+    def read_snapshot(self) -> Optional[Dict[str, Any]]:
+        """
+        Read the snapshot when it is recent and was taken from this vault
+
+        Returns:
+            Settings field values, or None without a usable snapshot
+        """
+        if not self.snapshot_path or self.snapshot_max_age <= 0:
+            return None
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as file:
+                snapshot = json.load(file)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable Key Vault snapshot: {e}")
+            return None
+
+        age = time.time() - snapshot.get("fetched_at", 0)
+        if snapshot.get("vault_url") != self.vault_url or not 0 <= age <= self.snapshot_max_age:
+            return None
+        fields = {field for field, _ in SECRET_FIELDS.values()}
+        return {field: value for field, value in snapshot.get("values", {}).items() if field in fields}
+
+    def save_snapshot(self, values: Dict[str, Any]) -> None:
+        """
+        Write the secrets to the snapshot file, readable by its owner only
+
+        Args:
+            values: Settings field values
+        """
+        if not self.snapshot_path or self.snapshot_max_age <= 0:
+            return
+        temporary = f"{self.snapshot_path}.{os.getpid()}.tmp"
+        try:
+            descriptor = os.open(temporary, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(descriptor, "w", encoding="utf-8") as file:
+                json.dump({"vault_url": self.vault_url, "fetched_at": time.time(), "values": values}, file)
+            os.replace(temporary, self.snapshot_path)
+        except OSError as e:
+            logger.warning(f"Could not write Key Vault snapshot: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the state of the secrets
+
+        Returns:
+            Where the secrets were last loaded from and when, the number of
+            fetches, secrets missing from the last one and its duration
+        """
+        return {
+            "source": self.source,
+            "age_seconds": round(time.time() - self.loaded_at, 1) if self.loaded_at else None,
+            "fetches": self.fetches,
+            "failed_secrets": self.failed_secrets,
+            "last_fetch_ms": self.last_fetch_ms,
+        }
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import BinaryIO, Optional
+from typing import BinaryIO, Optional, Union
 
 
 class DocumentExtractor(ABC):
@@ -21,12 +21,15 @@ class DocumentExtractor(ABC):
         pass
 
     @abstractmethod
-    async def extract_text(self, file_content: bytes, file_name: str) -> str:
+    async def extract_text(self, file_content: Union[bytes, memoryview], file_name: str) -> str:
         """
         Extract text from a document
 
+        Implementations must not copy or retain the content buffer, which
+        is the single in-memory copy of the upload.
+
         Args:
-            file_content: Binary content of the file
+            file_content: Binary content of the file, as bytes or a memoryview
             file_name: Name of the file
 
         Returns:
@@ -1,6 +1,6 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
-from app.domain.models import CVModel
+from typing import Any, AsyncIterator, Dict, Optional
+from app.domain.models import CVFieldEvent, CVModel, iter_cv_events
 
 
 class TextAnalyzer(ABC):
@@ -8,6 +8,16 @@ class TextAnalyzer(ABC):
     Interface for text analyzers that extract structured information
     """
 
+    @property
+    def version(self) -> str:
+        """
+        Identifier of the analyzer configuration
+
+        Results produced under different versions must not be reused
+        for one another, so this is part of every result cache key.
+        """
+        return self.__class__.__name__
+
     @abstractmethod
     async def analyze(
         self, text: str, options: Optional[Dict[str, Any]] = None
@@ -26,3 +36,27 @@ class TextAnalyzer(ABC):
             AnalysisError: If analysis fails
         """
         pass
+
+    async def analyze_stream(
+        self, text: str, options: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[CVFieldEvent]:
+        """
+        Analyze text and yield each CV field as soon as it is known
+
+        The default implementation runs analyze() and splits its result;
+        analyzers able to produce partial results should override it.
+
+        Args:
+            text: Text to analyze
+            options: Optional parameters for the analyzer
+
+        Yields:
+            One event per field or list entry, then a ``result`` event
+            carrying the complete CV model
+
+        Raises:
+            AnalysisError: If analysis fails
+        """
+        cv_model = await self.analyze(text, options)
+        for event in iter_cv_events(cv_model):
+            yield event
@@ -1,4 +1,5 @@
-from .resume import CVModel, Experience, Training
+from .resume import CVModel, Experience, JSONModel, Training
+from .stream import CVFieldEvent, RESULT_EVENT, iter_cv_events
 
 # Expose these classes directly from the module
-__all__ = ["CVModel", "Experience", "Training"]
\ No newline at end of file
+__all__ = ["CVModel", "Experience", "JSONModel", "Training", "CVFieldEvent", "RESULT_EVENT", "iter_cv_events"]
\ No newline at end of file
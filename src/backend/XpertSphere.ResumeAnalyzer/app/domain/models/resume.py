@@ -1,47 +1,123 @@
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Type, TypeVar, Union
 from uuid import uuid4
+import functools
 
+if TYPE_CHECKING:
+    from pydantic import TypeAdapter
 
-@dataclass
-class Experience:
+ModelT = TypeVar("ModelT", bound="JSONModel")
+
+
+@functools.lru_cache(maxsize=None)
+def _adapter(model: type) -> "TypeAdapter[Any]":
+    """Validator and serializer of a model class, built on first use"""
+    from pydantic import TypeAdapter
+
+    return TypeAdapter(model)
+
+
+def _clean(value: Optional[str]) -> str:
+    """Strip a required text field, reading a null from the LLM as empty"""
+    return value.strip() if value else ""
+
+
+class JSONModel:
+    """
+    Conversion of slotted model dataclasses from and to JSON
+
+    Decoding validates the JSON against the dataclass fields and builds
+    the nested models in a single pass of pydantic's compiled validator,
+    without an intermediate dictionary. Encoding writes JSON bytes
+    directly from the instances.
+
+    Required text fields accept null, which LLMs write for values missing
+    from the CV, and are stored as empty strings.
+    """
+
+    __slots__ = ()
+
+    # LLMs sometimes write phone numbers or years as JSON numbers
+    __pydantic_config__ = {"coerce_numbers_to_str": True}
+
+    @classmethod
+    def from_json(cls: Type[ModelT], data: Union[str, bytes]) -> ModelT:
+        """
+        Decode and validate a model from JSON
+
+        Args:
+            data: JSON document
+
+        Returns:
+            Model
+
+        Raises:
+            ValueError: If the document is not valid JSON or does not match the model
+        """
+        return _adapter(cls).validate_json(data)
+
+    @classmethod
+    def from_dict(cls: Type[ModelT], data: Dict[str, Any]) -> ModelT:
+        """
+        Build a model from a dictionary, including nested entries
+
+        Args:
+            data: Dictionary as produced by to_dict
+
+        Returns:
+            Model
+
+        Raises:
+            ValueError: If the dictionary does not match the model
+        """
+        return _adapter(cls).validate_python(data)
+
+    def to_json(self) -> bytes:
+        """Encode as JSON"""
+        return _adapter(type(self)).dump_json(self)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary"""
+        return _adapter(type(self)).dump_python(self)
+
+
+@dataclass(slots=True)
+class Experience(JSONModel):
     """Professional experience"""
 
-    title: str
-    description: str
+    title: Optional[str]
+    description: Optional[str] = ""
     date: Optional[str] = None
     company: Optional[str] = None
     location: Optional[str] = None
 
     def __post_init__(self):
         """Validate and clean data after initialization"""
-        self.title = self.title.strip() if self.title else self.title
-        self.description = (
-            self.description.strip() if self.description else self.description
-        )
+        self.title = _clean(self.title)
+        self.description = _clean(self.description)
 
 
-@dataclass
-class Training:
+@dataclass(slots=True)
+class Training(JSONModel):
     """Educational training"""
 
-    school: str
-    level: str
+    school: Optional[str]
+    level: Optional[str]
     period: Optional[str] = None
     field: Optional[str] = None
 
     def __post_init__(self):
         """Validate and clean data after initialization"""
-        self.school = self.school.strip() if self.school else self.school
-        self.level = self.level.strip() if self.level else self.level
+        self.school = _clean(self.school)
+        self.level = _clean(self.level)
 
 
-@dataclass
-class CVModel:
+@dataclass(slots=True)
+class CVModel(JSONModel):
     """Complete CV model"""
 
-    first_name: str
-    last_name: str
+    first_name: Optional[str]
+    last_name: Optional[str]
     email: Optional[str] = None
     phone_number: Optional[str] = None
     profession: Optional[str] = None
@@ -54,10 +130,8 @@ class CVModel:
 
     def __post_init__(self):
         """Validate and clean data after initialization"""
-        self.first_name = (
-            self.first_name.strip() if self.first_name else self.first_name
-        )
-        self.last_name = self.last_name.strip() if self.last_name else self.last_name
+        self.first_name = _clean(self.first_name)
+        self.last_name = _clean(self.last_name)
         self.email = self.email.strip().lower() if self.email else self.email
 
     @property
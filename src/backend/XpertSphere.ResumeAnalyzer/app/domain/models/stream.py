@@ -0,0 +1,52 @@
+from dataclasses import dataclass, fields
+from typing import Any, Dict, Iterator, Optional
+
+from .resume import CVModel, Experience, Training
+
+# Name of the final event carrying the complete CV model
+RESULT_EVENT = "result"
+
+# List fields streamed one entry at a time, with the type of their entries
+ITEM_TYPES = {"experiences": Experience, "trainings": Training}
+
+# Event type sent for each entry of a list field
+ITEM_EVENTS = {"experiences": "experience", "trainings": "training"}
+
+
+@dataclass
+class CVFieldEvent:
+    """Part of a CV model, produced as soon as it is known"""
+
+    name: str
+    value: Any
+    index: Optional[int] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a JSON-serializable dictionary with an ``event`` type"""
+        if self.name == RESULT_EVENT:
+            return {"event": RESULT_EVENT, "extracted_data": self.value.to_dict()}
+        if self.index is not None:
+            return {"event": ITEM_EVENTS[self.name], "index": self.index, "value": self.value.to_dict()}
+        return {"event": "field", "name": self.name, "value": self.value}
+
+
+def iter_cv_events(cv_model: CVModel) -> Iterator[CVFieldEvent]:
+    """
+    Split a complete CV model into the events a streamed analysis produces
+
+    Args:
+        cv_model: Complete CV model
+
+    Yields:
+        One event per field or list entry, in field order, then the result
+    """
+    for model_field in fields(CVModel):
+        if model_field.name == "id":
+            continue
+        value = getattr(cv_model, model_field.name)
+        if model_field.name in ITEM_TYPES:
+            for index, item in enumerate(value):
+                yield CVFieldEvent(model_field.name, item, index=index)
+        else:
+            yield CVFieldEvent(model_field.name, value)
+    yield CVFieldEvent(RESULT_EVENT, cv_model)
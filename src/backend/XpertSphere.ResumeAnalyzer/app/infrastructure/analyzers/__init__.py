@@ -1,4 +1,8 @@
 from .base_analyzer import BaseAnalyzer
 from .openai_analyzer import OpenAIAnalyzer
+from .rule_based_analyzer import RuleBasedAnalyzer
+from .hybrid_analyzer import HybridAnalyzer
+from .hedged_analyzer import HedgedAnalyzer, LatencyWindow
+from .circuit_breaker import CircuitBreaker, CircuitBreakerAnalyzer
 
-__all__ = [BaseAnalyzer, OpenAIAnalyzer]
+__all__ = [BaseAnalyzer, OpenAIAnalyzer, RuleBasedAnalyzer, HybridAnalyzer, HedgedAnalyzer, LatencyWindow, CircuitBreaker, CircuitBreakerAnalyzer]
@@ -0,0 +1,287 @@
+from collections import deque
+from typing import Any, AsyncIterator, Dict, Optional
+import time
+from app.core import CircuitOpenError, ServiceOverloadedError
+from app.domain.interfaces import TextAnalyzer
+from app.domain.models import CVFieldEvent, CVModel
+from app.infrastructure.analyzers import BaseAnalyzer
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker state machine over a window of recent calls
+
+    Closed, the breaker records the outcome and latency of every call and
+    opens when the failure rate or the slow call rate of the window crosses
+    its threshold. Open, calls are rejected without being made until the
+    open period ends. Half-open, a few probe calls are let through: the
+    breaker closes when they all succeed and opens again on any failure.
+
+    Every state change starts a new generation, and outcomes are only
+    counted in the generation their call was allowed in, so a slow call
+    let through while closed cannot count as a probe once the breaker
+    has opened and turned half-open.
+    """
+
+    def __init__(
+        self,
+        window: int = 20,
+        min_calls: int = 10,
+        failure_rate: float = 0.5,
+        slow_call_seconds: float = 30.0,
+        slow_call_rate: float = 0.8,
+        open_seconds: float = 30.0,
+        half_open_probes: int = 3,
+    ):
+        """
+        Initialize a closed breaker
+
+        Args:
+            window: Number of recent calls the rates are computed on
+            min_calls: Calls needed in the window before the breaker can open
+            failure_rate: Share of failed calls opening the breaker (0-1)
+            slow_call_seconds: Latency above which a call counts as slow
+            slow_call_rate: Share of slow calls opening the breaker (0-1)
+            open_seconds: Time the breaker stays open before probing
+            half_open_probes: Successful probes needed to close the breaker
+        """
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.slow_call_seconds = slow_call_seconds
+        self.slow_call_rate = slow_call_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = half_open_probes
+        self._outcomes = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._generation = 1
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        self.times_opened = 0
+        self.rejected = 0
+
+    @property
+    def state(self) -> str:
+        """Current state; an open breaker is half-open once its open period has elapsed"""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+            self._transition(HALF_OPEN)
+        return self._state
+
+    def allow(self) -> Optional[int]:
+        """
+        Reserve a call if the breaker lets it through
+
+        Returns:
+            The generation the call is allowed in, or None when it is
+            rejected; every allowed call must be followed by record() or
+            release() with that generation
+        """
+        state = self.state
+        if state == OPEN:
+            self.rejected += 1
+            return None
+
+        if state == HALF_OPEN:
+            if self._probes_started >= self.half_open_probes:
+                self.rejected += 1
+                return None
+            self._probes_started += 1
+        return self._generation
+
+    def record(self, generation: int, failed: bool, seconds: float) -> None:
+        """
+        Record the outcome of an allowed call
+
+        Args:
+            generation: Generation returned by allow() for the call;
+                outcomes of earlier generations are ignored
+            failed: Whether the call failed
+            seconds: Latency of the call
+        """
+        if generation != self._generation:
+            return
+        slow = seconds > self.slow_call_seconds
+        if self._state == HALF_OPEN:
+            if failed or slow:
+                self._transition(OPEN)
+                return
+            self._probes_succeeded += 1
+            if self._probes_succeeded >= self.half_open_probes:
+                self._transition(CLOSED)
+            return
+        if self._state == OPEN:
+            return
+
+        self._outcomes.append((failed, slow))
+        if len(self._outcomes) < self.min_calls:
+            return
+        failure_rate, slow_call_rate = self._rates()
+        if failure_rate >= self.failure_rate or slow_call_rate >= self.slow_call_rate:
+            self._transition(OPEN)
+
+    def release(self, generation: int) -> None:
+        """
+        Give back an allowed call that ended without an outcome
+
+        Args:
+            generation: Generation returned by allow() for the call
+        """
+        if generation == self._generation and self._state == HALF_OPEN and self._probes_started > self._probes_succeeded:
+            self._probes_started -= 1
+
+    def _rates(self):
+        """Failure rate and slow call rate of the window"""
+        if not self._outcomes:
+            return 0.0, 0.0
+        failures = sum(failed for failed, _ in self._outcomes)
+        slow = sum(slow for _, slow in self._outcomes)
+        return failures / len(self._outcomes), slow / len(self._outcomes)
+
+    def _transition(self, state: str) -> None:
+        """Move to a state, starting a new window"""
+        self._state = state
+        self._outcomes.clear()
+        self._probes_started = 0
+        self._probes_succeeded = 0
+        self._generation += 1
+        if state == OPEN:
+            self._opened_at = time.monotonic()
+            self.times_opened += 1
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets probes through"""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.open_seconds - (time.monotonic() - self._opened_at))
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get the breaker state and window rates
+
+        Returns:
+            State, rates of the current window, open count and rejected calls
+        """
+        failure_rate, slow_call_rate = self._rates()
+        return {
+            "state": self.state,
+            "calls_in_window": len(self._outcomes),
+            "failure_rate": round(failure_rate, 3),
+            "slow_call_rate": round(slow_call_rate, 3),
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+            "retry_after_ms": round(self.retry_after() * 1000, 1),
+        }
+
+
+class CircuitBreakerAnalyzer(BaseAnalyzer):
+    """
+    Analyzer failing fast while the analyzer it wraps is unhealthy
+
+    Calls are rejected with CircuitOpenError while the breaker is open,
+    which the CV service answers with the local fallback when enabled.
+    Queue rejections of the rate limiter are not counted as failures.
+    """
+
+    def __init__(self, analyzer: TextAnalyzer, breaker: CircuitBreaker):
+        """
+        Initialize the analyzer
+
+        Args:
+            analyzer: Analyzer making the protected calls
+            breaker: Breaker deciding which calls are made
+        """
+        super().__init__()
+        self.analyzer = analyzer
+        self.breaker = breaker
+
+    @property
+    def version(self) -> str:
+        """Version of the wrapped analyzer, whose results are returned unchanged"""
+        return self.analyzer.version
+
+    def _allow(self) -> int:
+        """Reserve a call and return its generation, raising CircuitOpenError when the breaker is open"""
+        generation = self.breaker.allow()
+        if generation is None:
+            retry_after = self.breaker.retry_after()
+            raise CircuitOpenError(
+                f"Azure OpenAI circuit is {self.breaker.state}, retry in {retry_after:.0f}s",
+                retry_after=retry_after,
+            )
+        return generation
+
+    async def analyze(
+        self, text: str, options: Optional[Dict[str, Any]] = None
+    ) -> CVModel:
+        """
+        Analyze text unless the breaker is open
+
+        Args:
+            text: Text to analyze
+            options: Optional parameters passed to the wrapped analyzer
+
+        Returns:
+            Structured CV model
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            AnalysisError: If analysis fails
+        """
+        generation = self._allow()
+        started = time.perf_counter()
+        try:
+            cv_model = await self.analyzer.analyze(text, options)
+        except ServiceOverloadedError:
+            self.breaker.release(generation)
+            raise
+        except Exception:
+            self.breaker.record(generation, True, time.perf_counter() - started)
+            raise
+        except BaseException:
+            self.breaker.release(generation)
+            raise
+        self.breaker.record(generation, False, time.perf_counter() - started)
+        return cv_model
+
+    async def analyze_stream(
+        self, text: str, options: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[CVFieldEvent]:
+        """
+        Stream the analysis unless the breaker is open
+
+        The latency recorded for a stream is the time to its first event.
+
+        Args:
+            text: Text to analyze
+            options: Optional parameters passed to the wrapped analyzer
+
+        Yields:
+            Events of the wrapped analyzer
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            AnalysisError: If analysis fails
+        """
+        generation = self._allow()
+        started = time.perf_counter()
+        first_event = None
+        try:
+            async for event in self.analyzer.analyze_stream(text, options):
+                if first_event is None:
+                    first_event = time.perf_counter() - started
+                yield event
+        except ServiceOverloadedError:
+            self.breaker.release(generation)
+            raise
+        except Exception:
+            self.breaker.record(generation, True, time.perf_counter() - started)
+            raise
+        except BaseException:
+            # Closed by the consumer or cancelled before the end
+            self.breaker.release(generation)
+            raise
+        self.breaker.record(generation, False, first_event if first_event is not None else time.perf_counter() - started)
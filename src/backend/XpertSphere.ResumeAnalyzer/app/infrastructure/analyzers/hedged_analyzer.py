@@ -0,0 +1,262 @@
+from collections import deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+import asyncio
+import math
+import time
+from app.domain.interfaces import TextAnalyzer
+from app.domain.models import CVFieldEvent, CVModel
+from app.infrastructure.analyzers import BaseAnalyzer
+
+
+class LatencyWindow:
+    """
+    Sliding window of recent latencies giving the hedge delay
+
+    The delay is a percentile of the window, clamped to bounds, or the
+    initial delay until enough samples were recorded.
+    """
+
+    def __init__(
+        self,
+        percentile: float,
+        initial_delay: float,
+        min_delay: float,
+        max_delay: float,
+        size: int = 200,
+        min_samples: int = 20,
+    ):
+        """
+        Initialize the latency window
+
+        Args:
+            percentile: Percentile of the window used as the delay (0-100)
+            initial_delay: Delay in seconds used until min_samples are recorded
+            min_delay: Lower bound of the delay in seconds
+            max_delay: Upper bound of the delay in seconds
+            size: Number of most recent latencies kept
+            min_samples: Samples needed before the percentile is used
+        """
+        self.percentile = percentile
+        self.initial_delay = initial_delay
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.min_samples = min_samples
+        self._samples = deque(maxlen=size)
+
+    def record(self, seconds: float) -> None:
+        """Record a latency in seconds"""
+        self._samples.append(seconds)
+
+    def delay(self) -> float:
+        """
+        Get the current hedge delay
+
+        Returns:
+            Delay in seconds before the request is hedged
+        """
+        if len(self._samples) < self.min_samples:
+            return self.initial_delay
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, math.ceil(self.percentile / 100 * len(ordered)) - 1)
+        return min(self.max_delay, max(self.min_delay, ordered[max(0, index)]))
+
+
+class HedgedAnalyzer(BaseAnalyzer):
+    """
+    Analyzer hedging slow requests to a second deployment
+
+    The request is sent to the primary analyzer; when it has not answered
+    within a percentile of its recent latencies, the same request is sent
+    to the secondary analyzer. The first valid result is returned and the
+    other request is cancelled. A primary failing before the delay is
+    retried on the secondary at once.
+    """
+
+    def __init__(
+        self,
+        primary: TextAnalyzer,
+        secondary: TextAnalyzer,
+        percentile: float = 95.0,
+        initial_delay: float = 8.0,
+        min_delay: float = 1.0,
+        max_delay: float = 20.0,
+        window: int = 200,
+        min_samples: int = 20,
+    ):
+        """
+        Initialize the hedged analyzer
+
+        Args:
+            primary: Analyzer of the primary deployment
+            secondary: Analyzer of the deployment receiving hedged requests
+            percentile: Percentile of primary latencies used as the hedge delay
+            initial_delay: Hedge delay in seconds until enough latencies are known
+            min_delay: Lower bound of the hedge delay in seconds
+            max_delay: Upper bound of the hedge delay in seconds
+            window: Number of recent primary latencies kept
+            min_samples: Latencies needed before the percentile is used
+        """
+        super().__init__()
+        self.primary = primary
+        self.secondary = secondary
+        # Full responses and streamed first events have separate latency profiles
+        self.latencies = LatencyWindow(percentile, initial_delay, min_delay, max_delay, window, min_samples)
+        self.first_event_latencies = LatencyWindow(
+            percentile, initial_delay, min_delay, max_delay, window, min_samples
+        )
+        self.requests = 0
+        self.hedged = 0
+        self.primary_wins = 0
+        self.secondary_wins = 0
+        self.failures = 0
+
+    @property
+    def version(self) -> str:
+        """Versions of both analyzers, as either may answer"""
+        return f"{self.primary.version}|{self.secondary.version}"
+
+    async def analyze(
+        self, text: str, options: Optional[Dict[str, Any]] = None
+    ) -> CVModel:
+        """
+        Analyze text, hedging to the secondary analyzer when the primary is slow
+
+        Args:
+            text: Text to analyze
+            options: Optional parameters passed to both analyzers
+
+        Returns:
+            Structured CV model of the first analyzer to answer
+
+        Raises:
+            AnalysisError: If both analyzers fail
+        """
+        _, cv_model = await self._race(
+            lambda analyzer: analyzer.analyze(text, options), self.latencies
+        )
+        return cv_model
+
+    async def analyze_stream(
+        self, text: str, options: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[CVFieldEvent]:
+        """
+        Stream from the first analyzer to yield an event
+
+        The hedge is decided on the first event: once an analyzer has
+        started streaming, the other stream is closed and the rest of the
+        events come from the winner only.
+
+        Args:
+            text: Text to analyze
+            options: Optional parameters passed to both analyzers
+
+        Yields:
+            Events of the winning analyzer
+
+        Raises:
+            AnalysisError: If both analyzers fail before their first event
+        """
+        streams = {}
+
+        def first_event(analyzer: TextAnalyzer) -> Awaitable[CVFieldEvent]:
+            streams[analyzer] = analyzer.analyze_stream(text, options)
+            return streams[analyzer].__anext__()
+
+        winner = None
+        try:
+            winner, event = await self._race(first_event, self.first_event_latencies)
+        except StopAsyncIteration:
+            return
+        finally:
+            # Losing streams were cancelled by the race and can be closed
+            for analyzer, stream in streams.items():
+                if analyzer is not winner:
+                    await stream.aclose()
+
+        stream = streams[winner]
+        try:
+            yield event
+            async for event in stream:
+                yield event
+        finally:
+            await stream.aclose()
+
+    async def _race(
+        self, start: Callable[[TextAnalyzer], Awaitable[Any]], latencies: LatencyWindow
+    ) -> Tuple[TextAnalyzer, Any]:
+        """
+        Run a call on the primary analyzer, hedged to the secondary when slow
+
+        Args:
+            start: Function starting the call on an analyzer
+            latencies: Latency window of the call, giving the hedge delay
+
+        Returns:
+            Winning analyzer and the result of its call
+
+        Raises:
+            Exception: Error of the first failed call when both calls fail
+        """
+        self.requests += 1
+        delay = latencies.delay()
+        started = time.perf_counter()
+        primary = asyncio.ensure_future(start(self.primary))
+        secondary = None
+        pending = {primary}
+        errors = []
+        try:
+            while True:
+                timeout = None if secondary is not None else max(0.0, delay - (time.perf_counter() - started))
+                done, pending = await asyncio.wait(
+                    pending, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                # Successful calls first; reading every exception also marks it retrieved
+                for task in sorted(done, key=lambda task: task.exception() is not None):
+                    if task.exception() is not None:
+                        errors.append(task.exception())
+                        continue
+                    if task is primary:
+                        latencies.record(time.perf_counter() - started)
+                        self.primary_wins += 1
+                        return self.primary, task.result()
+                    self.secondary_wins += 1
+                    return self.secondary, task.result()
+
+                if secondary is None:
+                    self.hedged += 1
+                    self.logger.info(
+                        f"Hedging analysis to {self.secondary.version} "
+                        f"({'primary failed' if errors else f'no response after {delay:.1f}s'})"
+                    )
+                    secondary = asyncio.ensure_future(start(self.secondary))
+                    pending.add(secondary)
+                elif not pending:
+                    self.failures += 1
+                    raise errors[0]
+        finally:
+            # A cancelled primary took at least this long: recording it keeps
+            # the percentile from drifting down to the hedged requests only
+            if primary in pending:
+                latencies.record(time.perf_counter() - started)
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hedging statistics
+
+        Returns:
+            Request and hedge counts, hedge rate, wins per analyzer and the
+            current hedge delays
+        """
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_rate": round(self.hedged / self.requests, 3) if self.requests else 0.0,
+            "primary_wins": self.primary_wins,
+            "secondary_wins": self.secondary_wins,
+            "failures": self.failures,
+            "delay_ms": round(self.latencies.delay() * 1000, 1),
+            "stream_delay_ms": round(self.first_event_latencies.delay() * 1000, 1),
+        }
@@ -0,0 +1,157 @@
+import asyncio
+import re
+from typing import Any, AsyncIterator, Dict, List, Optional
+from app.domain.interfaces import TextAnalyzer
+from app.domain.models import CVFieldEvent, CVModel, RESULT_EVENT
+from app.infrastructure.analyzers import BaseAnalyzer
+from app.infrastructure.analyzers.rule_based_analyzer import RuleBasedAnalyzer
+from app.utils.field_patterns import LocalFields, find_years, phone_digits
+
+# Fields the LLM is not asked for when the patterns found them. Languages
+# are always asked for, as the patterns only know the most common ones
+SKIPPABLE_FIELDS = ("email", "phone_number")
+
+
+class HybridAnalyzer(BaseAnalyzer):
+    """
+    LLM analyzer backed by deterministic pre-extraction
+
+    Contact details found by the patterns are filled in locally and left
+    out of the LLM prompt, which shortens the response. Languages found by
+    the patterns are added to those of the LLM. The LLM output is then
+    checked against the text: emails, phone numbers and dates that do not
+    appear in the CV are dropped or replaced.
+    """
+
+    def __init__(self, llm: TextAnalyzer, local: RuleBasedAnalyzer):
+        """
+        Initialize the hybrid analyzer
+
+        Args:
+            llm: Analyzer accepting a ``skip_fields`` option
+            local: Pattern-based analyzer
+        """
+        super().__init__()
+        self.llm = llm
+        self.local = local
+
+    @property
+    def version(self) -> str:
+        """Versions of the LLM analyzer and of the patterns"""
+        return f"{self.llm.version}+{self.local.version}"
+
+    async def analyze(
+        self, text: str, options: Optional[Dict[str, Any]] = None
+    ) -> CVModel:
+        """
+        Pre-extract local fields, analyze the rest with the LLM and merge
+
+        Args:
+            text: Text to analyze
+            options: Optional parameters passed to the LLM analyzer
+
+        Returns:
+            Structured CV model
+
+        Raises:
+            AnalysisError: If the LLM analysis fails
+        """
+        fields = await asyncio.to_thread(self.local.extract, text)
+        skip_fields = self._skip_fields(fields)
+        cv_model = await self.llm.analyze(text, {**(options or {}), "skip_fields": skip_fields})
+        return self._merge(cv_model, fields, skip_fields, text)
+
+    async def analyze_stream(
+        self, text: str, options: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[CVFieldEvent]:
+        """
+        Yield pre-extracted fields at once, then the LLM fields as they complete
+
+        Args:
+            text: Text to analyze
+            options: Optional parameters passed to the LLM analyzer
+
+        Yields:
+            One event per field or list entry, then a ``result`` event
+            carrying the merged CV model
+
+        Raises:
+            AnalysisError: If the LLM analysis fails
+        """
+        fields = await asyncio.to_thread(self.local.extract, text)
+        skip_fields = self._skip_fields(fields)
+        for name in skip_fields:
+            yield CVFieldEvent(name, getattr(fields, name))
+
+        options = {**(options or {}), "skip_fields": skip_fields}
+        async for event in self.llm.analyze_stream(text, options):
+            if event.name == RESULT_EVENT:
+                event = CVFieldEvent(RESULT_EVENT, self._merge(event.value, fields, skip_fields, text))
+            yield event
+
+    def _skip_fields(self, fields: LocalFields) -> List[str]:
+        """Fields found locally, which the LLM does not need to extract"""
+        return [name for name in SKIPPABLE_FIELDS if getattr(fields, name)]
+
+    def _merge(
+        self, cv_model: CVModel, fields: LocalFields, skip_fields: List[str], text: str
+    ) -> CVModel:
+        """
+        Fill skipped fields from the patterns and drop values not found in the text
+
+        Args:
+            cv_model: CV model returned by the LLM
+            fields: Fields found by the patterns
+            skip_fields: Fields left out of the LLM prompt
+            text: Analyzed text
+
+        Returns:
+            The corrected CV model
+        """
+        corrections = []
+        if cv_model.email and cv_model.email not in text.lower():
+            corrections.append(f"email {cv_model.email}")
+            cv_model.email = fields.email
+        # Compare trailing digits, as the LLM may rewrite a trunk prefix as a country code
+        if cv_model.phone_number and phone_digits(cv_model.phone_number)[-8:] not in re.sub(r"\D", "", text):
+            corrections.append(f"phone number {cv_model.phone_number}")
+            cv_model.phone_number = fields.phone_number
+
+        # Skipped fields are filled after the checks, which would reject de-obfuscated emails
+        for name in skip_fields:
+            setattr(cv_model, name, getattr(fields, name))
+        if not cv_model.first_name and not cv_model.last_name:
+            cv_model.first_name, cv_model.last_name = fields.first_name, fields.last_name
+        cv_model.languages = self._merge_languages(cv_model.languages, fields.languages)
+
+        years = set(find_years(text))
+        for experience in cv_model.experiences:
+            if experience.date and not set(find_years(experience.date)) <= years:
+                corrections.append(f"date {experience.date}")
+                experience.date = None
+        for training in cv_model.trainings:
+            if training.period and not set(find_years(training.period)) <= years:
+                corrections.append(f"period {training.period}")
+                training.period = None
+
+        if corrections:
+            self.logger.warning(f"Dropped LLM values not found in the CV: {', '.join(corrections)}")
+        return cv_model
+
+    @staticmethod
+    def _merge_languages(llm_languages: List[str], local_languages: List[str]) -> List[str]:
+        """
+        Add the languages found by the patterns to those of the LLM
+
+        Args:
+            llm_languages: Languages returned by the LLM
+            local_languages: Languages found by the patterns, as "Language (level)"
+
+        Returns:
+            The LLM languages, followed by local languages the LLM did not name
+        """
+        named = " ".join(llm_languages).lower()
+        return list(llm_languages) + [
+            language for language in local_languages
+            if language.split(" (")[0].lower() not in named
+        ]
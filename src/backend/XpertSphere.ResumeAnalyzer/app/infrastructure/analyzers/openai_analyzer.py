@@ -1,51 +1,191 @@
-from typing import Any, Dict, Optional
-import json
-from openai import AzureOpenAI
-from app.domain.models import CVModel, Experience, Training
+from dataclasses import fields
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional
+import asyncio
+import time
+import httpx
+import openai
+from openai import AsyncAzureOpenAI
+from app.domain.models import CVFieldEvent, CVModel, RESULT_EVENT
+from app.domain.models.stream import ITEM_TYPES
 from app.infrastructure.analyzers import BaseAnalyzer
-from app.core import AnalysisError, settings
-from app.utils import get_llm
+from app.core import AnalysisError, ServiceOverloadedError, settings
+from app.utils import (
+    IncrementalJSONParser,
+    JSONStreamEvent,
+    RateLimiter,
+    backoff_delay,
+    current_span,
+    estimate_tokens,
+    get_async_llm,
+    get_request_timeout,
+    observe_stage,
+    parse_retry_after,
+    record_token_usage,
+    time_stage,
+    tracer,
+)
 
+# Bump whenever the prompt or the post-processing changes the output
+PROMPT_VERSION = "3"
+
+# Failures worth retrying: throttling, timeouts, dropped connections and 5xx
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+# CV fields the model may return
+CV_FIELDS = {model_field.name for model_field in fields(CVModel)} - {"id"}
+
+# Expected JSON value of each field, in the order the model should write them
+RESPONSE_FIELDS = {
+    "first_name": '"person\'s first name"',
+    "last_name": '"person\'s last name"',
+    "email": '"email address"',
+    "phone_number": '"phone number"',
+    "profession": '"main professional title"',
+    "address": '"complete address"',
+    "languages": '["language1 (level)", "language2 (level)"]',
+    "trainings": """[{
+        "school": "institution name",
+        "level": "degree level (e.g.: Master, Bachelor, High School)",
+        "period": "period (e.g.: 2023/2025)",
+        "field": "field of study"
+    }]""",
+    "skills": """[
+        "Frameworks: list of frameworks",
+        "Programming Languages: list of languages",
+        "Databases: list of DBMS",
+        "DevOps Tools: list of tools",
+        "Personal Qualities: list of soft skills"
+    ]""",
+    "experiences": """[{
+        "title": "job position",
+        "company": "company name",
+        "location": "company location",
+        "date": "period (original CV format)",
+        "description": "detailed description of missions and responsibilities"
+    }]""",
+}
 
 
 class OpenAIAnalyzer(BaseAnalyzer):
     """
-    Text analyzer using Azure OpenAI
+    Text analyzer using the async Azure OpenAI client
+
+    LLM calls are awaited on the event loop so a worker can analyze
+    several CVs concurrently. Every response to the deployment through
+    the pooled HTTP client, successful or throttled, aligns the rate
+    limiter with the remaining quota it reports, so calls slow down
+    before the quota runs out.
     """
 
-    def __init__(self):
-        """Initialize the OpenAI analyzer"""
+    def __init__(
+        self,
+        http_client: Optional[httpx.AsyncClient] = None,
+        deployment: Optional[str] = None,
+        model_version: Optional[str] = None,
+        endpoint: Optional[str] = None,
+        api_key: Optional[str] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        """
+        Initialize the OpenAI analyzer
+
+        Args:
+            http_client: Optional pooled HTTP client owned by the caller
+            deployment: Optional deployment, defaults to the current deployment
+            model_version: Optional model version of the deployment
+            endpoint: Optional endpoint, defaults to the configured endpoint
+            api_key: Optional API key of the endpoint
+            rate_limiter: Optional limiter shared by the calls to the deployment,
+                defaults to a limiter without quotas
+        """
         super().__init__()
-        self.client = self._initialize_client()
+        self.deployment = deployment or settings.current_deployment
+        self.model_version = model_version or settings.current_model_version
+        self.endpoint = endpoint or settings.AZURE_OPENAI_ENDPOINT
+        self.api_key = api_key or settings.AZURE_OPENAI_API_KEY
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.http_client = http_client
+        self.client = self._initialize_client(http_client)
+        if http_client is not None:
+            http_client.event_hooks["response"].append(self._observe_rate_limits)
+
+    @property
+    def version(self) -> str:
+        """Deployment, model version and prompt version of this analyzer"""
+        return f"{self.deployment}:{self.model_version}:{PROMPT_VERSION}"
 
-    def _initialize_client(self) -> AzureOpenAI:
+    def _initialize_client(self, http_client: Optional[httpx.AsyncClient] = None) -> AsyncAzureOpenAI:
         """
         Initialize the Azure OpenAI client
 
+        Args:
+            http_client: Optional pooled HTTP client owned by the caller
+
         Returns:
             Configured Azure OpenAI client
         """
         try:
-            # Debug logging
-            self.logger.info(f"Initializing Azure OpenAI client...")
-            self.logger.info(f"ENVIRONMENT: {settings.ENVIRONMENT}")
-            self.logger.info(f"KEY_VAULT_URL: {settings.KEY_VAULT_URL}")
-            self.logger.info(f"AZURE_CLIENT_ID: {settings.AZURE_CLIENT_ID}")
-            self.logger.info(f"AZURE_OPENAI_ENDPOINT: {settings.AZURE_OPENAI_ENDPOINT if settings.AZURE_OPENAI_ENDPOINT else 'NOT SET'}")
-            self.logger.info(f"AZURE_OPENAI_API_KEY: {'***SET***' if settings.AZURE_OPENAI_API_KEY else 'NOT SET'}")
-            self.logger.info(f"AZURE_OPENAI_API_VERSION: {settings.AZURE_OPENAI_API_VERSION}")
-            
-            
-            if not settings.AZURE_OPENAI_ENDPOINT:
+            self.logger.info(
+                f"Initializing Azure OpenAI client (environment: {settings.ENVIRONMENT}, "
+                f"deployment: {self.deployment})"
+            )
+            self.logger.debug(f"KEY_VAULT_URL: {settings.KEY_VAULT_URL}")
+            self.logger.debug(f"AZURE_CLIENT_ID: {settings.AZURE_CLIENT_ID}")
+            self.logger.debug(f"AZURE_OPENAI_ENDPOINT: {settings.AZURE_OPENAI_ENDPOINT if settings.AZURE_OPENAI_ENDPOINT else 'NOT SET'}")
+            self.logger.debug(f"AZURE_OPENAI_API_KEY: {'***SET***' if settings.AZURE_OPENAI_API_KEY else 'NOT SET'}")
+            self.logger.debug(f"AZURE_OPENAI_API_VERSION: {settings.AZURE_OPENAI_API_VERSION}")
+
+            if not self.endpoint:
                 raise ValueError("AZURE_OPENAI_ENDPOINT is not set")
-            if not settings.AZURE_OPENAI_API_KEY:
+            if not self.api_key:
                 raise ValueError("AZURE_OPENAI_API_KEY is not set")
                 
-            return get_llm()
+            return get_async_llm(http_client, self.deployment, self.endpoint, self.api_key)
         except Exception as e:
             self.logger.error(f"Failed to initialize Azure OpenAI client: {str(e)}")
             raise AnalysisError(f"Failed to initialize Azure OpenAI client: {str(e)}")
 
+    async def _observe_rate_limits(self, response: httpx.Response) -> None:
+        """Pass the quota headers of a response to this deployment to the rate limiter"""
+        url = response.request.url
+        if url.host == httpx.URL(self.endpoint).host and f"/deployments/{self.deployment}/" in url.path:
+            self.rate_limiter.observe(response.headers)
+
+    def reconfigure(
+        self,
+        deployment: str,
+        model_version: Optional[str],
+        endpoint: Optional[str],
+        api_key: Optional[str],
+    ) -> None:
+        """
+        Switch to another deployment, endpoint or API key, such as rotated secrets
+
+        A new client sharing the pooled HTTP client replaces the current
+        one. Calls in flight keep the client they started with and finish
+        normally; their retries and later calls use the new configuration.
+
+        Args:
+            deployment: Deployment name
+            model_version: Model version of the deployment
+            endpoint: Azure OpenAI endpoint
+            api_key: API key of the endpoint
+
+        Raises:
+            AnalysisError: If the new configuration is incomplete; the
+                current one is kept
+        """
+        previous = (self.deployment, self.model_version, self.endpoint, self.api_key)
+        self.deployment, self.model_version, self.endpoint, self.api_key = (
+            deployment, model_version, endpoint, api_key
+        )
+        try:
+            client = self._initialize_client(self.http_client)
+        except AnalysisError:
+            self.deployment, self.model_version, self.endpoint, self.api_key = previous
+            raise
+        self.client = client
+
     async def analyze(
         self, text: str, options: Optional[Dict[str, Any]] = None
     ) -> CVModel:
@@ -55,6 +195,8 @@ class OpenAIAnalyzer(BaseAnalyzer):
         Args:
             text: Text to analyze
             options: Optional parameters for the analyzer
+                (``timeout``: per-call timeout in seconds, ``skip_fields``:
+                fields already known, left out of the prompt)
 
         Returns:
             Structured CV model
@@ -62,49 +204,256 @@ class OpenAIAnalyzer(BaseAnalyzer):
         Raises:
             AnalysisError: If analysis fails
         """
-        try:
-            prompt = self._create_prompt(text)
-
-            response = self.client.chat.completions.create(
-                model=settings.current_deployment,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """You are an expert in CV information extraction. 
-                        You must carefully analyze the CV and extract ONLY the information that is present.
-                        Clearly distinguish between EDUCATION (schools, universities, degrees) and PROFESSIONAL EXPERIENCES (jobs, internships).
-                        Be precise and never mix these two categories.""",
-                    },
-                    {"role": "user", "content": prompt},
-                ],
-                response_format={"type": "json_object"},
-                temperature=settings.AZURE_OPENAI_TEMPERATURE
-            )
+        options = options or {}
+        with tracer.start_span(
+            "OpenAIAnalyzer.analyze", {"deployment": self.deployment, "chars": len(text)}
+        ) as span:
+            try:
+                with time_stage("prompt"):
+                    messages = self._create_messages(text, options.get("skip_fields", ()))
+                with time_stage("llm"):
+                    response = await self._create_completion(messages, options)
+                usage = getattr(response, "usage", None)
+                record_token_usage(usage)
+                for kind in ("prompt_tokens", "completion_tokens"):
+                    if isinstance(getattr(usage, kind, None), int):
+                        span.set_attribute(kind, getattr(usage, kind))
+
+                # Decode and validate the JSON into a CVModel in one pass
+                with time_stage("parse"):
+                    return self._build_cv_model(response.choices[0].message.content)
 
-            # Parse JSON and create CVModel object
-            parsed_data = json.loads(response.choices[0].message.content)
+            except ServiceOverloadedError:
+                raise
+            except Exception as e:
+                self.logger.error(f"Error analyzing CV text: {str(e)}")
+                raise AnalysisError(f"Failed to analyze CV: {str(e)}")
+
+    async def analyze_stream(
+        self, text: str, options: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[CVFieldEvent]:
+        """
+        Analyze text with a streamed completion, yielding fields as they complete
+
+        The JSON response is parsed incrementally as tokens arrive. Scalar
+        fields and string lists are yielded once complete, experiences and
+        trainings one entry at a time.
+
+        Args:
+            text: Text to analyze
+            options: Optional parameters for the analyzer
+                (``timeout``: per-call timeout in seconds, ``skip_fields``:
+                fields already known, left out of the prompt)
 
-            # Transform each experience into Experience object
-            parsed_data["experiences"] = [
-                Experience(**exp) for exp in parsed_data["experiences"]
-            ]
+        Yields:
+            One event per field or list entry, then a ``result`` event
+            carrying the complete CV model
 
-            parsed_data["trainings"] = [
-                Training(**training) for training in parsed_data["trainings"]
-            ]
+        Raises:
+            AnalysisError: If analysis fails
+        """
+        options = options or {}
+        try:
+            parser = IncrementalJSONParser()
+            with time_stage("prompt"):
+                messages = self._create_messages(text, options.get("skip_fields", ()))
+            llm_started = time.perf_counter()
+            stream = await self._create_completion(messages, options, stream=True)
+            async with stream:
+                async for chunk in stream:
+                    # The last chunk carries the usage and no choices
+                    record_token_usage(getattr(chunk, "usage", None))
+                    # Azure sends content filter results in chunks without choices
+                    if not chunk.choices or not chunk.choices[0].delta.content:
+                        continue
+                    for parsed in parser.feed(chunk.choices[0].delta.content):
+                        event = self._to_field_event(parsed)
+                        if event is not None:
+                            yield event
+            observe_stage("llm", time.perf_counter() - llm_started)
 
-            return CVModel(**parsed_data)
+            # Post-process the whole document exactly as analyze() does
+            with time_stage("parse"):
+                cv_model = self._build_cv_model(parser.text)
 
+        except ServiceOverloadedError:
+            raise
         except Exception as e:
             self.logger.error(f"Error analyzing CV text: {str(e)}")
             raise AnalysisError(f"Failed to analyze CV: {str(e)}")
 
-    def _create_prompt(self, text: str) -> str:
+        yield CVFieldEvent(RESULT_EVENT, cv_model)
+
+    async def _create_completion(
+        self, messages: List[Dict[str, str]], options: Dict[str, Any], stream: bool = False
+    ) -> Any:
+        """
+        Send a chat completion through the rate limiter, retrying transient failures
+
+        The call waits in the limiter queue until the deployment quota has
+        room for it. Throttled calls pause the whole queue for the
+        ``Retry-After`` period; timeouts, connection errors and server
+        errors are retried with jittered exponential backoff.
+
+        Args:
+            messages: Chat messages
+            options: Analyzer options, optionally containing ``timeout``
+            stream: Whether to stream the completion
+
+        Returns:
+            Completion, or the completion stream when streaming
+
+        Raises:
+            ServiceOverloadedError: If the limiter queue is full
+            openai.APIError: If the call fails after the last retry
+        """
+        estimated = (
+            sum(estimate_tokens(message["content"]) for message in messages)
+            + settings.AZURE_OPENAI_COMPLETION_TOKENS_ESTIMATE
+        )
+        kwargs = {"stream": True, "stream_options": {"include_usage": True}} if stream else {}
+        for attempt in range(settings.AZURE_OPENAI_MAX_RETRIES + 1):
+            waited = await self.rate_limiter.acquire(estimated)
+            observe_stage("queue", waited)
+            if waited:
+                current_span().add_event("queued", {"wait_ms": round(waited * 1000, 1), "attempt": attempt})
+            try:
+                response = await self.client.chat.completions.create(
+                    model=self.deployment,
+                    messages=messages,
+                    response_format={"type": "json_object"},
+                    temperature=settings.AZURE_OPENAI_TEMPERATURE,
+                    timeout=self._get_timeout(options),
+                    **kwargs,
+                )
+            except RETRYABLE_ERRORS as e:
+                if attempt == settings.AZURE_OPENAI_MAX_RETRIES:
+                    raise
+                error_response = getattr(e, "response", None)
+                headers = error_response.headers if error_response is not None else None
+                delay = parse_retry_after(headers)
+                if delay is None:
+                    delay = backoff_delay(
+                        attempt,
+                        settings.AZURE_OPENAI_RETRY_BASE_DELAY_SECONDS,
+                        settings.AZURE_OPENAI_RETRY_MAX_DELAY_SECONDS,
+                    )
+                self.rate_limiter.record_retry()
+                current_span().add_event(
+                    "retry", {"error": e.__class__.__name__, "delay_ms": round(delay * 1000, 1), "attempt": attempt}
+                )
+                self.logger.warning(
+                    f"Azure OpenAI call failed ({e.__class__.__name__}), "
+                    f"retrying in {delay:.2f}s (attempt {attempt + 1})"
+                )
+                if isinstance(e, openai.RateLimitError):
+                    # Every queued call waits out the throttling, not only this one
+                    self.rate_limiter.record_throttle(delay, headers)
+                else:
+                    await asyncio.sleep(delay)
+                continue
+
+            # Streamed completions do not report usage; keep the estimate
+            usage = getattr(getattr(response, "usage", None), "total_tokens", None)
+            if isinstance(usage, int):
+                self.rate_limiter.record_usage(estimated, usage)
+            return response
+
+    def _to_field_event(self, parsed: JSONStreamEvent) -> Optional[CVFieldEvent]:
+        """
+        Turn a value completed by the JSON parser into a CV field event
+
+        Args:
+            parsed: Completed top-level value or list entry
+
+        Returns:
+            Field event, or None for values streamed another way or unknown
+        """
+        if parsed.key in ITEM_TYPES:
+            if not parsed.is_item:
+                return None
+            return CVFieldEvent(parsed.key, ITEM_TYPES[parsed.key].from_dict(parsed.value), index=parsed.index)
+        if parsed.is_item or parsed.key not in CV_FIELDS:
+            return None
+        return CVFieldEvent(parsed.key, parsed.value)
+
+    def _build_cv_model(self, content: str) -> CVModel:
+        """
+        Build the CV model from the LLM response
+
+        Args:
+            content: JSON response
+
+        Returns:
+            Structured CV model
+
+        Raises:
+            ValueError: If the response is not valid JSON or misses required fields
+        """
+        return CVModel.from_json(content)
+
+    def _create_messages(self, text: str, skip_fields: Iterable[str] = ()) -> List[Dict[str, str]]:
+        """
+        Create the chat messages for OpenAI
+
+        Args:
+            text: Text to analyze
+            skip_fields: Fields left out of the requested JSON
+
+        Returns:
+            System and user messages
+        """
+        return [
+            {
+                "role": "system",
+                "content": """You are an expert in CV information extraction. 
+                You must carefully analyze the CV and extract ONLY the information that is present.
+                Clearly distinguish between EDUCATION (schools, universities, degrees) and PROFESSIONAL EXPERIENCES (jobs, internships).
+                Be precise and never mix these two categories.""",
+            },
+            {"role": "user", "content": self._create_prompt(text, skip_fields)},
+        ]
+
+    def _get_timeout(self, options: Dict[str, Any]) -> httpx.Timeout:
+        """
+        Get the timeout for a single LLM call
+
+        Args:
+            options: Analyzer options, optionally containing ``timeout``
+
+        Returns:
+            Timeout to pass to the Azure OpenAI client
+        """
+        timeout = options.get("timeout")
+        if timeout is None:
+            return get_request_timeout()
+        return httpx.Timeout(
+            float(timeout), connect=min(float(timeout), settings.AZURE_OPENAI_CONNECT_TIMEOUT_SECONDS)
+        )
+
+    def _create_response_format(self, skip_fields: Iterable[str] = ()) -> str:
+        """
+        Create the JSON template the model must fill
+
+        Args:
+            skip_fields: Fields left out of the template
+
+        Returns:
+            JSON template
+        """
+        skipped = set(skip_fields)
+        lines = [
+            f'    "{name}": {value}' for name, value in RESPONSE_FIELDS.items() if name not in skipped
+        ]
+        return "{\n" + ",\n".join(lines) + "\n}"
+
+    def _create_prompt(self, text: str, skip_fields: Iterable[str] = ()) -> str:
         """
         Create the prompt for OpenAI
 
         Args:
             text: Text to analyze
+            skip_fields: Fields left out of the requested JSON
 
         Returns:
             Formatted prompt
@@ -125,35 +474,7 @@ class OpenAIAnalyzer(BaseAnalyzer):
             {text}
 
             Respond ONLY with this exact JSON format:
-            {{
-                "first_name": "person's first name",
-                "last_name": "person's last name", 
-                "email": "email address",
-                "phone_number": "phone number",
-                "profession": "main professional title",
-                "address": "complete address",
-                "languages": ["language1 (level)", "language2 (level)"],
-                "trainings": [{{
-                    "school": "institution name",
-                    "level": "degree level (e.g.: Master, Bachelor, High School)",
-                    "period": "period (e.g.: 2023/2025)",
-                    "field": "field of study"
-                }}],
-                "skills": [
-                    "Frameworks: list of frameworks",
-                    "Programming Languages: list of languages", 
-                    "Databases: list of DBMS",
-                    "DevOps Tools: list of tools",
-                    "Personal Qualities: list of soft skills"
-                ],
-                "experiences": [{{
-                    "title": "job position",
-                    "company": "company name",
-                    "location": "company location",
-                    "date": "period (original CV format)",
-                    "description": "detailed description of missions and responsibilities"
-                }}]
-            }}
+            {self._create_response_format(skip_fields)}
 
             EXAMPLES of what to distinguish:
             - EDUCATION: "Master in Software Engineering at Ynov Campus"
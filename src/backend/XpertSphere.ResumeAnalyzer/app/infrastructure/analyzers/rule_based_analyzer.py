@@ -0,0 +1,70 @@
+import asyncio
+from typing import Any, Dict, Optional
+from app.domain.models import CVModel, Experience, Training
+from app.infrastructure.analyzers import BaseAnalyzer
+from app.utils.field_patterns import LocalFields, extract_local_fields
+
+# Bump whenever the patterns change the output
+RULES_VERSION = "2"
+
+
+class RuleBasedAnalyzer(BaseAnalyzer):
+    """
+    Text analyzer using precompiled regular expressions only
+
+    Finds the name, contact details, languages and dated entries of a CV
+    in milliseconds and without a network call. Used on its own for fast
+    mode and as a degraded fallback when the LLM is unavailable, and by
+    HybridAnalyzer to pre-extract fields before the LLM call.
+    """
+
+    @property
+    def version(self) -> str:
+        """Version of the extraction patterns"""
+        return f"rules:{RULES_VERSION}"
+
+    def extract(self, text: str) -> LocalFields:
+        """
+        Extract the fields found by the patterns
+
+        Args:
+            text: Text to analyze
+
+        Returns:
+            Fields found in the text
+        """
+        return extract_local_fields(text)
+
+    async def analyze(
+        self, text: str, options: Optional[Dict[str, Any]] = None
+    ) -> CVModel:
+        """
+        Build a CV model from the fields found by the patterns
+
+        Dated lines become experiences, or trainings when they mention a
+        school or degree; descriptions and skills are left empty.
+
+        Args:
+            text: Text to analyze
+            options: Unused
+
+        Returns:
+            Partial CV model
+        """
+        # Off the event loop, as CVs can be long
+        fields = await asyncio.to_thread(self.extract, text)
+        return CVModel(
+            first_name=fields.first_name,
+            last_name=fields.last_name,
+            email=fields.email,
+            phone_number=fields.phone_number,
+            languages=fields.languages,
+            trainings=[
+                Training(school=entry.title, level="", period=entry.period)
+                for entry in fields.entries if entry.education
+            ],
+            experiences=[
+                Experience(title=entry.title, description="", date=entry.period)
+                for entry in fields.entries if not entry.education
+            ],
+        )
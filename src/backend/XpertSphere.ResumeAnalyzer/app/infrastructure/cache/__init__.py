@@ -0,0 +1,3 @@
+from .result_cache import MemoryCacheTier, ResultCache, SQLiteCacheTier
+
+__all__ = ["MemoryCacheTier", "ResultCache", "SQLiteCacheTier"]
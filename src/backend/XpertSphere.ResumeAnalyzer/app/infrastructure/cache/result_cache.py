@@ -0,0 +1,246 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class MemoryCacheTier:
+    """
+    Bounded in-memory LRU tier with per-entry expiry
+    """
+
+    def __init__(self, max_entries: int):
+        """
+        Initialize the tier
+
+        Args:
+            max_entries: Number of entries kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, str, Any]]" = OrderedDict()
+        self.evictions = 0
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get a value and mark it as recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, _, value = entry
+        if expires_at <= time.time():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key: str, tag: str, value: Any, expires_at: float) -> None:
+        """Store a value, evicting the least recently used entries if full"""
+        self._entries[key] = (expires_at, tag, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, tag: str) -> int:
+        """Remove every entry stored with the given tag"""
+        keys = [key for key, (_, entry_tag, _) in self._entries.items() if entry_tag == tag]
+        for key in keys:
+            del self._entries[key]
+        return len(keys)
+
+    def clear(self) -> None:
+        """Remove every entry"""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteCacheTier:
+    """
+    Optional local SQLite tier surviving process restarts
+    """
+
+    def __init__(self, path: str, table: str = "result_cache"):
+        """
+        Initialize the tier and create its table if needed
+
+        Args:
+            path: SQLite database file path
+            table: Table name, letting several caches share one file
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid cache table name: {table}")
+        self.table = table
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} ("
+                "key TEXT PRIMARY KEY, tag TEXT NOT NULL, value TEXT NOT NULL, expires_at REAL NOT NULL)"
+            )
+            self._connection.execute(
+                f"CREATE INDEX IF NOT EXISTS {table}_tag ON {table} (tag)"
+            )
+
+    def get(self, key: str) -> Optional[Tuple[Any, str, float]]:
+        """Get a value with its tag and expiry time"""
+        with self._lock:
+            row = self._connection.execute(
+                f"SELECT value, tag, expires_at FROM {self.table} WHERE key = ? AND expires_at > ?",
+                (key, time.time()),
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1], row[2]
+
+    def set(self, key: str, tag: str, value: Any, expires_at: float) -> None:
+        """Store a value"""
+        with self._lock, self._connection:
+            self._connection.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, tag, value, expires_at) VALUES (?, ?, ?, ?)",
+                (key, tag, json.dumps(value), expires_at),
+            )
+
+    def invalidate(self, tag: str) -> int:
+        """Remove every entry stored with the given tag"""
+        with self._lock, self._connection:
+            return self._connection.execute(
+                f"DELETE FROM {self.table} WHERE tag = ?", (tag,)
+            ).rowcount
+
+    def clear(self) -> None:
+        """Remove every entry, including expired ones"""
+        with self._lock, self._connection:
+            self._connection.execute(f"DELETE FROM {self.table}")
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
+
+
+class ResultCache:
+    """
+    Two-tier cache of JSON-serializable analysis results
+
+    Entries carry a tag (for example the file digest) so every result
+    derived from the same input can be invalidated at once.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_entries: int,
+        ttl_seconds: float,
+        db_path: Optional[str] = None,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            name: Cache name used in logs and statistics
+            max_entries: Capacity of the in-memory LRU tier
+            ttl_seconds: Lifetime of an entry
+            db_path: SQLite file for the disk tier, disabled when not set
+        """
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.memory = MemoryCacheTier(max_entries)
+        self.disk = SQLiteCacheTier(db_path, table=f"{name}_cache") if db_path else None
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    async def get(self, key: str) -> Optional[Any]:
+        """
+        Look up a value, promoting disk hits to memory
+
+        Args:
+            key: Cache key
+
+        Returns:
+            Cached value or None
+        """
+        value = self.memory.get(key)
+        if value is not None:
+            self.memory_hits += 1
+            return value
+
+        if self.disk is not None:
+            entry = await asyncio.to_thread(self.disk.get, key)
+            if entry is not None:
+                value, tag, expires_at = entry
+                self.memory.set(key, tag, value, expires_at)
+                self.disk_hits += 1
+                return value
+
+        self.misses += 1
+        return None
+
+    async def set(self, key: str, value: Any, tag: str = "") -> None:
+        """
+        Store a value in every tier
+
+        Args:
+            key: Cache key
+            value: JSON-serializable value
+            tag: Tag used for grouped invalidation
+        """
+        expires_at = time.time() + self.ttl_seconds
+        self.memory.set(key, tag, value, expires_at)
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.set, key, tag, value, expires_at)
+
+    async def invalidate(self, tag: str) -> int:
+        """
+        Remove every entry stored with a tag
+
+        Args:
+            tag: Tag given when the entries were stored
+
+        Returns:
+            Number of entries removed from the largest tier
+        """
+        removed = self.memory.invalidate(tag)
+        if self.disk is not None:
+            removed = max(removed, await asyncio.to_thread(self.disk.invalidate, tag))
+        return removed
+
+    async def clear(self) -> None:
+        """Remove every entry from every tier"""
+        self.memory.clear()
+        if self.disk is not None:
+            await asyncio.to_thread(self.disk.clear)
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get hit and miss counters
+
+        Returns:
+            Counters, hit rate and tier sizes
+        """
+        hits = self.memory_hits + self.disk_hits
+        lookups = hits + self.misses
+        return {
+            "name": self.name,
+            "hits": hits,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+            "entries": len(self.memory),
+            "max_entries": self.memory.max_entries,
+            "evictions": self.memory.evictions,
+            "disk_enabled": self.disk is not None,
+        }
+
+    def close(self) -> None:
+        """Release the disk tier"""
+        if self.disk is not None:
+            self.disk.close()
+            self.disk = None
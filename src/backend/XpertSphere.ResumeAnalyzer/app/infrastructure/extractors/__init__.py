@@ -1,5 +1,6 @@
 
 from .base_extractor import BaseExtractor
 from .pdf_extractor import PDFExtractor
+from .extraction_pool import ExtractionPool, ProcessPoolPDFExtractor
 
-__all__ = ["BaseExtractor", "PDFExtractor"]
\ No newline at end of file
+__all__ = ["BaseExtractor", "PDFExtractor", "ExtractionPool", "ProcessPoolPDFExtractor"]
\ No newline at end of file
@@ -0,0 +1,475 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import psutil
+from app.infrastructure.extractors import BaseExtractor
+from app.infrastructure.extractors.pdf_extractor import add_page_events, assemble_pdf_text, extract_pdf_pages
+from app.infrastructure.extractors.tiered_extraction import TierStats
+from app.utils.tracing import current_span, tracer
+from app.utils.upload_utils import Buffer
+from app.core import ExtractionError, ServiceOverloadedError
+
+
+def _register_worker(worker_pids: Any) -> None:
+    """
+    Worker initializer: report the worker's PID to the pool
+
+    Args:
+        worker_pids: Queue read by the pool to find the workers of an executor
+    """
+    worker_pids.put(os.getpid())
+
+
+def _extract_pages_from_shared_memory(
+    shm_name: str,
+    size: int,
+    file_name: str,
+    start: int,
+    stop: Optional[int],
+    max_chars: Optional[int],
+    tiered: bool = False,
+) -> Tuple[List[str], int, TierStats, int]:
+    """
+    Worker entry point: extract a range of pages of a PDF held in shared memory
+
+    Args:
+        shm_name: Name of the shared memory block holding the PDF
+        size: Number of meaningful bytes in the block
+        file_name: Name of the file
+        start: Index of the first page to extract
+        stop: Index after the last page to extract, or None for the last page
+        max_chars: Optional number of characters after which extraction stops
+        tiered: Run layout analysis only on pages with a poor text layer
+
+    Returns:
+        Text of each non-empty page, the document's page count, the pages
+        and time spent in each extraction tier, and the worker's resident
+        memory in bytes
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    content = shm.buf[:size]
+    try:
+        # Parse straight from shared memory without copying the PDF
+        pages, page_count, stats = extract_pdf_pages(content, file_name, start, stop, max_chars, tiered)
+    finally:
+        content.release()
+        shm.close()
+    return pages, page_count, stats, psutil.Process().memory_info().rss
+
+
+class ExtractionPool:
+    """
+    Process pool running PDF extraction off the event loop
+
+    PDF bytes are handed to workers through shared memory instead of
+    being pickled. Submissions beyond the pool size plus queue size are
+    rejected, each job has a timeout, and workers are recycled after a
+    number of jobs or when their memory grows past a threshold.
+
+    A timed-out job cannot be cancelled, and killing its worker would
+    break every job of the same executor. Its executor is retired
+    instead: new jobs start fresh workers, and the retired workers are
+    killed once the other jobs they were running have finished.
+
+    Long documents are split into shards of pages: the first shard also
+    reports the page count, the remaining shards run in parallel, and
+    their pages are reassembled in order. Remaining shards are cancelled
+    once the character budget is reached. Shards still waiting or running
+    count against the submission bound alongside documents, so sharded
+    documents cannot queue more work than the bound allows.
+
+    With tiered extraction, workers read each page's text layer first and
+    run layout analysis only on pages whose text fails the quality checks.
+    """
+
+    def __init__(
+        self,
+        workers: int,
+        max_queue: int,
+        job_timeout: float,
+        max_tasks_per_worker: int,
+        max_worker_rss_mb: int,
+        pages_per_shard: int = 0,
+        tiered: bool = False,
+    ):
+        """
+        Initialize the pool; worker processes start on the first job
+
+        Args:
+            workers: Number of worker processes
+            max_queue: Jobs allowed to wait for a free worker
+            job_timeout: Seconds before a job is abandoned
+            max_tasks_per_worker: Jobs a worker runs before it is replaced
+            max_worker_rss_mb: Resident memory that triggers a pool recycle
+            pages_per_shard: Pages extracted per job, or 0 to extract each
+                document in a single job
+            tiered: Run layout analysis only on pages with a poor text layer
+        """
+        self.workers = workers
+        self.max_queue = max_queue
+        self.job_timeout = job_timeout
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.max_worker_rss_bytes = max_worker_rss_mb * 1024 * 1024
+        self.pages_per_shard = pages_per_shard
+        self.tiered = tiered
+        self.tier_stats = TierStats()
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._jobs: Dict[ProcessPoolExecutor, Set[Future]] = {}
+        self._worker_pids: Dict[ProcessPoolExecutor, Any] = {}
+        self._retiring: Set["asyncio.Task[None]"] = set()
+        self._pending = 0
+        self._shards: Set[Future] = set()
+        self._completed = 0
+        self._failed = 0
+        self._timeouts = 0
+        self._rejected = 0
+        self._recycles = 0
+        self._sharded = 0
+        self._shards_cancelled = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        """Get the current executor, starting one if needed"""
+        if self._executor is None:
+            # Forget retired executors whose jobs are all done
+            self._jobs = {executor: running for executor, running in self._jobs.items() if running}
+            self._worker_pids = {
+                executor: pids for executor, pids in self._worker_pids.items() if executor in self._jobs
+            }
+            context = multiprocessing.get_context("spawn")
+            worker_pids = context.SimpleQueue()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=context,
+                initializer=_register_worker,
+                initargs=(worker_pids,),
+                max_tasks_per_child=self.max_tasks_per_worker,
+            )
+            self._worker_pids[self._executor] = worker_pids
+        return self._executor
+
+    def _submit_job(self, jobs: List[Future], *args: Any) -> Future:
+        """
+        Submit an extraction job to the current executor
+
+        Args:
+            jobs: Jobs of the document, receiving the new job
+            *args: Arguments of _extract_pages_from_shared_memory
+
+        Returns:
+            Future of the job
+        """
+        executor = self._get_executor()
+        future = executor.submit(_extract_pages_from_shared_memory, *args)
+        running = self._jobs.setdefault(executor, set())
+        running.add(future)
+        future.add_done_callback(running.discard)
+        jobs.append(future)
+        return future
+
+    def _recycle(self, reason: str) -> None:
+        """
+        Retire the current executor so the next job starts fresh workers
+
+        Running jobs finish in the retired workers.
+
+        Args:
+            reason: Why the pool is recycled, for logging
+        """
+        executor, self._executor = self._executor, None
+        if executor is None:
+            return
+
+        self._recycles += 1
+        self.logger.warning(f"Recycling extraction workers: {reason}")
+        executor.shutdown(wait=False)
+
+    def _retire_stuck(self, stuck: List[Future]) -> None:
+        """
+        Retire the executors running timed-out jobs
+
+        New jobs go to fresh workers; the retired workers are killed once
+        their other jobs are done, so those are not failed along with the
+        stuck ones.
+
+        Args:
+            stuck: Jobs of the timed-out document
+        """
+        for executor, running in list(self._jobs.items()):
+            if not any(job in running and job.running() for job in stuck):
+                continue
+            if executor is self._executor:
+                self._executor = None
+            self._recycles += 1
+            self.logger.warning(f"Recycling extraction workers: job exceeded {self.job_timeout}s")
+            del self._jobs[executor]
+            others = [job for job in list(running) if job not in stuck]
+            task = asyncio.create_task(self._terminate_when_done(executor, others))
+            self._retiring.add(task)
+            task.add_done_callback(self._retiring.discard)
+
+    async def _terminate_when_done(self, executor: ProcessPoolExecutor, others: List[Future]) -> None:
+        """
+        Kill the workers of a retired executor once its other jobs are done
+
+        Those jobs were submitted before the executor was retired, so
+        their own timeouts expire within one job timeout.
+
+        Args:
+            executor: Retired executor
+            others: Jobs of other documents submitted to it
+        """
+        try:
+            if others:
+                await asyncio.wait([asyncio.wrap_future(job) for job in others], timeout=self.job_timeout)
+        finally:
+            self._terminate_workers(executor)
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _terminate_workers(self, executor: ProcessPoolExecutor) -> None:
+        """
+        Kill the worker processes an executor has started
+
+        The executor has no public way to reach its workers, so each worker
+        reports its PID when it starts. Workers that have already exited,
+        and PIDs since reused by processes that are not our children, are
+        skipped.
+
+        Args:
+            executor: Retired executor
+        """
+        worker_pids = self._worker_pids.pop(executor, None)
+        if worker_pids is None:
+            return
+        pids = set()
+        while not worker_pids.empty():
+            pids.add(worker_pids.get())
+        worker_pids.close()
+        for pid in pids:
+            try:
+                process = psutil.Process(pid)
+                if process.ppid() == os.getpid():
+                    process.terminate()
+            except psutil.NoSuchProcess:
+                continue
+
+    async def submit(
+        self,
+        file_content: Buffer,
+        file_name: str,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None,
+    ) -> str:
+        """
+        Extract text from a PDF in worker processes
+
+        Args:
+            file_content: Binary content of the PDF file, as bytes or a memoryview
+            file_name: Name of the file
+            max_pages: Optional number of pages to extract
+            max_chars: Optional maximum length of the text
+
+        Returns:
+            Extracted text
+
+        Raises:
+            ServiceOverloadedError: If the submission queue is full
+            ExtractionError: If extraction fails or times out
+        """
+        if self._pending + len(self._shards) >= self.workers + self.max_queue:
+            self._rejected += 1
+            raise ServiceOverloadedError("PDF extraction queue is full, retry later")
+
+        size = len(file_content)
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        jobs: List[Future] = []
+        self._pending += 1
+        try:
+            shm.buf[:size] = file_content
+            pages, worker_rss = await asyncio.wait_for(
+                self._extract_pages(shm.name, size, file_name, max_pages, max_chars, jobs),
+                timeout=self.job_timeout,
+            )
+        except asyncio.TimeoutError:
+            self._timeouts += 1
+            self._retire_stuck(jobs)
+            raise ExtractionError(
+                f"PDF extraction timed out after {self.job_timeout} seconds: {file_name}"
+            )
+        except BrokenProcessPool as e:
+            self._failed += 1
+            self._recycle("worker process died")
+            raise ExtractionError(f"PDF extraction worker failed: {str(e)}")
+        except ExtractionError:
+            self._failed += 1
+            raise
+        finally:
+            self._pending -= 1
+            shm.close()
+            shm.unlink()
+
+        self._completed += 1
+        if worker_rss > self.max_worker_rss_bytes:
+            self._recycle(f"worker memory reached {worker_rss // (1024 * 1024)} MB")
+        return assemble_pdf_text(pages, file_name, max_chars)
+
+    async def _extract_pages(
+        self,
+        shm_name: str,
+        size: int,
+        file_name: str,
+        max_pages: Optional[int],
+        max_chars: Optional[int],
+        jobs: List[Future],
+    ) -> Tuple[List[str], int]:
+        """
+        Extract the pages of a PDF in shared memory, sharding long documents
+
+        Args:
+            shm_name: Name of the shared memory block holding the PDF
+            size: Number of meaningful bytes in the block
+            file_name: Name of the file
+            max_pages: Optional number of pages to extract
+            max_chars: Optional maximum length of the text
+            jobs: Jobs of the document, receiving each submitted job
+
+        Returns:
+            Text of each non-empty page in order, and the highest worker
+            resident memory in bytes
+        """
+        limits = [limit for limit in (self.pages_per_shard or None, max_pages) if limit]
+        first_stop = min(limits) if limits else None
+        first = self._submit_job(jobs, shm_name, size, file_name, 0, first_stop, max_chars, self.tiered)
+        pages, page_count, tier_stats, worker_rss = await asyncio.wrap_future(first)
+        self.tier_stats.merge(tier_stats)
+        add_page_events(current_span(), tier_stats)
+        last_page = page_count if max_pages is None else min(page_count, max_pages)
+        chars = sum(len(page) for page in pages)
+        if first_stop is None or first_stop >= last_page or (max_chars is not None and chars >= max_chars):
+            return pages, worker_rss
+
+        self._sharded += 1
+        shards = [
+            self._submit_job(
+                jobs,
+                shm_name,
+                size,
+                file_name,
+                start,
+                min(start + self.pages_per_shard, last_page),
+                max_chars,
+                self.tiered,
+            )
+            for start in range(first_stop, last_page, self.pages_per_shard)
+        ]
+        for shard in shards:
+            # Done callbacks run on the executor's thread, where a set is safe
+            self._shards.add(shard)
+            shard.add_done_callback(self._shards.discard)
+        try:
+            # Reassemble in page order, stopping once the text budget is reached
+            for shard in shards:
+                shard_pages, _, tier_stats, shard_rss = await asyncio.wrap_future(shard)
+                self.tier_stats.merge(tier_stats)
+                add_page_events(current_span(), tier_stats)
+                pages.extend(shard_pages)
+                worker_rss = max(worker_rss, shard_rss)
+                chars += sum(len(page) for page in shard_pages)
+                if max_chars is not None and chars >= max_chars:
+                    break
+        finally:
+            self._shards_cancelled += sum(shard.cancel() for shard in shards)
+        return pages, worker_rss
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get pool usage counters
+
+        Returns:
+            Pool configuration and job counters
+        """
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "running": self._executor is not None,
+            "pending": self._pending,
+            "pending_shards": len(self._shards),
+            "completed": self._completed,
+            "failed": self._failed,
+            "timeouts": self._timeouts,
+            "rejected": self._rejected,
+            "recycles": self._recycles,
+            "retiring": len(self._retiring),
+            "pages_per_shard": self.pages_per_shard,
+            "sharded": self._sharded,
+            "shards_cancelled": self._shards_cancelled,
+            "tiered": self.tiered,
+            "tiers": self.tier_stats.snapshot(),
+        }
+
+    async def shutdown(self) -> None:
+        """
+        Stop the worker processes
+        """
+        for task in list(self._retiring):
+            task.cancel()
+        await asyncio.gather(*self._retiring, return_exceptions=True)
+        executor, self._executor = self._executor, None
+        self._jobs.clear()
+        self._worker_pids.clear()
+        if executor is not None:
+            await asyncio.to_thread(executor.shutdown, wait=True, cancel_futures=True)
+
+
+class ProcessPoolPDFExtractor(BaseExtractor):
+    """
+    PDF document extractor running extraction in an extraction pool
+    """
+
+    def __init__(
+        self,
+        pool: ExtractionPool,
+        max_pages: Optional[int] = None,
+        max_chars: Optional[int] = None,
+    ):
+        """
+        Initialize the extractor
+
+        Args:
+            pool: Process pool executing the extraction jobs
+            max_pages: Optional number of pages extracted per document
+            max_chars: Optional maximum length of the extracted text
+        """
+        super().__init__(supported_extensions={"pdf"})
+        self.pool = pool
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+
+    async def extract_text(self, file_content: Buffer, file_name: str) -> str:
+        """
+        Extract text from a PDF document in worker processes
+
+        Args:
+            file_content: Binary content of the PDF file, as bytes or a memoryview
+            file_name: Name of the file
+
+        Returns:
+            Extracted text
+
+        Raises:
+            ExtractionError: If extraction fails
+            ServiceOverloadedError: If the extraction queue is full
+        """
+        with tracer.start_span(
+            "PDFExtractor.extract_text",
+            {"size_bytes": len(file_content), "tiered": self.pool.tiered, "process_pool": True},
+        ) as span:
+            text = await self.pool.submit(file_content, file_name, self.max_pages, self.max_chars)
+            span.set_attribute("chars", len(text))
+            return text
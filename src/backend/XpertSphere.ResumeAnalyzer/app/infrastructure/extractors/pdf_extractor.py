@@ -1,25 +1,182 @@
+import logging
+import time
+from typing import Any, Dict, List, Optional, Tuple
 import pdfplumber
-import tempfile
-import os
 from app.infrastructure.extractors import BaseExtractor
+from app.infrastructure.extractors.tiered_extraction import LAYOUT_TIER, TierStats, extract_pages_tiered
 from app.core import ExtractionError
+from app.utils.pdf_utils import iter_page_text
+from app.utils.text_compaction import PAGE_BREAK
+from app.utils.tracing import current_span, tracer
+from app.utils.upload_utils import Buffer, as_binary_stream
+
+logger = logging.getLogger(__name__)
+
+
+def extract_pdf_pages(
+    file_content: Buffer,
+    file_name: str,
+    start: int = 0,
+    stop: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    tiered: bool = False,
+) -> Tuple[List[str], int, TierStats]:
+    """
+    Extract the text of a range of pages of a PDF document synchronously
+
+    Runs in the calling thread or process; used directly by PDFExtractor
+    and by extraction pool workers, which each extract a shard of pages.
+
+    Args:
+        file_content: Binary content of the PDF file, as bytes or a memoryview
+        file_name: Name of the file
+        start: Index of the first page to extract
+        stop: Index after the last page to extract, or None for the last page
+        max_chars: Optional number of characters after which extraction stops
+        tiered: Read the text layer first and run layout analysis only on
+            pages whose text fails the quality checks
+
+    Returns:
+        Text of each non-empty page in order, the document's page count,
+        and the pages and time spent in each extraction tier
+
+    Raises:
+        ExtractionError: If the document cannot be read
+    """
+    try:
+        if tiered:
+            return extract_pages_tiered(file_content, start, stop, max_chars)
+
+        stats = TierStats()
+        started = time.perf_counter()
+        # Read the buffer in place instead of copying it into a BytesIO
+        with as_binary_stream(file_content) as stream, pdfplumber.open(stream) as pdf:
+            page_count = len(pdf.pages)
+            pages: List[str] = []
+            chars = 0
+            page_started = time.perf_counter()
+            for index, text in iter_page_text(pdf, start, stop):
+                page_ended = time.perf_counter()
+                stats.page_timings.append((index, LAYOUT_TIER, page_ended - page_started, len(text)))
+                page_started = page_ended
+                if not text:
+                    continue
+                stats.record(LAYOUT_TIER)
+                pages.append(text)
+                chars += len(text)
+                if max_chars is not None and chars >= max_chars:
+                    break
+        stats.layout_seconds = time.perf_counter() - started
+        return pages, page_count, stats
+    except Exception as e:
+        logger.error(f"Error extracting text from PDF: {str(e)}")
+        raise ExtractionError(f"Failed to extract text from PDF: {str(e)}")
+
+
+def add_page_events(span: Any, stats: TierStats) -> None:
+    """
+    Attach the timing of each extracted page to a span as ``page`` events
+
+    Args:
+        span: Span of the extraction
+        stats: Tier counters of a single extraction run
+    """
+    for index, tier, seconds, chars in stats.page_timings:
+        span.add_event(
+            "page", {"page": index, "tier": tier, "duration_ms": round(seconds * 1000, 3), "chars": chars}
+        )
+
+
+def assemble_pdf_text(pages: List[str], file_name: str, max_chars: Optional[int] = None) -> str:
+    """
+    Join page texts in order, separated by form feeds
+
+    Args:
+        pages: Text of each non-empty page, in page order
+        file_name: Name of the file
+        max_chars: Optional maximum length of the text
+
+    Returns:
+        Extracted text
+
+    Raises:
+        ExtractionError: If no text was found
+    """
+    full_text = PAGE_BREAK.join(pages)
+    if max_chars is not None and len(full_text) > max_chars:
+        logger.info(f"Truncated text of {file_name} to {max_chars} characters")
+        full_text = full_text[:max_chars]
+
+    if not full_text or full_text.isspace():
+        logger.warning(f"Failed to extract text from PDF: {file_name}")
+        raise ExtractionError(f"Could not extract text from PDF: {file_name}")
+
+    return full_text + "\n"
+
+
+def extract_pdf_text(
+    file_content: Buffer,
+    file_name: str,
+    max_pages: Optional[int] = None,
+    max_chars: Optional[int] = None,
+    tiered: bool = False,
+    tier_stats: Optional[TierStats] = None,
+) -> str:
+    """
+    Extract text from a PDF document synchronously
+
+    Pages are separated by form feeds. Extraction stops at max_pages, or
+    as soon as max_chars characters have been read.
+
+    Args:
+        file_content: Binary content of the PDF file, as bytes or a memoryview
+        file_name: Name of the file
+        max_pages: Optional number of pages to extract
+        max_chars: Optional maximum length of the text
+        tiered: Run layout analysis only on pages with a poor text layer
+        tier_stats: Optional counters the extraction tiers are added to
+
+    Returns:
+        Extracted text
+
+    Raises:
+        ExtractionError: If extraction fails
+    """
+    pages, page_count, stats = extract_pdf_pages(file_content, file_name, 0, max_pages, max_chars, tiered)
+    add_page_events(current_span(), stats)
+    if tier_stats is not None:
+        tier_stats.merge(stats)
+    if max_pages is not None and page_count > max_pages:
+        logger.info(f"Extracted the first {max_pages} of {page_count} pages of {file_name}")
+    return assemble_pdf_text(pages, file_name, max_chars)
 
 
 class PDFExtractor(BaseExtractor):
     """
-    PDF document extractor using pdfplumber
+    PDF document extractor using pdfplumber, optionally behind a pdfium text-layer pass
     """
 
-    def __init__(self):
-        """Initialize the PDF extractor"""
+    def __init__(self, max_pages: Optional[int] = None, max_chars: Optional[int] = None, tiered: bool = False):
+        """
+        Initialize the PDF extractor
+
+        Args:
+            max_pages: Optional number of pages extracted per document
+            max_chars: Optional maximum length of the extracted text
+            tiered: Run layout analysis only on pages with a poor text layer
+        """
         super().__init__(supported_extensions={"pdf"})
+        self.max_pages = max_pages
+        self.max_chars = max_chars
+        self.tiered = tiered
+        self.tier_stats = TierStats()
 
-    async def extract_text(self, file_content: bytes, file_name: str) -> str:
+    async def extract_text(self, file_content: Buffer, file_name: str) -> str:
         """
         Extract text from a PDF document
 
         Args:
-            file_content: Binary content of the PDF file
+            file_content: Binary content of the PDF file, as bytes or a memoryview
             file_name: Name of the file
 
         Returns:
@@ -28,28 +185,20 @@ class PDFExtractor(BaseExtractor):
         Raises:
             ExtractionError: If extraction fails
         """
-        # Create a temporary file
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as temp_file:
-            temp_file.write(file_content)
-            temp_path = temp_file.name
-
-        try:
-            with pdfplumber.open(temp_path) as pdf:
-                # Extract text from all pages
-                full_text = ""
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        full_text += text + "\n"
-
-            if not full_text or full_text.isspace():
-                self.logger.warning(f"Failed to extract text from PDF: {file_name}")
-                raise ExtractionError(f"Could not extract text from PDF: {file_name}")
-
-            return full_text
-        except Exception as e:
-            self.logger.error(f"Error extracting text from PDF: {str(e)}")
-            raise ExtractionError(f"Failed to extract text from PDF: {str(e)}")
-        finally:
-            # Clean up the temporary file
-            os.unlink(temp_path)
+        with tracer.start_span(
+            "PDFExtractor.extract_text", {"size_bytes": len(file_content), "tiered": self.tiered}
+        ) as span:
+            text = extract_pdf_text(
+                file_content, file_name, self.max_pages, self.max_chars, self.tiered, self.tier_stats
+            )
+            span.set_attribute("chars", len(text))
+            return text
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get extraction tier counters
+
+        Returns:
+            Whether tiered extraction is enabled, with tier hit rates and timings
+        """
+        return {"tiered": self.tiered, "tiers": self.tier_stats.snapshot()}
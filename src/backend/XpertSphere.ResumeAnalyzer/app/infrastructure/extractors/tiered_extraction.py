@@ -0,0 +1,284 @@
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+import pdfplumber
+import pypdfium2 as pdfium
+from app.utils.upload_utils import Buffer, as_binary_stream
+
+# Extraction tiers, cheapest first
+TEXT_LAYER_TIER = "text_layer"
+LAYOUT_TIER = "layout"
+
+# A page's text layer is rejected when any of these ratios is exceeded
+MAX_SINGLE_CHAR_RATIO = 0.3
+MAX_LONG_WORD_RATIO = 0.1
+MAX_INTERLEAVE_RATIO = 0.2
+MAX_BAD_CHAR_RATIO = 0.02
+
+# Ratios are only meaningful on pages with enough words or text runs
+MIN_WORDS_FOR_RATIOS = 20
+MIN_RUNS_FOR_RATIOS = 6
+
+# Words this long are usually several words missing their spaces
+LONG_WORD_LENGTH = 30
+
+# Horizontal gap, as a fraction of page width, separating two columns
+COLUMN_GAP_RATIO = 0.12
+
+_WORDS = re.compile(r"\S+")
+# pdfium marks hyphens that break words at line ends with these characters
+_LINE_END_HYPHENS = re.compile(r"[\x02\ufffe]")
+_CONTROL_CHARS = re.compile(r"[\x00-\x08\x0b-\x1f\x7f]")
+# Replacement and private use characters come from fonts without a usable encoding
+_BAD_CHARS = re.compile(r"[\ufffd\ue000-\uf8ff]")
+
+
+@dataclass
+class PageQuality:
+    """Signals that a text-layer dump of a page is unreliable"""
+
+    chars: int = 0
+    single_char_ratio: float = 0.0
+    long_word_ratio: float = 0.0
+    interleave_ratio: float = 0.0
+    bad_char_ratio: float = 0.0
+
+    @property
+    def acceptable(self) -> bool:
+        """Whether the text layer is good enough to skip layout analysis"""
+        return (
+            self.single_char_ratio <= MAX_SINGLE_CHAR_RATIO
+            and self.long_word_ratio <= MAX_LONG_WORD_RATIO
+            and self.interleave_ratio <= MAX_INTERLEAVE_RATIO
+            and self.bad_char_ratio <= MAX_BAD_CHAR_RATIO
+        )
+
+
+@dataclass
+class TierStats:
+    """Pages with text served by each extraction tier and the time spent in each"""
+
+    text_layer_pages: int = 0
+    layout_pages: int = 0
+    text_layer_seconds: float = 0.0
+    layout_seconds: float = 0.0
+    # Index, tier, seconds and characters of each page read by this run;
+    # kept per document for tracing and not added up by merge
+    page_timings: List[Tuple[int, str, float, int]] = field(default_factory=list)
+
+    def record(self, tier: str) -> None:
+        """Count a page with text served by the given tier"""
+        if tier == LAYOUT_TIER:
+            self.layout_pages += 1
+        else:
+            self.text_layer_pages += 1
+
+    def merge(self, other: "TierStats") -> None:
+        """Add the counters of another run"""
+        self.text_layer_pages += other.text_layer_pages
+        self.layout_pages += other.layout_pages
+        self.text_layer_seconds += other.text_layer_seconds
+        self.layout_seconds += other.layout_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get hit rates and average page timings
+
+        Returns:
+            Page counts, share of pages served by the text layer, and
+            average milliseconds per page for each tier
+        """
+        pages = self.text_layer_pages + self.layout_pages
+        # Escalated pages went through the text layer first
+        return {
+            "pages": pages,
+            "text_layer_pages": self.text_layer_pages,
+            "layout_pages": self.layout_pages,
+            "text_layer_hit_rate": round(self.text_layer_pages / pages, 3) if pages else 0.0,
+            "text_layer_ms_per_page": round(self.text_layer_seconds * 1000 / pages, 2) if pages else 0.0,
+            "layout_ms_per_page": (
+                round(self.layout_seconds * 1000 / self.layout_pages, 2) if self.layout_pages else 0.0
+            ),
+        }
+
+
+def _interleave_ratio(textpage: "pdfium.PdfTextPage", page_width: float) -> float:
+    """
+    Share of text runs that jump between columns on the same line
+
+    The text layer follows content stream order. When a run is followed
+    by another on the same baseline but far to its right, two columns
+    were written line by line and a raw dump mixes them.
+    """
+    runs = textpage.count_rects()
+    if runs < MIN_RUNS_FOR_RATIOS:
+        return 0.0
+
+    jumps = 0
+    previous = textpage.get_rect(0)
+    for index in range(1, runs):
+        left, bottom, right, top = textpage.get_rect(index)
+        same_line = abs(bottom - previous[1]) < (top - bottom) / 2
+        if same_line and left - previous[2] > page_width * COLUMN_GAP_RATIO:
+            jumps += 1
+        previous = (left, bottom, right, top)
+    return jumps / (runs - 1)
+
+
+def score_page_text(text: str, interleave_ratio: float = 0.0) -> PageQuality:
+    """
+    Score a text-layer dump of a page
+
+    Args:
+        text: Text of the page
+        interleave_ratio: Share of text runs jumping between columns
+
+    Returns:
+        Quality signals of the text
+    """
+    words = _WORDS.findall(text)
+    quality = PageQuality(chars=len(text), interleave_ratio=interleave_ratio)
+    if text:
+        quality.bad_char_ratio = len(_BAD_CHARS.findall(text)) / len(text)
+    if len(words) >= MIN_WORDS_FOR_RATIOS:
+        quality.single_char_ratio = sum(len(word) == 1 and word.isalpha() for word in words) / len(words)
+        quality.long_word_ratio = sum(len(word) >= LONG_WORD_LENGTH for word in words) / len(words)
+    return quality
+
+
+def read_text_layer(pdf: "pdfium.PdfDocument", index: int) -> Tuple[str, PageQuality]:
+    """
+    Dump the text layer of a page without layout analysis
+
+    Args:
+        pdf: Open pdfium document
+        index: Page index
+
+    Returns:
+        Page text and its quality signals
+    """
+    page = pdf[index]
+    try:
+        textpage = page.get_textpage()
+        try:
+            text = textpage.get_text_bounded().replace("\r\n", "\n")
+            interleave_ratio = _interleave_ratio(textpage, page.get_width())
+        finally:
+            textpage.close()
+    finally:
+        page.close()
+    text = _CONTROL_CHARS.sub("", _LINE_END_HYPHENS.sub("-", text)).strip()
+    return text, score_page_text(text, interleave_ratio)
+
+
+def _find_gutter(words: List[Dict[str, Any]], page_width: float) -> Optional[Tuple[float, float]]:
+    """
+    Find the widest vertical band free of words in the middle of a page
+
+    Args:
+        words: Words of the page, with their x0 and x1 coordinates
+        page_width: Width of the page
+
+    Returns:
+        Left and right edges of the gutter, or None for a single column
+    """
+    gutter = None
+    covered_to = None
+    for word in sorted(words, key=lambda word: word["x0"]):
+        if covered_to is not None and word["x0"] - covered_to >= page_width * COLUMN_GAP_RATIO:
+            middle = (covered_to + word["x0"]) / 2
+            if page_width * 0.2 <= middle <= page_width * 0.8:
+                if gutter is None or word["x0"] - covered_to > gutter[1] - gutter[0]:
+                    gutter = (covered_to, word["x0"])
+        covered_to = word["x1"] if covered_to is None else max(covered_to, word["x1"])
+    return gutter
+
+
+def read_layout_text(page: "pdfplumber.page.Page") -> str:
+    """
+    Extract a page with pdfplumber, reading two-column layouts column by column
+
+    Args:
+        page: Open pdfplumber page
+
+    Returns:
+        Page text
+    """
+    gutter = _find_gutter(page.extract_words(), page.width)
+    if gutter is None:
+        return page.extract_text() or ""
+
+    split = (gutter[0] + gutter[1]) / 2
+    columns = [
+        page.crop((page.bbox[0], page.bbox[1], split, page.bbox[3])),
+        page.crop((split, page.bbox[1], page.bbox[2], page.bbox[3])),
+    ]
+    return "\n".join(text for text in (column.extract_text() for column in columns) if text)
+
+
+def extract_pages_tiered(
+    file_content: Buffer,
+    start: int = 0,
+    stop: Optional[int] = None,
+    max_chars: Optional[int] = None,
+) -> Tuple[List[str], int, TierStats]:
+    """
+    Extract a range of pages, running layout analysis only where needed
+
+    Each page is first dumped from its text layer with pdfium and scored;
+    pages that fail the quality checks are extracted again with
+    pdfplumber's character-level layout analysis, which also separates
+    the columns of two-column layouts.
+
+    Args:
+        file_content: Binary content of the PDF file, as bytes or a memoryview
+        start: Index of the first page to extract
+        stop: Index after the last page to extract, or None for the last page
+        max_chars: Optional number of characters after which extraction stops
+
+    Returns:
+        Text of each non-empty page in order, the document's page count,
+        and the pages and time spent in each tier
+    """
+    stats = TierStats()
+    pages: List[str] = []
+    chars = 0
+    layout_stream = layout_pdf = None
+    with as_binary_stream(file_content) as stream:
+        pdf = pdfium.PdfDocument(stream)
+        try:
+            page_count = len(pdf)
+            for index in range(start, min(stop or page_count, page_count)):
+                page_started = started = time.perf_counter()
+                text, quality = read_text_layer(pdf, index)
+                stats.text_layer_seconds += time.perf_counter() - started
+
+                tier = TEXT_LAYER_TIER
+                if not quality.acceptable:
+                    if layout_pdf is None:
+                        layout_stream = as_binary_stream(file_content)
+                        layout_pdf = pdfplumber.open(layout_stream)
+                    started = time.perf_counter()
+                    page = layout_pdf.pages[index]
+                    try:
+                        text = read_layout_text(page)
+                    finally:
+                        page.close()
+                    stats.layout_seconds += time.perf_counter() - started
+                    tier = LAYOUT_TIER
+                stats.page_timings.append((index, tier, time.perf_counter() - page_started, len(text)))
+
+                if text:
+                    stats.record(tier)
+                    pages.append(text)
+                    chars += len(text)
+                    if max_chars is not None and chars >= max_chars:
+                        break
+        finally:
+            pdf.close()
+            if layout_pdf is not None:
+                layout_pdf.close()
+                layout_stream.close()
+    return pages, page_count, stats
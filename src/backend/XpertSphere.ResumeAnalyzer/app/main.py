@@ -2,7 +2,14 @@ from fastapi import FastAPI, Request
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.router import router as api_router
-from app.core.exceptions import BaseApplicationError
+from app.api.endpoints import metrics
+from app.api.middleware import MULTIPART_OVERHEAD_BYTES, TracingMiddleware, UploadSizeLimitMiddleware
+from app.core import settings
+from app.core.exceptions import BaseApplicationError, CircuitOpenError, ServiceOverloadedError, retry_after_headers
+from app.services import HealthMonitor, ServiceContainer
+from app.utils import build_exporter, configure_tracing, tracer
+from contextlib import asynccontextmanager
+from typing import Dict, Tuple
 import logging
 from dotenv import load_dotenv
 
@@ -19,6 +26,38 @@ logging.getLogger("uvicorn").setLevel(logging.INFO)
 logger = logging.getLogger(__name__)
 logger.info("Starting XpertSphere CV Analyzer API")
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Build the shared CV pipeline at startup and release it on shutdown
+
+    With background warm-up, the server accepts health probes right away
+    while the pipeline is built; otherwise startup waits for it.
+    """
+    configure_tracing(build_exporter(settings.TRACING_EXPORTER, settings.TRACING_FILE_PATH))
+    health_monitor = HealthMonitor(
+        interval=settings.HEALTH_SAMPLE_INTERVAL_SECONDS,
+        probe_ttl=settings.HEALTH_OPENAI_PROBE_TTL_SECONDS,
+        probe_timeout=settings.HEALTH_OPENAI_PROBE_TIMEOUT_SECONDS,
+    )
+    await health_monitor.start()
+    app.state.health_monitor = health_monitor
+    container = ServiceContainer()
+    app.state.container = container
+    if settings.STARTUP_BACKGROUND_WARM_UP:
+        container.warm_up()
+    else:
+        await container.start()
+    try:
+        yield
+    finally:
+        await container.shutdown()
+        app.state.container = None
+        await health_monitor.stop()
+        app.state.health_monitor = None
+        tracer.shutdown()
+
 # Create FastAPI application
 app = FastAPI(
     title="XpertSphere CV Analyzer",
@@ -36,8 +75,31 @@ app = FastAPI(
     ],
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
+
+def upload_limits() -> Dict[str, Tuple[int, str]]:
+    """Maximum body size and error detail of the upload endpoints"""
+    file_limit = (
+        settings.MAX_FILE_SIZE_MB * 1024 * 1024 + MULTIPART_OVERHEAD_BYTES,
+        f"File too large. Maximum allowed size is {settings.MAX_FILE_SIZE_MB} MB.",
+    )
+    return {
+        "/api/extract/": file_limit,
+        "/api/extract/stream": file_limit,
+        "/api/jobs": file_limit,
+        "/api/extract/batch": (
+            settings.BATCH_MAX_UPLOAD_MB * 1024 * 1024,
+            f"Upload too large. Maximum allowed batch size is {settings.BATCH_MAX_UPLOAD_MB} MB.",
+        ),
+    }
+
+
+# Reject oversized uploads while they stream in; the limits are read from
+# the settings on the first request, not when the application is imported
+app.add_middleware(UploadSizeLimitMiddleware, limits=upload_limits)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -47,13 +109,26 @@ app.add_middleware(
     allow_headers=["*"],  # Allows all headers
 )
 
+# Trace requests, outermost so rejected uploads are traced too
+app.add_middleware(TracingMiddleware, excluded_paths=("/api/health", "/metrics"))
+
 # Include API router
 app.include_router(api_router, prefix="/api")
 
+# Prometheus scrapes /metrics at the root; the endpoint answers 404 when disabled
+app.include_router(metrics.router, tags=["Metrics"])
+
 
 # Exception handler for application errors
 @app.exception_handler(BaseApplicationError)
 async def application_exception_handler(request: Request, exc: BaseApplicationError):
+    # Overload and an open circuit are temporary: tell clients when to retry
+    if isinstance(exc, (ServiceOverloadedError, CircuitOpenError)):
+        return JSONResponse(
+            status_code=503,
+            content={"detail": str(exc)},
+            headers=retry_after_headers(exc),
+        )
     return JSONResponse(
         status_code=422,
         content={"detail": str(exc)},
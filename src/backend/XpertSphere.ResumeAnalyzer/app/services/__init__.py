@@ -1,3 +1,16 @@
 from .cv_service import CVService
+from .job_queue import JobQueue, JobStore
+from .container import ServiceContainer
+from .batch_pipeline import BatchItem, BatchPipeline, build_batch_items
+from .health_monitor import HealthMonitor
 
-__all__ = ["CVService"]
\ No newline at end of file
+__all__ = [
+    "CVService",
+    "JobQueue",
+    "JobStore",
+    "ServiceContainer",
+    "BatchItem",
+    "BatchPipeline",
+    "build_batch_items",
+    "HealthMonitor",
+]
@@ -0,0 +1,230 @@
+import asyncio
+import logging
+import time
+import zipfile
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from fastapi import UploadFile
+from app.core import ValidationError
+from app.services.cv_service import CVService
+from app.utils import Buffer, file_too_large, read_upload
+
+
+@dataclass
+class BatchItem:
+    """A single CV of a batch, read lazily by the pipeline"""
+
+    file_name: str
+    read: Callable[[], Awaitable[Buffer]]
+
+
+def _zip_member_reader(archive: zipfile.ZipFile, info: zipfile.ZipInfo, max_file_size: int):
+    """Create a reader for one archive member that refuses oversized entries"""
+
+    async def read() -> bytes:
+        if info.file_size > max_file_size:
+            raise file_too_large(max_file_size)
+        return await asyncio.to_thread(archive.read, info)
+
+    return read
+
+
+def _upload_reader(upload: UploadFile, max_file_size: int):
+    """Create a reader loading an uploaded file once, up to the size limit"""
+
+    async def read() -> Buffer:
+        return await read_upload(upload, max_file_size)
+
+    return read
+
+
+def _failing_reader(error: Exception):
+    """Create a reader reporting an error found while listing the batch"""
+
+    async def read() -> bytes:
+        raise error
+
+    return read
+
+
+def build_batch_items(files: List[UploadFile], max_file_size: int) -> List[BatchItem]:
+    """
+    Turn uploaded files into batch items, expanding ZIP archives
+
+    Args:
+        files: Uploaded CV files and ZIP archives of CV files
+        max_file_size: Maximum size of a single CV in bytes
+
+    Returns:
+        One item per CV; an unreadable archive becomes a single failing item
+    """
+    items = []
+    for upload in files:
+        file_name = upload.filename or ""
+        if not file_name.lower().endswith(".zip"):
+            items.append(BatchItem(file_name=file_name, read=_upload_reader(upload, max_file_size)))
+            continue
+
+        try:
+            archive = zipfile.ZipFile(upload.file)
+        except zipfile.BadZipFile as e:
+            error = ValidationError(f"Invalid ZIP archive {file_name}: {str(e)}")
+            items.append(BatchItem(file_name=file_name, read=_failing_reader(error)))
+            continue
+
+        for info in archive.infolist():
+            member_name = info.filename.rsplit("/", 1)[-1]
+            if info.is_dir() or not member_name or member_name.startswith(".") or info.filename.startswith("__MACOSX/"):
+                continue
+            items.append(BatchItem(
+                file_name=f"{file_name}/{info.filename}",
+                read=_zip_member_reader(archive, info, max_file_size),
+            ))
+    return items
+
+
+class BatchPipeline:
+    """
+    Staged concurrent pipeline running many CVs through a CV service
+
+    Reading, extraction and analysis each have their own concurrency
+    limit, so a slow LLM does not stop files from being read and
+    extracted. Results are yielded as soon as each CV completes, and a
+    failing item is reported without failing the batch.
+
+    Items are taken by a fixed set of workers, as many as the stage
+    limits add up to, and completed results wait in a queue of the same
+    size. A CV is only read once a worker is free, so a slow LLM or a
+    slow client bounds the number of documents held in memory instead of
+    letting reads run ahead of the rest of the batch.
+    """
+
+    def __init__(
+        self,
+        cv_service: CVService,
+        read_concurrency: int,
+        extract_concurrency: int,
+        analyze_concurrency: int,
+        max_file_size: int,
+    ):
+        """
+        Initialize the pipeline
+
+        Args:
+            cv_service: Service running extraction and analysis
+            read_concurrency: Files read at the same time
+            extract_concurrency: Documents extracted at the same time
+            analyze_concurrency: LLM analyses running at the same time
+            max_file_size: Maximum size of a single CV in bytes
+        """
+        self.cv_service = cv_service
+        self.limits = {
+            "read": read_concurrency,
+            "extract": extract_concurrency,
+            "analyze": analyze_concurrency,
+        }
+        self.window = sum(self.limits.values())
+        self.max_file_size = max_file_size
+        self.logger = logging.getLogger(self.__class__.__name__)
+
+    async def run(
+        self, items: List[BatchItem], options: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a batch and yield one result per item, in completion order
+
+        Args:
+            items: CVs to process
+            options: Optional processing parameters passed to the analyzer
+
+        Yields:
+            Result dictionaries with per-stage timings in milliseconds, the
+            analysis mode and, when text was compacted, its token counts
+        """
+        stage_limits = {stage: asyncio.Semaphore(limit) for stage, limit in self.limits.items()}
+        pending = iter(enumerate(items))
+        results: asyncio.Queue = asyncio.Queue(maxsize=self.window)
+
+        async def work():
+            for index, item in pending:
+                await results.put(await self._process_item(index, item, options, stage_limits))
+
+        workers = [asyncio.create_task(work()) for _ in range(min(self.window, len(items)))]
+        try:
+            for _ in items:
+                yield await results.get()
+        finally:
+            for worker in workers:
+                worker.cancel()
+
+    async def _process_item(
+        self,
+        index: int,
+        item: BatchItem,
+        options: Optional[Dict[str, Any]],
+        stage_limits: Dict[str, asyncio.Semaphore],
+    ) -> Dict[str, Any]:
+        """
+        Run one CV through every stage, turning failures into error results
+
+        Args:
+            index: Position of the item in the batch
+            item: CV to process
+            options: Optional processing parameters
+            stage_limits: Semaphores shared by every item of the batch
+
+        Returns:
+            Result dictionary for the item
+        """
+        timings: Dict[str, float] = {}
+        token_usage: Dict[str, int] = {}
+        analysis: Dict[str, str] = {}
+        started = time.perf_counter()
+        result: Dict[str, Any] = {"index": index, "file_name": item.file_name}
+        try:
+            cv_model = await self._run_stages(item, options, stage_limits, timings, token_usage, analysis)
+            result["status"] = "ok"
+            result["extracted_data"] = cv_model.to_dict()
+        except Exception as e:
+            self.logger.warning(f"Batch item {item.file_name} failed: {str(e)}")
+            result["status"] = "error"
+            result["error"] = {"type": e.__class__.__name__, "detail": str(e)}
+
+        timings["total"] = time.perf_counter() - started
+        result["timings_ms"] = {
+            stage: round(seconds * 1000, 1) for stage, seconds in timings.items()
+        }
+        if token_usage:
+            result["tokens"] = token_usage
+        if analysis:
+            result["analysis_mode"] = analysis["mode"]
+        return result
+
+    async def _run_stages(
+        self,
+        item: BatchItem,
+        options: Optional[Dict[str, Any]],
+        stage_limits: Dict[str, asyncio.Semaphore],
+        timings: Dict[str, float],
+        token_usage: Dict[str, int],
+        analysis: Dict[str, str],
+    ):
+        """Read the item, then extract and analyze it"""
+        async with stage_limits["read"]:
+            read_started = time.perf_counter()
+            content = await item.read()
+            timings["read"] = time.perf_counter() - read_started
+
+        if len(content) > self.max_file_size:
+            raise file_too_large(self.max_file_size)
+
+        return await self.cv_service.process_content(
+            content,
+            item.file_name,
+            options,
+            stage_limits=stage_limits,
+            timings=timings,
+            token_usage=token_usage,
+            analysis=analysis,
+        )
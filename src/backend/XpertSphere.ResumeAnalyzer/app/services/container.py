@@ -0,0 +1,452 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+import asyncio
+import logging
+import time
+
+from app.services.cv_service import CVService
+from app.services.job_queue import JobQueue, JobStore
+from app.core import settings
+from app.infrastructure.cache import ResultCache
+from app.utils import ConnectionStats, RateLimiter, build_http_client, get_pool_info
+
+if TYPE_CHECKING:
+    from app.infrastructure.analyzers import CircuitBreaker, HedgedAnalyzer, OpenAIAnalyzer
+    from app.infrastructure.extractors import ExtractionPool, PDFExtractor
+
+
+class ServiceContainer:
+    """
+    Process-wide holder of the CV pipeline and its clients
+
+    Built once when the application starts and shared by every request,
+    so the Azure OpenAI connection pool is reused across CVs. The analyzers
+    and extractors, which pull in the openai SDK and the PDF libraries, are
+    imported when the pipeline is built rather than with the application.
+    """
+
+    def __init__(self):
+        """Initialize an empty container"""
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.connection_stats = ConnectionStats()
+        self.http_client = None
+        self.extraction_pool: Optional["ExtractionPool"] = None
+        self.pdf_extractor: Optional["PDFExtractor"] = None
+        self.llm_analyzer: Optional["OpenAIAnalyzer"] = None
+        self.hedged_analyzer: Optional["HedgedAnalyzer"] = None
+        self.circuit_breaker: Optional["CircuitBreaker"] = None
+        self.rate_limiters: Dict[Tuple[Optional[str], str], RateLimiter] = {}
+        self.result_cache: Optional[ResultCache] = None
+        self.text_cache: Optional[ResultCache] = None
+        self.cv_service: Optional[CVService] = None
+        self.job_queue: Optional[JobQueue] = None
+        self.warm_up_seconds: Optional[float] = None
+        self._warm_up_task: Optional["asyncio.Task[None]"] = None
+        self._secret_refresh_task: Optional["asyncio.Task[None]"] = None
+        self.secret_refreshes = 0
+        self.secret_refresh_failures = 0
+
+    @property
+    def ready(self) -> bool:
+        """Whether the pipeline is built and its job workers started"""
+        task = self._warm_up_task
+        if task is None:
+            return self.cv_service is not None
+        return task.done() and not task.cancelled() and task.exception() is None
+
+    def startup(self) -> None:
+        """
+        Build the HTTP client, extractors, analyzer and CV service
+
+        Blocking; the application runs it on a worker thread through start(),
+        which also releases a partly built pipeline when it fails.
+        """
+        if self.cv_service is not None:
+            return
+
+        from app.infrastructure.analyzers import (
+            CircuitBreaker,
+            CircuitBreakerAnalyzer,
+            HybridAnalyzer,
+            OpenAIAnalyzer,
+            RuleBasedAnalyzer,
+        )
+
+        settings.load_secrets()
+        self.http_client = build_http_client(self.connection_stats)
+        extractors = [self._build_pdf_extractor()]
+        local_analyzer = RuleBasedAnalyzer()
+        self.llm_analyzer = analyzer = OpenAIAnalyzer(
+            http_client=self.http_client,
+            rate_limiter=self._get_rate_limiter(settings.current_deployment, settings.AZURE_OPENAI_ENDPOINT),
+        )
+        if settings.AZURE_OPENAI_HEDGING_ENABLED:
+            self.hedged_analyzer = analyzer = self._build_hedged_analyzer(analyzer)
+        if settings.LOCAL_PREEXTRACTION_ENABLED:
+            analyzer = HybridAnalyzer(analyzer, local_analyzer)
+        if settings.LLM_CIRCUIT_BREAKER_ENABLED:
+            # Outermost, so an open circuit fails before any field is streamed
+            self.circuit_breaker = CircuitBreaker(
+                window=settings.LLM_CIRCUIT_WINDOW,
+                min_calls=settings.LLM_CIRCUIT_MIN_CALLS,
+                failure_rate=settings.LLM_CIRCUIT_FAILURE_RATE,
+                slow_call_seconds=settings.LLM_CIRCUIT_SLOW_CALL_SECONDS,
+                slow_call_rate=settings.LLM_CIRCUIT_SLOW_CALL_RATE,
+                open_seconds=settings.LLM_CIRCUIT_OPEN_SECONDS,
+                half_open_probes=settings.LLM_CIRCUIT_HALF_OPEN_PROBES,
+            )
+            analyzer = CircuitBreakerAnalyzer(analyzer, self.circuit_breaker)
+
+        if settings.RESULT_CACHE_ENABLED:
+            self.result_cache = ResultCache(
+                name="file",
+                max_entries=settings.RESULT_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+                db_path=settings.RESULT_CACHE_DB_PATH,
+            )
+        if settings.TEXT_CACHE_ENABLED:
+            self.text_cache = ResultCache(
+                name="text",
+                max_entries=settings.TEXT_CACHE_MAX_ENTRIES,
+                ttl_seconds=settings.RESULT_CACHE_TTL_SECONDS,
+                db_path=settings.RESULT_CACHE_DB_PATH,
+            )
+
+        self.cv_service = CVService(
+            extractors=extractors,
+            analyzer=analyzer,
+            result_cache=self.result_cache,
+            text_cache=self.text_cache,
+            compaction_enabled=settings.TEXT_COMPACTION_ENABLED,
+            compaction_max_tokens=settings.TEXT_COMPACTION_MAX_TOKENS,
+            local_analyzer=local_analyzer,
+            local_fallback=settings.LOCAL_FALLBACK_ENABLED,
+            extraction_settings=(
+                f"pages={settings.EXTRACTION_MAX_PAGES};chars={settings.EXTRACTION_MAX_CHARS};"
+                f"tiered={settings.EXTRACTION_TIERED}"
+            ),
+        )
+        if settings.JOB_QUEUE_ENABLED:
+            self.job_queue = JobQueue(
+                store=JobStore(settings.JOB_QUEUE_DB_PATH),
+                cv_service=self.cv_service,
+                workers=settings.JOB_QUEUE_WORKERS,
+                max_attempts=settings.JOB_QUEUE_MAX_ATTEMPTS,
+                retention_seconds=settings.JOB_QUEUE_RETENTION_HOURS * 3600,
+            )
+        self.logger.info("CV pipeline initialized")
+
+    def warm_up(self) -> "asyncio.Task[None]":
+        """
+        Start building the pipeline in the background
+
+        The pipeline is built on a worker thread, so the event loop keeps
+        answering health probes while the heavy modules are imported and
+        Key Vault is read. A failed warm-up is retried on the next call.
+
+        Returns:
+            Task completing once the pipeline is ready
+        """
+        task = self._warm_up_task
+        if task is None or (task.done() and (task.cancelled() or task.exception() is not None)):
+            self._warm_up_task = task = asyncio.create_task(self._warm_up())
+        return task
+
+    async def start(self) -> None:
+        """
+        Build the pipeline and start the background job workers
+
+        Waits for the warm-up in progress, if any, rather than starting another.
+
+        Raises:
+            Exception: Error raised while building the pipeline
+        """
+        await asyncio.shield(self.warm_up())
+
+    async def _warm_up(self) -> None:
+        """Build the pipeline off the event loop, then start the job workers"""
+        started = time.perf_counter()
+        try:
+            await asyncio.to_thread(self.startup)
+            if self.job_queue is not None:
+                await self.job_queue.start()
+        except Exception:
+            self.logger.exception("CV pipeline warm-up failed")
+            # Release what was built, so that a retry starts from scratch
+            await self._release()
+            raise
+        if settings.secrets_enabled and settings.KEY_VAULT_REFRESH_SECONDS > 0 and self._secret_refresh_task is None:
+            # Secrets read from a snapshot are checked against Key Vault right away
+            first_delay = 0 if settings.key_vault().source == "snapshot" else settings.KEY_VAULT_REFRESH_SECONDS
+            self._secret_refresh_task = asyncio.create_task(
+                self._refresh_secrets(first_delay, settings.KEY_VAULT_REFRESH_SECONDS)
+            )
+        self.warm_up_seconds = time.perf_counter() - started
+        self.logger.info(f"CV pipeline warmed up in {self.warm_up_seconds:.2f}s")
+
+    async def _refresh_secrets(self, first_delay: float, interval: float) -> None:
+        """
+        Reload the Key Vault secrets periodically, applying rotated values
+
+        Args:
+            first_delay: Seconds before the first reload
+            interval: Seconds between reloads
+        """
+        delay = first_delay
+        while True:
+            await asyncio.sleep(delay)
+            delay = interval
+            try:
+                changed = await asyncio.to_thread(settings.refresh_secrets)
+                self.secret_refreshes += 1
+                if changed:
+                    self.logger.info(f"Key Vault secrets changed: {', '.join(sorted(changed))}")
+                    self.reconfigure_analyzers()
+            except Exception as e:
+                self.secret_refresh_failures += 1
+                self.logger.warning(f"Key Vault secret refresh failed, keeping current secrets: {e}")
+
+    def reconfigure_analyzers(self) -> None:
+        """
+        Point the Azure OpenAI analyzers at the current settings
+
+        Requests in flight finish with the configuration they started with.
+        """
+        if self.llm_analyzer is not None:
+            self.llm_analyzer.reconfigure(
+                settings.current_deployment,
+                settings.current_model_version,
+                settings.AZURE_OPENAI_ENDPOINT,
+                settings.AZURE_OPENAI_API_KEY,
+            )
+        if self.hedged_analyzer is not None:
+            self.hedged_analyzer.secondary.reconfigure(*self._hedge_configuration())
+
+    def _hedge_configuration(self) -> Tuple[str, Optional[str], Optional[str], Optional[str]]:
+        """
+        Get the configuration of the deployment receiving hedged requests
+
+        Returns:
+            Deployment, model version, endpoint and API key, falling back
+            to the current deployment, endpoint and key
+        """
+        return (
+            settings.AZURE_OPENAI_HEDGE_DEPLOYMENT or settings.current_deployment,
+            settings.AZURE_OPENAI_HEDGE_MODEL_VERSION or settings.current_model_version,
+            settings.AZURE_OPENAI_HEDGE_ENDPOINT or settings.AZURE_OPENAI_ENDPOINT,
+            settings.AZURE_OPENAI_HEDGE_API_KEY or settings.AZURE_OPENAI_API_KEY,
+        )
+
+    def _build_hedged_analyzer(self, primary: "OpenAIAnalyzer") -> "HedgedAnalyzer":
+        """
+        Wrap the primary analyzer with hedging to the secondary deployment
+
+        Args:
+            primary: Analyzer of the current deployment
+
+        Returns:
+            Analyzer hedging slow requests to the configured deployment or endpoint
+        """
+        from app.infrastructure.analyzers import HedgedAnalyzer, OpenAIAnalyzer
+
+        deployment, model_version, endpoint, api_key = self._hedge_configuration()
+        secondary = OpenAIAnalyzer(
+            http_client=self.http_client,
+            deployment=deployment,
+            model_version=model_version,
+            endpoint=endpoint,
+            api_key=api_key,
+            rate_limiter=self._get_rate_limiter(deployment, endpoint),
+        )
+        return HedgedAnalyzer(
+            primary,
+            secondary,
+            percentile=settings.AZURE_OPENAI_HEDGE_PERCENTILE,
+            initial_delay=settings.AZURE_OPENAI_HEDGE_INITIAL_DELAY_SECONDS,
+            min_delay=settings.AZURE_OPENAI_HEDGE_MIN_DELAY_SECONDS,
+            max_delay=settings.AZURE_OPENAI_HEDGE_MAX_DELAY_SECONDS,
+        )
+
+    def _get_rate_limiter(self, deployment: str, endpoint: Optional[str]) -> RateLimiter:
+        """
+        Get the rate limiter of a deployment, shared by all its analyzers
+
+        Args:
+            deployment: Azure OpenAI deployment name
+            endpoint: Azure OpenAI endpoint of the deployment
+
+        Returns:
+            Limiter tracking the quota of the deployment
+        """
+        key = (endpoint, deployment)
+        if key not in self.rate_limiters:
+            self.rate_limiters[key] = RateLimiter(
+                requests_per_minute=settings.AZURE_OPENAI_RATE_LIMIT_RPM,
+                tokens_per_minute=settings.AZURE_OPENAI_RATE_LIMIT_TPM,
+                max_wait=settings.AZURE_OPENAI_RATE_LIMIT_MAX_WAIT_SECONDS,
+            )
+        return self.rate_limiters[key]
+
+    def _build_pdf_extractor(self):
+        """
+        Build the PDF extractor, backed by a process pool when configured
+
+        Returns:
+            PDF document extractor
+        """
+        from app.infrastructure.extractors import ExtractionPool, PDFExtractor, ProcessPoolPDFExtractor
+
+        max_pages = settings.EXTRACTION_MAX_PAGES or None
+        max_chars = settings.EXTRACTION_MAX_CHARS or None
+        if settings.EXTRACTION_POOL_WORKERS <= 0:
+            self.pdf_extractor = PDFExtractor(
+                max_pages=max_pages, max_chars=max_chars, tiered=settings.EXTRACTION_TIERED
+            )
+            return self.pdf_extractor
+
+        self.extraction_pool = ExtractionPool(
+            workers=settings.EXTRACTION_POOL_WORKERS,
+            max_queue=settings.EXTRACTION_QUEUE_SIZE,
+            job_timeout=settings.EXTRACTION_TIMEOUT_SECONDS,
+            max_tasks_per_worker=settings.EXTRACTION_MAX_TASKS_PER_WORKER,
+            max_worker_rss_mb=settings.EXTRACTION_MAX_WORKER_RSS_MB,
+            pages_per_shard=settings.EXTRACTION_PAGES_PER_SHARD,
+            tiered=settings.EXTRACTION_TIERED,
+        )
+        return ProcessPoolPDFExtractor(self.extraction_pool, max_pages=max_pages, max_chars=max_chars)
+
+    async def shutdown(self) -> None:
+        """
+        Close the clients and worker processes owned by the container
+        """
+        refresh, self._secret_refresh_task = self._secret_refresh_task, None
+        if refresh is not None:
+            refresh.cancel()
+            await asyncio.gather(refresh, return_exceptions=True)
+        task, self._warm_up_task = self._warm_up_task, None
+        if task is not None:
+            # The pipeline is built on a thread that cannot be interrupted
+            await asyncio.wait([task])
+            if not task.cancelled() and task.exception() is not None:
+                self.logger.info("Shutting down a pipeline whose warm-up failed")
+        await self._release()
+        self.logger.info("CV pipeline shut down")
+
+    async def _release(self) -> None:
+        """Close the clients, workers and caches built so far and forget them"""
+        if self.job_queue is not None:
+            await self.job_queue.stop()
+            self.job_queue.store.close()
+            self.job_queue = None
+        if self.extraction_pool is not None:
+            await self.extraction_pool.shutdown()
+            self.extraction_pool = None
+        self.pdf_extractor = None
+        self.llm_analyzer = None
+        self.hedged_analyzer = None
+        self.circuit_breaker = None
+        self.rate_limiters = {}
+        for cache in self.caches():
+            cache.close()
+        self.result_cache = None
+        self.text_cache = None
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+        self.cv_service = None
+        self.warm_up_seconds = None
+
+    def caches(self) -> List[ResultCache]:
+        """
+        Get the enabled result cache layers
+
+        Returns:
+            File-content layer first, then normalized-text layer
+        """
+        return [cache for cache in (self.result_cache, self.text_cache) if cache is not None]
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get connection pool and connection reuse statistics
+
+        Returns:
+            Pool state and reuse counters for the Azure OpenAI client
+        """
+        if self.http_client is None:
+            return {"status": "not started"}
+
+        return {
+            **get_pool_info(self.http_client),
+            **self.connection_stats.snapshot(),
+        }
+
+    def extraction_stats(self) -> Dict[str, Any]:
+        """
+        Get extraction worker pool statistics
+
+        Returns:
+            Pool counters, or the in-process mode when no pool is used,
+            with extraction tier hit rates and timings
+        """
+        if self.extraction_pool is None:
+            if self.pdf_extractor is None:
+                return {"mode": "in-process"}
+            return {"mode": "in-process", **self.pdf_extractor.stats()}
+        return {"mode": "process-pool", **self.extraction_pool.stats()}
+
+
+    def hedging_stats(self) -> Dict[str, Any]:
+        """
+        Get hedged request statistics
+
+        Returns:
+            Hedge rate, wins per deployment and current hedge delays, or
+            the disabled state
+        """
+        if self.hedged_analyzer is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.hedged_analyzer.stats()}
+
+    def rate_limit_stats(self) -> Dict[str, Any]:
+        """
+        Get Azure OpenAI rate limiter statistics
+
+        Returns:
+            Quotas, throttling counters and queue wait times per deployment
+        """
+        if not self.rate_limiters:
+            return {"status": "not started"}
+        return {
+            "deployments": [
+                {"deployment": deployment, **limiter.stats()}
+                for (_, deployment), limiter in self.rate_limiters.items()
+            ]
+        }
+
+    def secrets_stats(self) -> Dict[str, Any]:
+        """
+        Get the state of the Key Vault secrets
+
+        Returns:
+            Secret source, age and fetch counters with the refresh
+            counters, or the disabled state outside production and staging
+        """
+        if not settings.secrets_enabled:
+            return {"enabled": False}
+        return {
+            "enabled": True,
+            **settings.key_vault().stats(),
+            "refresh_interval_seconds": settings.KEY_VAULT_REFRESH_SECONDS,
+            "refreshes": self.secret_refreshes,
+            "refresh_failures": self.secret_refresh_failures,
+        }
+
+    def circuit_stats(self) -> Dict[str, Any]:
+        """
+        Get the state of the Azure OpenAI circuit breaker
+
+        Returns:
+            Breaker state and window rates, or the disabled state
+        """
+        if self.circuit_breaker is None:
+            return {"enabled": False}
+        return {"enabled": True, **self.circuit_breaker.stats()}
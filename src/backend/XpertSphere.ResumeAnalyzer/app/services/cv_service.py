@@ -1,11 +1,34 @@
-from typing import Dict, List, Any, Optional, Union
+from typing import AsyncIterator, Dict, List, Any, Optional, Tuple, Union
 
 from fastapi import UploadFile, HTTPException
+from contextlib import asynccontextmanager, nullcontext
+import asyncio
+import hashlib
 import logging
+import time
 from app.domain.interfaces import DocumentExtractor
 from app.domain.interfaces import TextAnalyzer
-from app.domain.models import CVModel
-from app.core.exceptions import ExtractionError, AnalysisError
+from app.domain.models import CVFieldEvent, CVModel, RESULT_EVENT, iter_cv_events
+from app.core import settings
+from app.core.exceptions import ExtractionError, AnalysisError, CircuitOpenError, FileTooLargeError, ServiceOverloadedError, ValidationError, retry_after_headers
+from app.infrastructure.cache import ResultCache
+from app.utils import (
+    Buffer,
+    compact_text,
+    normalize_text,
+    observe_stage,
+    read_upload,
+    record_error,
+    record_extraction,
+    track_requests,
+    tracer,
+)
+
+# Analysis modes: the configured analyzer, the local analyzer on request,
+# or the local analyzer standing in for a failed LLM call
+FULL_MODE = "full"
+FAST_MODE = "fast"
+FALLBACK_MODE = "fallback"
 
 
 class CVService:
@@ -13,27 +36,66 @@ class CVService:
     Service for CV extraction and analysis
     """
 
-    def __init__(self, extractors: List[DocumentExtractor], analyzer: TextAnalyzer):
+    def __init__(
+        self,
+        extractors: List[DocumentExtractor],
+        analyzer: TextAnalyzer,
+        result_cache: Optional[ResultCache] = None,
+        text_cache: Optional[ResultCache] = None,
+        compaction_enabled: bool = False,
+        compaction_max_tokens: Optional[int] = None,
+        local_analyzer: Optional[TextAnalyzer] = None,
+        local_fallback: bool = False,
+        extraction_settings: str = "",
+    ):
         """
         Initialize the CV service
 
         Args:
             extractors: List of document extractors
             analyzer: Text analyzer for CV parsing
+            result_cache: Optional cache of results keyed by file content
+            text_cache: Optional cache of results keyed by normalized text
+            compaction_enabled: Compact extracted text before analysis
+            compaction_max_tokens: Optional token budget of compacted text
+            local_analyzer: Optional analyzer without network calls, used
+                for fast mode requests
+            local_fallback: Answer with the local analyzer when the main
+                analyzer fails; such degraded results are not cached
+            extraction_settings: Description of the settings shaping the
+                extracted text, such as page and character limits
         """
         self.extractors = extractors
         self.analyzer = analyzer
+        self.result_cache = result_cache
+        self.text_cache = text_cache
+        self.compaction_enabled = compaction_enabled
+        self.compaction_max_tokens = compaction_max_tokens
+        self.local_analyzer = local_analyzer
+        self.local_fallback = local_fallback
+        # Part of every cache key, so that results built from differently
+        # extracted or compacted text are not served after a settings change
+        fingerprint = f"{extraction_settings}|{compaction_enabled}|{compaction_max_tokens}"
+        self.cache_version = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()[:12]
         self.logger = logging.getLogger(self.__class__.__name__)
 
     async def process_cv(
-        self, file: UploadFile, options: Optional[Dict[str, Any]] = None
+        self,
+        file: UploadFile,
+        options: Optional[Dict[str, Any]] = None,
+        token_usage: Optional[Dict[str, int]] = None,
+        analysis: Optional[Dict[str, str]] = None,
     ) -> CVModel:
         """
         Process a CV file to extract structured information
 
         Args:
             file: Uploaded CV file
-            options: Optional processing parameters
+            options: Optional processing parameters (``mode``: "full" or
+                "fast")
+            token_usage: Optional dictionary receiving the text compaction
+                token counts
+            analysis: Optional dictionary receiving the analysis ``mode``
 
         Returns:
             Structured CV model
@@ -48,39 +110,389 @@ class CVService:
                 status_code=400, detail=f"Unsupported file format: {file.filename}"
             )
 
-        try:
-            # Read file content
-            content = await file.read()
+        mode = (options or {}).get("mode", FULL_MODE)
+        with tracer.start_span("CVService.process_cv", {"mode": mode}) as span:
+            try:
+                # Read file content once into a single buffer
+                async with self._stage("read", None, None):
+                    try:
+                        content = await read_upload(file, settings.MAX_FILE_SIZE_MB * 1024 * 1024)
+                    except FileTooLargeError as e:
+                        record_error(e)
+                        raise
 
-            # Extract text from document
-            text = await extractor.extract_text(content, file.filename)
+                span.set_attribute("size_bytes", len(content))
+                cv_model = await self.process_content(
+                    content, file.filename, options, token_usage=token_usage, analysis=analysis
+                )
+                if analysis:
+                    span.set_attribute("analysis_mode", analysis["mode"])
+                return cv_model
 
-            # Analyze text to extract structured information
-            cv_model = await self.analyzer.analyze(text, options)
+            except (FileTooLargeError, ValidationError) as e:
+                raise HTTPException(status_code=400, detail=str(e))
 
-            return cv_model
+            except (ServiceOverloadedError, CircuitOpenError) as e:
+                self.logger.warning(f"Service overloaded: {str(e)}")
+                raise HTTPException(status_code=503, detail=str(e), headers=retry_after_headers(e))
 
-        except ExtractionError as e:
-            self.logger.error(f"Extraction error: {str(e)}")
-            raise HTTPException(
-                status_code=422,
-                detail=f"Failed to extract text from document: {str(e)}",
-            )
+            except ExtractionError as e:
+                self.logger.error(f"Extraction error: {str(e)}")
+                raise HTTPException(
+                    status_code=422,
+                    detail=f"Failed to extract text from document: {str(e)}",
+                )
+
+            except AnalysisError as e:
+                self.logger.error(f"Analysis error: {str(e)}")
+                raise HTTPException(
+                    status_code=422, detail=f"Failed to analyze CV: {str(e)}"
+                )
+
+            except Exception as e:
+                self.logger.error(f"Unexpected error: {str(e)}")
+                raise HTTPException(
+                    status_code=500, detail=f"An unexpected error occurred: {str(e)}"
+                )
+            finally:
+                # Reset file pointer for potential reuse
+                await file.seek(0)
+
+    @track_requests
+    async def process_content(
+        self,
+        content: Buffer,
+        file_name: str,
+        options: Optional[Dict[str, Any]] = None,
+        stage_limits: Optional[Dict[str, asyncio.Semaphore]] = None,
+        timings: Optional[Dict[str, float]] = None,
+        token_usage: Optional[Dict[str, int]] = None,
+        analysis: Optional[Dict[str, str]] = None,
+    ) -> CVModel:
+        """
+        Run cache lookups, text extraction and analysis on file content
+
+        Args:
+            content: Binary content of the CV file, as bytes or a memoryview
+            file_name: Name of the file
+            options: Optional processing parameters (``mode``: "full" or
+                "fast")
+            stage_limits: Optional semaphores bounding the "extract" and
+                "analyze" stages, shared by concurrent callers
+            timings: Optional dictionary receiving per-stage durations in seconds
+            token_usage: Optional dictionary receiving the text compaction
+                token counts
+            analysis: Optional dictionary receiving the analysis ``mode``:
+                "full", "fast", or "fallback" when the local analyzer stood
+                in for a failed analysis
+
+        Returns:
+            Structured CV model
+
+        Raises:
+            ValidationError: If the file format is not supported
+            ExtractionError: If text extraction fails
+            AnalysisError: If analysis fails
+            CircuitOpenError: If the analyzer circuit is open and there is
+                no local fallback
+            ServiceOverloadedError: If a bounded work queue is full
+        """
+        extractor = self._get_extractor(file_name)
+        if not extractor:
+            raise ValidationError(f"Unsupported file format: {file_name}")
+        analyzer, mode = self._select_analyzer(options)
+        if analysis is not None:
+            analysis["mode"] = mode
+
+        # Return a previous analysis of the same file if available
+        digest, cache_key, cached = await self._lookup_file(content, analyzer)
+        if cached is not None:
+            return cached
+
+        # Extract text from document
+        async with self._stage("extract", stage_limits, timings):
+            text = await extractor.extract_text(content, file_name)
+        record_extraction(text)
+
+        # Shrink the text sent to the LLM
+        async with self._stage("compact", None, timings):
+            text = self._compact(text, file_name, token_usage)
+
+        # Reuse the analysis of a different file with the same text
+        text_key, cached = await self._lookup_text(text, cache_key, digest, analyzer)
+        if cached is not None:
+            return cached
+
+        # Analyze text to extract structured information
+        async with self._stage("analyze", stage_limits, timings):
+            try:
+                cv_model = await analyzer.analyze(text, options)
+            except AnalysisError as e:
+                if not self._can_fall_back(analyzer):
+                    raise
+                self.logger.warning(f"Analysis of {file_name} failed, using local fallback: {str(e)}")
+                if analysis is not None:
+                    analysis["mode"] = FALLBACK_MODE
+                return await self.local_analyzer.analyze(text, options)
+
+        await self._store(cv_model, cache_key, text_key, digest)
+        return cv_model
+
+    @track_requests
+    async def stream_content(
+        self,
+        content: Buffer,
+        file_name: str,
+        options: Optional[Dict[str, Any]] = None,
+    ) -> AsyncIterator[CVFieldEvent]:
+        """
+        Run the same pipeline as process_content, yielding CV fields as they complete
 
+        Cached results are replayed field by field; otherwise fields come
+        from the analyzer's streamed analysis. If the analysis fails before
+        its first field, the local fallback's fields are streamed instead.
+
+        Args:
+            content: Binary content of the CV file, as bytes or a memoryview
+            file_name: Name of the file
+            options: Optional processing parameters (``mode``: "full" or
+                "fast")
+
+        Yields:
+            One event per field or list entry, then a ``result`` event
+            carrying the complete CV model
+
+        Raises:
+            ValidationError: If the file format is not supported
+            ExtractionError: If text extraction fails
+            AnalysisError: If analysis fails
+            CircuitOpenError: If the analyzer circuit is open and there is
+                no local fallback
+            ServiceOverloadedError: If a bounded work queue is full
+        """
+        extractor = self._get_extractor(file_name)
+        if not extractor:
+            raise ValidationError(f"Unsupported file format: {file_name}")
+        analyzer, _ = self._select_analyzer(options)
+
+        digest, cache_key, cached = await self._lookup_file(content, analyzer)
+        if cached is None:
+            async with self._stage("extract", None, None):
+                text = await extractor.extract_text(content, file_name)
+            record_extraction(text)
+            async with self._stage("compact", None, None):
+                text = self._compact(text, file_name)
+            text_key, cached = await self._lookup_text(text, cache_key, digest, analyzer)
+
+        if cached is not None:
+            for event in iter_cv_events(cached):
+                yield event
+            return
+
+        started = False
+        try:
+            async for event in analyzer.analyze_stream(text, options):
+                started = True
+                if event.name == RESULT_EVENT:
+                    await self._store(event.value, cache_key, text_key, digest)
+                yield event
         except AnalysisError as e:
-            self.logger.error(f"Analysis error: {str(e)}")
-            raise HTTPException(
-                status_code=422, detail=f"Failed to analyze CV: {str(e)}"
+            if started or not self._can_fall_back(analyzer):
+                raise
+            self.logger.warning(f"Analysis of {file_name} failed, using local fallback: {str(e)}")
+            async for event in self.local_analyzer.analyze_stream(text, options):
+                yield event
+
+    def _select_analyzer(self, options: Optional[Dict[str, Any]]) -> Tuple[TextAnalyzer, str]:
+        """
+        Choose the analyzer for the requested mode
+
+        Args:
+            options: Processing parameters, optionally containing ``mode``
+
+        Returns:
+            Analyzer and analysis mode
+
+        Raises:
+            ValidationError: If fast mode is requested without a local analyzer
+        """
+        if (options or {}).get("mode", FULL_MODE) != FAST_MODE:
+            return self.analyzer, FULL_MODE
+        if self.local_analyzer is None:
+            raise ValidationError("Fast mode is not available")
+        return self.local_analyzer, FAST_MODE
+
+    def _can_fall_back(self, analyzer: TextAnalyzer) -> bool:
+        """Whether a failure of the given analyzer can be answered locally"""
+        return self.local_fallback and self.local_analyzer is not None and analyzer is not self.local_analyzer
+
+    def _compact(
+        self, text: str, file_name: str, token_usage: Optional[Dict[str, int]] = None
+    ) -> str:
+        """
+        Compact extracted text when enabled and report the tokens saved
+
+        Args:
+            text: Extracted text
+            file_name: Name of the file, for logging
+            token_usage: Optional dictionary receiving the token counts
+
+        Returns:
+            Text to analyze
+        """
+        if not self.compaction_enabled:
+            return text
+
+        result = compact_text(text, self.compaction_max_tokens)
+        self.logger.info(
+            f"Compacted {file_name}: {result.original_tokens} -> {result.compacted_tokens} "
+            f"tokens ({result.tokens_saved} saved{', truncated' if result.truncated else ''})"
+        )
+        if token_usage is not None:
+            token_usage.update(
+                original=result.original_tokens,
+                compacted=result.compacted_tokens,
+                saved=result.tokens_saved,
             )
+        return result.text
+
+    async def _lookup_file(
+        self, content: Buffer, analyzer: TextAnalyzer
+    ) -> Tuple[str, str, Optional[CVModel]]:
+        """
+        Look up a previous analysis of the same file content
+
+        Args:
+            content: Binary content of the CV file
+            analyzer: Analyzer whose results are looked up
+
+        Returns:
+            SHA-256 of the content, file cache key and cached model or None
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        cache_key = f"{analyzer.version}:{self.cache_version}:{digest}"
+        return digest, cache_key, await self._get_cached(self.result_cache, cache_key)
+
+    async def _lookup_text(
+        self, text: str, cache_key: str, digest: str, analyzer: TextAnalyzer
+    ) -> Tuple[Optional[str], Optional[CVModel]]:
+        """
+        Look up a previous analysis of a file with the same normalized text
+
+        A hit is also stored under the file key of the current content.
+
+        Args:
+            text: Extracted text
+            cache_key: File cache key of the current content
+            digest: SHA-256 of the current content
+            analyzer: Analyzer whose results are looked up
+
+        Returns:
+            Text cache key (None when the layer is disabled) and cached model or None
+        """
+        if self.text_cache is None:
+            return None, None
+        text_digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        text_key = f"{analyzer.version}:{self.cache_version}:{text_digest}"
+        cached = await self._get_cached(self.text_cache, text_key)
+        if cached is not None:
+            await self._set_cached(self.result_cache, cache_key, cached, digest)
+        return text_key, cached
+
+    async def _store(
+        self, cv_model: CVModel, cache_key: str, text_key: Optional[str], digest: str
+    ) -> None:
+        """
+        Store a new analysis in every enabled cache layer
+
+        Args:
+            cv_model: Result to store
+            cache_key: File cache key
+            text_key: Text cache key, if the layer is enabled
+            digest: SHA-256 of the source file, used for invalidation
+        """
+        await self._set_cached(self.result_cache, cache_key, cv_model, digest)
+        if text_key is not None:
+            await self._set_cached(self.text_cache, text_key, cv_model, digest)
+
+    @asynccontextmanager
+    async def _stage(
+        self,
+        name: str,
+        stage_limits: Optional[Dict[str, asyncio.Semaphore]],
+        timings: Optional[Dict[str, float]],
+    ) -> AsyncIterator[None]:
+        """
+        Run a pipeline stage under its concurrency limit and time it
+
+        Durations are recorded in the stage histogram as well.
 
+        Args:
+            name: Stage name
+            stage_limits: Optional semaphores keyed by stage name
+            timings: Optional dictionary receiving the stage duration
+        """
+        limit = (stage_limits or {}).get(name)
+        async with limit if limit is not None else nullcontext():
+            started = time.perf_counter()
+            try:
+                yield
+            finally:
+                elapsed = time.perf_counter() - started
+                observe_stage(name, elapsed)
+                if timings is not None:
+                    timings[name] = elapsed
+
+    async def _get_cached(self, cache: Optional[ResultCache], key: str) -> Optional[CVModel]:
+        """
+        Look up a cached result, ignoring cache failures
+
+        Args:
+            cache: Cache layer to query, if enabled
+            key: Cache key
+
+        Returns:
+            Cached CV model or None
+        """
+        if cache is None:
+            return None
+        try:
+            data = await cache.get(key)
         except Exception as e:
-            self.logger.error(f"Unexpected error: {str(e)}")
-            raise HTTPException(
-                status_code=500, detail=f"An unexpected error occurred: {str(e)}"
-            )
-        finally:
-            # Reset file pointer for potential reuse
-            await file.seek(0)
+            self.logger.warning(f"{cache.name} cache lookup failed: {str(e)}")
+            return None
+        return CVModel.from_dict(data) if data is not None else None
+
+    async def _set_cached(
+        self, cache: Optional[ResultCache], key: str, cv_model: CVModel, digest: str
+    ) -> None:
+        """
+        Store a result, ignoring cache failures
+
+        Args:
+            cache: Cache layer to update, if enabled
+            key: Cache key
+            cv_model: Result to store
+            digest: SHA-256 of the source file, used for invalidation
+        """
+        if cache is None:
+            return
+        try:
+            await cache.set(key, cv_model.to_dict(), tag=digest)
+        except Exception as e:
+            self.logger.warning(f"{cache.name} cache store failed: {str(e)}")
+
+    def can_process(self, file_name: str) -> bool:
+        """
+        Check whether an extractor supports the given file
+
+        Args:
+            file_name: Name of the file
+
+        Returns:
+            True if the file format is supported
+        """
+        return self._get_extractor(file_name) is not None
 
     def _get_extractor(self, file_name: str) -> Optional[DocumentExtractor]:
         """
@@ -0,0 +1,225 @@
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
+import asyncio
+import logging
+import statistics
+import time
+
+from app.core import settings
+from app.utils import in_flight_requests
+
+if TYPE_CHECKING:
+    import httpx
+
+
+def collect_system_stats() -> Dict[str, Any]:
+    """
+    Sample CPU, memory and disk usage without blocking
+
+    CPU usage is measured since the previous call, so the first call of a
+    process reports 0.
+
+    Returns:
+        Host CPU, memory and disk usage, and the CPU, memory and thread
+        count of this process
+    """
+    import psutil
+
+    memory = psutil.virtual_memory()
+    disk = psutil.disk_usage("/")
+    process = psutil.Process()
+    with process.oneshot():
+        process_stats = {
+            "cpu_percent": process.cpu_percent(interval=None),
+            "rss_mb": round(process.memory_info().rss / (1024**2), 1),
+            "threads": process.num_threads(),
+        }
+    return {
+        "cpu_percent": psutil.cpu_percent(interval=None),
+        "memory": {
+            "total_gb": round(memory.total / (1024**3), 2),
+            "available_gb": round(memory.available / (1024**3), 2),
+            "percent_used": memory.percent,
+        },
+        "disk": {
+            "total_gb": round(disk.total / (1024**3), 2),
+            "free_gb": round(disk.free / (1024**3), 2),
+            "percent_used": round((disk.used / disk.total) * 100, 1),
+        },
+        "process": process_stats,
+    }
+
+
+class HealthMonitor:
+    """
+    Background sampler of the state reported by the detailed health check
+
+    System usage and in-flight CV analyses are sampled on a fixed
+    interval, and event loop lag is measured continuously as the delay of
+    the sampler's own short sleeps. Azure OpenAI reachability is probed
+    with a request that costs no tokens, at most once per probe TTL. Health
+    checks read the latest snapshot, so their cost does not depend on how
+    often they are polled.
+    """
+
+    def __init__(
+        self,
+        interval: float = 5.0,
+        probe_ttl: float = 60.0,
+        probe_timeout: float = 5.0,
+        lag_interval: float = 0.1,
+    ):
+        """
+        Initialize the monitor
+
+        Args:
+            interval: Seconds between system samples
+            probe_ttl: Seconds a probe result is served before the next
+                probe, or 0 to disable the Azure OpenAI probe
+            probe_timeout: Timeout of a probe request in seconds
+            lag_interval: Seconds between event loop lag measurements
+        """
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self.interval = interval
+        self.probe_ttl = probe_ttl
+        self.probe_timeout = probe_timeout
+        self.lag_interval = lag_interval
+        self.started_at: Optional[float] = None
+        self.samples = 0
+        self.probes = 0
+        self._snapshot: Dict[str, Any] = {}
+        self._lags: List[float] = []
+        self._probe_result: Dict[str, Any] = {"status": "pending" if probe_ttl > 0 else "disabled"}
+        self._probe_checked_at: Optional[float] = None
+        self._probe_task: Optional["asyncio.Task[None]"] = None
+        self._task: Optional["asyncio.Task[None]"] = None
+        self._http_client: Optional["httpx.AsyncClient"] = None
+
+    async def start(self) -> None:
+        """
+        Take a first sample and start sampling in the background
+        """
+        if self._task is not None:
+            return
+        self.started_at = time.time()
+        await self._sample()
+        self._refresh_probe()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """
+        Stop sampling and close the probe's HTTP client
+        """
+        tasks = [task for task in (self._task, self._probe_task) if task is not None]
+        self._task = self._probe_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        if self._http_client is not None:
+            await self._http_client.aclose()
+            self._http_client = None
+
+    async def _run(self) -> None:
+        """Measure event loop lag continuously and sample on the interval"""
+        loop = asyncio.get_running_loop()
+        next_sample = loop.time() + self.interval
+        while True:
+            expected = loop.time() + self.lag_interval
+            await asyncio.sleep(self.lag_interval)
+            self._lags.append(max(0.0, loop.time() - expected))
+            if loop.time() >= next_sample:
+                next_sample = loop.time() + self.interval
+                try:
+                    await self._sample()
+                except Exception as e:
+                    self.logger.warning(f"System sampling failed: {e}")
+                self._refresh_probe()
+
+    async def _sample(self) -> None:
+        """Replace the snapshot with a fresh sample"""
+        system = await asyncio.to_thread(collect_system_stats)
+        lags, self._lags = self._lags, []
+        self._snapshot = {
+            "sampled_at": time.time(),
+            "system": system,
+            "event_loop_lag_ms": {
+                "last": round(lags[-1] * 1000, 2) if lags else 0.0,
+                "mean": round(statistics.fmean(lags) * 1000, 2) if lags else 0.0,
+                "max": round(max(lags) * 1000, 2) if lags else 0.0,
+            },
+            "requests_in_flight": in_flight_requests(),
+        }
+        self.samples += 1
+
+    def _refresh_probe(self) -> None:
+        """Start an Azure OpenAI probe when the last result has expired"""
+        if self.probe_ttl <= 0 or (self._probe_task is not None and not self._probe_task.done()):
+            return
+        if self._probe_checked_at is not None and time.monotonic() - self._probe_checked_at < self.probe_ttl:
+            return
+        self._probe_task = asyncio.create_task(self._probe())
+
+    async def _probe(self) -> None:
+        """Probe Azure OpenAI and cache the result"""
+        self._probe_result = await self.probe_azure_openai()
+        self._probe_checked_at = time.monotonic()
+        self.probes += 1
+
+    async def probe_azure_openai(self) -> Dict[str, Any]:
+        """
+        Check that Azure OpenAI answers with the configured credentials
+
+        Lists the models of the resource, which costs no tokens. Any answer
+        but an authentication failure or a server error is a success.
+
+        Returns:
+            Probe status, HTTP status and latency, with the endpoint and deployment
+        """
+        if not settings.AZURE_OPENAI_ENDPOINT or not settings.AZURE_OPENAI_API_KEY:
+            return {"status": "error", "message": "Azure OpenAI credentials not configured"}
+
+        import httpx
+
+        if self._http_client is None:
+            self._http_client = httpx.AsyncClient(timeout=self.probe_timeout)
+        result: Dict[str, Any] = {
+            "endpoint": settings.AZURE_OPENAI_ENDPOINT[:30] + "...",
+            "deployment": settings.current_deployment,
+            "api_version": settings.AZURE_OPENAI_API_VERSION,
+        }
+        started = time.perf_counter()
+        try:
+            response = await self._http_client.get(
+                f"{settings.AZURE_OPENAI_ENDPOINT.rstrip('/')}/openai/models",
+                params={"api-version": settings.AZURE_OPENAI_API_VERSION},
+                headers={"api-key": settings.AZURE_OPENAI_API_KEY},
+            )
+        except httpx.HTTPError as e:
+            return {**result, "status": "error", "message": f"{e.__class__.__name__}: {e}",
+                    "latency_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+        result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        result["http_status"] = response.status_code
+        if response.status_code in (401, 403) or response.status_code >= 500:
+            return {**result, "status": "error", "message": f"Azure OpenAI answered HTTP {response.status_code}"}
+        return {**result, "status": "ok"}
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get the latest sample and probe result
+
+        Returns:
+            System usage, event loop lag and in-flight analyses with their
+            age, the uptime, and the cached Azure OpenAI probe result
+        """
+        if self.started_at is None:
+            return {"status": "not started"}
+        now = time.time()
+        probe = dict(self._probe_result)
+        if self._probe_checked_at is not None:
+            probe["age_seconds"] = round(time.monotonic() - self._probe_checked_at, 1)
+        return {
+            **self._snapshot,
+            "age_seconds": round(now - self._snapshot.get("sampled_at", now), 2),
+            "uptime_seconds": round(now - self.started_at, 1),
+            "azure_openai": probe,
+        }
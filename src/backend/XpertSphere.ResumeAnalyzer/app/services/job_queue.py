@@ -0,0 +1,374 @@
+import asyncio
+import json
+import logging
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional
+from uuid import uuid4
+
+from app.core import CircuitOpenError, ServiceOverloadedError
+from app.services.cv_service import CVService
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+# Errors after which a job is retried rather than failed
+TRANSIENT_ERRORS = (ServiceOverloadedError, CircuitOpenError)
+
+# Longest pause of a worker after failed store accesses or transient errors
+MAX_BACKOFF_SECONDS = 30.0
+
+# Longest interval between two deletions of expired jobs
+SWEEP_INTERVAL_SECONDS = 3600.0
+
+
+class JobStore:
+    """
+    SQLite-backed persistent store of extraction jobs
+
+    Uploaded content is kept until the job finishes, so queued jobs
+    survive a restart.
+    """
+
+    def __init__(self, path: str):
+        """
+        Initialize the store and create its table if needed
+
+        Args:
+            path: SQLite database file path
+        """
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.row_factory = sqlite3.Row
+        with self._lock, self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS jobs ("
+                "id TEXT PRIMARY KEY, status TEXT NOT NULL, file_name TEXT NOT NULL, "
+                "content BLOB, options TEXT NOT NULL, result TEXT, error TEXT, "
+                "attempts INTEGER NOT NULL DEFAULT 0, created_at REAL NOT NULL, "
+                "started_at REAL, finished_at REAL)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created_at)"
+            )
+
+    def enqueue(self, file_name: str, content: bytes, options: Dict[str, Any]) -> str:
+        """Add a queued job and return its ID"""
+        job_id = str(uuid4())
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT INTO jobs (id, status, file_name, content, options, created_at) "
+                "VALUES (?, 'queued', ?, ?, ?, ?)",
+                (job_id, file_name, content, json.dumps(options), time.time()),
+            )
+        return job_id
+
+    def claim_next(self) -> Optional[Dict[str, Any]]:
+        """
+        Mark the oldest queued job as running and return it with its content
+
+        The job is only claimed if it is still queued when it is updated,
+        so processes sharing the database never claim the same job.
+
+        Returns:
+            The claimed job with its attempt count, or None if none is queued
+        """
+        while True:
+            with self._lock, self._connection:
+                row = self._connection.execute(
+                    "SELECT id, file_name, content, options, attempts FROM jobs "
+                    "WHERE status = 'queued' ORDER BY created_at LIMIT 1"
+                ).fetchone()
+                if row is None:
+                    return None
+                claimed = self._connection.execute(
+                    "UPDATE jobs SET status = 'running', started_at = ?, attempts = attempts + 1 "
+                    "WHERE id = ? AND status = 'queued'",
+                    (time.time(), row["id"]),
+                ).rowcount
+            if claimed:
+                return {
+                    "id": row["id"],
+                    "file_name": row["file_name"],
+                    "content": row["content"],
+                    "options": json.loads(row["options"]),
+                    "attempts": row["attempts"] + 1,
+                }
+
+    def finish(self, job_id: str, result: Optional[Dict[str, Any]] = None, error: Optional[Dict[str, Any]] = None) -> None:
+        """Record the outcome of a job and drop its uploaded content"""
+        status = "failed" if error is not None else "completed"
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, content = NULL, finished_at = ? WHERE id = ?",
+                (
+                    status,
+                    json.dumps(result) if result is not None else None,
+                    json.dumps(error) if error is not None else None,
+                    time.time(),
+                    job_id,
+                ),
+            )
+
+    def requeue(self, job_id: str, error: Dict[str, Any]) -> None:
+        """Put a running job back in the queue, keeping its content and last error"""
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL, error = ? WHERE id = ?",
+                (json.dumps(error), job_id),
+            )
+
+    def purge(self, older_than: float) -> int:
+        """
+        Delete finished jobs and their results
+
+        Args:
+            older_than: Seconds since a job finished for it to be deleted
+
+        Returns:
+            Number of jobs deleted
+        """
+        with self._lock, self._connection:
+            return self._connection.execute(
+                f"DELETE FROM jobs WHERE status IN ({', '.join('?' for _ in TERMINAL_STATUSES)}) "
+                "AND finished_at < ?",
+                (*TERMINAL_STATUSES, time.time() - older_than),
+            ).rowcount
+
+    def recover(self, max_attempts: int) -> int:
+        """
+        Requeue jobs left running by a previous process
+
+        Jobs that already used every attempt are marked as failed.
+
+        Returns:
+            Number of jobs requeued
+        """
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE jobs SET status = 'failed', content = NULL, finished_at = ?, error = ? "
+                "WHERE status = 'running' AND attempts >= ?",
+                (
+                    time.time(),
+                    json.dumps({"type": "WorkerLost", "detail": "Job interrupted too many times"}),
+                    max_attempts,
+                ),
+            )
+            return self._connection.execute(
+                "UPDATE jobs SET status = 'queued', started_at = NULL WHERE status = 'running'"
+            ).rowcount
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the public state of a job"""
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT id, status, file_name, result, error, attempts, created_at, started_at, finished_at "
+                "FROM jobs WHERE id = ?",
+                (job_id,),
+            ).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["result"] = json.loads(job["result"]) if job["result"] else None
+        job["error"] = json.loads(job["error"]) if job["error"] else None
+        return job
+
+    def counts(self) -> Dict[str, Any]:
+        """Get the number of jobs per status and the age of the oldest queued job"""
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT status, COUNT(*), MIN(created_at) FROM jobs GROUP BY status"
+            ).fetchall()
+        counts = {status: 0 for status in ("queued", "running", *TERMINAL_STATUSES)}
+        oldest_queued = None
+        for status, count, oldest in rows:
+            counts[status] = count
+            if status == "queued":
+                oldest_queued = oldest
+        counts["oldest_queued_age_seconds"] = (
+            round(time.time() - oldest_queued, 1) if oldest_queued else 0.0
+        )
+        return counts
+
+    def close(self) -> None:
+        """Close the database connection"""
+        with self._lock:
+            self._connection.close()
+
+
+class JobQueue:
+    """
+    Background workers draining the persistent job store through a CV service
+
+    A job failing because the service is overloaded or the analyzer
+    circuit is open is requeued until it has used every attempt, and the
+    worker backs off before claiming again. Finished jobs are deleted
+    once they are older than the retention period.
+    """
+
+    def __init__(
+        self,
+        store: JobStore,
+        cv_service: CVService,
+        workers: int,
+        max_attempts: int,
+        retention_seconds: Optional[float] = None,
+        retry_delay: float = 1.0,
+    ):
+        """
+        Initialize the queue; workers start with start()
+
+        Args:
+            store: Persistent job store
+            cv_service: Service processing each job
+            workers: Number of concurrent worker tasks
+            max_attempts: Times a job interrupted by a restart or a
+                transient error is tried
+            retention_seconds: Time finished jobs are kept, or None to keep
+                them forever
+            retry_delay: First backoff in seconds after a transient error or
+                a failed store access, doubled on each consecutive failure
+        """
+        self.store = store
+        self.cv_service = cv_service
+        self.workers = workers
+        self.max_attempts = max_attempts
+        self.retention_seconds = retention_seconds
+        self.retry_delay = retry_delay
+        self.logger = logging.getLogger(self.__class__.__name__)
+        self._wakeup = asyncio.Event()
+        self._tasks: List[asyncio.Task] = []
+        self._sweeper: Optional[asyncio.Task] = None
+        self._listeners: Dict[str, List[asyncio.Queue]] = {}
+
+    async def start(self) -> None:
+        """Requeue interrupted jobs and start the worker tasks"""
+        requeued = await asyncio.to_thread(self.store.recover, self.max_attempts)
+        if requeued:
+            self.logger.info(f"Requeued {requeued} interrupted job(s)")
+        self._wakeup.set()
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"job-worker-{index}")
+            for index in range(self.workers)
+        ]
+        if self.retention_seconds is not None:
+            self._sweeper = asyncio.create_task(self._sweep(), name="job-sweeper")
+
+    async def stop(self) -> None:
+        """Stop the worker tasks; running jobs are requeued on next start"""
+        tasks = [*self._tasks, *([self._sweeper] if self._sweeper else [])]
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks = []
+        self._sweeper = None
+
+    async def submit(self, file_name: str, content: bytes, options: Dict[str, Any]) -> str:
+        """
+        Persist a job and wake a worker
+
+        Args:
+            file_name: Name of the CV file
+            content: Binary content of the CV file
+            options: Processing parameters
+
+        Returns:
+            Job ID
+        """
+        job_id = await asyncio.to_thread(self.store.enqueue, file_name, content, options)
+        self._wakeup.set()
+        return job_id
+
+    async def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Get the public state of a job"""
+        return await asyncio.to_thread(self.store.get, job_id)
+
+    def subscribe(self, job_id: str) -> asyncio.Queue:
+        """Get a queue receiving the job's status changes"""
+        listener: asyncio.Queue = asyncio.Queue()
+        self._listeners.setdefault(job_id, []).append(listener)
+        return listener
+
+    def unsubscribe(self, job_id: str, listener: asyncio.Queue) -> None:
+        """Stop receiving a job's status changes"""
+        listeners = self._listeners.get(job_id, [])
+        if listener in listeners:
+            listeners.remove(listener)
+        if not listeners:
+            self._listeners.pop(job_id, None)
+
+    async def stats(self) -> Dict[str, Any]:
+        """Get queue depth and worker counters"""
+        counts = await asyncio.to_thread(self.store.counts)
+        return {"workers": self.workers, "active_workers": sum(not task.done() for task in self._tasks), **counts}
+
+    async def _notify(self, job_id: str) -> None:
+        """Send the current job state to its subscribers"""
+        if job_id not in self._listeners:
+            return
+        job = await self.get(job_id)
+        for listener in self._listeners.get(job_id, []):
+            listener.put_nowait(job)
+
+    async def _sweep(self) -> None:
+        """Delete expired finished jobs until cancelled"""
+        while True:
+            try:
+                purged = await asyncio.to_thread(self.store.purge, self.retention_seconds)
+                if purged:
+                    self.logger.info(f"Purged {purged} finished job(s)")
+            except Exception as e:
+                self.logger.error(f"Failed to purge finished jobs: {str(e)}")
+            await asyncio.sleep(max(min(self.retention_seconds, SWEEP_INTERVAL_SECONDS), 1.0))
+
+    def _backoff(self, failures: int) -> float:
+        """Pause before the next claim after consecutive failures"""
+        return min(self.retry_delay * 2 ** (failures - 1), MAX_BACKOFF_SECONDS)
+
+    async def _worker(self) -> None:
+        """Claim and process jobs until cancelled"""
+        failures = 0
+        while True:
+            if failures:
+                await asyncio.sleep(self._backoff(failures))
+            # Clear before claiming so a submission racing the claim still wakes us
+            self._wakeup.clear()
+            try:
+                job = await asyncio.to_thread(self.store.claim_next)
+            except Exception as e:
+                failures += 1
+                self.logger.error(f"Failed to claim a job: {str(e)}")
+                continue
+            if job is None:
+                failures = 0
+                await self._wakeup.wait()
+                continue
+
+            await self._notify(job["id"])
+            result = error = None
+            transient = False
+            try:
+                cv_model = await self.cv_service.process_content(
+                    job["content"], job["file_name"], job["options"]
+                )
+                result = cv_model.to_dict()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.logger.warning(f"Job {job['id']} failed: {str(e)}")
+                error = {"type": e.__class__.__name__, "detail": str(e)}
+                transient = isinstance(e, TRANSIENT_ERRORS) and job["attempts"] < self.max_attempts
+
+            try:
+                if transient:
+                    await asyncio.to_thread(self.store.requeue, job["id"], error)
+                else:
+                    await asyncio.to_thread(self.store.finish, job["id"], result, error)
+            except Exception as e:
+                # The job stays running and is requeued on next start
+                failures += 1
+                self.logger.error(f"Failed to record the outcome of job {job['id']}: {str(e)}")
+                continue
+            failures = failures + 1 if transient else 0
+            await self._notify(job["id"])
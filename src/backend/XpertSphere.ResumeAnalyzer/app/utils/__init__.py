@@ -1,4 +1,64 @@
-from .openapi_utils import get_llm
+from .openapi_utils import get_async_llm, get_llm
 from .pdf_utils import extract_text_from_pdf
+from .text_utils import normalize_text
+from .json_stream import IncrementalJSONParser, JSONStreamEvent
+from .text_compaction import CompactionResult, compact_text, estimate_tokens
+from .http_client import ConnectionStats, build_http_client, get_pool_info, get_request_timeout
+from .rate_limiter import RateLimiter, TokenBucket, backoff_delay, parse_retry_after
+from .metrics import in_flight_requests, observe_stage, record_error, record_extraction, record_token_usage, render_metrics, time_stage, track_requests
+from .tracing import (
+    ConsoleSpanExporter,
+    FileSpanExporter,
+    Span,
+    SpanContext,
+    SpanExporter,
+    build_exporter,
+    configure_tracing,
+    current_span,
+    parse_traceparent,
+    tracer,
+)
+from .upload_utils import Buffer, BufferReader, as_binary_stream, file_too_large, read_upload
 
-__all__ = ["get_llm", "extract_text_from_pdf"]
\ No newline at end of file
+__all__ = [
+    "get_llm",
+    "get_async_llm",
+    "extract_text_from_pdf",
+    "normalize_text",
+    "CompactionResult",
+    "compact_text",
+    "estimate_tokens",
+    "IncrementalJSONParser",
+    "JSONStreamEvent",
+    "ConnectionStats",
+    "build_http_client",
+    "get_pool_info",
+    "get_request_timeout",
+    "RateLimiter",
+    "TokenBucket",
+    "backoff_delay",
+    "parse_retry_after",
+    "in_flight_requests",
+    "observe_stage",
+    "record_error",
+    "record_extraction",
+    "record_token_usage",
+    "render_metrics",
+    "time_stage",
+    "track_requests",
+    "ConsoleSpanExporter",
+    "FileSpanExporter",
+    "Span",
+    "SpanContext",
+    "SpanExporter",
+    "build_exporter",
+    "configure_tracing",
+    "current_span",
+    "parse_traceparent",
+    "tracer",
+    "Buffer",
+    "BufferReader",
+    "as_binary_stream",
+    "file_too_large",
+    "read_upload",
+]
@@ -0,0 +1,256 @@
+import re
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+# Email addresses, with the obfuscated " at " / "(at)" spellings some CVs use.
+# Each part is a single greedy class, so matching stays linear on hostile
+# input; the domain's top-level label is checked afterwards
+_EMAIL = re.compile(
+    r"(?<![A-Za-z0-9._%+-])[A-Za-z0-9._%+-]+\s?(?:@|\(at\)|\[at\])\s?[A-Za-z0-9.-]+"
+)
+_EMAIL_DOMAIN = re.compile(r"[A-Za-z0-9-]+(?:\.[A-Za-z0-9-]+)*\.[A-Za-z]{2,}")
+_EMAIL_AT = re.compile(r"\s?(?:\(at\)|\[at\])\s?|\s?@\s?")
+
+# Phone numbers: international (+33 6 12 34 56 78, +1 (555) 123-4567),
+# national trunk prefixes (06.12.34.56.78, 07700 900123, (030) 1234567).
+# Every repetition ends on a single digit, so a run of digits matches in
+# one way only and the digit count is checked afterwards
+_PHONE = re.compile(r"(?<![\w+])\+?\(?\d(?:[ .\-/()]{0,3}\d)*\)?(?!\w)")
+_PHONE_LABEL = re.compile(
+    r"\b(?:tel|t[ée]l[ée]phone|phone|mobile|mob|cell|portable|gsm|telefon|handy|"
+    r"tel[ée]fono|m[óo]vil|cellulare|telefono)\b",
+    re.IGNORECASE,
+)
+_MIN_PHONE_DIGITS = 8
+_MAX_PHONE_DIGITS = 15
+
+# Dates: "Jan 2020", "janvier 2020", "März 2020", "01/2020", "2020-01", "2020"
+_MONTHS = (
+    r"jan(?:uary|vier|uar|\.)?|feb(?:ruary|ruar|\.)?|f[ée]v(?:rier|\.)?|mar(?:ch|s|\.)?|m[äa]rz|"
+    r"apr(?:il|\.)?|avr(?:il|\.)?|may|mai|jun(?:e|i)?|juin|jul(?:y|i)?|juil(?:let|\.)?|"
+    r"aug(?:ust|\.)?|ao[ûu]t|sep(?:t(?:ember|embre)?)?\.?|oct(?:ober|obre|\.)?|okt(?:ober)?|"
+    r"nov(?:ember|embre|\.)?|d[ée]c(?:ember|embre|\.)?|dez(?:ember)?|"
+    r"enero|febrero|marzo|abril|mayo|junio|julio|agosto|septiembre|octubre|noviembre|diciembre"
+)
+_DATE = rf"(?:(?:{_MONTHS})\s+\d{{4}}|\d{{1,2}}[/.]\d{{4}}|\d{{4}}[/.-]\d{{1,2}}(?!\d)|(?:19|20)\d{{2}})"
+_ONGOING = (
+    r"present|current|now|today|ongoing|pr[ée]sent|aujourd'hui|actuel(?:lement)?|en cours|"
+    r"heute|aktuell|laufend|actualidad|presente|hoy|oggi|attuale"
+)
+_DATE_RANGE = re.compile(
+    rf"(?<!\w)(?:(?:since|depuis|seit|desde|dal)\s+{_DATE}|"
+    rf"(?:from\s+|de\s+|du\s+|von\s+)?{_DATE}\s*(?:-|–|—|to|until|[àa]|au|bis|hasta|al)\s*"
+    rf"(?:{_DATE}|{_ONGOING}))(?!\w)",
+    re.IGNORECASE,
+)
+_YEAR = re.compile(r"(?<!\d)(?:19|20)\d{2}(?!\d)")
+
+# Language names in English, French, German and Spanish
+_LANGUAGES = re.compile(
+    r"\b(?:english|anglais|englisch|ingl[ée]s|french|fran[çc]ais|franz[öo]sisch|franc[ée]s|"
+    r"german|allemand|deutsch|alem[áa]n|spanish|espagnol|spanisch|espa[ñn]ol|castellano|"
+    r"italian|italien|italienisch|italiano|portuguese|portugais|portugiesisch|portugu[ée]s|"
+    r"dutch|n[ée]erlandais|niederl[äa]ndisch|holand[ée]s|arabic|arabe|arabisch|[áa]rabe|"
+    r"chinese|mandarin|chinois|chinesisch|chino|japanese|japonais|japanisch|japon[ée]s|"
+    r"russian|russe|russisch|ruso|polish|polonais|polnisch|polaco|turkish|turc|t[üu]rkisch|turco|"
+    r"hindi|korean|cor[ée]en|koreanisch|coreano)\b",
+    re.IGNORECASE,
+)
+# Proficiency: CEFR levels and their usual wording in the same languages
+_LANGUAGE_LEVEL = re.compile(
+    r"\b(?:[abc][12](?:\+)?|native(?: speaker)?|mother tongue|bilingual|fluent|proficient|"
+    r"professional(?: working)?(?: proficiency)?|advanced|upper[- ]intermediate|intermediate|"
+    r"conversational|basic|beginner|elementary|notions?|langue maternelle|maternelle|natif|native|"
+    r"bilingue|courant|interm[ée]diaire|d[ée]butant|avanc[ée]|professionnel|scolaire|"
+    r"muttersprache|flie[ßs]end|verhandlungssicher|grundkenntnisse|gute kenntnisse|"
+    r"nativo|lengua materna|fluido|intermedio|b[áa]sico|avanzado|madrelingua|toeic\s*\d{3}|"
+    r"toefl\s*\d{2,3}|ielts\s*\d(?:\.\d)?)\b",
+    re.IGNORECASE,
+)
+_LANGUAGES_HEADING = re.compile(r"\b(?:languages?|langues?|sprachen|idiomas|lingue)\b", re.IGNORECASE)
+
+# A line holding nothing but two to four capitalized words
+_NAME_LINE = re.compile(r"[A-ZÀ-Þ][A-Za-zÀ-ÖØ-öø-ÿ'\-]+(?:\s+[A-ZÀ-Þ][A-Za-zÀ-ÖØ-öø-ÿ'\-]+){1,3}")
+_NOT_A_NAME = re.compile(
+    r"\b(?:curriculum|vitae|resume|r[ée]sum[ée]|cv|lebenslauf|profile|profil|contact|"
+    r"developer|engineer|manager|consultant|d[ée]veloppeur|ing[ée]nieur)\b",
+    re.IGNORECASE,
+)
+_NAME_SEARCH_LINES = 5
+
+# Words marking a dated line as education rather than work experience
+_EDUCATION = re.compile(
+    r"\b(?:university|universit[ée]|universit[äa]t|universidad|universit[àa]|college|coll[èe]ge|"
+    r"school|[ée]cole|schule|hochschule|escuela|institute|institut|instituto|academy|campus|"
+    r"bachelor|master|mba|phd|ph\.d|doctora\w*|licence|bts|dut|bac|baccalaur[ée]at|diploma|"
+    r"dipl[ôo]me|degree|abitur|grado|m[áa]ster|formation|training|studies|[ée]tudes)\b",
+    re.IGNORECASE,
+)
+
+
+@dataclass
+class DatedEntry:
+    """A line of the CV carrying a date range"""
+
+    title: str
+    period: str
+    education: bool = False
+
+
+@dataclass
+class LocalFields:
+    """Fields extracted with regular expressions, without a model call"""
+
+    first_name: str = ""
+    last_name: str = ""
+    email: Optional[str] = None
+    phone_number: Optional[str] = None
+    languages: List[str] = field(default_factory=list)
+    entries: List[DatedEntry] = field(default_factory=list)
+
+
+def _find_email(text: str) -> Optional[str]:
+    """First email address of the text, de-obfuscated and lowercased"""
+    for match in _EMAIL.finditer(text):
+        email = _EMAIL_AT.sub("@", match.group(0))
+        local, domain = email.rsplit("@", 1)
+        # Trailing punctuation and labels without a TLD are not part of the domain
+        domain_match = _EMAIL_DOMAIN.match(domain)
+        if domain_match is not None:
+            return f"{local}@{domain_match.group(0)}".lower()
+    return None
+
+
+def phone_digits(value: str) -> str:
+    """Digits of a phone number, with a 00 international prefix read as +"""
+    digits = re.sub(r"\D", "", value)
+    return digits[2:] if digits.startswith("00") else digits
+
+
+def _find_phone(text: str) -> Optional[str]:
+    """
+    First plausible phone number of the text
+
+    A candidate must have 8 to 15 digits and either an international or
+    trunk prefix, or a phone label on the same line, so that year ranges
+    and postal codes are not mistaken for numbers.
+    """
+    for line in text.split("\n"):
+        labelled = _PHONE_LABEL.search(line) is not None
+        for match in _PHONE.finditer(line):
+            candidate = match.group(0).strip(" .-/")
+            if _DATE_RANGE.fullmatch(candidate) or _YEAR.fullmatch(candidate):
+                continue
+            digits = phone_digits(candidate)
+            if not _MIN_PHONE_DIGITS <= len(digits) <= _MAX_PHONE_DIGITS:
+                continue
+            if labelled or candidate.startswith(("+", "0", "(")):
+                return candidate
+    return None
+
+
+def _find_languages(text: str) -> List[str]:
+    """
+    Languages with their level, formatted as "Language (level)"
+
+    A language counts when a proficiency level follows it on the same line,
+    or when the line belongs to a languages section.
+    """
+    languages: List[str] = []
+    seen = set()
+    in_section = False
+    for line in text.split("\n"):
+        stripped = line.strip(" -:*#")
+        if _LANGUAGES_HEADING.fullmatch(stripped):
+            in_section = True
+            continue
+        if in_section and stripped.isupper() and not _LANGUAGES.search(stripped):
+            in_section = False
+
+        matches = list(_LANGUAGES.finditer(line))
+        for position, match in enumerate(matches):
+            end = matches[position + 1].start() if position + 1 < len(matches) else len(line)
+            level = _LANGUAGE_LEVEL.search(line, match.end(), end)
+            if level is None and not (in_section or _LANGUAGES_HEADING.search(line)):
+                continue
+            name = match.group(0).capitalize()
+            if name.lower() in seen:
+                continue
+            seen.add(name.lower())
+            languages.append(f"{name} ({level.group(0)})" if level else name)
+    return languages
+
+
+def _find_name(text: str) -> Tuple[str, str]:
+    """First and last name from the first lines holding only capitalized words"""
+    lines = [line.strip() for line in text.split("\n") if line.strip()]
+    for line in lines[:_NAME_SEARCH_LINES]:
+        if _NAME_LINE.fullmatch(line) and not _NOT_A_NAME.search(line):
+            first, _, last = line.partition(" ")
+            return first, last
+    return "", ""
+
+
+def _find_entries(text: str) -> List[DatedEntry]:
+    """
+    Dated lines, titled by the rest of the line or the previous line
+
+    Args:
+        text: CV text
+
+    Returns:
+        One entry per date range, in document order
+    """
+    entries = []
+    previous = ""
+    for line in text.split("\n"):
+        line = line.strip()
+        match = _DATE_RANGE.search(line)
+        if match is not None:
+            title = (line[:match.start()] + " " + line[match.end():]).strip(" -|,:()\t")
+            title = title or previous
+            entries.append(DatedEntry(
+                title=title,
+                period=match.group(0),
+                education=_EDUCATION.search(title) is not None,
+            ))
+        if line:
+            previous = line
+    return entries
+
+
+def find_years(text: str) -> List[str]:
+    """
+    Four-digit years between 1900 and 2099 appearing in a text
+
+    Args:
+        text: Text to search
+
+    Returns:
+        Years in order of appearance
+    """
+    return _YEAR.findall(text)
+
+
+def extract_local_fields(text: str) -> LocalFields:
+    """
+    Extract contact details, languages and dated entries with regular expressions
+
+    Patterns cover English, French, German and Spanish CVs. Extraction is
+    deterministic and takes milliseconds.
+
+    Args:
+        text: CV text
+
+    Returns:
+        Fields found in the text; missing fields are left empty
+    """
+    first_name, last_name = _find_name(text)
+    return LocalFields(
+        first_name=first_name,
+        last_name=last_name,
+        email=_find_email(text),
+        phone_number=_find_phone(text),
+        languages=_find_languages(text),
+        entries=_find_entries(text),
+    )
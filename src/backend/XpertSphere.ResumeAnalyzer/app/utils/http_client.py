@@ -0,0 +1,122 @@
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Dict
+
+from app.core import settings
+
+if TYPE_CHECKING:
+    import httpx
+
+
+class ConnectionStats:
+    """
+    Connection pool usage counters for an HTTP client
+
+    A connection is considered reused when a response is served over a
+    network stream that has already carried a previous response.
+    """
+
+    def __init__(self):
+        """Initialize empty counters"""
+        self._lock = threading.Lock()
+        self._seen_streams = weakref.WeakSet()
+        self.requests = 0
+        self.new_connections = 0
+        self.reused_connections = 0
+
+    def record(self, response: "httpx.Response") -> None:
+        """
+        Record a response and whether its connection was reused
+
+        Args:
+            response: Response received by the HTTP client
+        """
+        stream = response.extensions.get("network_stream")
+        with self._lock:
+            self.requests += 1
+            if stream is None:
+                return
+            if stream in self._seen_streams:
+                self.reused_connections += 1
+            else:
+                self._seen_streams.add(stream)
+                self.new_connections += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Get a copy of the counters
+
+        Returns:
+            Counters and connection reuse ratio
+        """
+        with self._lock:
+            tracked = self.new_connections + self.reused_connections
+            return {
+                "requests": self.requests,
+                "new_connections": self.new_connections,
+                "reused_connections": self.reused_connections,
+                "reuse_ratio": round(self.reused_connections / tracked, 3) if tracked else 0.0,
+            }
+
+
+def get_request_timeout() -> "httpx.Timeout":
+    """
+    Get the default timeout applied to Azure OpenAI calls
+
+    Returns:
+        Timeout with a short connect phase and the configured overall budget
+    """
+    import httpx
+
+    return httpx.Timeout(
+        settings.AZURE_OPENAI_TIMEOUT_SECONDS,
+        connect=settings.AZURE_OPENAI_CONNECT_TIMEOUT_SECONDS,
+    )
+
+
+def build_http_client(stats: ConnectionStats) -> "httpx.AsyncClient":
+    """
+    Create the pooled async HTTP client shared by the Azure OpenAI SDK
+
+    Args:
+        stats: Counters updated on every response
+
+    Returns:
+        Configured HTTP client with keep-alive enabled
+    """
+    import httpx
+
+    limits = httpx.Limits(
+        max_connections=settings.AZURE_OPENAI_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.AZURE_OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.AZURE_OPENAI_KEEPALIVE_EXPIRY_SECONDS,
+    )
+
+    async def record_response(response: "httpx.Response") -> None:
+        stats.record(response)
+
+    return httpx.AsyncClient(
+        limits=limits,
+        timeout=get_request_timeout(),
+        event_hooks={"response": [record_response]},
+    )
+
+
+def get_pool_info(client: "httpx.AsyncClient") -> Dict[str, Any]:
+    """
+    Describe the current state of the client's connection pool
+
+    Args:
+        client: HTTP client to inspect
+
+    Returns:
+        Open and idle connection counts, when available
+    """
+    pool = getattr(getattr(client, "_transport", None), "_pool", None)
+    connections = list(getattr(pool, "connections", []) or [])
+    return {
+        "open_connections": len(connections),
+        "idle_connections": sum(1 for connection in connections if connection.is_idle()),
+        "max_connections": settings.AZURE_OPENAI_MAX_CONNECTIONS,
+        "max_keepalive_connections": settings.AZURE_OPENAI_MAX_KEEPALIVE_CONNECTIONS,
+    }
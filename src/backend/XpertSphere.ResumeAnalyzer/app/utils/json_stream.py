@@ -0,0 +1,183 @@
+import json
+from bisect import bisect_right
+from dataclasses import dataclass
+from typing import Any, List, Optional
+
+
+@dataclass
+class JSONStreamEvent:
+    """A value completed while parsing a streamed JSON object"""
+
+    key: str
+    value: Any
+    index: Optional[int] = None
+
+    @property
+    def is_item(self) -> bool:
+        """Whether the value is an element of a top-level array"""
+        return self.index is not None
+
+
+class IncrementalJSONParser:
+    """
+    Incremental parser for a streamed top-level JSON object
+
+    Text is fed in arbitrary chunks, such as LLM tokens. An event is
+    returned as soon as a top-level value is complete, and for top-level
+    arrays also as soon as each of their elements is complete. Only the
+    new characters of each chunk are scanned, and each completed value
+    is decoded exactly once.
+
+    Chunks are kept in a list rather than concatenated, and positions are
+    offsets in the whole document, so feeding costs time proportional to
+    the chunk and only completed values are joined back into strings.
+    """
+
+    def __init__(self):
+        """Initialize an empty parser"""
+        self._chunks: List[str] = []
+        self._chunk_starts: List[int] = []
+        self._length = 0
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        self._awaiting_key = False
+        self._key: Optional[str] = None
+        self._key_start: Optional[int] = None
+        self._value_start: Optional[int] = None
+        self._value_is_array = False
+        self._item_start: Optional[int] = None
+        self._item_index = 0
+        self.done = False
+
+    @property
+    def text(self) -> str:
+        """All text fed so far"""
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+            self._chunk_starts = [0]
+        return self._chunks[0] if self._chunks else ""
+
+    def feed(self, chunk: str) -> List[JSONStreamEvent]:
+        """
+        Parse the next chunk of the document
+
+        Args:
+            chunk: Next piece of JSON text
+
+        Returns:
+            Values completed by this chunk, in document order
+
+        Raises:
+            ValueError: If a completed value is not valid JSON
+        """
+        events: List[JSONStreamEvent] = []
+        if not chunk:
+            return events
+        start = self._length
+        self._chunks.append(chunk)
+        self._chunk_starts.append(start)
+        self._length += len(chunk)
+        for offset, char in enumerate(chunk):
+            if self.done:
+                break
+            self._scan(start + offset, char, events)
+        return events
+
+    def _slice(self, start: int, end: int) -> str:
+        """Get the document text between two offsets"""
+        first = bisect_right(self._chunk_starts, start) - 1
+        last = bisect_right(self._chunk_starts, end - 1)
+        base = self._chunk_starts[first]
+        if last - first == 1:
+            return self._chunks[first][start - base:end - base]
+        return "".join(self._chunks[first:last])[start - base:end - base]
+
+    def _scan(self, i: int, char: str, events: List[JSONStreamEvent]) -> None:
+        """Advance the state machine by one character"""
+        if self._in_string:
+            if self._escaped:
+                self._escaped = False
+            elif char == "\\":
+                self._escaped = True
+            elif char == '"':
+                self._in_string = False
+                self._end_string(i, events)
+            return
+
+        if char.isspace():
+            return
+
+        if char == '"':
+            self._in_string = True
+            if self._depth == 1 and self._awaiting_key:
+                self._key_start = i
+            else:
+                self._start_value(i)
+        elif char in "{[":
+            if self._depth == 0:
+                if char != "{":
+                    raise ValueError("Expected a JSON object")
+                self._awaiting_key = True
+            else:
+                self._start_value(i, is_array=self._depth == 1 and char == "[")
+            self._depth += 1
+        elif char in "}]":
+            if self._depth == 1:
+                self._end_value(i, events)
+                self.done = True
+            elif self._depth == 2 and self._value_is_array:
+                self._end_item(i, events)
+            self._depth -= 1
+            if self._depth == 1:
+                self._end_value(i + 1, events)
+            elif self._depth == 2 and self._value_is_array:
+                self._end_item(i + 1, events)
+        elif char == ",":
+            if self._depth == 1:
+                self._end_value(i, events)
+                self._awaiting_key = True
+            elif self._depth == 2 and self._value_is_array:
+                self._end_item(i, events)
+        elif char == ":":
+            return
+        else:
+            # First character of a number, true, false or null
+            self._start_value(i)
+
+    def _start_value(self, i: int, is_array: bool = False) -> None:
+        """Record where a top-level value or array element starts"""
+        if self._depth == 1 and self._value_start is None:
+            self._value_start = i
+            self._value_is_array = is_array
+            self._item_index = 0
+        elif self._depth == 2 and self._value_is_array and self._item_start is None:
+            self._item_start = i
+
+    def _end_string(self, i: int, events: List[JSONStreamEvent]) -> None:
+        """Handle the closing quote of a string"""
+        if self._depth == 1 and self._awaiting_key:
+            self._key = json.loads(self._slice(self._key_start, i + 1))
+            self._awaiting_key = False
+        elif self._depth == 1:
+            self._end_value(i + 1, events)
+        elif self._depth == 2 and self._value_is_array:
+            self._end_item(i + 1, events)
+
+    def _end_value(self, end: int, events: List[JSONStreamEvent]) -> None:
+        """Emit the pending top-level value, if any"""
+        if self._value_start is None:
+            return
+        events.append(JSONStreamEvent(self._key, json.loads(self._slice(self._value_start, end))))
+        self._value_start = None
+        self._value_is_array = False
+
+    def _end_item(self, end: int, events: List[JSONStreamEvent]) -> None:
+        """Emit the pending element of a top-level array, if any"""
+        if self._item_start is None:
+            return
+        events.append(JSONStreamEvent(
+            self._key, json.loads(self._slice(self._item_start, end)), index=self._item_index
+        ))
+        self._item_start = None
+        self._item_index += 1
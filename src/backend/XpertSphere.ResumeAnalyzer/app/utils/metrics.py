@@ -0,0 +1,173 @@
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Tuple
+
+from prometheus_client import CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Gauge, Histogram, generate_latest
+
+# Label values are fixed up front so the number of series stays bounded.
+# "llm" covers the whole completion call, including "queue", the wait in
+# the rate limiter, and retries
+STAGES = ("read", "extract", "compact", "analyze", "prompt", "queue", "llm", "parse")
+ERROR_TYPES = (
+    "ValidationError",
+    "FileTooLargeError",
+    "ExtractionError",
+    "AnalysisError",
+    "CircuitOpenError",
+    "ServiceOverloadedError",
+    "other",
+)
+
+# Pipeline stages range from sub-millisecond parsing to LLM calls of a minute
+STAGE_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0)
+
+REGISTRY = CollectorRegistry(auto_describe=True)
+
+STAGE_SECONDS = Histogram(
+    "cv_stage_duration_seconds",
+    "Duration of each CV pipeline stage",
+    ["stage"],
+    buckets=STAGE_BUCKETS,
+    registry=REGISTRY,
+)
+PAGES = Counter("cv_pages_extracted", "Pages extracted from CV documents", registry=REGISTRY)
+CHARACTERS = Counter("cv_characters_extracted", "Characters extracted from CV documents", registry=REGISTRY)
+TOKENS = Counter("llm_tokens", "Tokens reported by Azure OpenAI responses", ["kind"], registry=REGISTRY)
+ERRORS = Counter("cv_errors", "Failed CV analyses by error type", ["type"], registry=REGISTRY)
+IN_FLIGHT = Gauge("cv_requests_in_flight", "CV analyses in progress", registry=REGISTRY)
+
+# Children are bound once; recording is then a lock and a bucket lookup
+_STAGE_CHILDREN = {stage: STAGE_SECONDS.labels(stage) for stage in STAGES}
+_ERROR_CHILDREN = {error_type: ERRORS.labels(error_type) for error_type in ERROR_TYPES}
+_PROMPT_TOKENS = TOKENS.labels("prompt")
+_COMPLETION_TOKENS = TOKENS.labels("completion")
+
+
+def observe_stage(stage: str, seconds: float) -> None:
+    """
+    Record the duration of a pipeline stage
+
+    Args:
+        stage: One of STAGES; other names are ignored
+        seconds: Duration of the stage
+    """
+    child = _STAGE_CHILDREN.get(stage)
+    if child is not None:
+        child.observe(seconds)
+
+
+@contextmanager
+def time_stage(stage: str) -> Iterator[None]:
+    """
+    Time the enclosed block as a pipeline stage
+
+    Args:
+        stage: One of STAGES
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe_stage(stage, time.perf_counter() - started)
+
+
+def record_extraction(text: str) -> None:
+    """
+    Count the pages and characters of an extracted text
+
+    Args:
+        text: Extracted text, with pages separated by form feeds
+    """
+    if not text:
+        return
+    PAGES.inc(text.count("\f") + 1)
+    CHARACTERS.inc(len(text))
+
+
+def record_token_usage(usage: Any) -> None:
+    """
+    Count the tokens reported in the ``usage`` of a completion
+
+    Args:
+        usage: Usage object of a completion, may be None
+    """
+    prompt_tokens = getattr(usage, "prompt_tokens", None)
+    completion_tokens = getattr(usage, "completion_tokens", None)
+    if isinstance(prompt_tokens, int):
+        _PROMPT_TOKENS.inc(prompt_tokens)
+    if isinstance(completion_tokens, int):
+        _COMPLETION_TOKENS.inc(completion_tokens)
+
+
+def record_error(error: BaseException) -> None:
+    """
+    Count a failed analysis by error type
+
+    Args:
+        error: Raised exception, counted as "other" when not an application error
+    """
+    child = _ERROR_CHILDREN.get(error.__class__.__name__, _ERROR_CHILDREN["other"])
+    child.inc()
+
+
+def track_requests(func: Callable) -> Callable:
+    """
+    Count the calls of a coroutine or async generator function in flight and their errors
+
+    Args:
+        func: Coroutine function or async generator function to track
+
+    Returns:
+        Wrapped function
+    """
+    if inspect.isasyncgenfunction(func):
+        @functools.wraps(func)
+        async def track_stream(*args, **kwargs):
+            IN_FLIGHT.inc()
+            stream = func(*args, **kwargs)
+            try:
+                async for item in stream:
+                    yield item
+            except Exception as e:
+                record_error(e)
+                raise
+            finally:
+                IN_FLIGHT.dec()
+                await stream.aclose()
+
+        return track_stream
+
+    @functools.wraps(func)
+    async def track(*args, **kwargs):
+        IN_FLIGHT.inc()
+        try:
+            return await func(*args, **kwargs)
+        except Exception as e:
+            record_error(e)
+            raise
+        finally:
+            IN_FLIGHT.dec()
+
+    return track
+
+
+def in_flight_requests() -> int:
+    """
+    Get the number of CV analyses in progress
+
+    Returns:
+        Current value of the in-flight gauge
+    """
+    return int(REGISTRY.get_sample_value("cv_requests_in_flight") or 0)
+
+
+def render_metrics() -> Tuple[bytes, str]:
+    """
+    Render every metric in the Prometheus text format
+
+    Returns:
+        Exposition body and its content type
+    """
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
@@ -1,14 +1,56 @@
-from openai import AzureOpenAI
+from typing import TYPE_CHECKING, Optional
+
 from app.core import settings
 
+if TYPE_CHECKING:
+    import httpx
+    from openai import AsyncAzureOpenAI, AzureOpenAI
+
+# The openai SDK is imported on first use: it is the heaviest import of
+# the service and is not needed to answer health probes at startup
+
 
-def get_llm() -> AzureOpenAI:
+def get_llm(http_client: Optional["httpx.Client"] = None) -> "AzureOpenAI":
     """
     Initialize and return Azure OpenAI client
+
+    Args:
+        http_client: Optional pooled HTTP client to share connections with
     """
+    from openai import AzureOpenAI
+
     return AzureOpenAI(
         azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
         api_key=settings.AZURE_OPENAI_API_KEY,
         api_version=settings.AZURE_OPENAI_API_VERSION,
         azure_deployment=settings.current_deployment,
-    )
\ No newline at end of file
+        http_client=http_client,
+    )
+
+
+def get_async_llm(
+    http_client: Optional["httpx.AsyncClient"] = None,
+    deployment: Optional[str] = None,
+    endpoint: Optional[str] = None,
+    api_key: Optional[str] = None,
+) -> "AsyncAzureOpenAI":
+    """
+    Initialize and return async Azure OpenAI client
+
+    Args:
+        http_client: Optional pooled HTTP client to share connections with
+        deployment: Optional deployment, defaults to the current deployment
+        endpoint: Optional endpoint, defaults to the configured endpoint
+        api_key: Optional API key of the endpoint, defaults to the configured key
+    """
+    from openai import AsyncAzureOpenAI
+
+    return AsyncAzureOpenAI(
+        azure_endpoint=endpoint or settings.AZURE_OPENAI_ENDPOINT,
+        api_key=api_key or settings.AZURE_OPENAI_API_KEY,
+        api_version=settings.AZURE_OPENAI_API_VERSION,
+        azure_deployment=deployment or settings.current_deployment,
+        http_client=http_client,
+        # Retries are handled by the analyzer, which shares the rate limit state
+        max_retries=0,
+    )
@@ -1,14 +1,47 @@
-import pdfplumber
+import io
+from typing import TYPE_CHECKING, BinaryIO, Iterator, Optional, Tuple, Union
 
+if TYPE_CHECKING:
+    import pdfplumber
 
-def extract_text_from_pdf(pdf_path):
+
+def iter_page_text(
+    pdf: "pdfplumber.PDF", start: int = 0, stop: Optional[int] = None
+) -> Iterator[Tuple[int, str]]:
+    """
+    Yield the index and text of each page of an open PDF
+
+    Each page's cached layout objects are released as soon as its text
+    has been read, so memory stays bounded by a single page.
+
+    Args:
+        pdf: Open pdfplumber document
+        start: Index of the first page to read
+        stop: Index after the last page to read, or None for the last page
+
+    Yields:
+        Index of each page and its text, empty when the page has none
+    """
+    for index, page in enumerate(pdf.pages[start:stop], start):
+        try:
+            text = page.extract_text()
+        finally:
+            page.close()
+        yield index, text or ""
+
+
+def extract_text_from_pdf(pdf_source: Union[str, bytes, BinaryIO]):
     """
     Extract text from PDF using pdfplumber
+
+    Args:
+        pdf_source: Path to the PDF, its binary content, or an open binary stream
     """
-    with pdfplumber.open(pdf_path) as pdf:
-        # Extract text from all pages
-        full_text = ""
-        for page in pdf.pages:
-            full_text += page.extract_text() or ""
+    import pdfplumber
+
+    if isinstance(pdf_source, (bytes, bytearray, memoryview)):
+        pdf_source = io.BytesIO(pdf_source)
 
-    return full_text
+    with pdfplumber.open(pdf_source) as pdf:
+        # Extract text from all pages
+        return "".join(text for _, text in iter_page_text(pdf))
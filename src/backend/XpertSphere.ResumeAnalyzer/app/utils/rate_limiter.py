@@ -0,0 +1,302 @@
+import asyncio
+import random
+import re
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Mapping, Optional
+
+from app.core import ServiceOverloadedError
+
+# Azure OpenAI evaluates quotas over short windows: allow a burst of ten
+# seconds' worth of the per-minute quota rather than the whole minute
+BURST_SECONDS = 10.0
+
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously at a per-minute rate
+
+    Reservations may take the level below zero: the deficit is the time
+    the caller has to wait, so callers are served in arrival order.
+    """
+
+    def __init__(self, per_minute: float):
+        """
+        Initialize a full bucket
+
+        Args:
+            per_minute: Quota per minute
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = max(1.0, self.rate * BURST_SECONDS)
+        self.level = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        """Add the quota accrued since the last update"""
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float, now: float) -> float:
+        """
+        Take an amount from the bucket
+
+        Args:
+            amount: Quota needed, capped at the bucket capacity
+            now: Current monotonic time
+
+        Returns:
+            Seconds until the reserved amount is available
+        """
+        self._refill(now)
+        self.level -= min(amount, self.capacity)
+        return max(0.0, -self.level / self.rate)
+
+    def refund(self, amount: float, now: float) -> None:
+        """Give back an amount that was reserved but not used"""
+        self._refill(now)
+        self.level = min(self.capacity, self.level + min(amount, self.capacity))
+
+    def limit(self, remaining: float, now: float) -> None:
+        """Lower the level to the quota the server reports as remaining"""
+        self._refill(now)
+        self.level = min(self.level, remaining)
+
+
+class RateLimiter:
+    """
+    Client-side limiter for the Azure OpenAI quota of a deployment
+
+    Tracks requests and estimated tokens per minute with token buckets and
+    queues calls until both are available, instead of sending them into a
+    429. A ``Retry-After`` received from the server pauses every queued
+    call. Shared by all analyzer calls to a deployment in the process.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: int = 0,
+        tokens_per_minute: int = 0,
+        max_wait: float = 30.0,
+    ):
+        """
+        Initialize the limiter
+
+        Args:
+            requests_per_minute: Requests quota per minute (0 disables the limit)
+            tokens_per_minute: Tokens quota per minute (0 disables the limit)
+            max_wait: Longest queue wait in seconds before a call is rejected
+        """
+        self.requests = TokenBucket(requests_per_minute) if requests_per_minute > 0 else None
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute > 0 else None
+        self.max_wait = max_wait
+        self._paused_until = 0.0
+        self.calls = 0
+        self.queued = 0
+        self.rejected = 0
+        self.throttled = 0
+        self.retries = 0
+        self.wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+
+    async def acquire(self, tokens: int) -> float:
+        """
+        Wait until a call with the given token estimate fits in the quota
+
+        Args:
+            tokens: Estimated prompt and completion tokens of the call
+
+        Returns:
+            Seconds spent waiting in the queue
+
+        Raises:
+            ServiceOverloadedError: If the wait would exceed max_wait
+        """
+        started = time.monotonic()
+        wait = self._reserve(tokens, started)
+        if wait > self.max_wait:
+            self._refund(tokens)
+            self.rejected += 1
+            raise ServiceOverloadedError(
+                "Azure OpenAI rate limit queue is full, retry later", retry_after=wait - self.max_wait
+            )
+
+        self.calls += 1
+        if wait <= 0:
+            return 0.0
+        try:
+            # A pause set by a 429 while waiting delays the call further
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = self._paused_until - time.monotonic()
+        except asyncio.CancelledError:
+            self.calls -= 1
+            self._refund(tokens)
+            raise
+
+        waited = time.monotonic() - started
+        self.queued += 1
+        self.wait_seconds += waited
+        self.max_wait_seconds = max(self.max_wait_seconds, waited)
+        return waited
+
+    def _reserve(self, tokens: int, now: float) -> float:
+        """Reserve one request and the tokens, returning the wait in seconds"""
+        wait = self._paused_until - now
+        if self.requests is not None:
+            wait = max(wait, self.requests.reserve(1, now))
+        if self.tokens is not None:
+            wait = max(wait, self.tokens.reserve(tokens, now))
+        return max(0.0, wait)
+
+    def _refund(self, tokens: int) -> None:
+        """Give back a reservation of a call that was not sent"""
+        now = time.monotonic()
+        if self.requests is not None:
+            self.requests.refund(1, now)
+        if self.tokens is not None:
+            self.tokens.refund(tokens, now)
+
+    def record_usage(self, estimated: int, actual: int) -> None:
+        """
+        Correct the token bucket with the usage reported in a response
+
+        Args:
+            estimated: Tokens reserved for the call
+            actual: Tokens the call consumed
+        """
+        if self.tokens is None:
+            return
+        now = time.monotonic()
+        if actual < estimated:
+            self.tokens.refund(estimated - actual, now)
+        else:
+            self.tokens.reserve(actual - estimated, now)
+
+    def record_throttle(self, retry_after: float, headers: Optional[Mapping[str, str]] = None) -> None:
+        """
+        Pause every call after a 429 response
+
+        Args:
+            retry_after: Seconds to wait before the next call
+            headers: Response headers, whose remaining quotas empty the buckets
+        """
+        self.throttled += 1
+        self._paused_until = max(self._paused_until, time.monotonic() + retry_after)
+        if headers is not None:
+            self.observe(headers)
+
+    def record_retry(self) -> None:
+        """Count a retried call"""
+        self.retries += 1
+
+    def observe(self, headers: Mapping[str, str]) -> None:
+        """
+        Align the buckets with the remaining quotas reported by the server
+
+        Args:
+            headers: Response headers with ``x-ratelimit-remaining-*`` values
+        """
+        now = time.monotonic()
+        for bucket, name in (
+            (self.requests, "x-ratelimit-remaining-requests"),
+            (self.tokens, "x-ratelimit-remaining-tokens"),
+        ):
+            if bucket is None or headers.get(name) is None:
+                continue
+            try:
+                bucket.limit(float(headers[name]), now)
+            except ValueError:
+                continue
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get limiter statistics
+
+        Returns:
+            Configured quotas, call and throttle counters and queue wait times
+        """
+        return {
+            "requests_per_minute": round(self.requests.rate * 60) if self.requests else None,
+            "tokens_per_minute": round(self.tokens.rate * 60) if self.tokens else None,
+            "calls": self.calls,
+            "queued": self.queued,
+            "rejected": self.rejected,
+            "throttled": self.throttled,
+            "retries": self.retries,
+            "queue_wait_ms_total": round(self.wait_seconds * 1000, 1),
+            "queue_wait_ms_avg": round(self.wait_seconds / self.calls * 1000, 1) if self.calls else 0.0,
+            "queue_wait_ms_max": round(self.max_wait_seconds * 1000, 1),
+            "paused_ms": round(max(0.0, self._paused_until - time.monotonic()) * 1000, 1),
+        }
+
+
+def parse_retry_after(headers: Optional[Mapping[str, str]]) -> Optional[float]:
+    """
+    Read how long to wait from the headers of a throttled response
+
+    Args:
+        headers: Response headers, may be None
+
+    Returns:
+        Seconds to wait from ``retry-after-ms``, ``retry-after`` or the
+        ``x-ratelimit-reset-*`` headers, or None when none is usable
+    """
+    if headers is None:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return max(0.0, float(headers["retry-after-ms"]) / 1000)
+    except ValueError:
+        pass
+
+    value = headers.get("retry-after")
+    if value:
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+        except (TypeError, ValueError):
+            pass
+
+    resets = [
+        _parse_duration(headers.get(name))
+        for name in ("x-ratelimit-reset-requests", "x-ratelimit-reset-tokens")
+    ]
+    resets = [reset for reset in resets if reset is not None]
+    return max(resets) if resets else None
+
+
+def _parse_duration(value: Optional[str]) -> Optional[float]:
+    """Parse a reset duration such as ``1s``, ``6m0s`` or ``20ms`` into seconds"""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    return sum(float(number) * _DURATION_UNITS[unit] for number, unit in parts)
+
+
+def backoff_delay(attempt: int, base: float, maximum: float) -> float:
+    """
+    Get a jittered exponential backoff delay
+
+    Args:
+        attempt: Zero-based number of the failed attempt
+        base: Delay of the first retry in seconds
+        maximum: Upper bound of the delay in seconds
+
+    Returns:
+        Random delay between zero and the exponential bound ("full jitter")
+    """
+    return random.uniform(0, min(maximum, base * 2 ** attempt))
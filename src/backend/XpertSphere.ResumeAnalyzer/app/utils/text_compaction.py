@@ -0,0 +1,251 @@
+import math
+import re
+from collections import Counter
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from .text_utils import normalize_text
+
+# Separator between pages in extracted text
+PAGE_BREAK = "\f"
+
+# Lines examined at the top and bottom of each page for headers and footers
+_EDGE_LINES = 3
+
+# Marker left where a section was truncated
+TRUNCATION_MARKER = "[...]"
+
+_TOKEN_PIECES = re.compile(r"\w+|[^\w\s]")
+_DIGITS = re.compile(r"\d+")
+
+# Page numbers such as "3", "- 3 -", "3/5", "Page 3 of 5" or "Page 3 sur 5"
+_PAGE_NUMBER = re.compile(r"[-\s]*(?:page\s*)?\d+(?:\s*(?:/|of|sur|de)\s*\d+)?[-\s]*")
+
+# Section headings, with a lower priority for sections trimmed first
+_SECTION_PRIORITIES = [
+    (re.compile(r"publications?|papers|articles|conferences?|talks|presentations"), 0),
+    (re.compile(r"references?|referees|recommendations"), 0),
+    (re.compile(r"interests|hobbies|activities|volunteer\w*|associati\w+|loisirs|centres? d'int\w+"), 1),
+    (re.compile(r"projects?|projets?|awards?|honou?rs|certifications?|courses|formations? compl\w+"), 2),
+]
+_CORE_SECTIONS = re.compile(
+    r"experiences?|exp\w+ professionnelles?|employment|work history|career|"
+    r"education|formations?|dipl\w+|studies|academic|"
+    r"skills|comp\w+tences|technologies|languages|langues|summary|profile|profil|about|contact"
+)
+_DEFAULT_PRIORITY = 3
+_CORE_PRIORITY = 4
+
+
+@dataclass
+class CompactionResult:
+    """Compacted text with the token counts before and after"""
+
+    text: str
+    original_tokens: int
+    compacted_tokens: int
+    removed_lines: int = 0
+    truncated: bool = False
+
+    @property
+    def tokens_saved(self) -> int:
+        """Estimated tokens removed from the prompt"""
+        return self.original_tokens - self.compacted_tokens
+
+
+@dataclass
+class _Section:
+    """Lines [first, end) of a CV section"""
+
+    priority: int
+    first: int
+    end: int = 0
+    truncated: bool = False
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the number of LLM tokens in a text without a tokenizer
+
+    Counts one token per punctuation mark and one per four characters of
+    each word, which tracks BPE tokenizers closely on CV text.
+
+    Args:
+        text: Text to measure
+
+    Returns:
+        Estimated token count
+    """
+    return sum(math.ceil(len(piece) / 4) for piece in _TOKEN_PIECES.findall(text))
+
+
+def _edge_key(line: str) -> str:
+    """
+    Key under which header and footer lines compare equal across pages
+
+    Digits are only masked in page numbers, so other lines such as the
+    dates of consecutive entries must match exactly.
+    """
+    key = line.strip().lower()
+    return _DIGITS.sub("#", key) if _PAGE_NUMBER.fullmatch(key) else key
+
+
+def remove_repeated_edges(pages: List[List[str]]) -> Tuple[List[List[str]], int]:
+    """
+    Drop header and footer lines repeated on most pages
+
+    Page numbers are ignored when comparing lines, so "Page 1 of 3" and
+    "Page 2 of 3" count as the same footer, while other lines must repeat
+    exactly. The first occurrence of each
+    repeated line is kept.
+
+    Args:
+        pages: Non-empty lines of each page
+
+    Returns:
+        Pages without their repeated edge lines, and the number of lines removed
+    """
+    if len(pages) < 2:
+        return pages, 0
+
+    counts: Counter = Counter()
+    for lines in pages:
+        edges = lines[:_EDGE_LINES] + lines[-_EDGE_LINES:]
+        counts.update({_edge_key(line) for line in edges})
+
+    threshold = max(2, math.ceil(len(pages) / 2))
+    repeated = {key for key, count in counts.items() if count >= threshold}
+    if not repeated:
+        return pages, 0
+
+    # The first copy is kept, as headers often carry the candidate's name
+    kept = set()
+    removed = 0
+    compacted = []
+    for lines in pages:
+        start, end = 0, len(lines)
+        while start < min(_EDGE_LINES, end) and _edge_key(lines[start]) in repeated & kept:
+            start += 1
+        while end > max(start, len(lines) - _EDGE_LINES) and _edge_key(lines[end - 1]) in repeated & kept:
+            end -= 1
+        removed += len(lines) - (end - start)
+        compacted.append(lines[start:end])
+        kept.update(repeated.intersection(map(_edge_key, lines[start:end])))
+    return compacted, removed
+
+
+def _section_priority(line: str) -> Optional[int]:
+    """Priority of the section a heading line starts, or None if not a heading"""
+    heading = line.strip(" :-#*").lower()
+    if not heading or len(heading) > 40:
+        return None
+    for pattern, priority in _SECTION_PRIORITIES:
+        if pattern.fullmatch(heading):
+            return priority
+    if _CORE_SECTIONS.fullmatch(heading):
+        return _CORE_PRIORITY
+    if line.isupper() and len(heading.split()) <= 4:
+        return _DEFAULT_PRIORITY
+    return None
+
+
+def truncate_to_budget(lines: List[str], max_tokens: int) -> Tuple[List[str], bool]:
+    """
+    Trim text to a token budget, least useful sections first
+
+    The text is split into sections at heading lines. Low-priority sections
+    (publications, references, hobbies...) are trimmed from their end
+    first, then the remaining sections from the end of the document. The
+    text before the first heading, usually the contact details, is trimmed
+    last. Each trimmed section keeps its heading and a truncation marker.
+
+    Args:
+        lines: Lines of the text
+        max_tokens: Token budget
+
+    Returns:
+        Lines within the budget, and whether anything was removed
+    """
+    line_tokens = [estimate_tokens(line) for line in lines]
+    total = sum(line_tokens)
+    if total <= max_tokens:
+        return lines, False
+
+    sections = [_Section(priority=_CORE_PRIORITY + 1, first=0)]
+    for index, line in enumerate(lines):
+        priority = _section_priority(line)
+        if priority is not None and index > 0:
+            sections[-1].end = index
+            sections.append(_Section(priority=priority, first=index))
+    sections[-1].end = len(lines)
+
+    keep = [True] * len(lines)
+    marker_tokens = estimate_tokens(TRUNCATION_MARKER)
+    # Lowest priority first, and among equals the last section first
+    order = sorted(range(len(sections)), key=lambda position: (sections[position].priority, -position))
+    for position in order:
+        section = sections[position]
+        # Keep the heading line of every section but the preamble
+        floor = section.first if position == 0 else section.first + 1
+        for index in range(section.end - 1, floor - 1, -1):
+            if total <= max_tokens:
+                break
+            keep[index] = False
+            total -= line_tokens[index]
+            if not section.truncated:
+                section.truncated = True
+                total += marker_tokens
+        if total <= max_tokens:
+            break
+
+    compacted = []
+    for section in sections:
+        compacted.extend(lines[index] for index in range(section.first, section.end) if keep[index])
+        if section.truncated:
+            compacted.append(TRUNCATION_MARKER)
+    return compacted, True
+
+
+def compact_text(text: str, max_tokens: Optional[int] = None) -> CompactionResult:
+    """
+    Shrink extracted CV text before it is sent to the LLM
+
+    Removes headers and footers repeated across pages, canonicalizes
+    whitespace and glyphs, drops consecutive duplicate lines, and trims
+    the text to a token budget section by section.
+
+    Args:
+        text: Extracted text, with pages separated by form feeds
+        max_tokens: Optional token budget
+
+    Returns:
+        Compacted text and token counts
+    """
+    original_tokens = estimate_tokens(text)
+
+    pages = [
+        [line for line in normalize_text(page).split("\n") if line]
+        for page in text.split(PAGE_BREAK)
+    ]
+    pages, removed = remove_repeated_edges([lines for lines in pages if lines])
+
+    lines: List[str] = []
+    for page in pages:
+        for line in page:
+            if lines and lines[-1] == line:
+                removed += 1
+                continue
+            lines.append(line)
+
+    truncated = False
+    if max_tokens is not None:
+        lines, truncated = truncate_to_budget(lines, max_tokens)
+
+    compacted = "\n".join(lines)
+    return CompactionResult(
+        text=compacted,
+        original_tokens=original_tokens,
+        compacted_tokens=estimate_tokens(compacted),
+        removed_lines=removed,
+        truncated=truncated,
+    )
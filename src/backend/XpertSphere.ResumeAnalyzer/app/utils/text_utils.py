@@ -0,0 +1,39 @@
+import re
+import unicodedata
+
+# Characters dropped entirely: soft hyphen, zero-width spaces and joiners, BOM
+_INVISIBLE_CHARS = dict.fromkeys(map(ord, "\u00ad\u200b\u200c\u200d\u2060\ufeff"))
+
+# Typographic variants that differ between PDF exporters
+_CHAR_REPLACEMENTS = str.maketrans({
+    **dict.fromkeys("\u2018\u2019\u201a\u2032", "'"),
+    **dict.fromkeys("\u201c\u201d\u201e\u00ab\u00bb", '"'),
+    **dict.fromkeys("\u2010\u2011\u2012\u2013\u2014\u2212", "-"),
+    # Bullet glyphs, including the Symbol font bullet in the private use area
+    **dict.fromkeys("\u2022\u25aa\u25cf\u25e6\u2023\u2219\u25a0\uf0b7", "-"),
+    # Page and paragraph breaks
+    **dict.fromkeys("\f\v\u2028\u2029", "\n"),
+})
+
+_HORIZONTAL_WHITESPACE = re.compile(r"[^\S\n]+")
+_BLANK_LINES = re.compile(r"\n\s*\n+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Canonicalize extracted text so cosmetically different exports compare equal
+
+    Applies Unicode NFKC normalization, unifies quotes, dashes and bullet
+    glyphs, turns page breaks into line breaks, and collapses whitespace.
+
+    Args:
+        text: Extracted document text
+
+    Returns:
+        Canonical form of the text
+    """
+    text = unicodedata.normalize("NFKC", text)
+    text = text.translate(_INVISIBLE_CHARS).translate(_CHAR_REPLACEMENTS)
+    text = _HORIZONTAL_WHITESPACE.sub(" ", text)
+    text = "\n".join(line.strip() for line in text.split("\n"))
+    return _BLANK_LINES.sub("\n", text).strip()
@@ -0,0 +1,367 @@
+import importlib
+import json
+import logging
+import os
+import re
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, TextIO
+
+logger = logging.getLogger(__name__)
+
+TRACEPARENT_HEADER = "traceparent"
+TRACESTATE_HEADER = "tracestate"
+
+_TRACEPARENT = re.compile(r"^([0-9a-f]{2})-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})(-.*)?$")
+_INVALID_TRACE_ID = "0" * 32
+_INVALID_SPAN_ID = "0" * 16
+
+
+@dataclass(frozen=True)
+class SpanContext:
+    """Identifiers of a span as carried by the W3C ``traceparent`` header"""
+
+    trace_id: str
+    span_id: str
+    sampled: bool = True
+    tracestate: Optional[str] = None
+
+    @property
+    def traceparent(self) -> str:
+        """Value of the ``traceparent`` header for this span"""
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+def parse_traceparent(value: Optional[str], tracestate: Optional[str] = None) -> Optional[SpanContext]:
+    """
+    Parse a W3C ``traceparent`` header
+
+    Args:
+        value: Header value, may be None
+        tracestate: Optional ``tracestate`` header, passed through unchanged
+
+    Returns:
+        Context of the remote parent span, or None when the header is
+        missing or invalid
+    """
+    match = _TRACEPARENT.match((value or "").strip().lower())
+    if match is None:
+        return None
+    version, trace_id, span_id, flags, rest = match.groups()
+    # Version 00 has no trailing fields; later versions may add some
+    if version == "ff" or (version == "00" and rest):
+        return None
+    if trace_id == _INVALID_TRACE_ID or span_id == _INVALID_SPAN_ID:
+        return None
+    return SpanContext(trace_id, span_id, bool(int(flags, 16) & 1), tracestate)
+
+
+class Span:
+    """
+    Timed operation of a trace, with attributes and timestamped events
+    """
+
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent_id: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+    ):
+        """
+        Start a span
+
+        Args:
+            name: Operation name
+            context: Trace and span identifiers of the span
+            parent_id: Span identifier of the parent span, if any
+            attributes: Optional initial attributes
+        """
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.attributes: Dict[str, Any] = dict(attributes or {})
+        self.events: List[Dict[str, Any]] = []
+        self.status = "ok"
+        self.start_time_ns = time.time_ns()
+        self.end_time_ns: Optional[int] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute of the span"""
+        self.attributes[key] = value
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        """Record a timestamped event in the span"""
+        self.events.append({"name": name, "time_ns": time.time_ns(), "attributes": attributes or {}})
+
+    def record_exception(self, error: BaseException) -> None:
+        """Mark the span as failed and record the exception as an event"""
+        self.status = "error"
+        self.add_event("exception", {"type": error.__class__.__name__, "message": str(error)})
+
+    def end(self) -> None:
+        """End the span"""
+        if self.end_time_ns is None:
+            self.end_time_ns = time.time_ns()
+
+    @property
+    def duration_ms(self) -> float:
+        """Duration of the span in milliseconds, up to now when still running"""
+        end = self.end_time_ns if self.end_time_ns is not None else time.time_ns()
+        return (end - self.start_time_ns) / 1_000_000
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Serialize the span
+
+        Returns:
+            JSON-serializable span, with times in nanoseconds since the epoch
+        """
+        return {
+            "name": self.name,
+            "trace_id": self.context.trace_id,
+            "span_id": self.context.span_id,
+            "parent_id": self.parent_id,
+            "start_time_ns": self.start_time_ns,
+            "end_time_ns": self.end_time_ns,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes,
+            "events": self.events,
+        }
+
+
+class _NoopSpan:
+    """Span returned while tracing is disabled, ignoring every call"""
+
+    context = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add_event(self, name: str, attributes: Optional[Dict[str, Any]] = None) -> None:
+        pass
+
+    def record_exception(self, error: BaseException) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class SpanExporter(ABC):
+    """
+    Destination of finished spans
+
+    Implement this interface and set TRACING_EXPORTER to its import path
+    (``package.module:ClassName``) to send spans to a tracing backend.
+    """
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        """
+        Export a finished span
+
+        Args:
+            span: Ended span
+        """
+        pass
+
+    def shutdown(self) -> None:
+        """Flush and release the exporter"""
+        pass
+
+
+class ConsoleSpanExporter(SpanExporter):
+    """Exporter writing each span as a JSON line to a text stream"""
+
+    def __init__(self, stream: Optional[TextIO] = None):
+        """
+        Initialize the exporter
+
+        Args:
+            stream: Stream receiving the spans, standard error by default
+        """
+        self.stream = stream or sys.stderr
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        """Write the span as one JSON line"""
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self.stream.write(line + "\n")
+            self.stream.flush()
+
+
+class FileSpanExporter(SpanExporter):
+    """Exporter appending each span as a JSON line to a file, for offline analysis"""
+
+    def __init__(self, path: str):
+        """
+        Initialize the exporter
+
+        Args:
+            path: JSON lines file the spans are appended to
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, "a", encoding="utf-8")
+        self._lock = threading.Lock()
+
+    def export(self, span: Span) -> None:
+        """Append the span as one JSON line"""
+        line = json.dumps(span.to_dict(), default=str)
+        with self._lock:
+            self._file.write(line + "\n")
+            self._file.flush()
+
+    def shutdown(self) -> None:
+        """Close the file"""
+        with self._lock:
+            self._file.close()
+
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class Tracer:
+    """
+    Creates spans in the current context and hands them to the exporter
+
+    The current span follows the asyncio task, so spans started by the
+    pipeline nest under the request span. Without an exporter, spans are
+    not created at all.
+    """
+
+    def __init__(self, exporter: Optional[SpanExporter] = None):
+        """
+        Initialize the tracer
+
+        Args:
+            exporter: Destination of finished spans, None disables tracing
+        """
+        self.exporter = exporter
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are recorded"""
+        return self.exporter is not None
+
+    @contextmanager
+    def start_span(
+        self,
+        name: str,
+        attributes: Optional[Dict[str, Any]] = None,
+        parent: Optional[SpanContext] = None,
+    ) -> Iterator[Any]:
+        """
+        Run the enclosed block in a new span
+
+        Args:
+            name: Operation name
+            attributes: Optional initial attributes
+            parent: Remote parent context, defaults to the current span
+
+        Yields:
+            The span, or a no-op span when tracing is disabled
+        """
+        if self.exporter is None:
+            yield NOOP_SPAN
+            return
+
+        if parent is None:
+            current = _current_span.get()
+            parent = current.context if current is not None else None
+        context = SpanContext(
+            trace_id=parent.trace_id if parent is not None else os.urandom(16).hex(),
+            span_id=os.urandom(8).hex(),
+            sampled=parent.sampled if parent is not None else True,
+            tracestate=parent.tracestate if parent is not None else None,
+        )
+        span = Span(name, context, parent.span_id if parent is not None else None, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_exception(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            span.end()
+            if context.sampled:
+                self._export(span)
+
+    def _export(self, span: Span) -> None:
+        """Export a span, never letting an exporter failure reach the caller"""
+        try:
+            self.exporter.export(span)
+        except Exception as e:
+            logger.warning(f"Failed to export span {span.name}: {str(e)}")
+
+    def shutdown(self) -> None:
+        """Flush the exporter and disable tracing"""
+        if self.exporter is not None:
+            self.exporter.shutdown()
+            self.exporter = None
+
+
+tracer = Tracer()
+
+
+def current_span() -> Any:
+    """
+    Get the span of the current context
+
+    Returns:
+        Current span, or a no-op span outside of a span
+    """
+    return _current_span.get() or NOOP_SPAN
+
+
+def build_exporter(name: str, file_path: Optional[str] = None) -> Optional[SpanExporter]:
+    """
+    Build the span exporter named in the settings
+
+    Args:
+        name: "none", "console", "file", or the ``package.module:ClassName``
+            import path of a SpanExporter taking no arguments
+        file_path: JSON lines file of the "file" exporter
+
+    Returns:
+        Span exporter, or None when tracing is disabled
+
+    Raises:
+        ValueError: If the exporter name cannot be resolved
+    """
+    if not name or name == "none":
+        return None
+    if name == "console":
+        return ConsoleSpanExporter()
+    if name == "file":
+        return FileSpanExporter(file_path or "traces.jsonl")
+    module_name, _, class_name = name.partition(":")
+    if not class_name:
+        raise ValueError(f"Unknown span exporter: {name}")
+    return getattr(importlib.import_module(module_name), class_name)()
+
+
+def configure_tracing(exporter: Optional[SpanExporter]) -> Tracer:
+    """
+    Set the exporter of the process-wide tracer
+
+    Args:
+        exporter: Destination of finished spans, None disables tracing
+
+    Returns:
+        The process-wide tracer
+    """
+    tracer.shutdown()
+    tracer.exporter = exporter
+    return tracer
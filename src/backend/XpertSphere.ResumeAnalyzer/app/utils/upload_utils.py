@@ -0,0 +1,154 @@
+import asyncio
+import io
+from typing import BinaryIO, Optional, Union
+
+from fastapi import UploadFile
+from app.core import FileTooLargeError
+
+# Size of each read from the spooled upload
+READ_CHUNK_SIZE = 256 * 1024
+
+Buffer = Union[bytes, bytearray, memoryview]
+
+
+def file_too_large(max_bytes: int) -> FileTooLargeError:
+    """
+    Build the error reported for an oversized upload
+
+    Args:
+        max_bytes: Maximum allowed size
+
+    Returns:
+        Error with the user-facing message
+    """
+    return FileTooLargeError(
+        f"File too large. Maximum allowed size is {max_bytes // (1024 * 1024)} MB."
+    )
+
+
+class BufferReader(io.RawIOBase):
+    """
+    Seekable read-only stream over an in-memory buffer, without copying it
+    """
+
+    def __init__(self, buffer: Buffer):
+        """
+        Initialize the stream
+
+        Args:
+            buffer: Bytes-like object to read from
+        """
+        super().__init__()
+        self._view = memoryview(buffer).cast("B")
+        self._position = 0
+
+    def readable(self) -> bool:
+        return True
+
+    def seekable(self) -> bool:
+        return True
+
+    def readinto(self, target) -> int:
+        size = min(len(target), len(self._view) - self._position)
+        if size <= 0:
+            return 0
+        target[:size] = self._view[self._position:self._position + size]
+        self._position += size
+        return size
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        if whence == io.SEEK_SET:
+            position = offset
+        elif whence == io.SEEK_CUR:
+            position = self._position + offset
+        elif whence == io.SEEK_END:
+            position = len(self._view) + offset
+        else:
+            raise ValueError(f"Invalid whence: {whence}")
+        if position < 0:
+            raise ValueError(f"Negative seek position: {position}")
+        self._position = position
+        return position
+
+    def tell(self) -> int:
+        return self._position
+
+    def close(self) -> None:
+        # Release the view so the underlying buffer can be resized or unmapped
+        if not self.closed:
+            self._view.release()
+        super().close()
+
+
+def as_binary_stream(content: Buffer) -> BinaryIO:
+    """
+    Wrap file content in a seekable binary stream without copying it
+
+    Args:
+        content: Binary content as bytes, bytearray or memoryview
+
+    Returns:
+        Readable, seekable stream
+    """
+    if isinstance(content, bytes):
+        # BytesIO shares the bytes object's storage until it is written to
+        return io.BytesIO(content)
+    return BufferReader(content)
+
+
+def _read_into(source: BinaryIO, max_bytes: int, expected_size: Optional[int]) -> memoryview:
+    """Read a file object into a single buffer, failing past max_bytes"""
+    if expected_size is not None:
+        buffer = bytearray(expected_size)
+        view = memoryview(buffer)
+        filled = 0
+        while filled < expected_size:
+            read = source.readinto(view[filled:filled + READ_CHUNK_SIZE])
+            if not read:
+                break
+            filled += read
+        tail = source.read(max_bytes - filled + 1)
+        if not tail:
+            return view[:filled]
+
+        # The reported size was too small; grow the buffer once
+        view.release()
+        buffer += tail
+        if len(buffer) > max_bytes:
+            raise file_too_large(max_bytes)
+        return memoryview(buffer)
+
+    buffer = bytearray()
+    while True:
+        chunk = source.read(READ_CHUNK_SIZE)
+        if not chunk:
+            return memoryview(buffer)
+        buffer += chunk
+        if len(buffer) > max_bytes:
+            raise file_too_large(max_bytes)
+
+
+async def read_upload(file: UploadFile, max_bytes: int) -> memoryview:
+    """
+    Read an uploaded file exactly once into a single buffer
+
+    When the upload size is known the buffer is allocated once and filled
+    in place; otherwise bytes are counted as they are read and reading
+    stops as soon as the limit is exceeded.
+
+    Args:
+        file: Uploaded file
+        max_bytes: Maximum allowed size
+
+    Returns:
+        View over the file content
+
+    Raises:
+        FileTooLargeError: If the file exceeds max_bytes
+    """
+    size = file.size
+    if size is not None and size > max_bytes:
+        raise file_too_large(max_bytes)
+
+    await file.seek(0)
+    return await asyncio.to_thread(_read_into, file.file, max_bytes, size)
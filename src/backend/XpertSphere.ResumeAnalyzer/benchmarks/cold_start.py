@@ -0,0 +1,287 @@
+#!/usr/bin/env python3
+"""
+Cold-start benchmark of the service
+
+Measures, over several fresh interpreter processes:
+
+- import: time to import app.main, with the heaviest modules of the
+  import graph taken from python -X importtime
+- liveness: time from process spawn until /api/health/liveness answers,
+  the probe Azure Container Apps waits for on scale-from-zero
+- first_extract: time from process spawn until a CV posted to
+  /api/extract/ right after the first liveness answer is extracted,
+  against the local Azure OpenAI stand-in of loadtest/mock_openai.py
+- ready: time from process spawn until /api/health/readiness answers 200,
+  polled alongside the first extraction
+
+Results use the JSON format of run_benchmarks.py, as cold_start.* entries,
+so that runs are compared with a baseline against the tolerances of
+thresholds.json. The exit status is 1 on a regression or when the median
+liveness time exceeds --liveness-budget-ms.
+
+Usage:
+    python benchmarks/cold_start.py [--runs 5] [--json cold_start.json]
+    python benchmarks/cold_start.py --baseline main.json --liveness-budget-ms 1500
+    python benchmarks/cold_start.py --sync-startup   # Without background warm-up
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.run_benchmarks import DEFAULT_THRESHOLDS, compare, environment, report, sample_stats  # noqa: E402
+from benchmarks.synthetic_cvs import generate_cv  # noqa: E402
+from loadtest.mock_openai import document_spec  # noqa: E402
+from loadtest.run_loadtest import free_port, wait_until_ready  # noqa: E402
+
+PROJECT_ROOT = Path(__file__).parent.parent
+MOCK_SCRIPT = PROJECT_ROOT / "loadtest" / "mock_openai.py"
+IMPORT_SNIPPET = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+# Interval between probes while waiting for the service
+POLL_SECONDS = 0.05
+
+
+def service_environment(mock_url: Optional[str], sync_startup: bool) -> Dict[str, str]:
+    """
+    Environment of the measured processes
+
+    Args:
+        mock_url: Azure OpenAI stand-in the service calls, if any
+        sync_startup: Build the pipeline before accepting requests
+
+    Returns:
+        Environment variables, isolated from the caller's .env file and caches
+    """
+    env = dict(os.environ)
+    env.update({
+        "PYTHONPATH": str(PROJECT_ROOT),
+        "ENVIRONMENT": "development",
+        "AZURE_OPENAI_ENDPOINT": mock_url or "https://cold-start.openai.azure.com/",
+        "AZURE_OPENAI_API_KEY": "cold-start",
+        "JOB_QUEUE_DB_PATH": os.path.join(tempfile.mkdtemp(), "jobs.db"),
+        "STARTUP_BACKGROUND_WARM_UP": "false" if sync_startup else "true",
+    })
+    return env
+
+
+def measure_import(env: Dict[str, str]) -> float:
+    """
+    Time the import of app.main in a fresh interpreter
+
+    Args:
+        env: Environment of the process
+
+    Returns:
+        Import time in seconds
+    """
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_SNIPPET],
+        env=env, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    ).stdout
+    return float(output.strip().splitlines()[-1])
+
+
+def heaviest_imports(env: Dict[str, str], top: int = 15) -> List[Dict[str, Any]]:
+    """
+    List the modules with the largest cumulative import time under app.main
+
+    Args:
+        env: Environment of the process
+        top: Number of modules listed
+
+    Returns:
+        Module names with their self and cumulative import times in microseconds
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        env=env, cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+    ).stderr
+    modules = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        self_us, cumulative_us, name = (field.strip() for field in line[len("import time:"):].split("|"))
+        if self_us.isdigit():
+            modules.append({"module": name, "self_us": int(self_us), "cumulative_us": int(cumulative_us)})
+    modules.sort(key=lambda module: module["cumulative_us"], reverse=True)
+    return modules[:top]
+
+
+async def _wait_for(client: httpx.AsyncClient, url: str, started: float, timeout: float) -> float:
+    """Poll a URL until it answers 200, returning the time since started"""
+    deadline = started + timeout
+    while True:
+        try:
+            if (await client.get(url)).status_code == 200:
+                return time.perf_counter() - started
+        except httpx.TransportError:
+            pass
+        if time.perf_counter() > deadline:
+            raise RuntimeError(f"{url} did not answer within {timeout} seconds")
+        await asyncio.sleep(POLL_SECONDS)
+
+
+async def _probe_startup(port: int, document: bytes, started: float, timeout: float) -> Dict[str, float]:
+    """Time the first liveness answer, then the first extraction and readiness"""
+    base_url = f"http://127.0.0.1:{port}"
+    async with httpx.AsyncClient(timeout=timeout) as client:
+        liveness = await _wait_for(client, f"{base_url}/api/health/liveness", started, timeout)
+
+        async def first_extract() -> float:
+            response = await client.post(
+                f"{base_url}/api/extract/", files={"file": ("cv.pdf", document, "application/pdf")}
+            )
+            response.raise_for_status()
+            return time.perf_counter() - started
+
+        extract, ready = await asyncio.gather(
+            first_extract(),
+            _wait_for(client, f"{base_url}/api/health/readiness", started, timeout),
+        )
+    return {"liveness": liveness, "first_extract": extract, "ready": ready}
+
+
+def measure_startup(env: Dict[str, str], document: bytes, timeout: float) -> Dict[str, float]:
+    """
+    Start the service in a fresh process and time its first answers
+
+    Args:
+        env: Environment of the process
+        document: CV posted as the first extraction request
+        timeout: Seconds allowed for the service to answer
+
+    Returns:
+        Seconds from spawn to the first liveness answer, first extraction
+        and readiness
+    """
+    port = free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--log-level", "warning"],
+        env=env, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        return asyncio.run(_probe_startup(port, document, started, timeout))
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def start_mock(seed: int) -> Tuple[subprocess.Popen, str]:
+    """Start the Azure OpenAI stand-in, answering instantly, in a subprocess"""
+    port = free_port()
+    process = subprocess.Popen(
+        [sys.executable, str(MOCK_SCRIPT), "--port", str(port), "--latency", "fixed:0",
+         "--tokens-per-second", "0", "--responses", "1", "--seed", str(seed)],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    wait_until_ready(f"http://127.0.0.1:{port}/stats")
+    return process, f"http://127.0.0.1:{port}/"
+
+
+def run(runs: int, sync_startup: bool, timeout: float, seed: int = 0) -> Tuple[Dict[str, Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Run the cold-start measurements
+
+    Args:
+        runs: Fresh processes started per measurement
+        sync_startup: Build the pipeline before accepting requests
+        timeout: Seconds allowed for each service process to answer
+        seed: Seed of the posted synthetic CV
+
+    Returns:
+        Statistics per cold_start.* benchmark, and the heaviest imports
+    """
+    document = generate_cv(document_spec(seed, 0)).pdf
+    mock, mock_url = start_mock(seed)
+    try:
+        env = service_environment(mock_url, sync_startup)
+        samples: Dict[str, List[float]] = {"import": []}
+        for _ in range(runs):
+            samples["import"].append(measure_import(env))
+        for _ in range(runs):
+            for name, seconds in measure_startup(env, document, timeout).items():
+                samples.setdefault(name, []).append(seconds)
+        imports = heaviest_imports(env)
+    finally:
+        mock.terminate()
+        mock.wait(timeout=30)
+
+    results = {}
+    print(f"{'benchmark':40} {'median ms':>12} {'p95 ms':>12}")
+    for name, seconds in samples.items():
+        stats = {"rounds": runs, **sample_stats([value * 1_000_000 for value in seconds])}
+        results[f"cold_start.{name}"] = stats
+        print(f"{'cold_start.' + name:40} {stats['median_us'] / 1000:>12.1f} {stats['p95_us'] / 1000:>12.1f}")
+    return results, imports
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="Fresh processes started per measurement")
+    parser.add_argument("--sync-startup", action="store_true", help="Build the pipeline before accepting requests")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds allowed for the service to answer")
+    parser.add_argument("--liveness-budget-ms", type=float, help="Fail when the median liveness time exceeds it")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare with")
+    parser.add_argument("--thresholds", default=str(DEFAULT_THRESHOLDS), help="Regression tolerances")
+    args = parser.parse_args()
+
+    results, imports = run(args.runs, args.sync_startup, args.timeout)
+    print("\nHeaviest imports under app.main (cumulative ms)")
+    for module in imports:
+        print(f"  {module['module']:50} {module['cumulative_us'] / 1000:>8.1f}")
+
+    output: Dict[str, Any] = {
+        "environment": {**environment(), "sync_startup": args.sync_startup},
+        "benchmarks": results,
+        "imports": imports,
+    }
+    exit_code = 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        thresholds = json.loads(Path(args.thresholds).read_text())
+        comparisons = compare(results, baseline["benchmarks"], thresholds)
+        regressions, improvements = report(comparisons)
+        output["comparison"] = {
+            "baseline": baseline.get("environment", {}).get("commit"),
+            "regressions": regressions,
+            "improvements": improvements,
+            "benchmarks": comparisons,
+        }
+        print(f"\n{regressions} regression(s), {improvements} improvement(s)")
+        exit_code = 1 if regressions else 0
+
+    if args.liveness_budget_ms is not None:
+        liveness_ms = results["cold_start.liveness"]["median_us"] / 1000
+        within = liveness_ms <= args.liveness_budget_ms
+        output["liveness_budget"] = {"budget_ms": args.liveness_budget_ms, "median_ms": liveness_ms, "met": within}
+        print(f"\nLiveness {liveness_ms:.1f} ms, budget {args.liveness_budget_ms:.0f} ms: {'met' if within else 'EXCEEDED'}")
+        exit_code = exit_code or (0 if within else 1)
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(output, indent=2))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
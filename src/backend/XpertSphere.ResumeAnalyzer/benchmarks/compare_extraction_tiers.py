@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Compare layout-only and tiered PDF extraction on a corpus of PDFs
+
+For each document, extracts the text with pdfplumber layout analysis on
+every page, then with the tiered extractor (pdfium text layer first,
+layout analysis only on pages failing the quality checks), and reports
+timings, the share of pages served by the text layer and how similar
+the two texts are.
+
+Usage:
+    python benchmarks/compare_extraction_tiers.py path/to/cvs [more.pdf ...] [--repeat 3] [--json out.json]
+"""
+
+import argparse
+import difflib
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Any, Dict, List
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.infrastructure.extractors.pdf_extractor import extract_pdf_pages  # noqa: E402
+from app.infrastructure.extractors.tiered_extraction import TierStats  # noqa: E402
+from app.utils.text_compaction import PAGE_BREAK  # noqa: E402
+
+
+def collect_pdfs(paths: List[str]) -> List[Path]:
+    """Expand files and directories into a sorted list of PDF files"""
+    pdfs = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            pdfs.extend(sorted(path.rglob("*.pdf")))
+        elif path.suffix.lower() == ".pdf":
+            pdfs.append(path)
+    return pdfs
+
+
+def time_extraction(content: bytes, name: str, tiered: bool, repeat: int):
+    """Extract a document several times, returning the median seconds and the last result"""
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = extract_pdf_pages(content, name, tiered=tiered)
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings), result
+
+
+def benchmark_document(path: Path, repeat: int) -> Dict[str, Any]:
+    """Compare both extraction modes on one PDF"""
+    content = path.read_bytes()
+    layout_seconds, (layout_pages, page_count, _) = time_extraction(content, path.name, False, repeat)
+    tiered_seconds, (tiered_pages, _, tier_stats) = time_extraction(content, path.name, True, repeat)
+
+    layout_text = PAGE_BREAK.join(layout_pages)
+    tiered_text = PAGE_BREAK.join(tiered_pages)
+    return {
+        "file": str(path),
+        "pages": page_count,
+        "layout_ms": round(layout_seconds * 1000, 2),
+        "tiered_ms": round(tiered_seconds * 1000, 2),
+        "speedup": round(layout_seconds / tiered_seconds, 2) if tiered_seconds else None,
+        "similarity": round(difflib.SequenceMatcher(None, layout_text, tiered_text).ratio(), 4),
+        "tiers": tier_stats.snapshot(),
+        "_tier_stats": tier_stats,
+    }
+
+
+def summarize(results: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Aggregate per-document results over the corpus"""
+    tier_stats = TierStats()
+    for result in results:
+        tier_stats.merge(result.pop("_tier_stats"))
+    pages = sum(result["pages"] for result in results)
+    layout_ms = sum(result["layout_ms"] for result in results)
+    tiered_ms = sum(result["tiered_ms"] for result in results)
+    return {
+        "documents": len(results),
+        "pages": pages,
+        "layout_ms_per_page": round(layout_ms / pages, 2) if pages else 0.0,
+        "tiered_ms_per_page": round(tiered_ms / pages, 2) if pages else 0.0,
+        "speedup": round(layout_ms / tiered_ms, 2) if tiered_ms else None,
+        "min_similarity": min((result["similarity"] for result in results), default=None),
+        "tiers": tier_stats.snapshot(),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("paths", nargs="+", help="PDF files or directories searched recursively")
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per document, the median is kept")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    pdfs = collect_pdfs(args.paths)
+    if not pdfs:
+        print("No PDF files found", file=sys.stderr)
+        return 1
+
+    results = []
+    print(f"{'file':40} {'pages':>5} {'layout ms':>10} {'tiered ms':>10} {'speedup':>8} {'text hit':>8} {'similar':>8}")
+    for path in pdfs:
+        try:
+            result = benchmark_document(path, args.repeat)
+        except Exception as e:
+            print(f"{path.name[:40]:40} failed: {e}", file=sys.stderr)
+            continue
+        results.append(result)
+        print(
+            f"{path.name[:40]:40} {result['pages']:>5} {result['layout_ms']:>10} {result['tiered_ms']:>10} "
+            f"{result['speedup'] or '-':>8} {result['tiers']['text_layer_hit_rate']:>8} {result['similarity']:>8}"
+        )
+
+    summary = summarize(results)
+    print()
+    print(json.dumps(summary, indent=2))
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps({"summary": summary, "documents": results}, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
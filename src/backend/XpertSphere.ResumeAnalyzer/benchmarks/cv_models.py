@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the CV models against their previous implementation
+
+Compares, on the LLM responses of synthetic CVs of one and five pages:
+
+- decode: LLM JSON response to a CVModel. Before: json.loads, then
+  Experience/Training/CVModel dataclasses built by dict unpacking. After:
+  CVModel.from_json, decoding and validating in one pass
+- encode: CVModel to the /api/extract/ JSON body. Before: FastAPI's
+  jsonable_encoder and JSONResponse. After: CVModel.to_json
+- memory: bytes allocated per decoded CV, measured with tracemalloc over
+  distinct CVs decoded and kept alive, and bytes of the model instances
+  themselves (objects and their attribute dictionaries, strings and lists
+  excluded). The first includes pydantic's sharing of repeated short
+  strings, such as skills and school names, across decodes
+
+The "before" models are copies of the dict-backed dataclasses the
+service used, so both sides run in the same process and on the same
+data. Throughput is reported in operations and megabytes of JSON per
+second.
+
+Usage:
+    python benchmarks/cv_models.py [--quick] [--json cv_models.json]
+"""
+
+import argparse
+import json
+import sys
+import tracemalloc
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from uuid import uuid4
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from app.domain.models import CVModel  # noqa: E402
+from benchmarks.run_benchmarks import SHORT_CV, LONG_CV, environment, measure  # noqa: E402
+from benchmarks.synthetic_cvs import CVSpec, generate_cv  # noqa: E402
+
+# Distinct CVs decoded per memory measurement
+MEMORY_COPIES = 500
+
+
+@dataclass
+class LegacyExperience:
+    """Experience as a dict-backed dataclass"""
+
+    title: str
+    description: str
+    date: Optional[str] = None
+    company: Optional[str] = None
+    location: Optional[str] = None
+
+    def __post_init__(self):
+        self.title = self.title.strip() if self.title else self.title
+        self.description = self.description.strip() if self.description else self.description
+
+
+@dataclass
+class LegacyTraining:
+    """Training as a dict-backed dataclass"""
+
+    school: str
+    level: str
+    period: Optional[str] = None
+    field: Optional[str] = None
+
+    def __post_init__(self):
+        self.school = self.school.strip() if self.school else self.school
+        self.level = self.level.strip() if self.level else self.level
+
+
+@dataclass
+class LegacyCVModel:
+    """CV model as a dict-backed dataclass"""
+
+    first_name: str
+    last_name: str
+    email: Optional[str] = None
+    phone_number: Optional[str] = None
+    profession: Optional[str] = None
+    address: Optional[str] = None
+    languages: List[str] = field(default_factory=list)
+    trainings: List[LegacyTraining] = field(default_factory=list)
+    skills: List[str] = field(default_factory=list)
+    experiences: List[LegacyExperience] = field(default_factory=list)
+    id: str = field(default_factory=lambda: str(uuid4()))
+
+    def __post_init__(self):
+        self.first_name = self.first_name.strip() if self.first_name else self.first_name
+        self.last_name = self.last_name.strip() if self.last_name else self.last_name
+        self.email = self.email.strip().lower() if self.email else self.email
+
+
+def legacy_decode(response: str) -> LegacyCVModel:
+    """Decode an LLM response the way the analyzer did before"""
+    parsed_data = json.loads(response)
+    parsed_data["experiences"] = [LegacyExperience(**exp) for exp in parsed_data["experiences"]]
+    parsed_data["trainings"] = [LegacyTraining(**training) for training in parsed_data["trainings"]]
+    return LegacyCVModel(**parsed_data)
+
+
+def legacy_encode(cv_model: LegacyCVModel) -> bytes:
+    """Encode the /api/extract/ body the way FastAPI did before"""
+    return JSONResponse(jsonable_encoder({"extracted_data": cv_model})).body
+
+
+def encode(cv_model: CVModel) -> bytes:
+    """Encode the /api/extract/ body as extract_data_from_cv does"""
+    return b'{"extracted_data":' + cv_model.to_json() + b"}"
+
+
+def instance_bytes(cv_model: Any) -> int:
+    """Size of a CV's model objects and their attribute dictionaries"""
+    objects = [cv_model, *cv_model.experiences, *cv_model.trainings]
+    return sum(sys.getsizeof(obj) + (sys.getsizeof(obj.__dict__) if hasattr(obj, "__dict__") else 0) for obj in objects)
+
+
+def allocated_bytes(decode: Callable[[str], Any], responses: List[str]) -> float:
+    """
+    Measure the memory allocated per decoded CV
+
+    Args:
+        decode: Function decoding an LLM response
+        responses: LLM responses of distinct CVs, all decoded and kept alive
+
+    Returns:
+        Bytes allocated per CV, the models and the strings they hold
+    """
+    decode(responses[0])  # Warm up caches and lazy imports
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        kept = [decode(response) for response in responses]
+        allocated = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+    del kept
+    return allocated / len(responses)
+
+
+def run(rounds: int, min_round_seconds: float, copies: int = MEMORY_COPIES) -> Dict[str, Dict[str, Any]]:
+    """
+    Run the before/after comparisons, printing each result
+
+    Args:
+        rounds: Timed rounds per benchmark
+        min_round_seconds: Minimum duration of a round
+        copies: Distinct CVs decoded per memory measurement
+
+    Returns:
+        Statistics by cv_models.<operation>.<size>.<before|after> name
+    """
+    results: Dict[str, Dict[str, Any]] = {}
+    print(f"{'benchmark':40} {'median us':>12} {'ops/s':>10} {'MB/s':>8} {'bytes/CV':>10} {'model bytes':>12}")
+    for size, spec in (("short", SHORT_CV), ("long", LONG_CV)):
+        response = generate_cv(spec).llm_response
+        distinct = [
+            generate_cv(CVSpec(seed=spec.seed * 100_000 + index, pages=spec.pages, columns=spec.columns)).llm_response
+            for index in range(copies)
+        ]
+        legacy, current = legacy_decode(response), CVModel.from_json(response)
+        cases = {
+            "decode": (
+                (lambda: legacy_decode(response), len(response.encode())),
+                (lambda: CVModel.from_json(response), len(response.encode())),
+            ),
+            "encode": (
+                (lambda: legacy_encode(legacy), len(legacy_encode(legacy))),
+                (lambda: encode(current), len(encode(current))),
+            ),
+        }
+        for operation, sides in cases.items():
+            for side, (func, payload_bytes) in zip(("before", "after"), sides):
+                stats = measure(func, rounds, min_round_seconds)
+                stats["mb_per_sec"] = round(payload_bytes / stats["median_us"], 1) if stats["median_us"] else 0.0
+                if operation == "decode":
+                    decode = legacy_decode if side == "before" else CVModel.from_json
+                    stats["bytes_per_object"] = round(allocated_bytes(decode, distinct))
+                    stats["instance_bytes"] = instance_bytes(legacy if side == "before" else current)
+                name = f"cv_models.{operation}.{size}.{side}"
+                results[name] = stats
+                print(
+                    f"{name:40} {stats['median_us']:>12} {stats['ops_per_sec']:>10} {stats['mb_per_sec']:>8} "
+                    f"{stats.get('bytes_per_object', '-'):>10} {stats.get('instance_bytes', '-'):>12}"
+                )
+    return results
+
+
+def speedups(results: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, float]]:
+    """
+    Compare each "after" benchmark with its "before" counterpart
+
+    Args:
+        results: Statistics by benchmark name
+
+    Returns:
+        Speedup of the median, and memory ratios of decodes, by operation and size
+    """
+    comparison = {}
+    for name, after in results.items():
+        if not name.endswith(".after"):
+            continue
+        before = results[name[: -len("after")] + "before"]
+        key = name[len("cv_models."): -len(".after")]
+        comparison[key] = {"speedup": round(before["median_us"] / after["median_us"], 2)}
+        if "bytes_per_object" in after:
+            comparison[key]["memory_ratio"] = round(after["bytes_per_object"] / before["bytes_per_object"], 2)
+            comparison[key]["instance_memory_ratio"] = round(after["instance_bytes"] / before["instance_bytes"], 2)
+    return comparison
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=15, help="Timed rounds per benchmark")
+    parser.add_argument("--min-round-ms", type=float, default=50, help="Minimum duration of a round")
+    parser.add_argument("--copies", type=int, default=MEMORY_COPIES, help="Distinct CVs decoded per memory measurement")
+    parser.add_argument("--quick", action="store_true", help="Fewer, shorter rounds for a smoke run")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this JSON file")
+    args = parser.parse_args()
+
+    rounds, min_round_seconds = args.rounds, args.min_round_ms / 1000
+    if args.quick:
+        rounds, min_round_seconds = 5, 0.01
+    results = run(rounds, min_round_seconds, args.copies)
+    comparison = speedups(results)
+    print(f"\n{'comparison':20} {'speedup':>8} {'memory':>8} {'model memory':>13}")
+    for key, ratios in comparison.items():
+        print(
+            f"{key:20} {ratios['speedup']:>7}x {ratios.get('memory_ratio', '-'):>8} "
+            f"{ratios.get('instance_memory_ratio', '-'):>13}"
+        )
+
+    if args.json_path:
+        output = {"environment": environment(), "benchmarks": results, "comparison": comparison}
+        Path(args.json_path).write_text(json.dumps(output, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+"""
+Microbenchmarks of the CV pipeline's CPU-bound steps
+
+Runs each benchmark on synthetic CVs from synthetic_cvs.py:
+
+- extract_text: PDFExtractor.extract_text, layout-only and tiered, on CVs
+  of varying page count, column layout, fonts and embedded images
+- build_prompt: chat messages sent to Azure OpenAI, from extracted text
+- parse_response: LLM JSON response decoded into a CVModel
+- serialize_response: CVModel encoded as the /api/extract/ JSON body
+
+benchmarks/cv_models.py compares the CV models with their previous
+dict-backed implementation.
+
+Each benchmark is timed over several rounds of calibrated iteration
+counts; results are printed and optionally written as JSON. Given the
+JSON of a previous run, medians are compared against the per-benchmark
+tolerances of thresholds.json and the exit status is 1 on a regression.
+
+Usage:
+    python benchmarks/run_benchmarks.py [--filter 'extract_text.*'] [--quick] [--json out.json]
+    python benchmarks/run_benchmarks.py --baseline main.json [--thresholds benchmarks/thresholds.json]
+"""
+
+import argparse
+import asyncio
+import fnmatch
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+# The analyzer is built for prompt construction only and never calls Azure OpenAI
+os.environ.setdefault("AZURE_OPENAI_ENDPOINT", "https://benchmark.openai.azure.com/")
+os.environ.setdefault("AZURE_OPENAI_API_KEY", "benchmark")
+
+from app.infrastructure.analyzers.openai_analyzer import OpenAIAnalyzer  # noqa: E402
+from app.infrastructure.extractors.pdf_extractor import PDFExtractor  # noqa: E402
+from benchmarks.synthetic_cvs import CVSpec, generate_cv  # noqa: E402
+
+DEFAULT_THRESHOLDS = Path(__file__).parent / "thresholds.json"
+
+# Documents of the extraction benchmarks, from the simplest to the heaviest
+EXTRACTION_SPECS = (
+    CVSpec(seed=1, pages=1, columns=1, fonts=1, images=0),
+    CVSpec(seed=2, pages=2, columns=2, fonts=3, images=0),
+    CVSpec(seed=3, pages=2, columns=1, fonts=1, images=2),
+    CVSpec(seed=4, pages=5, columns=2, fonts=3, images=2),
+)
+# CVs whose text and LLM response feed the analyzer benchmarks
+SHORT_CV = CVSpec(seed=5, pages=1)
+LONG_CV = CVSpec(seed=6, pages=5, columns=2)
+
+
+def build_benchmarks() -> Dict[str, Callable[[], Any]]:
+    """
+    Build the benchmarked callables, each running one operation
+
+    Returns:
+        Benchmark callables by name
+    """
+    benchmarks: Dict[str, Callable[[], Any]] = {}
+    loop = asyncio.new_event_loop()
+
+    for spec in EXTRACTION_SPECS:
+        cv = generate_cv(spec)
+        label = f"p{spec.pages}-c{spec.columns}-f{spec.fonts}-i{spec.images}"
+        for mode, tiered in (("layout", False), ("tiered", True)):
+            extractor = PDFExtractor(tiered=tiered)
+            benchmarks[f"extract_text.{mode}.{label}"] = (
+                lambda extractor=extractor, cv=cv: loop.run_until_complete(
+                    extractor.extract_text(cv.pdf, f"{cv.spec.name}.pdf")
+                )
+            )
+
+    analyzer = OpenAIAnalyzer()
+    extractor = PDFExtractor(tiered=True)
+    for size, spec in (("short", SHORT_CV), ("long", LONG_CV)):
+        cv = generate_cv(spec)
+        text = loop.run_until_complete(extractor.extract_text(cv.pdf, f"{spec.name}.pdf"))
+        response = cv.llm_response
+        cv_model = analyzer._build_cv_model(response)
+        benchmarks[f"build_prompt.{size}"] = lambda text=text: analyzer._create_messages(text)
+        benchmarks[f"parse_response.{size}"] = lambda response=response: analyzer._build_cv_model(response)
+        # The body extract_data_from_cv returns
+        benchmarks[f"serialize_response.{size}"] = (
+            lambda cv_model=cv_model: b'{"extracted_data":' + cv_model.to_json() + b"}"
+        )
+    return benchmarks
+
+
+def measure(func: Callable[[], Any], rounds: int, min_round_seconds: float) -> Dict[str, Any]:
+    """
+    Time a callable
+
+    The iteration count of a round is calibrated so that a round lasts
+    at least min_round_seconds; each round gives one per-call time.
+
+    Args:
+        func: Benchmarked callable
+        rounds: Number of timed rounds
+        min_round_seconds: Minimum duration of a round
+
+    Returns:
+        Per-call statistics in microseconds
+    """
+    func()  # Warm up caches and lazy imports
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_round_seconds:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_round_seconds / elapsed) + 1))
+
+    samples = []
+    for _ in range(rounds):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        samples.append((time.perf_counter() - started) / number * 1_000_000)
+    return {"rounds": rounds, "iterations": number, **sample_stats(samples)}
+
+
+def sample_stats(samples: List[float]) -> Dict[str, float]:
+    """
+    Summarize timings
+
+    Args:
+        samples: Timings in microseconds, at least one
+
+    Returns:
+        Median, mean, min, 95th percentile, standard deviation and rate
+    """
+    samples = sorted(samples)
+    median = statistics.median(samples)
+    return {
+        "median_us": round(median, 3),
+        "mean_us": round(statistics.fmean(samples), 3),
+        "min_us": round(samples[0], 3),
+        "p95_us": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 3),
+        "stdev_us": round(statistics.stdev(samples), 3) if len(samples) > 1 else 0.0,
+        "ops_per_sec": round(1_000_000 / median, 1) if median else 0.0,
+    }
+
+
+def environment() -> Dict[str, Any]:
+    """Describe the machine and commit the results were measured on"""
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=Path(__file__).parent,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def threshold_for(name: str, thresholds: Dict[str, Any]) -> Dict[str, float]:
+    """Tolerances of a benchmark: defaults overridden by the first matching pattern"""
+    limits = dict(thresholds.get("default", {}))
+    for pattern, overrides in thresholds.get("benchmarks", {}).items():
+        if fnmatch.fnmatchcase(name, pattern):
+            limits.update(overrides)
+            break
+    return limits
+
+
+def compare(
+    results: Dict[str, Dict[str, Any]],
+    baseline: Dict[str, Dict[str, Any]],
+    thresholds: Dict[str, Any],
+) -> List[Dict[str, Any]]:
+    """
+    Compare medians with a baseline run
+
+    A benchmark regresses when its median grew by more than
+    ``max_regression`` (a fraction of the baseline) and by more than
+    ``min_delta_us``, which keeps sub-microsecond noise from failing runs.
+
+    Args:
+        results: Benchmark statistics of this run
+        baseline: Benchmark statistics of the baseline run
+        thresholds: Default and per-pattern tolerances
+
+    Returns:
+        One comparison per benchmark of this run, with its status:
+        "ok", "improved", "regressed" or "new"
+    """
+    comparisons = []
+    for name, stats in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            comparisons.append({"name": name, "status": "new", "median_us": stats["median_us"]})
+            continue
+        limits = threshold_for(name, thresholds)
+        delta = stats["median_us"] - previous["median_us"]
+        change = delta / previous["median_us"] if previous["median_us"] else 0.0
+        significant = abs(delta) > limits.get("min_delta_us", 0)
+        if significant and change > limits.get("max_regression", 0.2):
+            status = "regressed"
+        elif significant and change < -limits.get("max_regression", 0.2):
+            status = "improved"
+        else:
+            status = "ok"
+        comparisons.append({
+            "name": name,
+            "status": status,
+            "median_us": stats["median_us"],
+            "baseline_us": previous["median_us"],
+            "change": round(change, 4),
+        })
+    return comparisons
+
+
+def run(pattern: Optional[str], rounds: int, min_round_seconds: float) -> Dict[str, Dict[str, Any]]:
+    """Run the benchmarks matching a pattern, printing each result"""
+    results = {}
+    print(f"{'benchmark':40} {'median us':>12} {'p95 us':>12} {'ops/s':>10}")
+    for name, func in build_benchmarks().items():
+        if pattern and not fnmatch.fnmatchcase(name, pattern):
+            continue
+        stats = measure(func, rounds, min_round_seconds)
+        results[name] = stats
+        print(f"{name:40} {stats['median_us']:>12} {stats['p95_us']:>12} {stats['ops_per_sec']:>10}")
+    return results
+
+
+def report(comparisons: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """Print the comparison with the baseline, returning regression and improvement counts"""
+    print()
+    print(f"{'benchmark':40} {'baseline us':>12} {'median us':>12} {'change':>8}  status")
+    for comparison in comparisons:
+        change = comparison.get("change")
+        print(
+            f"{comparison['name']:40} {comparison.get('baseline_us', '-'):>12} {comparison['median_us']:>12} "
+            f"{f'{change:+.1%}' if change is not None else '-':>8}  {comparison['status']}"
+        )
+    statuses = [comparison["status"] for comparison in comparisons]
+    return statuses.count("regressed"), statuses.count("improved")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--filter", help="Run only benchmarks matching this glob pattern")
+    parser.add_argument("--rounds", type=int, default=15, help="Timed rounds per benchmark")
+    parser.add_argument("--min-round-ms", type=float, default=50, help="Minimum duration of a round")
+    parser.add_argument("--quick", action="store_true", help="Fewer, shorter rounds for a smoke run")
+    parser.add_argument("--json", dest="json_path", help="Write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results of a previous run to compare with")
+    parser.add_argument("--thresholds", default=str(DEFAULT_THRESHOLDS), help="Regression tolerances")
+    args = parser.parse_args()
+
+    rounds, min_round_seconds = args.rounds, args.min_round_ms / 1000
+    if args.quick:
+        rounds, min_round_seconds = 5, 0.01
+    results = run(args.filter, rounds, min_round_seconds)
+    if not results:
+        print("No benchmark matches the filter", file=sys.stderr)
+        return 1
+
+    output: Dict[str, Any] = {"environment": environment(), "benchmarks": results}
+    exit_code = 0
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        thresholds = json.loads(Path(args.thresholds).read_text())
+        comparisons = compare(results, baseline["benchmarks"], thresholds)
+        regressions, improvements = report(comparisons)
+        output["comparison"] = {
+            "baseline": baseline.get("environment", {}).get("commit"),
+            "regressions": regressions,
+            "improvements": improvements,
+            "benchmarks": comparisons,
+        }
+        print(f"\n{regressions} regression(s), {improvements} improvement(s)")
+        exit_code = 1 if regressions else 0
+
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(output, indent=2))
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
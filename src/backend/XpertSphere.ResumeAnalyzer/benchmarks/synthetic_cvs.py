@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+"""
+Deterministic generator of synthetic CV PDFs for benchmarks
+
+Each CV is fully determined by its spec: the seed picks the candidate,
+experiences, trainings and skills, while the page count, column layout,
+number of fonts and number of embedded images shape the document. The
+same spec always produces byte-identical PDFs, so timings can be
+compared between commits. Alongside the PDF, each CV carries the JSON
+an LLM would return for it, used to benchmark response parsing.
+
+Usage:
+    python benchmarks/synthetic_cvs.py --out corpus/ [--seed 0]
+"""
+
+import argparse
+import itertools
+import json
+import random
+import sys
+import textwrap
+import unicodedata
+import zlib
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Sequence, Tuple
+
+# Standard Type1 fonts, available in every PDF reader without embedding
+FONTS = ("Helvetica", "Times-Roman", "Courier", "Helvetica-Bold", "Times-Italic", "Courier-Bold")
+
+PAGE_WIDTH = 595
+PAGE_HEIGHT = 842
+TOP = 800
+BOTTOM = 50
+LINE_HEIGHT = 13
+FONT_SIZE = 10
+IMAGE_SIZE = 64
+
+FIRST_NAMES = ("Alice", "Bruno", "Chloé", "David", "Emma", "Farid", "Gaëlle", "Hugo", "Inès", "Julien")
+LAST_NAMES = ("Martin", "Bernard", "Dubois", "Thomas", "Robert", "Petit", "Durand", "Leroy", "Moreau", "Simon")
+CITIES = ("Paris", "Lyon", "Marseille", "Toulouse", "Nantes", "Lille", "Bordeaux", "Strasbourg")
+PROFESSIONS = ("Software Engineer", "Data Scientist", "DevOps Engineer", "Product Manager", "QA Analyst")
+COMPANIES = ("Capgemini", "Sopra Steria", "Atos", "Thales", "Orange", "Dassault Systèmes", "Ubisoft", "Criteo")
+TITLES = ("Backend Developer", "Full Stack Developer", "Data Engineer", "Tech Lead", "Cloud Architect", "Intern")
+SCHOOLS = ("Université Paris-Saclay", "INSA Lyon", "EPITA", "Télécom Paris", "Université de Nantes", "ENSIMAG")
+LEVELS = ("Master", "Bachelor", "Engineering degree", "DUT", "Baccalauréat")
+FIELDS = ("Computer Science", "Applied Mathematics", "Software Engineering", "Data Science", "Networks")
+SKILLS = (
+    "Python", "C#", ".NET", "FastAPI", "Docker", "Kubernetes", "Azure", "SQL", "PostgreSQL", "React",
+    "TypeScript", "Terraform", "Git", "CI/CD", "Scrum", "Kafka", "Redis", "Spark", "Linux", "Teamwork",
+)
+LANGUAGES = ("French", "English", "Spanish", "German", "Italian")
+DUTIES = (
+    "Designed and maintained REST APIs serving several million requests a day",
+    "Migrated legacy services to containers orchestrated with Kubernetes",
+    "Built data pipelines ingesting events from Kafka into the data warehouse",
+    "Reduced cloud costs by right-sizing databases and caching hot queries",
+    "Mentored junior developers and led code reviews for a team of six",
+    "Automated deployments with infrastructure as code and blue-green releases",
+    "Improved test coverage from forty to eighty-five percent across the codebase",
+    "Worked with product owners to refine the backlog and estimate user stories",
+)
+
+
+@dataclass(frozen=True)
+class CVSpec:
+    """Shape of a synthetic CV"""
+
+    seed: int = 0
+    pages: int = 1
+    columns: int = 1
+    fonts: int = 1
+    images: int = 0
+
+    @property
+    def name(self) -> str:
+        """Stable name of the CV, used in file and benchmark names"""
+        return f"cv-s{self.seed}-p{self.pages}-c{self.columns}-f{self.fonts}-i{self.images}"
+
+
+@dataclass(frozen=True)
+class SyntheticCV:
+    """Generated CV document and the structured data it contains"""
+
+    spec: CVSpec
+    pdf: bytes
+    data: Dict[str, Any]
+
+    @property
+    def llm_response(self) -> str:
+        """JSON an LLM would return for this CV"""
+        return json.dumps(self.data, ensure_ascii=False)
+
+
+def corpus_specs(
+    pages: Sequence[int] = (1, 2, 5),
+    columns: Sequence[int] = (1, 2),
+    fonts: Sequence[int] = (1, 3),
+    images: Sequence[int] = (0, 2),
+    seed: int = 0,
+) -> List[CVSpec]:
+    """
+    Every combination of the given document shapes
+
+    Args:
+        pages: Page counts
+        columns: Column layouts, 1 or 2
+        fonts: Numbers of distinct fonts
+        images: Numbers of embedded images per page
+        seed: Seed of the first CV, incremented for each combination
+
+    Returns:
+        One spec per combination
+    """
+    return [
+        CVSpec(seed + index, *shape)
+        for index, shape in enumerate(itertools.product(pages, columns, fonts, images))
+    ]
+
+
+def _ascii(text: str) -> str:
+    """Drop the accents of a string"""
+    return unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+
+
+def _profile(rng: random.Random, pages: int) -> Dict[str, Any]:
+    """Candidate data, with enough experiences to fill the requested pages"""
+    first_name, last_name = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    city = rng.choice(CITIES)
+    experiences = []
+    year = 2024
+    # About three experiences fill a page once duties are wrapped
+    for _ in range(3 * pages + 1):
+        start = year - rng.randint(1, 3)
+        experiences.append({
+            "title": rng.choice(TITLES),
+            "description": ". ".join(rng.sample(DUTIES, 4)) + ".",
+            "date": f"{start} - {year}",
+            "company": rng.choice(COMPANIES),
+            "location": rng.choice(CITIES),
+        })
+        year = start
+    trainings = [
+        {
+            "school": rng.choice(SCHOOLS),
+            "level": level,
+            "period": f"{year - 2 * (index + 1)} - {year - 2 * index}",
+            "field": rng.choice(FIELDS),
+        }
+        for index, level in enumerate(rng.sample(LEVELS, 2))
+    ]
+    return {
+        "first_name": first_name,
+        "last_name": last_name,
+        "email": _ascii(f"{first_name}.{last_name}@example.com".lower()),
+        "phone_number": "+33 6 " + " ".join(f"{rng.randint(0, 99):02d}" for _ in range(4)),
+        "profession": rng.choice(PROFESSIONS),
+        "address": f"{rng.randint(1, 120)} rue de la République, {city}",
+        "languages": rng.sample(LANGUAGES, 3),
+        "trainings": trainings,
+        "skills": rng.sample(SKILLS, 12),
+        "experiences": experiences,
+    }
+
+
+def _main_lines(data: Dict[str, Any], width: int, with_contact: bool) -> List[Tuple[int, str]]:
+    """Lines of the main column, as (font index, text) pairs"""
+    lines = [(1, f"{data['first_name']} {data['last_name']}"), (0, data["profession"])]
+    if with_contact:
+        lines += [(0, data["email"]), (0, data["phone_number"]), (0, data["address"])]
+        lines += [(0, "Skills: " + ", ".join(data["skills"])), (0, "Languages: " + ", ".join(data["languages"]))]
+    lines += [(0, ""), (1, "PROFESSIONAL EXPERIENCE")]
+    for experience in data["experiences"]:
+        lines.append((2, f"{experience['title']} - {experience['company']}, {experience['location']}"))
+        lines.append((3, experience["date"]))
+        lines += [(0, line) for line in textwrap.wrap(experience["description"], width)]
+        lines.append((0, ""))
+    lines.append((1, "EDUCATION"))
+    for training in data["trainings"]:
+        lines.append((2, f"{training['level']} in {training['field']} - {training['school']}"))
+        lines.append((3, training["period"]))
+    return lines
+
+
+def _sidebar_lines(data: Dict[str, Any], width: int) -> List[Tuple[int, str]]:
+    """Lines of the sidebar of two-column layouts"""
+    lines = [(1, "CONTACT")]
+    for value in (data["email"], data["phone_number"], data["address"]):
+        lines += [(0, line) for line in textwrap.wrap(value, width)]
+    lines += [(0, ""), (1, "SKILLS")] + [(0, skill) for skill in data["skills"]]
+    lines += [(0, ""), (1, "LANGUAGES")] + [(0, language) for language in data["languages"]]
+    return lines
+
+
+def _paginate(lines: List[Tuple[int, str]], pages: int) -> List[List[Tuple[int, str]]]:
+    """Split lines into exactly the requested number of pages"""
+    per_page = (TOP - BOTTOM) // LINE_HEIGHT
+    chunks = [lines[start:start + per_page] for start in range(0, len(lines), per_page)]
+    chunks = chunks[:pages]
+    while len(chunks) < pages:
+        chunks.append([(0, "References available on request")])
+    return chunks
+
+
+def _image(rng: random.Random) -> bytes:
+    """Compressed RGB pixels of a deterministic gradient, like a small photo"""
+    red, green, blue = rng.randint(0, 255), rng.randint(0, 255), rng.randint(0, 255)
+    pixels = bytearray()
+    for y in range(IMAGE_SIZE):
+        for x in range(IMAGE_SIZE):
+            pixels += bytes(((red + x * 3) % 256, (green + y * 3) % 256, (blue + x + y) % 256))
+    return zlib.compress(bytes(pixels))
+
+
+def _escape(text: str) -> str:
+    """Escape a string for a PDF literal, in the Latin-1 encoding of the standard fonts"""
+    return text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def _text_commands(lines: List[Tuple[int, str]], x: int, fonts: int) -> List[str]:
+    """Text operators drawing lines from the top of the page at the given x"""
+    commands = ["BT"]
+    current = None
+    for row, (font, text) in enumerate(lines):
+        if not text:
+            continue
+        font = font % fonts
+        if font != current:
+            commands.append(f"/F{font + 1} {FONT_SIZE} Tf")
+            current = font
+        commands.append(f"1 0 0 1 {x} {TOP - LINE_HEIGHT * row} Tm ({_escape(text)}) Tj")
+    commands.append("ET")
+    return commands
+
+
+def generate_cv(spec: CVSpec) -> SyntheticCV:
+    """
+    Generate a synthetic CV
+
+    Args:
+        spec: Shape of the CV
+
+    Returns:
+        PDF content and the structured data it contains
+    """
+    rng = random.Random(spec.seed)
+    data = _profile(rng, spec.pages)
+    fonts = max(1, min(spec.fonts, len(FONTS)))
+
+    if spec.columns > 1:
+        main_pages = _paginate(_main_lines(data, 60, with_contact=False), spec.pages)
+        sidebars = [_sidebar_lines(data, 28)] + [[]] * (spec.pages - 1)
+        main_x = 210
+    else:
+        main_pages = _paginate(_main_lines(data, 90, with_contact=True), spec.pages)
+        sidebars = [[]] * spec.pages
+        main_x = 50
+
+    objects: List[bytes] = [b"<< /Type /Catalog /Pages 2 0 R >>", b""]
+    font_refs = []
+    for font in FONTS[:fonts]:
+        objects.append(f"<< /Type /Font /Subtype /Type1 /BaseFont /{font} /Encoding /WinAnsiEncoding >>".encode())
+        font_refs.append(len(objects))
+    image_refs = []
+    for _ in range(spec.images):
+        pixels = _image(rng)
+        objects.append(
+            f"<< /Type /XObject /Subtype /Image /Width {IMAGE_SIZE} /Height {IMAGE_SIZE} "
+            f"/ColorSpace /DeviceRGB /BitsPerComponent 8 /Filter /FlateDecode /Length {len(pixels)} >>\n"
+            f"stream\n".encode() + pixels + b"\nendstream"
+        )
+        image_refs.append(len(objects))
+    resources = (
+        "<< /Font << " + " ".join(f"/F{index + 1} {ref} 0 R" for index, ref in enumerate(font_refs)) + " >>"
+        + " /XObject << " + " ".join(f"/Im{index + 1} {ref} 0 R" for index, ref in enumerate(image_refs)) + " >> >>"
+    )
+
+    page_refs = []
+    for main, sidebar in zip(main_pages, sidebars):
+        commands = _text_commands(main, main_x, fonts)
+        if sidebar:
+            commands += _text_commands(sidebar, 40, fonts)
+        # Images sit in the top-right corner, stacked downwards, like profile photos and logos
+        for index in range(len(image_refs)):
+            y = TOP - (IMAGE_SIZE + 10) * (index + 1)
+            commands.append(f"q {IMAGE_SIZE} 0 0 {IMAGE_SIZE} {PAGE_WIDTH - IMAGE_SIZE - 30} {y} cm /Im{index + 1} Do Q")
+        stream = "\n".join(commands).encode("cp1252")
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n".encode() + stream + b"\nendstream")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] "
+            f"/Resources {resources} /Contents {len(objects)} 0 R >>".encode()
+        )
+        page_refs.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(page_refs)} >>".encode()
+
+    output = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets).encode()
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n".encode()
+    return SyntheticCV(spec, bytes(output), data)
+
+
+def generate_corpus(specs: Sequence[CVSpec]) -> Iterator[SyntheticCV]:
+    """Generate the CV of each spec"""
+    for spec in specs:
+        yield generate_cv(spec)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--out", required=True, help="Directory receiving the PDFs and their JSON")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the first CV")
+    args = parser.parse_args()
+
+    out = Path(args.out)
+    out.mkdir(parents=True, exist_ok=True)
+    for cv in generate_corpus(corpus_specs(seed=args.seed)):
+        (out / f"{cv.spec.name}.pdf").write_bytes(cv.pdf)
+        (out / f"{cv.spec.name}.json").write_text(cv.llm_response, encoding="utf-8")
+        print(f"{cv.spec.name}.pdf {len(cv.pdf):>8} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
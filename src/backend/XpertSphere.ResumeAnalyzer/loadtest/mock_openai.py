@@ -0,0 +1,396 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Azure OpenAI chat completions API
+
+Serves ``POST /openai/deployments/{deployment}/chat/completions`` in the
+Azure OpenAI wire format, streamed or not, answering with the JSON of a
+synthetic CV. Latency before the first token, the token generation rate,
+throttling (random 429s or requests/tokens per minute quotas) and server
+errors are configurable, so the service can be load-tested offline
+without spending quota. ``GET /openai/models`` answers the health
+monitor's reachability probe and ``GET /stats`` returns the request
+counters.
+
+Latency distributions, in seconds:
+    fixed:0.8               always 0.8
+    uniform:0.5,2.0         uniform between 0.5 and 2.0
+    lognormal:0.8,0.5       log-normal with median 0.8 and sigma 0.5
+    exponential:1.0         exponential with mean 1.0
+
+Usage:
+    python loadtest/mock_openai.py --port 8100 --latency lognormal:0.8,0.5 --tokens-per-second 80 --throttle-rate 0.02
+
+Point the service at it with AZURE_OPENAI_ENDPOINT=http://127.0.0.1:8100/.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import re
+import sys
+import time
+import uuid
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Deque, Dict, List, Optional, Tuple
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi import FastAPI, Request  # noqa: E402
+from fastapi.responses import JSONResponse, StreamingResponse  # noqa: E402
+from benchmarks.synthetic_cvs import CVSpec, generate_cv  # noqa: E402
+
+# Characters per token, the usual approximation for English text
+CHARS_PER_TOKEN = 4
+# Tokens sent in each streamed chunk
+TOKENS_PER_CHUNK = 5
+QUOTA_WINDOW_SECONDS = 60.0
+# Synthetic CVs are told apart by their phone number
+_PHONE = re.compile(r"\+33 6(?: \d\d){4}")
+
+
+def document_spec(seed: int, index: int) -> CVSpec:
+    """
+    Shape of the index-th synthetic CV of a corpus
+
+    The load test sends these documents and the mock answers each with its
+    own data, so the service's checks against the CV text pass.
+
+    Args:
+        seed: Seed of the corpus
+        index: Position of the CV in the corpus
+
+    Returns:
+        Spec of the CV
+    """
+    return CVSpec(seed=seed + index, pages=1 + index % 3, columns=1 + index % 2, images=index % 2)
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """
+    Parse a latency distribution
+
+    Args:
+        spec: Distribution name and parameters, such as ``uniform:0.5,2.0``
+
+    Returns:
+        Function drawing a latency in seconds from a random generator
+
+    Raises:
+        ValueError: If the distribution is unknown or its parameters invalid
+    """
+    name, _, params = spec.partition(":")
+    values = [float(value) for value in params.split(",") if value]
+    if name == "fixed" and len(values) == 1:
+        return lambda rng: values[0]
+    if name == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1])
+    if name == "lognormal" and len(values) == 2:
+        return lambda rng: rng.lognormvariate(math.log(values[0]), values[1])
+    if name == "exponential" and len(values) == 1:
+        return lambda rng: rng.expovariate(1 / values[0]) if values[0] > 0 else 0.0
+    raise ValueError(f"Invalid latency distribution: {spec}")
+
+
+@dataclass
+class MockConfig:
+    """Behaviour of the mock deployment"""
+
+    latency: str = "fixed:0.5"
+    tokens_per_second: float = 100.0
+    throttle_rate: float = 0.0
+    error_rate: float = 0.0
+    retry_after_seconds: float = 1.0
+    rpm_limit: int = 0
+    tpm_limit: int = 0
+    responses: int = 32
+    seed: int = 0
+
+
+class MockDeployment:
+    """
+    State of the mock deployment: canned responses, quotas and counters
+    """
+
+    def __init__(self, config: MockConfig):
+        """
+        Initialize the deployment
+
+        Args:
+            config: Behaviour of the deployment
+        """
+        self.config = config
+        self.rng = random.Random(config.seed)
+        self.draw_latency = parse_latency(config.latency)
+        cvs = [generate_cv(document_spec(config.seed, index)) for index in range(max(1, config.responses))]
+        self.responses = [cv.llm_response for cv in cvs]
+        self._by_phone = {cv.data["phone_number"]: cv.llm_response for cv in cvs}
+        self._requests: Deque[float] = deque()
+        self._tokens: Deque[Tuple[float, int]] = deque()
+        self.counters = {
+            "requests": 0,
+            "completed": 0,
+            "streamed": 0,
+            "throttled": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "max_in_flight": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+            "model_listings": 0,
+        }
+
+    def pick_response(self, messages: List[Dict[str, Any]]) -> str:
+        """
+        Canned response for a prompt
+
+        A prompt containing one of the canned CVs gets that CV's data; any
+        other prompt gets a CV picked by a hash of the prompt.
+        """
+        prompt = "".join(str(message.get("content", "")) for message in messages)
+        for phone in _PHONE.findall(prompt):
+            if phone in self._by_phone:
+                return self._by_phone[phone]
+        return self.responses[zlib.crc32(prompt.encode()) % len(self.responses)]
+
+    def check_quota(self, tokens: int) -> Optional[float]:
+        """
+        Count a request against the per-minute quotas
+
+        Args:
+            tokens: Prompt and completion tokens of the request
+
+        Returns:
+            Seconds until the quota has room, or None when the request is admitted
+        """
+        now = time.monotonic()
+        while self._requests and now - self._requests[0] >= QUOTA_WINDOW_SECONDS:
+            self._requests.popleft()
+        while self._tokens and now - self._tokens[0][0] >= QUOTA_WINDOW_SECONDS:
+            self._tokens.popleft()
+        if self.config.rpm_limit and len(self._requests) >= self.config.rpm_limit:
+            return QUOTA_WINDOW_SECONDS - (now - self._requests[0])
+        used = sum(count for _, count in self._tokens)
+        if self.config.tpm_limit and self._tokens and used + tokens > self.config.tpm_limit:
+            return QUOTA_WINDOW_SECONDS - (now - self._tokens[0][0])
+        self._requests.append(now)
+        self._tokens.append((now, tokens))
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counters"""
+        return dict(self.counters)
+
+
+def _throttled(retry_after: float) -> JSONResponse:
+    """429 response as sent by Azure OpenAI"""
+    retry_after = max(retry_after, 0.001)
+    return JSONResponse(
+        status_code=429,
+        content={"error": {
+            "code": "429",
+            "message": "Requests to the ChatCompletions_Create Operation have exceeded the rate limit "
+                       f"of your current tier. Please retry after {math.ceil(retry_after)} seconds.",
+        }},
+        headers={"retry-after": str(math.ceil(retry_after)), "retry-after-ms": str(int(retry_after * 1000))},
+    )
+
+
+def _completion_id() -> str:
+    return f"chatcmpl-{uuid.uuid4().hex[:24]}"
+
+
+def create_app(config: Optional[MockConfig] = None) -> FastAPI:
+    """
+    Build the mock Azure OpenAI application
+
+    Args:
+        config: Behaviour of the mock deployment
+
+    Returns:
+        ASGI application
+    """
+    deployment = MockDeployment(config or MockConfig())
+    app = FastAPI(title="Mock Azure OpenAI")
+    app.state.deployment = deployment
+
+    @app.post("/openai/deployments/{name}/chat/completions")
+    async def chat_completions(name: str, request: Request):
+        body = await request.json()
+        counters = deployment.counters
+        counters["requests"] += 1
+        content = deployment.pick_response(body.get("messages", []))
+        prompt_tokens = sum(len(str(m.get("content", ""))) for m in body.get("messages", [])) // CHARS_PER_TOKEN
+        completion_tokens = max(1, len(content) // CHARS_PER_TOKEN)
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+        retry_after = deployment.check_quota(usage["total_tokens"])
+        if retry_after is None and deployment.rng.random() < deployment.config.throttle_rate:
+            retry_after = deployment.config.retry_after_seconds
+        if retry_after is not None:
+            counters["throttled"] += 1
+            return _throttled(retry_after)
+        if deployment.rng.random() < deployment.config.error_rate:
+            counters["errors"] += 1
+            return JSONResponse(
+                status_code=500, content={"error": {"code": "InternalServerError", "message": "Mock failure"}}
+            )
+
+        latency = deployment.draw_latency(deployment.rng)
+        tokens_per_second = deployment.config.tokens_per_second
+        headers = {
+            "x-ratelimit-remaining-requests": str(max(0, deployment.config.rpm_limit - len(deployment._requests))),
+            "x-ratelimit-remaining-tokens": str(
+                max(0, deployment.config.tpm_limit - sum(count for _, count in deployment._tokens))
+            ),
+        }
+        completion_id, created = _completion_id(), int(time.time())
+
+        if body.get("stream"):
+            counters["streamed"] += 1
+            include_usage = bool((body.get("stream_options") or {}).get("include_usage"))
+            return StreamingResponse(
+                _stream(deployment, content, usage, include_usage, latency, completion_id, created, name),
+                media_type="text/event-stream",
+                headers=headers,
+            )
+
+        counters["in_flight"] += 1
+        counters["max_in_flight"] = max(counters["max_in_flight"], counters["in_flight"])
+        try:
+            generation = completion_tokens / tokens_per_second if tokens_per_second > 0 else 0.0
+            await asyncio.sleep(latency + generation)
+        finally:
+            counters["in_flight"] -= 1
+        counters["completed"] += 1
+        counters["prompt_tokens"] += prompt_tokens
+        counters["completion_tokens"] += completion_tokens
+        return JSONResponse(
+            content={
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": name,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": content},
+                    "finish_reason": "stop",
+                }],
+                "usage": usage,
+            },
+            headers=headers,
+        )
+
+    @app.get("/openai/models")
+    async def models():
+        deployment.counters["model_listings"] += 1
+        return {"object": "list", "data": [{"id": "gpt-4o-mini", "object": "model"}]}
+
+    @app.get("/stats")
+    async def stats():
+        return deployment.stats()
+
+    return app
+
+
+async def _stream(
+    deployment: MockDeployment,
+    content: str,
+    usage: Dict[str, int],
+    include_usage: bool,
+    latency: float,
+    completion_id: str,
+    created: int,
+    model: str,
+) -> AsyncIterator[str]:
+    """Server-sent events of a streamed completion, generated at the configured token rate"""
+    counters = deployment.counters
+    counters["in_flight"] += 1
+    counters["max_in_flight"] = max(counters["max_in_flight"], counters["in_flight"])
+
+    def chunk(choices: List[Dict[str, Any]], **extra: Any) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": choices,
+            **extra,
+        }
+        return f"data: {json.dumps(payload)}\n\n"
+
+    try:
+        await asyncio.sleep(latency)
+        size = TOKENS_PER_CHUNK * CHARS_PER_TOKEN
+        tokens_per_second = deployment.config.tokens_per_second
+        for start in range(0, len(content), size):
+            delta = {"content": content[start:start + size]}
+            if start == 0:
+                delta["role"] = "assistant"
+            yield chunk([{"index": 0, "delta": delta, "finish_reason": None}])
+            if tokens_per_second > 0:
+                await asyncio.sleep(TOKENS_PER_CHUNK / tokens_per_second)
+        yield chunk([{"index": 0, "delta": {}, "finish_reason": "stop"}])
+        if include_usage:
+            yield chunk([], usage=usage)
+        yield "data: [DONE]\n\n"
+        counters["completed"] += 1
+        counters["prompt_tokens"] += usage["prompt_tokens"]
+        counters["completion_tokens"] += usage["completion_tokens"]
+    finally:
+        counters["in_flight"] -= 1
+
+
+def config_from_args(args: argparse.Namespace) -> MockConfig:
+    """Build the mock configuration from parsed command-line arguments"""
+    return MockConfig(
+        latency=args.latency,
+        tokens_per_second=args.tokens_per_second,
+        throttle_rate=args.throttle_rate,
+        error_rate=args.error_rate,
+        retry_after_seconds=args.retry_after,
+        rpm_limit=args.rpm_limit,
+        tpm_limit=args.tpm_limit,
+        responses=args.responses,
+        seed=args.seed,
+    )
+
+
+def add_mock_arguments(parser: argparse.ArgumentParser) -> None:
+    """Add the options of the mock deployment to a parser"""
+    parser.add_argument("--latency", default="fixed:0.5", help="Latency before the first token")
+    parser.add_argument("--tokens-per-second", type=float, default=100.0, help="Generation rate, 0 for instant")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Share of requests answered with a 429")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of requests answered with a 500")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After of injected 429s, seconds")
+    parser.add_argument("--rpm-limit", type=int, default=0, help="Requests per minute quota, 0 for none")
+    parser.add_argument("--tpm-limit", type=int, default=0, help="Tokens per minute quota, 0 for none")
+    parser.add_argument("--responses", type=int, default=32, help="Number of canned CVs, as in document_spec")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the canned CVs and random draws")
+
+
+def main() -> int:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+
+    parse_latency(args.latency)
+    uvicorn.run(create_app(config_from_args(args)), host=args.host, port=args.port, log_level="warning")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test of /api/extract/ against the local Azure OpenAI stand-in
+
+By default, starts mock_openai.py in a subprocess and the service in this
+process, on its own thread and event loop, pointed at the mock; result
+caches are disabled so every request reaches the LLM stage. Synthetic CV
+PDFs are then posted at the target rate with open-loop arrivals (requests
+are sent on schedule whatever the response times, as real clients do)
+and the run reports throughput, latency percentiles, error rates, the
+analysis modes served, and the lag of the service's event loop. Pass
+--target to load an already running service instead, in which case the
+service's event loop lag is not available.
+
+Usage:
+    python loadtest/run_loadtest.py --rps 20 --duration 60 --latency lognormal:1.5,0.4 --throttle-rate 0.05
+    python loadtest/run_loadtest.py --target http://localhost:8000 --rps 5 --duration 30 --json run.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+# Add the project root to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.synthetic_cvs import generate_cv  # noqa: E402
+from loadtest.mock_openai import add_mock_arguments, document_spec, parse_latency  # noqa: E402
+
+MOCK_SCRIPT = Path(__file__).parent / "mock_openai.py"
+
+
+@dataclass
+class RequestResult:
+    """Outcome of one request"""
+
+    started: float
+    latency: float
+    status: Optional[int]
+    error: Optional[str] = None
+    analysis_mode: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.status is not None and 200 <= self.status < 300
+
+
+def percentile(values: Sequence[float], percent: float) -> float:
+    """
+    Nearest-rank percentile
+
+    Args:
+        values: Samples, in any order
+        percent: Percentile between 0 and 100
+
+    Returns:
+        The percentile, 0.0 without samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, int(-(-percent * len(ordered) // 100)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+class LoopLagMonitor:
+    """
+    Measures event loop lag: how late a periodic timer wakes up
+
+    A loop blocked by CPU-bound work, such as PDF parsing on the event
+    loop thread, wakes its timers late by the time it was blocked.
+    """
+
+    def __init__(self, interval: float = 0.05):
+        """
+        Initialize the monitor
+
+        Args:
+            interval: Period of the timer, in seconds
+        """
+        self.interval = interval
+        self.samples: List[float] = []
+
+    async def run(self) -> None:
+        """Sample the lag until cancelled"""
+        loop = asyncio.get_running_loop()
+        while True:
+            started = loop.time()
+            await asyncio.sleep(self.interval)
+            self.samples.append(max(0.0, loop.time() - started - self.interval))
+
+    def reset(self) -> None:
+        """Drop the samples taken so far"""
+        self.samples = []
+
+    def summary(self) -> Dict[str, Any]:
+        """Lag percentiles in milliseconds"""
+        samples = self.samples
+        return {
+            "samples": len(samples),
+            "p50_ms": round(percentile(samples, 50) * 1000, 2),
+            "p99_ms": round(percentile(samples, 99) * 1000, 2),
+            "max_ms": round(max(samples, default=0.0) * 1000, 2),
+        }
+
+
+def summarize(results: List[RequestResult], elapsed: float, dropped: int) -> Dict[str, Any]:
+    """
+    Aggregate request outcomes
+
+    Args:
+        results: Outcome of every request sent
+        elapsed: Seconds from the first request sent to the last completion
+        dropped: Requests not sent because too many were outstanding
+
+    Returns:
+        Throughput, latency percentiles of successful requests, and
+        error counts by status code or exception
+    """
+    succeeded = [result for result in results if result.ok]
+    latencies = [result.latency * 1000 for result in succeeded]
+    errors = Counter(
+        str(result.status) if result.status is not None else result.error
+        for result in results
+        if not result.ok
+    )
+    attempted = len(results) + dropped
+    return {
+        "sent": len(results),
+        "dropped": dropped,
+        "succeeded": len(succeeded),
+        "elapsed_s": round(elapsed, 2),
+        "throughput_rps": round(len(succeeded) / elapsed, 2) if elapsed > 0 else 0.0,
+        "error_rate": round((attempted - len(succeeded)) / attempted, 4) if attempted else 0.0,
+        "errors": dict(errors),
+        "analysis_modes": dict(Counter(result.analysis_mode for result in succeeded if result.analysis_mode)),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 1),
+            "p95": round(percentile(latencies, 95), 1),
+            "p99": round(percentile(latencies, 99), 1),
+            "max": round(max(latencies, default=0.0), 1),
+            "mean": round(statistics.fmean(latencies), 1) if latencies else 0.0,
+        },
+    }
+
+
+async def send(client: httpx.AsyncClient, url: str, document: bytes, name: str, mode: str) -> RequestResult:
+    """Post one CV and record its outcome"""
+    started = time.perf_counter()
+    try:
+        response = await client.post(
+            url, params={"mode": mode}, files={"file": (name, document, "application/pdf")}
+        )
+    except httpx.HTTPError as e:
+        return RequestResult(started, time.perf_counter() - started, None, e.__class__.__name__)
+    return RequestResult(
+        started, time.perf_counter() - started, response.status_code,
+        analysis_mode=response.headers.get("x-analysis-mode"),
+    )
+
+
+async def generate_load(
+    base_url: str,
+    documents: List[bytes],
+    rps: float,
+    duration: float,
+    max_outstanding: int,
+    arrival: str = "constant",
+    mode: str = "full",
+    timeout: float = 120.0,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """
+    Post CVs at a target rate with open-loop arrivals
+
+    Args:
+        base_url: URL of the service
+        documents: PDF documents, sent in turn
+        rps: Target requests per second
+        duration: Seconds during which requests are sent
+        max_outstanding: Requests in flight beyond which new ones are dropped
+        arrival: "constant" spacing or "poisson" arrivals
+        mode: Analysis mode of the requests
+        timeout: Timeout of a single request, in seconds
+        seed: Seed of the Poisson arrivals
+
+    Returns:
+        Summary of the run, including the client's own event loop lag
+    """
+    rng = random.Random(seed)
+    url = f"{base_url.rstrip('/')}/api/extract/"
+    limits = httpx.Limits(max_connections=max_outstanding, max_keepalive_connections=max_outstanding)
+    client_lag = LoopLagMonitor()
+    lag_task = asyncio.create_task(client_lag.run())
+    tasks: List[asyncio.Task] = []
+    dropped = 0
+    async with httpx.AsyncClient(timeout=timeout, limits=limits) as client:
+        started = time.perf_counter()
+        next_send = started
+        index = 0
+        while next_send - started < duration:
+            await asyncio.sleep(max(0.0, next_send - time.perf_counter()))
+            if sum(not task.done() for task in tasks) >= max_outstanding:
+                dropped += 1
+            else:
+                document = documents[index % len(documents)]
+                tasks.append(asyncio.create_task(send(client, url, document, f"cv-{index}.pdf", mode)))
+            index += 1
+            next_send += rng.expovariate(rps) if arrival == "poisson" else 1 / rps
+        results = list(await asyncio.gather(*tasks))
+        elapsed = time.perf_counter() - started
+    lag_task.cancel()
+
+    summary = summarize(results, elapsed, dropped)
+    summary["target_rps"] = rps
+    summary["client_loop_lag"] = client_lag.summary()
+    return summary
+
+
+def free_port() -> int:
+    """Pick an unused local TCP port"""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(url: str, timeout: float = 30.0) -> None:
+    """Poll a URL until it answers"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            httpx.get(url, timeout=1.0)
+            return
+        except httpx.HTTPError:
+            if time.monotonic() > deadline:
+                raise RuntimeError(f"{url} did not start within {timeout} seconds")
+            time.sleep(0.1)
+
+
+def start_mock(port: int, args: argparse.Namespace) -> subprocess.Popen:
+    """Start the Azure OpenAI stand-in in a subprocess"""
+    command = [
+        sys.executable, str(MOCK_SCRIPT), "--port", str(port),
+        "--latency", args.latency,
+        "--tokens-per-second", str(args.tokens_per_second),
+        "--throttle-rate", str(args.throttle_rate),
+        "--error-rate", str(args.error_rate),
+        "--retry-after", str(args.retry_after),
+        "--rpm-limit", str(args.rpm_limit),
+        "--tpm-limit", str(args.tpm_limit),
+        "--responses", str(args.documents),
+        "--seed", str(args.seed),
+    ]
+    process = subprocess.Popen(command)
+    wait_until_ready(f"http://127.0.0.1:{port}/stats")
+    return process
+
+
+class ServiceThread(threading.Thread):
+    """The service, served by uvicorn on its own thread and event loop with a lag monitor"""
+
+    def __init__(self, port: int):
+        super().__init__(daemon=True)
+        self.port = port
+        self.lag = LoopLagMonitor()
+        self.server = None
+
+    def run(self) -> None:
+        asyncio.run(self._serve())
+
+    async def _serve(self) -> None:
+        import uvicorn
+        from app.main import app
+
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        lag_task = asyncio.create_task(self.lag.run())
+        try:
+            await self.server.serve()
+        finally:
+            lag_task.cancel()
+
+    def stop(self) -> None:
+        if self.server is not None:
+            self.server.should_exit = True
+        self.join(timeout=30)
+
+
+def configure_service(mock_url: str, cache: bool) -> None:
+    """Point the in-process service at the mock, before its settings are loaded"""
+    os.environ["AZURE_OPENAI_ENDPOINT"] = mock_url
+    os.environ["AZURE_OPENAI_API_KEY"] = "loadtest"
+    os.environ.setdefault("JOB_QUEUE_DB_PATH", os.path.join(tempfile.mkdtemp(), "jobs.db"))
+    if not cache:
+        os.environ.setdefault("RESULT_CACHE_ENABLED", "false")
+        os.environ.setdefault("TEXT_CACHE_ENABLED", "false")
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Print the main figures of a run"""
+    load = report["load"]
+    latency = load["latency_ms"]
+    print()
+    print(f"target {load['target_rps']} rps, sent {load['sent']}, dropped {load['dropped']}, "
+          f"succeeded {load['succeeded']} in {load['elapsed_s']} s")
+    print(f"throughput     {load['throughput_rps']} rps")
+    print(f"latency ms     p50 {latency['p50']}  p95 {latency['p95']}  p99 {latency['p99']}  "
+          f"max {latency['max']}  mean {latency['mean']}")
+    print(f"error rate     {load['error_rate']:.2%}  {load['errors'] or ''}")
+    print(f"analysis modes {load['analysis_modes']}")
+    if report.get("service_loop_lag"):
+        lag = report["service_loop_lag"]
+        print(f"service loop lag ms  p50 {lag['p50_ms']}  p99 {lag['p99_ms']}  max {lag['max_ms']}")
+    lag = load["client_loop_lag"]
+    print(f"client loop lag ms   p50 {lag['p50_ms']}  p99 {lag['p99_ms']}  max {lag['max_ms']}")
+    if lag["p99_ms"] > 50:
+        print("warning: the load generator itself is saturated, results understate the service")
+    if report.get("mock"):
+        print(f"mock           {report['mock']}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--target", help="URL of a running service; by default one is started with a mock LLM")
+    parser.add_argument("--rps", type=float, default=5.0, help="Target requests per second")
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds during which requests are sent")
+    parser.add_argument("--arrival", choices=("constant", "poisson"), default="poisson")
+    parser.add_argument("--max-outstanding", type=int, default=500, help="Requests in flight before dropping")
+    parser.add_argument("--mode", choices=("full", "fast"), default="full", help="Analysis mode of the requests")
+    parser.add_argument("--documents", type=int, default=32, help="Distinct synthetic CVs sent in turn")
+    parser.add_argument("--warmup", type=int, default=3, help="Requests sent before measuring")
+    parser.add_argument("--timeout", type=float, default=120.0, help="Timeout of a single request")
+    parser.add_argument("--cache", action="store_true", help="Keep the service's result caches enabled")
+    parser.add_argument("--json", dest="json_path", help="Write the report to this JSON file")
+    add_mock_arguments(parser)
+    args = parser.parse_args()
+    parse_latency(args.latency)
+
+    # The mock knows the same corpus and answers each CV with its own data
+    documents = [generate_cv(document_spec(args.seed, index)).pdf for index in range(args.documents)]
+
+    mock = service = None
+    mock_url = None
+    base_url = args.target
+    try:
+        if base_url is None:
+            mock_port, service_port = free_port(), free_port()
+            mock = start_mock(mock_port, args)
+            mock_url = f"http://127.0.0.1:{mock_port}/"
+            configure_service(mock_url, args.cache)
+            service = ServiceThread(service_port)
+            service.start()
+            base_url = f"http://127.0.0.1:{service_port}"
+            wait_until_ready(f"{base_url}/api/health/")
+
+        for index in range(args.warmup):
+            httpx.post(
+                f"{base_url}/api/extract/",
+                params={"mode": args.mode},
+                files={"file": (f"warmup-{index}.pdf", documents[index % len(documents)], "application/pdf")},
+                timeout=args.timeout,
+            )
+        if service is not None:
+            service.lag.reset()
+
+        load = asyncio.run(generate_load(
+            base_url, documents, args.rps, args.duration, args.max_outstanding,
+            args.arrival, args.mode, args.timeout, args.seed,
+        ))
+        report: Dict[str, Any] = {"load": load}
+        if service is not None:
+            report["service_loop_lag"] = service.lag.summary()
+        if mock_url is not None:
+            report["mock"] = httpx.get(f"{mock_url}stats").json()
+        try:
+            report["service"] = httpx.get(f"{base_url}/api/health/detailed", timeout=10).json()
+        except (httpx.HTTPError, ValueError):
+            pass
+    finally:
+        if service is not None:
+            service.stop()
+        if mock is not None:
+            mock.terminate()
+            mock.wait()
+
+    print_report(report)
+    if args.json_path:
+        Path(args.json_path).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,6 +1,9 @@
 import os
+import pytest
 import sys
+import tempfile
 from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
 
 # Get the project root directory
 project_root = Path(__file__).parent.parent
@@ -17,3 +20,104 @@ os.environ["AZURE_OPENAI_DEPLOYMENT_GPT_35_TURBO"] = "test-deployment"
 os.environ["AZURE_OPENAI_MODEL_VERSION_GPT_35_TURBO"] = "0613"
 os.environ["AZURE_OPENAI_TEMPERATURE"] = "0.7"
 os.environ["MAX_FILE_SIZE_MB"] = "3"
+os.environ["JOB_QUEUE_DB_PATH"] = os.path.join(tempfile.mkdtemp(), "jobs.db")
+# Tests entering the lifespan use the pipeline right away
+os.environ["STARTUP_BACKGROUND_WARM_UP"] = "false"
+# The detailed health check does not probe Azure OpenAI
+os.environ["HEALTH_OPENAI_PROBE_TTL_SECONDS"] = "0"
+
+
+def build_pdf(pages):
+    """
+    Build a minimal valid PDF with one line of Helvetica text per entry
+
+    A line given as a tuple is written as side-by-side columns, one text
+    run per column, the way two-column CV templates are.
+
+    Args:
+        pages: List of page texts, each a list of lines or a single string
+
+    Returns:
+        PDF file content
+    """
+    objects = ["<< /Type /Catalog /Pages 2 0 R >>", None, "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>"]
+    page_refs = []
+    for page in pages:
+        lines = [page] if isinstance(page, str) else page
+        commands = ["BT", "/F1 11 Tf"]
+        for row, line in enumerate(lines):
+            for column, text in enumerate([line] if isinstance(line, str) else line):
+                escaped = text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+                commands.append(f"1 0 0 1 {50 + 270 * column} {780 - 14 * row} Tm ({escaped}) Tj")
+        commands.append("ET")
+        stream = "\n".join(commands)
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+        content_ref = len(objects)
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {content_ref} 0 R >>"
+        )
+        page_refs.append(f"{len(objects)} 0 R")
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(page_refs)}] /Count {len(page_refs)} >>"
+
+    output = "%PDF-1.4\n"
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(output))
+        output += f"{number} 0 obj\n{body}\nendobj\n"
+    xref_offset = len(output)
+    output += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n"
+    output += "".join(f"{offset:010d} 00000 n \n" for offset in offsets)
+    output += f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref_offset}\n%%EOF\n"
+    return output.encode("latin-1")
+
+
+@pytest.fixture
+def make_pdf():
+    """Factory fixture building small real PDF documents"""
+    return build_pdf
+
+
+def build_cv_service(text=None, analyze=None, analyzer=None, pdf_only=False, version="test", **kwargs):
+    """
+    Build a CV service with a mocked extractor and analyzer
+
+    Args:
+        text: Text returned by the extractor, or None to echo the file content
+        analyze: Mock of the analyzer's analyze, by default returning John
+            Doe with one experience
+        analyzer: Analyzer used as is instead of a mock
+        pdf_only: Accept only file names ending in .pdf
+        version: Version of the mocked analyzer
+        **kwargs: Other CVService arguments
+
+    Returns:
+        CV service
+    """
+    from app.domain.models import CVModel, Experience
+    from app.services import CVService
+
+    extractor = MagicMock()
+    if pdf_only:
+        extractor.can_extract.side_effect = lambda name: name.endswith(".pdf")
+    else:
+        extractor.can_extract.return_value = True
+    if text is None:
+        extractor.extract_text = AsyncMock(side_effect=lambda content, name: bytes(content).decode())
+    else:
+        extractor.extract_text = AsyncMock(return_value=text)
+    if analyzer is None:
+        analyzer = MagicMock()
+        analyzer.version = version
+        analyzer.analyze = analyze or AsyncMock(return_value=CVModel(
+            first_name="John",
+            last_name="Doe",
+            experiences=[Experience(title="Developer", description="Code")],
+        ))
+    return CVService(extractors=[extractor], analyzer=analyzer, **kwargs)
+
+
+@pytest.fixture
+def make_cv_service():
+    """Factory fixture building CV services with a mocked extractor and analyzer"""
+    return build_cv_service
@@ -4,6 +4,7 @@ from fastapi.testclient import TestClient
 from io import BytesIO
 from app.main import app
 from app.api.dependencies import get_cv_service
+from app.core.exceptions import AnalysisError, CircuitOpenError, ServiceOverloadedError
 
 
 class TestAPI:
@@ -60,6 +61,72 @@ class TestAPI:
         finally:
             app.dependency_overrides.clear()
     
+    def test_extract_endpoint_encodes_full_model(self, client):
+        """Test that the JSON body carries nested entries and the headers are kept"""
+        from app.domain.models.resume import CVModel, Experience
+        
+        cv_model = CVModel(
+            first_name="John",
+            last_name="Doe",
+            experiences=[Experience(title="Developer", description="Code", date="2020")]
+        )
+        
+        async def process_cv(file, options, token_usage, analysis):
+            token_usage["saved"] = 120
+            return cv_model
+        
+        mock_service = MagicMock()
+        mock_service.process_cv = process_cv
+        app.dependency_overrides[get_cv_service] = lambda: mock_service
+        
+        try:
+            response = client.post(
+                "/api/extract/",
+                files={"file": ("test.pdf", BytesIO(b"fake pdf content"), "application/pdf")}
+            )
+            
+            assert response.status_code == 200
+            assert response.headers["content-type"] == "application/json"
+            assert response.headers["X-Tokens-Saved"] == "120"
+            assert response.json() == {"extracted_data": cv_model.to_dict()}
+            assert response.json()["extracted_data"]["experiences"][0]["date"] == "2020"
+        finally:
+            app.dependency_overrides.clear()
+    
+    @pytest.mark.parametrize("error, status_code, retry_after", [
+        (CircuitOpenError("Azure OpenAI circuit is open, retry in 12s", retry_after=11.2), 503, "12"),
+        (ServiceOverloadedError("Azure OpenAI rate limit queue is full", retry_after=0.2), 503, "1"),
+        (ServiceOverloadedError("PDF extraction queue is full"), 503, None),
+        (AnalysisError("Invalid JSON response"), 422, None),
+    ])
+    def test_extract_endpoint_temporary_errors(self, client, make_cv_service, error, status_code, retry_after):
+        """Test that overload and an open circuit are 503 with a Retry-After, other errors 422"""
+        app.dependency_overrides[get_cv_service] = lambda: make_cv_service(analyze=AsyncMock(side_effect=error))
+        
+        try:
+            response = client.post(
+                "/api/extract/",
+                files={"file": ("test.pdf", BytesIO(b"fake pdf content"), "application/pdf")}
+            )
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert response.status_code == status_code
+        assert response.headers.get("retry-after") == retry_after
+        assert str(error) in response.json()["detail"]
+    
+    @pytest.mark.asyncio
+    async def test_exception_handler_maps_temporary_errors(self):
+        """Test that errors escaping an endpoint get the same status codes"""
+        from app.main import application_exception_handler
+        
+        open_circuit = await application_exception_handler(None, CircuitOpenError("Circuit open", retry_after=4.5))
+        invalid = await application_exception_handler(None, AnalysisError("Invalid JSON response"))
+        
+        assert open_circuit.status_code == 503
+        assert open_circuit.headers["retry-after"] == "5"
+        assert invalid.status_code == 422
+    
     def test_extract_endpoint_file_too_large(self, client):
         """Test CV extraction with file too large"""
         # Create 4MB file (exceeds 3MB limit)
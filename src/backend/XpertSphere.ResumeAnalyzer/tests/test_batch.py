@@ -0,0 +1,115 @@
+import asyncio
+import io
+import json
+import zipfile
+import pytest
+from unittest.mock import AsyncMock
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.dependencies import get_cv_service
+from app.domain.models.resume import CVModel
+from app.services import BatchItem, BatchPipeline
+
+
+def analyze_echo(text, options=None):
+    """Analysis naming the CV after its text"""
+    return CVModel(first_name=text, last_name="Doe")
+
+
+class TestBatchExtraction:
+    """Tests for the batch extraction endpoint"""
+    
+    @pytest.fixture
+    def client(self, make_cv_service):
+        """Create test client with a stubbed CV service"""
+        app.dependency_overrides[get_cv_service] = lambda: make_cv_service(
+            analyze=AsyncMock(side_effect=analyze_echo), pdf_only=True
+        )
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+    
+    def test_batch_streams_one_line_per_cv(self, client):
+        """Test that files and ZIP members are processed and streamed"""
+        archive = io.BytesIO()
+        with zipfile.ZipFile(archive, "w") as zip_file:
+            zip_file.writestr("fair/Alice.pdf", "Alice")
+            zip_file.writestr("fair/notes.txt", "not a CV")
+            zip_file.writestr("__MACOSX/fair/._Alice.pdf", "metadata")
+    
+        response = client.post(
+            "/api/extract/batch",
+            files=[
+                ("files", ("John.pdf", b"John", "application/pdf")),
+                ("files", ("dump.zip", archive.getvalue(), "application/zip")),
+            ]
+        )
+    
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        results = {line["file_name"]: line for line in lines[:-1]}
+    
+        assert set(results) == {"John.pdf", "dump.zip/fair/Alice.pdf", "dump.zip/fair/notes.txt"}
+        assert results["John.pdf"]["extracted_data"]["first_name"] == "John"
+        assert results["dump.zip/fair/Alice.pdf"]["status"] == "ok"
+        assert results["dump.zip/fair/notes.txt"]["status"] == "error"
+        assert results["dump.zip/fair/notes.txt"]["error"]["type"] == "ValidationError"
+        assert {"read", "extract", "analyze", "total"} <= set(results["John.pdf"]["timings_ms"])
+        assert lines[-1]["summary"] == {
+            "total": 3,
+            "succeeded": 2,
+            "failed": 1,
+            "elapsed_ms": lines[-1]["summary"]["elapsed_ms"]
+        }
+    
+    def test_invalid_zip_does_not_fail_batch(self, client):
+        """Test that a corrupt archive is reported as a single failed item"""
+        response = client.post(
+            "/api/extract/batch",
+            files=[
+                ("files", ("broken.zip", b"not a zip", "application/zip")),
+                ("files", ("John.pdf", b"John", "application/pdf")),
+            ]
+        )
+    
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        statuses = {line["file_name"]: line["status"] for line in lines[:-1]}
+        assert statuses == {"broken.zip": "error", "John.pdf": "ok"}
+
+
+class TestBatchPipeline:
+    """Tests for the staged batch pipeline"""
+    
+    @pytest.mark.asyncio
+    async def test_reads_wait_for_slow_analysis(self, make_cv_service):
+        """Test that files are not read further ahead than the pipeline window"""
+        release = asyncio.Event()
+        reads = []
+        
+        async def analyze(text, options=None):
+            await release.wait()
+            return analyze_echo(text)
+        
+        def reader(name):
+            async def read():
+                reads.append(name)
+                return name.encode()
+            return read
+        
+        pipeline = BatchPipeline(
+            make_cv_service(analyze=AsyncMock(side_effect=analyze)),
+            read_concurrency=2,
+            extract_concurrency=1,
+            analyze_concurrency=1,
+            max_file_size=1024,
+        )
+        items = [BatchItem(file_name=f"cv{index}.pdf", read=reader(f"cv{index}")) for index in range(20)]
+        results = pipeline.run(items)
+        first = asyncio.ensure_future(results.__anext__())
+        await asyncio.sleep(0.05)
+        
+        assert len(reads) == pipeline.window == 4
+        release.set()
+        names = [(await first)["extracted_data"]["first_name"]]
+        names += [result["extracted_data"]["first_name"] async for result in results]
+        assert sorted(names) == sorted(f"cv{index}" for index in range(20))
@@ -0,0 +1,96 @@
+import pypdfium2 as pdfium
+import pytest
+from benchmarks.cv_models import run as run_cv_models, speedups
+from benchmarks.run_benchmarks import compare, measure
+from benchmarks.synthetic_cvs import CVSpec, corpus_specs, generate_cv
+from app.infrastructure.extractors.pdf_extractor import extract_pdf_pages
+
+
+class TestSyntheticCVs:
+    """Tests for the synthetic CV corpus generator"""
+    
+    def test_generation_is_deterministic(self):
+        """Test that a spec always produces the same document"""
+        spec = CVSpec(seed=7, pages=2, columns=2, fonts=3, images=1)
+    
+        assert generate_cv(spec).pdf == generate_cv(spec).pdf
+        assert generate_cv(spec).pdf != generate_cv(CVSpec(seed=8, pages=2, columns=2, fonts=3, images=1)).pdf
+    
+    @pytest.mark.parametrize("spec", corpus_specs(pages=(1, 3), columns=(1, 2), fonts=(3,), images=(2,)))
+    def test_documents_match_their_spec(self, spec):
+        """Test that page count, fonts and images follow the spec and the text is extractable"""
+        cv = generate_cv(spec)
+        pdf = pdfium.PdfDocument(cv.pdf)
+        try:
+            assert len(pdf) == spec.pages
+            images = sum(
+                obj.type == pdfium.raw.FPDF_PAGEOBJ_IMAGE for obj in pdf[0].get_objects()
+            )
+        finally:
+            pdf.close()
+        pages, _, _ = extract_pdf_pages(cv.pdf, f"{spec.name}.pdf", tiered=True)
+    
+        assert images == spec.images
+        assert cv.pdf.count(b"/Subtype /Type1") == spec.fonts
+        assert len(pages) == spec.pages
+        assert cv.data["last_name"] in pages[0]
+        assert cv.data["experiences"][0]["company"] in pages[0]
+
+
+class TestRegressionThresholds:
+    """Tests for comparing benchmark results between runs"""
+    
+    def test_compare_with_baseline(self):
+        """Test that only significant slowdowns beyond the tolerance regress"""
+        thresholds = {
+            "default": {"max_regression": 0.2, "min_delta_us": 5},
+            "benchmarks": {"noisy.*": {"max_regression": 1.0}},
+        }
+        baseline = {
+            "slower": {"median_us": 100},
+            "faster": {"median_us": 100},
+            "tiny": {"median_us": 2},
+            "noisy.case": {"median_us": 100},
+        }
+        results = {
+            "slower": {"median_us": 130},
+            "faster": {"median_us": 50},
+            "tiny": {"median_us": 4},
+            "noisy.case": {"median_us": 180},
+            "added": {"median_us": 10},
+        }
+    
+        statuses = {item["name"]: item["status"] for item in compare(results, baseline, thresholds)}
+    
+        assert statuses == {
+            "slower": "regressed",
+            "faster": "improved",
+            "tiny": "ok",
+            "noisy.case": "ok",
+            "added": "new",
+        }
+    
+    def test_measure_reports_statistics(self):
+        """Test that timings are calibrated and summarized per call"""
+        stats = measure(lambda: sum(range(100)), rounds=3, min_round_seconds=0.001)
+    
+        assert stats["rounds"] == 3
+        assert stats["iterations"] >= 1
+        assert 0 < stats["min_us"] <= stats["median_us"] <= stats["p95_us"]
+
+
+
+class TestCVModelBenchmark:
+    """Tests for the before/after benchmark of the CV models"""
+    
+    def test_cv_models_before_and_after(self):
+        """Test that both model implementations are measured on decode, encode and memory"""
+        results = run_cv_models(rounds=1, min_round_seconds=0.001, copies=5)
+        comparison = speedups(results)
+    
+        assert len(results) == 8
+        assert results["cv_models.decode.short.after"]["instance_bytes"] < results["cv_models.decode.short.before"]["instance_bytes"]
+        assert results["cv_models.decode.long.before"]["bytes_per_object"] > 0
+        assert results["cv_models.encode.long.after"]["mb_per_sec"] > 0
+        assert set(comparison) == {"decode.short", "encode.short", "decode.long", "encode.long"}
+        assert "memory_ratio" in comparison["decode.long"]
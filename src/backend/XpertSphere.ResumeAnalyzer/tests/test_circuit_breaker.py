@@ -0,0 +1,187 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi.testclient import TestClient
+from app.core import settings
+from app.main import app
+from app.core.exceptions import AnalysisError, CircuitOpenError, ServiceOverloadedError
+from app.domain.models.resume import CVModel
+from app.infrastructure.analyzers import CircuitBreaker, CircuitBreakerAnalyzer, RuleBasedAnalyzer
+from app.services import CVService
+
+
+def breaker(**kwargs):
+    """Breaker opening after two failures out of four calls"""
+    options = {"window": 4, "min_calls": 4, "failure_rate": 0.5, "open_seconds": 0.05, "half_open_probes": 2}
+    return CircuitBreaker(**{**options, **kwargs})
+
+
+class TestCircuitBreaker:
+    """Tests for the closed, open and half-open states"""
+    
+    def test_opens_on_failure_rate(self):
+        """Test that the breaker opens once the window fails too often"""
+        circuit = breaker()
+        for failed in (False, True, False):
+            generation = circuit.allow()
+            assert generation
+            circuit.record(generation, failed, 0.1)
+        assert circuit.state == "closed"
+    
+        circuit.record(circuit.allow(), True, 0.1)
+    
+        assert circuit.state == "open"
+        assert circuit.allow() is None
+        assert circuit.stats()["rejected"] == 1
+    
+    def test_opens_on_slow_call_rate(self):
+        """Test that successful but slow calls open the breaker"""
+        circuit = breaker(slow_call_seconds=1.0, slow_call_rate=0.75)
+        for seconds in (2.0, 0.1, 2.0, 2.0):
+            circuit.record(circuit.allow(), False, seconds)
+    
+        assert circuit.state == "open"
+    
+    @pytest.mark.asyncio
+    async def test_probes_close_the_breaker(self):
+        """Test that successful probes close a half-open breaker"""
+        circuit = breaker(failure_rate=0.25)
+        for _ in range(4):
+            circuit.record(circuit.allow(), True, 0.1)
+        await asyncio.sleep(0.06)
+    
+        probes = [circuit.allow(), circuit.allow()]
+        assert all(probes)
+        assert circuit.state == "half_open"
+        assert circuit.allow() is None
+        for probe in probes:
+            circuit.record(probe, False, 0.1)
+    
+        assert circuit.state == "closed"
+    
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens_the_breaker(self):
+        """Test that a failed probe opens the breaker again"""
+        circuit = breaker(failure_rate=0.25)
+        for _ in range(4):
+            circuit.record(circuit.allow(), True, 0.1)
+        await asyncio.sleep(0.06)
+    
+        circuit.record(circuit.allow(), True, 0.1)
+    
+        assert circuit.state == "open"
+        assert circuit.stats()["times_opened"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_stats_report_elapsed_open_state_as_half_open(self):
+        """Test that stats show a breaker whose open period has elapsed as half-open"""
+        circuit = breaker(failure_rate=0.25)
+        for _ in range(4):
+            circuit.record(circuit.allow(), True, 0.1)
+        assert circuit.stats()["state"] == "open"
+        await asyncio.sleep(0.06)
+    
+        stats = circuit.stats()
+    
+        assert stats["state"] == "half_open"
+        assert stats["retry_after_ms"] == 0
+        assert circuit.allow()
+    
+    @pytest.mark.asyncio
+    async def test_calls_spanning_the_open_period_are_not_probes(self):
+        """Test that slow calls allowed while closed neither close nor count against a half-open breaker"""
+        circuit = breaker(failure_rate=0.25, half_open_probes=1)
+        stragglers = [circuit.allow(), circuit.allow()]
+        for _ in range(4):
+            circuit.record(circuit.allow(), True, 0.1)
+        await asyncio.sleep(0.06)
+        assert circuit.state == "half_open"
+    
+        circuit.record(stragglers[0], False, 0.1)
+        circuit.release(stragglers[1])
+    
+        assert circuit.state == "half_open"
+        probe = circuit.allow()
+        assert circuit.allow() is None
+        circuit.record(probe, False, 0.1)
+        assert circuit.state == "closed"
+
+
+class TestCircuitBreakerAnalyzer:
+    """Tests for failing fast and falling back while the circuit is open"""
+    
+    @pytest.fixture
+    def llm(self):
+        """LLM analyzer mock failing every call"""
+        llm = MagicMock()
+        llm.version = "llm"
+        llm.analyze = AsyncMock(side_effect=AnalysisError("Azure OpenAI unavailable"))
+        return llm
+    
+    @pytest.mark.asyncio
+    async def test_fails_fast_when_open(self, llm):
+        """Test that the wrapped analyzer is not called while the circuit is open"""
+        analyzer = CircuitBreakerAnalyzer(llm, breaker(failure_rate=0.25, open_seconds=60))
+        for _ in range(4):
+            with pytest.raises(AnalysisError):
+                await analyzer.analyze("CV")
+    
+        with pytest.raises(CircuitOpenError):
+            await analyzer.analyze("CV")
+        assert llm.analyze.call_count == 4
+        assert analyzer.version == "llm"
+    
+    @pytest.mark.asyncio
+    async def test_overload_is_not_a_failure(self, llm):
+        """Test that rate limiter rejections do not open the breaker"""
+        llm.analyze.side_effect = ServiceOverloadedError("queue is full")
+        circuit = breaker(failure_rate=0.25)
+        analyzer = CircuitBreakerAnalyzer(llm, circuit)
+        for _ in range(4):
+            with pytest.raises(ServiceOverloadedError):
+                await analyzer.analyze("CV")
+    
+        assert circuit.state == "closed"
+    
+    @pytest.mark.asyncio
+    async def test_open_circuit_uses_local_fallback(self, llm):
+        """Test that the CV service answers locally while the circuit is open"""
+        circuit = breaker(open_seconds=60)
+        circuit._transition("open")
+        circuit._opened_at = float("inf")
+        extractor = MagicMock()
+        extractor.can_extract.return_value = True
+        extractor.extract_text = AsyncMock(return_value="John Smith\njohn@mail.com")
+        service = CVService(
+            extractors=[extractor],
+            analyzer=CircuitBreakerAnalyzer(llm, circuit),
+            local_analyzer=RuleBasedAnalyzer(),
+            local_fallback=True,
+        )
+        analysis = {}
+    
+        cv_model = await service.process_content(b"%PDF", "cv.pdf", analysis=analysis)
+    
+        assert isinstance(cv_model, CVModel)
+        assert cv_model.email == "john@mail.com"
+        assert analysis == {"mode": "fallback"}
+        llm.analyze.assert_not_called()
+    
+    def test_readiness_reports_open_circuit(self, monkeypatch):
+        """Test that readiness fails while the circuit is open and there is no local fallback"""
+        with TestClient(app) as client:
+            container = app.state.container
+            if container.circuit_breaker is None:
+                pytest.skip("Circuit breaker disabled")
+            assert client.get("/api/health/readiness").status_code == 200
+            container.circuit_breaker._transition("open")
+    
+            degraded = client.get("/api/health/readiness")
+            monkeypatch.setattr(settings, "LOCAL_FALLBACK_ENABLED", False)
+            readiness = client.get("/api/health/readiness")
+            detailed = client.get("/api/health/detailed")
+    
+        assert degraded.status_code == 200
+        assert degraded.json()["checks"]["azure_openai_circuit"] == "open"
+        assert readiness.status_code == 503
+        assert detailed.json()["llm_circuit_breaker"]["state"] == "open"
@@ -0,0 +1,67 @@
+import asyncio
+import json
+import time
+import pytest
+import httpx
+from unittest.mock import MagicMock
+from app.main import app
+from app.api.dependencies import get_cv_service
+from app.services import CVService
+from app.infrastructure.analyzers import OpenAIAnalyzer
+
+LLM_LATENCY_SECONDS = 0.3
+CONCURRENT_REQUESTS = 8
+
+
+class StubExtractor:
+    """Extractor returning fixed text without touching the event loop"""
+    
+    def can_extract(self, file_name):
+        return True
+    
+    async def extract_text(self, file_content, file_name):
+        return "John Doe - Developer"
+
+
+async def slow_completion(**kwargs):
+    """Simulate an LLM round trip that takes a fixed time"""
+    await asyncio.sleep(LLM_LATENCY_SECONDS)
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = json.dumps({
+        "first_name": "John",
+        "last_name": "Doe",
+        "experiences": [],
+        "trainings": []
+    })
+    return response
+
+
+class TestConcurrentExtraction:
+    """Concurrency tests for the async analyzer path"""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_overlap_llm_calls(self):
+        """Test that N concurrent requests finish in about one LLM latency"""
+        analyzer = OpenAIAnalyzer(http_client=httpx.AsyncClient())
+        analyzer.client.chat.completions.create = slow_completion
+        cv_service = CVService(extractors=[StubExtractor()], analyzer=analyzer)
+        app.dependency_overrides[get_cv_service] = lambda: cv_service
+        
+        try:
+            transport = httpx.ASGITransport(app=app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                started = time.perf_counter()
+                responses = await asyncio.gather(*[
+                    client.post(
+                        "/api/extract/",
+                        files={"file": (f"cv{i}.pdf", b"fake pdf content", "application/pdf")}
+                    )
+                    for i in range(CONCURRENT_REQUESTS)
+                ])
+                elapsed = time.perf_counter() - started
+        finally:
+            app.dependency_overrides.clear()
+        
+        assert all(response.status_code == 200 for response in responses)
+        assert elapsed < LLM_LATENCY_SECONDS * 3
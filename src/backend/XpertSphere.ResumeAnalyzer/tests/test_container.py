@@ -0,0 +1,119 @@
+import asyncio
+import pytest
+import httpx
+from types import SimpleNamespace
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.dependencies import get_container
+from app.services import ServiceContainer
+from app.utils import ConnectionStats
+
+
+class TestServiceContainer:
+    """Basic tests for the application service container"""
+    
+    @pytest.mark.asyncio
+    async def test_startup_builds_pipeline_once(self):
+        """Test that the CV service is built once and reused"""
+        container = ServiceContainer()
+        container.startup()
+        cv_service = container.cv_service
+        
+        container.startup()
+        
+        assert container.cv_service is cv_service
+        assert cv_service.analyzer.analyzer.llm.client._client is container.http_client
+        await container.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_shutdown_closes_http_client(self):
+        """Test that shutdown closes the pooled HTTP client"""
+        container = ServiceContainer()
+        container.startup()
+        http_client = container.http_client
+        
+        await container.shutdown()
+        
+        assert http_client.is_closed
+        assert container.cv_service is None
+        assert container.stats() == {"status": "not started"}
+    
+    def test_lifespan_shares_service_across_requests(self):
+        """Test that requests reuse the container built at startup"""
+        with TestClient(app) as client:
+            container = app.state.container
+            cv_service = container.cv_service
+            
+            client.get("/api/health/detailed")
+            response = client.get("/api/health/detailed")
+            
+            assert app.state.container.cv_service is cv_service
+            assert "llm_connection_pool" in response.json()
+        
+        assert app.state.container is None
+    
+    @pytest.mark.asyncio
+    async def test_failed_start_closes_http_client(self, monkeypatch):
+        """Test that a start failing after the HTTP client is built closes it before the retry"""
+        build_pdf_extractor = ServiceContainer._build_pdf_extractor
+        clients = []
+        
+        def failing_build(container):
+            clients.append(container.http_client)
+            raise RuntimeError("PDF libraries unavailable")
+        
+        monkeypatch.setattr(ServiceContainer, "_build_pdf_extractor", failing_build)
+        container = ServiceContainer()
+        
+        with pytest.raises(RuntimeError):
+            await container.start()
+        
+        assert clients[0].is_closed
+        assert container.http_client is None
+        monkeypatch.setattr(ServiceContainer, "_build_pdf_extractor", build_pdf_extractor)
+        await container.start()
+        assert container.http_client is not clients[0]
+        await container.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_dependency_builds_container_off_the_event_loop(self, monkeypatch):
+        """Test that a container created on first use is built on a worker thread"""
+        startup = ServiceContainer.startup
+        on_event_loop = []
+        
+        def recording_startup(container):
+            try:
+                asyncio.get_running_loop()
+                on_event_loop.append(True)
+            except RuntimeError:
+                on_event_loop.append(False)
+            startup(container)
+        
+        monkeypatch.setattr(ServiceContainer, "startup", recording_startup)
+        request = SimpleNamespace(app=SimpleNamespace(state=SimpleNamespace()))
+        
+        container = await get_container(request)
+        
+        assert on_event_loop == [False]
+        assert container.ready
+        assert request.app.state.container is container
+        await container.shutdown()
+
+
+class TestConnectionStats:
+    """Basic tests for connection reuse counters"""
+    
+    def test_reuse_is_tracked_per_network_stream(self):
+        """Test that responses over the same stream count as reused"""
+        stats = ConnectionStats()
+        stream_a = type("Stream", (), {})()
+        stream_b = type("Stream", (), {})()
+        
+        for stream in (stream_a, stream_a, stream_b, stream_a):
+            stats.record(httpx.Response(200, extensions={"network_stream": stream}))
+        
+        snapshot = stats.snapshot()
+        assert snapshot["requests"] == 4
+        assert snapshot["new_connections"] == 2
+        assert snapshot["reused_connections"] == 2
+        assert snapshot["reuse_ratio"] == 0.5
@@ -0,0 +1,170 @@
+import asyncio
+import os
+import tempfile
+import time
+from pathlib import Path
+import psutil
+import pytest
+import pytest_asyncio
+from app.infrastructure.extractors import ExtractionPool, ProcessPoolPDFExtractor
+from app.infrastructure.extractors import extraction_pool
+from app.core.exceptions import ExtractionError, ServiceOverloadedError
+
+extract_pages = extraction_pool._extract_pages_from_shared_memory
+
+
+def slow_extract_pages(shm_name, size, file_name, *args):
+    """Worker entry point sleeping for the number of seconds in the file name"""
+    Path(tempfile.gettempdir(), f"{file_name}.pid").write_text(str(os.getpid()))
+    time.sleep(float(file_name.split("-")[0]))
+    return extract_pages(shm_name, size, file_name, *args)
+
+
+def exits(pid, timeout=5):
+    """Whether a process exits within the timeout"""
+    try:
+        psutil.Process(pid).wait(timeout)
+    except psutil.NoSuchProcess:
+        pass
+    except psutil.TimeoutExpired:
+        return False
+    return True
+
+
+class TestExtractionPool:
+    """Tests for the process pool PDF extractor"""
+    
+    @pytest_asyncio.fixture
+    async def pool(self):
+        """Create a small extraction pool and stop it after the test"""
+        pool = ExtractionPool(
+            workers=2,
+            max_queue=1,
+            job_timeout=30,
+            max_tasks_per_worker=10,
+            max_worker_rss_mb=1024
+        )
+        yield pool
+        await pool.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_extract_text_in_worker(self, pool, make_pdf):
+        """Test that a real PDF is extracted by a worker process"""
+        extractor = ProcessPoolPDFExtractor(pool)
+        
+        result = await extractor.extract_text(make_pdf(["John Doe", "Developer"]), "cv.pdf")
+        
+        assert "John Doe" in result
+        assert "Developer" in result
+        assert pool.stats()["completed"] == 1
+        assert pool.stats()["pending"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_invalid_pdf_raises_extraction_error(self, pool):
+        """Test that worker failures surface as extraction errors"""
+        with pytest.raises(ExtractionError):
+            await pool.submit(b"not a pdf", "broken.pdf")
+        
+        assert pool.stats()["failed"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_submission(self, pool, make_pdf):
+        """Test that submissions beyond workers plus queue are rejected"""
+        pool._pending = pool.workers + pool.max_queue
+        
+        with pytest.raises(ServiceOverloadedError):
+            await pool.submit(make_pdf(["John Doe"]), "cv.pdf")
+        
+        assert pool.stats()["rejected"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_pending_shards_count_against_the_queue(self, pool, make_pdf, monkeypatch):
+        """Test that shards of a long document fill the queue like documents do"""
+        monkeypatch.setattr(extraction_pool, "_extract_pages_from_shared_memory", slow_extract_pages)
+        pool.pages_per_shard = 1
+        long_document = asyncio.create_task(pool.submit(make_pdf(["One", "Two", "Three", "Four"]), "0.5-long.pdf"))
+        for _ in range(100):
+            if pool.stats()["pending_shards"]:
+                break
+            await asyncio.sleep(0.05)
+    
+        assert pool.stats()["pending_shards"] == 3
+        with pytest.raises(ServiceOverloadedError):
+            await pool.submit(make_pdf(["John Doe"]), "0-cv.pdf")
+    
+        assert "Four" in await long_document
+        assert pool.stats()["pending_shards"] == 0
+        assert "John Doe" in await pool.submit(make_pdf(["John Doe"]), "0-cv.pdf")
+    
+    @pytest.mark.asyncio
+    async def test_memory_threshold_recycles_workers(self, pool, make_pdf):
+        """Test that a worker above the memory threshold triggers a recycle"""
+        pool.max_worker_rss_bytes = 0
+        
+        await pool.submit(make_pdf(["John Doe"]), "cv.pdf")
+        
+        assert pool.stats()["recycles"] == 1
+        assert pool.stats()["running"] is False
+    
+    @pytest.mark.asyncio
+    async def test_long_document_is_sharded_and_reassembled_in_order(self, pool, make_pdf):
+        """Test that page shards run in workers and keep page order"""
+        pool.pages_per_shard = 2
+        
+        result = await pool.submit(make_pdf([f"Page {number}" for number in range(7)]), "cv.pdf")
+        
+        assert result.split("\f") == [f"Page {number}" for number in range(6)] + ["Page 6\n"]
+        assert pool.stats()["sharded"] == 1
+        assert pool.stats()["completed"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_page_and_character_caps(self, pool, make_pdf):
+        """Test that extraction stops at the page and character limits"""
+        pool.pages_per_shard = 2
+        content = make_pdf([f"Page {number}" for number in range(7)])
+        
+        by_pages = await pool.submit(content, "cv.pdf", max_pages=3)
+        by_chars = await pool.submit(content, "cv.pdf", max_chars=10)
+        
+        assert by_pages == "Page 0\fPage 1\fPage 2\n"
+        assert by_chars == "Page 0\fPag\n"
+        assert pool.stats()["sharded"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_tiered_shards_report_tier_stats(self, pool, make_pdf):
+        """Test that tier counters of every shard are aggregated"""
+        pool.pages_per_shard = 2
+        pool.tiered = True
+        
+        await pool.submit(make_pdf([f"Page {number}" for number in range(5)]), "cv.pdf")
+        
+        tiers = pool.stats()["tiers"]
+        assert tiers["text_layer_pages"] == 5
+        assert tiers["text_layer_hit_rate"] == 1.0
+    
+    @pytest.mark.asyncio
+    async def test_timeout_spares_other_running_jobs(self, pool, make_pdf, monkeypatch):
+        """Test that a timed-out job's workers are killed only after the other jobs finish"""
+        monkeypatch.setattr(extraction_pool, "_extract_pages_from_shared_memory", slow_extract_pages)
+        content = make_pdf(["John Doe"])
+        await asyncio.gather(pool.submit(content, "0-a.pdf"), pool.submit(content, "0-b.pdf"))
+        pool.job_timeout = 2
+    
+        stuck = asyncio.create_task(pool.submit(content, "30-stuck.pdf"))
+        await asyncio.sleep(1)
+        running = asyncio.create_task(pool.submit(content, "1.5-running.pdf"))
+    
+        with pytest.raises(ExtractionError, match="timed out"):
+            await stuck
+        assert pool.stats()["retiring"] == 1
+        assert "John Doe" in await running
+        assert "John Doe" in await pool.submit(content, "0-after.pdf")
+        for _ in range(100):
+            if not pool.stats()["retiring"]:
+                break
+            await asyncio.sleep(0.05)
+    
+        assert pool.stats()["retiring"] == 0
+        assert exits(int(Path(tempfile.gettempdir(), "30-stuck.pdf.pid").read_text()))
+        assert pool.stats()["timeouts"] == 1
+        assert pool.stats()["recycles"] == 1
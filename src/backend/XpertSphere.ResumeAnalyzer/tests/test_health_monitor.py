@@ -0,0 +1,112 @@
+import asyncio
+import time
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from app.core import settings
+from app.main import app
+from app.services import HealthMonitor
+from app.utils.metrics import IN_FLIGHT
+from loadtest.mock_openai import MockConfig, create_app
+
+
+class TestHealthMonitor:
+    """Tests for the background health sampler"""
+    
+    @pytest.mark.asyncio
+    async def test_snapshot_is_served_without_sampling(self):
+        """Test that a snapshot reports system usage and in-flight requests in under a millisecond"""
+        monitor = HealthMonitor(interval=3600, probe_ttl=0)
+        assert monitor.snapshot() == {"status": "not started"}
+    
+        IN_FLIGHT.inc()
+        try:
+            await monitor.start()
+        finally:
+            IN_FLIGHT.dec()
+    
+        started = time.perf_counter()
+        snapshot = monitor.snapshot()
+        elapsed = time.perf_counter() - started
+    
+        assert elapsed < 0.001
+        assert snapshot["requests_in_flight"] == 1
+        assert 0 < snapshot["system"]["memory"]["total_gb"]
+        assert snapshot["system"]["process"]["rss_mb"] > 0
+        assert snapshot["azure_openai"] == {"status": "disabled"}
+        assert monitor.samples == 1
+        await monitor.stop()
+    
+    @pytest.mark.asyncio
+    async def test_event_loop_lag_is_measured(self):
+        """Test that a blocked event loop shows in the next sample"""
+        monitor = HealthMonitor(interval=3600, probe_ttl=0, lag_interval=0.01)
+        await monitor.start()
+        await asyncio.sleep(0.05)
+    
+        time.sleep(0.1)
+        await asyncio.sleep(0.02)
+        await monitor._sample()
+    
+        lag = monitor.snapshot()["event_loop_lag_ms"]
+        assert lag["max"] >= 50
+        assert lag["mean"] < lag["max"]
+        await monitor.stop()
+        assert monitor._task is None
+    
+    @pytest.mark.asyncio
+    async def test_probe_result_is_cached(self, monkeypatch):
+        """Test that Azure OpenAI is probed once per TTL however often samples are taken"""
+        mock_app = create_app(MockConfig(latency="fixed:0"))
+        monkeypatch.setattr(settings, "AZURE_OPENAI_ENDPOINT", "http://mock/")
+        monkeypatch.setattr(settings, "AZURE_OPENAI_API_KEY", "test-key")
+        monitor = HealthMonitor(interval=0.01, probe_ttl=3600, lag_interval=0.005)
+        monitor._http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=mock_app))
+    
+        await monitor.start()
+        await asyncio.sleep(0.1)
+        probe = monitor.snapshot()["azure_openai"]
+    
+        assert monitor.samples > 2
+        assert monitor.probes == 1
+        assert mock_app.state.deployment.counters["model_listings"] == 1
+        assert probe["status"] == "ok"
+        assert probe["http_status"] == 200
+        assert "age_seconds" in probe
+        await monitor.stop()
+    
+    @pytest.mark.asyncio
+    async def test_rejected_key_is_an_error(self, monkeypatch):
+        """Test that an authentication failure is reported as an error"""
+        async def deny(request):
+            return httpx.Response(401, json={"error": {"code": "401"}})
+    
+        monkeypatch.setattr(settings, "AZURE_OPENAI_ENDPOINT", "http://mock/")
+        monkeypatch.setattr(settings, "AZURE_OPENAI_API_KEY", "wrong-key")
+        monitor = HealthMonitor(probe_timeout=1)
+        monitor._http_client = httpx.AsyncClient(transport=httpx.MockTransport(deny))
+    
+        result = await monitor.probe_azure_openai()
+    
+        assert result["status"] == "error"
+        assert result["http_status"] == 401
+        await monitor.stop()
+
+
+class TestDetailedHealth:
+    """Tests for the detailed health endpoint"""
+    
+    def test_detailed_health_reads_the_snapshot(self):
+        """Test that the endpoint serves the monitor's sample"""
+        with TestClient(app) as client:
+            response = client.get("/api/health/detailed")
+    
+            body = response.json()
+            assert body["system"]["cpu_percent"] >= 0
+            assert body["event_loop"]["requests_in_flight"] == 0
+            assert body["uptime_seconds"] >= 0
+            assert body["dependencies"]["azure_openai"] == {"status": "disabled"}
+            assert body["response_time_ms"] < 50
+            assert app.state.health_monitor.samples >= 1
+    
+        assert app.state.health_monitor is None
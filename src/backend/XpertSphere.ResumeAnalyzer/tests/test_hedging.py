@@ -0,0 +1,160 @@
+import asyncio
+import pytest
+from unittest.mock import patch
+from app.core.exceptions import AnalysisError
+from app.domain.models import CVFieldEvent, RESULT_EVENT
+from app.domain.models.resume import CVModel
+from app.infrastructure.analyzers import BaseAnalyzer, HedgedAnalyzer, LatencyWindow, OpenAIAnalyzer
+
+
+class SlowAnalyzer(BaseAnalyzer):
+    """Analyzer answering after a delay, or failing"""
+    
+    def __init__(self, name, delay, error=None):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.cancelled = False
+        self.closed = False
+    
+    @property
+    def version(self):
+        return self.name
+    
+    async def analyze(self, text, options=None):
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+        if self.error:
+            raise self.error
+        return CVModel(first_name=self.name, last_name="")
+    
+    async def analyze_stream(self, text, options=None):
+        try:
+            await asyncio.sleep(self.delay)
+            if self.error:
+                raise self.error
+            yield CVFieldEvent("first_name", self.name)
+            yield CVFieldEvent(RESULT_EVENT, CVModel(first_name=self.name, last_name=""))
+        finally:
+            self.closed = True
+
+
+def hedged(primary, secondary, delay=0.05):
+    """Hedged analyzer with a fixed hedge delay"""
+    return HedgedAnalyzer(primary, secondary, initial_delay=delay, min_delay=0.01, max_delay=1.0)
+
+
+class TestLatencyWindow:
+    """Tests for the percentile hedge delay"""
+    
+    def test_uses_initial_delay_until_enough_samples(self):
+        """Test that the initial delay applies to a small window"""
+        window = LatencyWindow(95.0, initial_delay=3.0, min_delay=0.5, max_delay=10.0, min_samples=5)
+        for _ in range(4):
+            window.record(1.0)
+    
+        assert window.delay() == 3.0
+    
+    def test_clamps_percentile(self):
+        """Test that the delay is the clamped percentile of recent latencies"""
+        window = LatencyWindow(90.0, initial_delay=3.0, min_delay=0.5, max_delay=10.0, min_samples=5)
+        for seconds in range(1, 11):
+            window.record(float(seconds))
+    
+        assert window.delay() == 9.0
+    
+        window.max_delay = 4.0
+        assert window.delay() == 4.0
+
+
+class TestHedgedAnalyzer:
+    """Tests for hedging slow requests to a second deployment"""
+    
+    @pytest.mark.asyncio
+    async def test_fast_primary_is_not_hedged(self):
+        """Test that a primary answering before the delay wins alone"""
+        secondary = SlowAnalyzer("secondary", 0)
+        analyzer = hedged(SlowAnalyzer("primary", 0.01), secondary, delay=0.5)
+    
+        cv_model = await analyzer.analyze("CV")
+    
+        assert cv_model.first_name == "primary"
+        assert analyzer.stats()["hedged"] == 0
+        assert analyzer.stats()["primary_wins"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_slow_primary_is_hedged_and_cancelled(self):
+        """Test that the secondary answers a slow request and the primary is cancelled"""
+        primary = SlowAnalyzer("primary", 5)
+        analyzer = hedged(primary, SlowAnalyzer("secondary", 0.01))
+    
+        cv_model = await analyzer.analyze("CV")
+    
+        assert cv_model.first_name == "secondary"
+        assert primary.cancelled
+        stats = analyzer.stats()
+        assert (stats["requests"], stats["hedged"], stats["hedge_rate"]) == (1, 1, 1.0)
+        assert stats["secondary_wins"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_primary_can_win_after_hedge(self):
+        """Test that the primary still wins when it answers before the secondary"""
+        secondary = SlowAnalyzer("secondary", 5)
+        analyzer = hedged(SlowAnalyzer("primary", 0.1), secondary)
+    
+        cv_model = await analyzer.analyze("CV")
+    
+        assert cv_model.first_name == "primary"
+        assert secondary.cancelled
+        assert analyzer.stats()["hedged"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_failed_primary_is_hedged_at_once(self):
+        """Test that a primary failure goes to the secondary without waiting"""
+        analyzer = hedged(
+            SlowAnalyzer("primary", 0, AnalysisError("rate limited")),
+            SlowAnalyzer("secondary", 0),
+            delay=5,
+        )
+    
+        cv_model = await asyncio.wait_for(analyzer.analyze("CV"), timeout=1)
+    
+        assert cv_model.first_name == "secondary"
+    
+    @pytest.mark.asyncio
+    async def test_raises_when_both_fail(self):
+        """Test that the first error is raised when both deployments fail"""
+        analyzer = hedged(
+            SlowAnalyzer("primary", 0, AnalysisError("primary down")),
+            SlowAnalyzer("secondary", 0, AnalysisError("secondary down")),
+        )
+    
+        with pytest.raises(AnalysisError, match="primary down"):
+            await analyzer.analyze("CV")
+        assert analyzer.stats()["failures"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_stream_is_hedged_on_first_event(self):
+        """Test that the losing stream is closed and the winner streams every event"""
+        primary = SlowAnalyzer("primary", 5)
+        analyzer = hedged(primary, SlowAnalyzer("secondary", 0.01))
+    
+        events = [event async for event in analyzer.analyze_stream("CV")]
+    
+        assert [event.name for event in events] == ["first_name", RESULT_EVENT]
+        assert events[-1].value.first_name == "secondary"
+        assert primary.closed
+    
+    def test_secondary_deployment_settings(self):
+        """Test that the secondary analyzer uses its own deployment and endpoint"""
+        with patch('app.infrastructure.analyzers.openai_analyzer.get_async_llm') as mock_get_llm:
+            analyzer = OpenAIAnalyzer(
+                deployment="gpt-4o-mini-eu", endpoint="https://eu.example.com", api_key="key"
+            )
+    
+        assert mock_get_llm.call_args.args[1:] == ("gpt-4o-mini-eu", "https://eu.example.com", "key")
+        assert analyzer.version.startswith("gpt-4o-mini-eu:")
@@ -0,0 +1,247 @@
+import asyncio
+import sqlite3
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi.testclient import TestClient
+from app.core import ServiceOverloadedError
+from app.main import app
+from app.services import JobQueue, JobStore
+from app.domain.models.resume import CVModel
+
+
+def make_cv_service():
+    """Create a mocked CV service returning a fixed CV"""
+    cv_service = MagicMock()
+    cv_service.can_process.return_value = True
+    cv_service.process_content = AsyncMock(return_value=CVModel(first_name="John", last_name="Doe"))
+    return cv_service
+
+
+class TestJobStore:
+    """Tests for the persistent job store"""
+    
+    def test_running_jobs_are_requeued_after_restart(self, tmp_path):
+        """Test that a job interrupted by a restart is processed again"""
+        db_path = str(tmp_path / "jobs.db")
+        store = JobStore(db_path)
+        job_id = store.enqueue("cv.pdf", b"pdf content", {})
+        assert store.claim_next()["id"] == job_id
+        store.close()
+        
+        restarted = JobStore(db_path)
+        assert restarted.recover(max_attempts=3) == 1
+        job = restarted.claim_next()
+        
+        assert job["id"] == job_id
+        assert job["content"] == b"pdf content"
+        assert restarted.get(job_id)["attempts"] == 2
+        restarted.close()
+    
+    def test_jobs_exceeding_attempts_fail(self, tmp_path):
+        """Test that a job crashing every worker is eventually failed"""
+        store = JobStore(str(tmp_path / "jobs.db"))
+        job_id = store.enqueue("cv.pdf", b"pdf content", {})
+        store.claim_next()
+        
+        assert store.recover(max_attempts=1) == 0
+        assert store.get(job_id)["status"] == "failed"
+        assert store.counts()["failed"] == 1
+        store.close()
+    
+    def test_job_is_claimed_once_across_stores(self, tmp_path):
+        """Test that two processes sharing the database never claim the same job"""
+        db_path = str(tmp_path / "jobs.db")
+        first, second = JobStore(db_path), JobStore(db_path)
+        job_id = first.enqueue("cv.pdf", b"pdf content", {})
+        
+        claims = [first.claim_next(), second.claim_next()]
+        
+        assert claims[0]["id"] == job_id
+        assert claims[0]["attempts"] == 1
+        assert claims[1] is None
+        first.close()
+        second.close()
+    
+    def test_purge_deletes_expired_finished_jobs(self, tmp_path):
+        """Test that finished jobs are deleted after the retention period, queued ones kept"""
+        store = JobStore(str(tmp_path / "jobs.db"))
+        finished_id = store.enqueue("done.pdf", b"pdf content", {})
+        store.claim_next()
+        store.finish(finished_id, result={"first_name": "John"})
+        queued_id = store.enqueue("queued.pdf", b"pdf content", {})
+        
+        assert store.purge(older_than=3600) == 0
+        assert store.purge(older_than=0) == 1
+        assert store.get(finished_id) is None
+        assert store.get(queued_id)["status"] == "queued"
+        store.close()
+
+
+class TestJobQueue:
+    """Tests for the background job workers"""
+    
+    @pytest.mark.asyncio
+    async def test_submitted_job_completes(self, tmp_path):
+        """Test that a worker processes a submitted job and notifies subscribers"""
+        store = JobStore(str(tmp_path / "jobs.db"))
+        queue = JobQueue(store, make_cv_service(), workers=2, max_attempts=3)
+        await queue.start()
+        
+        try:
+            job_id = await queue.submit("cv.pdf", b"pdf content", {})
+            listener = queue.subscribe(job_id)
+            while (await listener.get())["status"] != "completed":
+                pass
+            job = await queue.get(job_id)
+        finally:
+            await queue.stop()
+            store.close()
+        
+        assert job["result"]["first_name"] == "John"
+        assert job["attempts"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_failed_job_records_error(self, tmp_path):
+        """Test that processing errors are stored on the job"""
+        store = JobStore(str(tmp_path / "jobs.db"))
+        cv_service = make_cv_service()
+        cv_service.process_content.side_effect = ValueError("Broken PDF")
+        queue = JobQueue(store, cv_service, workers=1, max_attempts=3)
+        await queue.start()
+        
+        try:
+            job_id = await queue.submit("cv.pdf", b"pdf content", {})
+            listener = queue.subscribe(job_id)
+            while (await listener.get())["status"] != "failed":
+                pass
+            job = await queue.get(job_id)
+        finally:
+            await queue.stop()
+            store.close()
+        
+        assert job["error"] == {"type": "ValueError", "detail": "Broken PDF"}
+    
+    @pytest.mark.asyncio
+    async def test_overloaded_job_is_retried(self, tmp_path):
+        """Test that a job rejected by an overloaded service is requeued, then completes"""
+        store = JobStore(str(tmp_path / "jobs.db"))
+        cv_service = make_cv_service()
+        cv_service.process_content.side_effect = [
+            ServiceOverloadedError("Extraction queue is full"),
+            CVModel(first_name="John", last_name="Doe"),
+        ]
+        queue = JobQueue(store, cv_service, workers=1, max_attempts=3, retry_delay=0.01)
+        await queue.start()
+        
+        try:
+            job_id = await queue.submit("cv.pdf", b"pdf content", {})
+            listener = queue.subscribe(job_id)
+            statuses = [(await listener.get())["status"]]
+            while statuses[-1] != "completed":
+                statuses.append((await listener.get())["status"])
+            job = await queue.get(job_id)
+        finally:
+            await queue.stop()
+            store.close()
+        
+        assert statuses == ["running", "queued", "running", "completed"]
+        assert job["attempts"] == 2
+        assert job["result"]["first_name"] == "John"
+    
+    @pytest.mark.asyncio
+    async def test_overloaded_job_fails_after_last_attempt(self, tmp_path):
+        """Test that a transient error fails the job once every attempt is used"""
+        store = JobStore(str(tmp_path / "jobs.db"))
+        cv_service = make_cv_service()
+        cv_service.process_content.side_effect = ServiceOverloadedError("Extraction queue is full")
+        queue = JobQueue(store, cv_service, workers=1, max_attempts=2, retry_delay=0.01)
+        await queue.start()
+        
+        try:
+            job_id = await queue.submit("cv.pdf", b"pdf content", {})
+            listener = queue.subscribe(job_id)
+            while (await listener.get())["status"] != "failed":
+                pass
+            job = await queue.get(job_id)
+        finally:
+            await queue.stop()
+            store.close()
+        
+        assert job["attempts"] == 2
+        assert job["error"]["type"] == "ServiceOverloadedError"
+    
+    @pytest.mark.asyncio
+    async def test_worker_survives_store_errors(self, tmp_path):
+        """Test that a failing claim is logged and retried instead of killing the worker"""
+        store = JobStore(str(tmp_path / "jobs.db"))
+        claim_next = store.claim_next
+        store.claim_next = MagicMock(side_effect=[sqlite3.OperationalError("database is locked"), None])
+        queue = JobQueue(store, make_cv_service(), workers=1, max_attempts=3, retry_delay=0.01)
+        await queue.start()
+        
+        try:
+            await asyncio.sleep(0.05)
+            store.claim_next = claim_next
+            job_id = await queue.submit("cv.pdf", b"pdf content", {})
+            listener = queue.subscribe(job_id)
+            while (await listener.get())["status"] != "completed":
+                pass
+            stats = await queue.stats()
+        finally:
+            await queue.stop()
+            store.close()
+        
+        assert stats["active_workers"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_sweeper_purges_finished_jobs(self, tmp_path):
+        """Test that the queue deletes finished jobs past their retention"""
+        store = JobStore(str(tmp_path / "jobs.db"))
+        job_id = store.enqueue("cv.pdf", b"pdf content", {})
+        store.claim_next()
+        store.finish(job_id, error={"type": "ValueError", "detail": "Broken PDF"})
+        queue = JobQueue(store, make_cv_service(), workers=1, max_attempts=3, retention_seconds=0)
+        
+        await queue.start()
+        await asyncio.sleep(0.05)
+        await queue.stop()
+        
+        assert store.get(job_id) is None
+        store.close()
+
+
+class TestJobsAPI:
+    """Tests for the asynchronous job endpoints"""
+    
+    def test_submit_poll_and_stream(self):
+        """Test submitting a job, polling it and reading its event stream"""
+        with TestClient(app) as client:
+            app.state.container.job_queue.cv_service = make_cv_service()
+            
+            response = client.post(
+                "/api/jobs",
+                files={"file": ("test.pdf", b"fake pdf content", "application/pdf")}
+            )
+            assert response.status_code == 202
+            job_id = response.json()["job_id"]
+            
+            for _ in range(100):
+                job = client.get(f"/api/jobs/{job_id}").json()
+                if job["status"] == "completed":
+                    break
+                time.sleep(0.01)
+            assert job["result"]["first_name"] == "John"
+            
+            events = client.get(f"/api/jobs/{job_id}/events")
+            assert events.headers["content-type"].startswith("text/event-stream")
+            assert '"status": "completed"' in events.text
+            
+            stats = client.get("/api/jobs/stats").json()
+            assert stats["queued"] == 0
+            assert stats["completed"] >= 1
+    
+    def test_unknown_job_returns_404(self):
+        """Test polling a job that does not exist"""
+        with TestClient(app) as client:
+            assert client.get("/api/jobs/unknown").status_code == 404
@@ -0,0 +1,108 @@
+import asyncio
+import random
+import time
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from app.infrastructure.analyzers.openai_analyzer import OpenAIAnalyzer
+from benchmarks.synthetic_cvs import generate_cv
+from loadtest.mock_openai import MockConfig, create_app, document_spec, parse_latency
+from loadtest.run_loadtest import LoopLagMonitor, RequestResult, percentile, summarize
+
+
+def mock_analyzer(config):
+    """OpenAI analyzer talking to the mock Azure OpenAI application in memory"""
+    app = create_app(config)
+    http_client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mock")
+    return app, OpenAIAnalyzer(http_client=http_client, endpoint="http://mock/", api_key="test-key")
+
+
+class TestMockOpenAI:
+    """Tests for the local Azure OpenAI stand-in"""
+    
+    @pytest.mark.asyncio
+    async def test_answers_in_the_azure_wire_format(self):
+        """Test that the analyzer parses completions and streams of the mock"""
+        app, analyzer = mock_analyzer(MockConfig(latency="fixed:0", tokens_per_second=0, responses=4))
+        cv = generate_cv(document_spec(0, 2))
+    
+        cv_model = await analyzer.analyze(f"CV\n{cv.data['phone_number']}")
+        events = [event async for event in analyzer.analyze_stream(f"CV\n{cv.data['phone_number']}")]
+    
+        assert cv_model.last_name == cv.data["last_name"]
+        assert len(cv_model.experiences) == len(cv.data["experiences"])
+        assert events[-1].value.email == cv.data["email"]
+        stats = app.state.deployment.stats()
+        assert stats["completed"] == 2 and stats["streamed"] == 1
+        assert stats["completion_tokens"] > 0
+    
+    def test_injects_throttling(self):
+        """Test that injected 429s carry Retry-After headers"""
+        client = TestClient(create_app(MockConfig(latency="fixed:0", throttle_rate=1.0, retry_after_seconds=2.5)))
+    
+        response = client.post("/openai/deployments/gpt/chat/completions", json={"messages": []})
+    
+        assert response.status_code == 429
+        assert response.headers["retry-after"] == "3"
+        assert response.headers["retry-after-ms"] == "2500"
+        assert client.get("/stats").json()["throttled"] == 1
+    
+    def test_enforces_requests_per_minute(self):
+        """Test that requests beyond the quota are throttled until the window has room"""
+        client = TestClient(create_app(MockConfig(latency="fixed:0", tokens_per_second=0, rpm_limit=2)))
+    
+        statuses = [
+            client.post("/openai/deployments/gpt/chat/completions", json={"messages": []}).status_code
+            for _ in range(3)
+        ]
+    
+        assert statuses == [200, 200, 429]
+    
+    @pytest.mark.parametrize("spec,low,high", [
+        ("fixed:0.8", 0.8, 0.8),
+        ("uniform:0.5,2", 0.5, 2.0),
+        ("lognormal:1,0.5", 0.0, float("inf")),
+        ("exponential:1", 0.0, float("inf")),
+    ])
+    def test_latency_distributions(self, spec, low, high):
+        """Test that latencies are drawn from the requested distribution"""
+        draw = parse_latency(spec)
+        rng = random.Random(0)
+    
+        assert all(low <= draw(rng) <= high for _ in range(100))
+    
+    def test_rejects_unknown_distribution(self):
+        """Test that invalid distributions fail early"""
+        with pytest.raises(ValueError):
+            parse_latency("gaussian:1")
+
+
+class TestLoadTestReport:
+    """Tests for the load test measurements"""
+    
+    def test_summarize(self):
+        """Test throughput, percentiles and error rates of a run"""
+        results = [RequestResult(0.0, latency / 1000, 200, analysis_mode="full") for latency in range(1, 101)]
+        results += [RequestResult(0.0, 0.5, 503), RequestResult(0.0, 1.0, None, "ReadTimeout")]
+    
+        summary = summarize(results, elapsed=10.0, dropped=2)
+    
+        assert summary["throughput_rps"] == 10.0
+        assert summary["latency_ms"]["p50"] == 50.0
+        assert summary["latency_ms"]["p99"] == 99.0
+        assert summary["errors"] == {"503": 1, "ReadTimeout": 1}
+        assert summary["error_rate"] == round(4 / 104, 4)
+        assert summary["analysis_modes"] == {"full": 100}
+        assert percentile([], 95) == 0.0
+    
+    @pytest.mark.asyncio
+    async def test_loop_lag_monitor(self):
+        """Test that a blocked event loop shows up as lag"""
+        monitor = LoopLagMonitor(interval=0.01)
+        task = asyncio.create_task(monitor.run())
+        await asyncio.sleep(0.02)
+        time.sleep(0.1)
+        await asyncio.sleep(0.02)
+        task.cancel()
+    
+        assert monitor.summary()["max_ms"] >= 80
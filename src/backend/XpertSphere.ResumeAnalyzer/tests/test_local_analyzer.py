@@ -0,0 +1,254 @@
+import time
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.dependencies import get_cv_service
+from app.core.exceptions import AnalysisError
+from app.domain.models import CVFieldEvent, RESULT_EVENT
+from app.domain.models.resume import CVModel, Experience, Training
+from app.infrastructure.analyzers import HybridAnalyzer, RuleBasedAnalyzer
+from app.infrastructure.analyzers.openai_analyzer import OpenAIAnalyzer
+from app.infrastructure.cache import ResultCache
+from app.utils.field_patterns import extract_local_fields
+
+FRENCH_CV = """Jean-Pierre DUPONT
+Développeur Full Stack
+jean.dupont@Example.fr | Tél : 06 12 34 56 78 | 75001 Paris
+EXPERIENCE
+Software Engineer - ACME Corp 2019 - 2021
+Lead Developer at Foo Jan 2021 – Present
+FORMATION
+Master Informatique, Université de Lyon
+sept. 2015 à juin 2017
+LANGUES
+Anglais : courant (C1)
+Allemand
+"""
+
+
+class TestFieldPatterns:
+    """Tests for the precompiled contact, date and language patterns"""
+    
+    def test_extracts_contact_details(self):
+        """Test that name, email and phone are found in a French CV"""
+        fields = extract_local_fields(FRENCH_CV)
+    
+        assert (fields.first_name, fields.last_name) == ("Jean-Pierre", "DUPONT")
+        assert fields.email == "jean.dupont@example.fr"
+        assert fields.phone_number == "06 12 34 56 78"
+    
+    def test_extracts_international_phone_and_obfuscated_email(self):
+        """Test international numbers and "[at]" spellings"""
+        fields = extract_local_fields("John Smith\nPhone: +1 (555) 123-4567\njohn [at] mail.com")
+    
+        assert fields.phone_number == "+1 (555) 123-4567"
+        assert fields.email == "john@mail.com"
+    
+    def test_year_ranges_are_not_phone_numbers(self):
+        """Test that date ranges and postal codes are not read as phones"""
+        fields = extract_local_fields("John Smith\nDeveloper 2019 2021 2023\n75001 Paris")
+    
+        assert fields.phone_number is None
+    
+    @pytest.mark.parametrize("text", [
+        "0" * 20000,
+        "x@" + "a." * 12000,
+        "a" * 24000,
+        "+" + "0 " * 12000,
+    ])
+    def test_hostile_input_is_matched_in_linear_time(self, text):
+        """Test that long digit and address-like runs do not make the patterns backtrack"""
+        started = time.perf_counter()
+        fields = extract_local_fields(text)
+        elapsed = time.perf_counter() - started
+    
+        assert elapsed < 0.5
+        assert fields.phone_number is None
+        assert fields.email is None
+    
+    def test_extracts_date_ranges_across_locales(self):
+        """Test English, French and numeric date ranges"""
+        entries = extract_local_fields(FRENCH_CV).entries
+    
+        assert [entry.period for entry in entries] == [
+            "2019 - 2021", "Jan 2021 – Present", "sept. 2015 à juin 2017"
+        ]
+        assert entries[0].title == "Software Engineer - ACME Corp"
+        assert entries[2].title == "Master Informatique, Université de Lyon"
+        assert [entry.education for entry in entries] == [False, False, True]
+    
+    def test_extracts_languages_with_levels(self):
+        """Test that languages need a level or a languages section"""
+        assert extract_local_fields(FRENCH_CV).languages == ["Anglais (courant)", "Allemand"]
+        assert extract_local_fields("Lived in the French Alps").languages == []
+        assert extract_local_fields("German - B2, Spanish: native").languages == [
+            "German (B2)", "Spanish (native)"
+        ]
+
+
+class TestRuleBasedAnalyzer:
+    """Tests for the local analyzer"""
+    
+    @pytest.mark.asyncio
+    async def test_builds_partial_cv_model(self):
+        """Test that dated lines become experiences and trainings"""
+        cv_model = await RuleBasedAnalyzer().analyze(FRENCH_CV)
+    
+        assert cv_model.full_name == "Jean-Pierre DUPONT"
+        assert [experience.date for experience in cv_model.experiences] == ["2019 - 2021", "Jan 2021 – Present"]
+        assert cv_model.trainings[0].period == "sept. 2015 à juin 2017"
+
+
+class TestHybridAnalyzer:
+    """Tests for merging local fields with LLM output"""
+    
+    @pytest.fixture
+    def llm(self):
+        """LLM analyzer mock returning a CV with a hallucinated email and date"""
+        llm = MagicMock()
+        llm.version = "llm"
+        llm.analyze = AsyncMock(return_value=CVModel(
+            first_name="Jean-Pierre",
+            last_name="Dupont",
+            email="jp@invented.com",
+            experiences=[
+                Experience(title="Software Engineer", description="", date="2019 - 2021"),
+                Experience(title="Intern", description="", date="2012"),
+            ],
+            trainings=[Training(school="Université de Lyon", level="Master", period="2015/2017")],
+        ))
+        return llm
+    
+    @pytest.mark.asyncio
+    async def test_skips_and_fills_local_fields(self, llm):
+        """Test that locally found fields are left out of the LLM call and filled in"""
+        analyzer = HybridAnalyzer(llm, RuleBasedAnalyzer())
+        text = FRENCH_CV.replace("jean.dupont@Example.fr | ", "")
+    
+        cv_model = await analyzer.analyze(text, {"timeout": 5})
+    
+        options = llm.analyze.call_args.args[1]
+        assert options == {"timeout": 5, "skip_fields": ["phone_number"]}
+        assert cv_model.phone_number == "06 12 34 56 78"
+        assert cv_model.languages == ["Anglais (courant)", "Allemand"]
+        assert analyzer.version == "llm+rules:2"
+    
+    @pytest.mark.asyncio
+    async def test_drops_values_missing_from_text(self, llm):
+        """Test that hallucinated emails and dates are dropped"""
+        text = FRENCH_CV.replace("jean.dupont@Example.fr | ", "")
+    
+        cv_model = await HybridAnalyzer(llm, RuleBasedAnalyzer()).analyze(text)
+    
+        assert cv_model.email is None
+        assert [experience.date for experience in cv_model.experiences] == ["2019 - 2021", None]
+        assert cv_model.trainings[0].period == "2015/2017"
+    
+    @pytest.mark.asyncio
+    async def test_stream_yields_local_fields_first(self, llm):
+        """Test that pre-extracted fields are streamed before the LLM fields"""
+        async def analyze_stream(text, options):
+            yield CVFieldEvent("first_name", "Jean-Pierre")
+            yield CVFieldEvent(RESULT_EVENT, await llm.analyze(text, options))
+    
+        llm.analyze_stream = analyze_stream
+    
+        events = [event async for event in HybridAnalyzer(llm, RuleBasedAnalyzer()).analyze_stream(FRENCH_CV)]
+    
+        assert [event.name for event in events] == [
+            "email", "phone_number", "first_name", RESULT_EVENT
+        ]
+        assert events[-1].value.email == "jean.dupont@example.fr"
+    
+    @pytest.mark.asyncio
+    async def test_languages_unknown_to_patterns_are_kept(self, llm):
+        """Test that the LLM is asked for languages and local ones are added to them"""
+        text = "John Doe\nLANGUAGES\nEnglish - fluent / Swahili - native / Vietnamese - B2\nGerman - A2"
+        llm.analyze.return_value = CVModel(
+            first_name="John",
+            last_name="Doe",
+            languages=["English (fluent)", "Swahili (native)", "Vietnamese (B2)"],
+        )
+    
+        cv_model = await HybridAnalyzer(llm, RuleBasedAnalyzer()).analyze(text)
+    
+        assert "languages" not in llm.analyze.call_args.args[1]["skip_fields"]
+        assert cv_model.languages == ["English (fluent)", "Swahili (native)", "Vietnamese (B2)", "German (A2)"]
+    
+    def test_openai_prompt_omits_skipped_fields(self):
+        """Test that skipped fields are removed from the requested JSON"""
+        with patch('app.infrastructure.analyzers.openai_analyzer.get_async_llm'):
+            analyzer = OpenAIAnalyzer()
+    
+        prompt = analyzer._create_prompt("CV text", ["email", "languages"])
+    
+        assert '"email"' not in prompt
+        assert '"languages"' not in prompt
+        assert '"phone_number"' in prompt
+
+
+class TestCVServiceLocalModes:
+    """Tests for fast mode and the degraded fallback"""
+    
+    @pytest.mark.asyncio
+    async def test_fast_mode_skips_llm(self, make_cv_service):
+        """Test that fast mode answers from the local analyzer"""
+        analyze = AsyncMock()
+        service = make_cv_service(analyze=analyze, version="llm", local_analyzer=RuleBasedAnalyzer())
+        analysis = {}
+    
+        cv_model = await service.process_content(
+            FRENCH_CV.encode(), "cv.pdf", {"mode": "fast"}, analysis=analysis
+        )
+    
+        assert cv_model.email == "jean.dupont@example.fr"
+        assert analysis == {"mode": "fast"}
+        analyze.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_falls_back_when_llm_fails(self, make_cv_service):
+        """Test that a failed LLM call returns an uncached local result"""
+        result_cache = ResultCache(name="file", max_entries=10, ttl_seconds=60)
+        service = make_cv_service(
+            analyze=AsyncMock(side_effect=AnalysisError("Azure OpenAI unavailable")),
+            version="llm",
+            local_analyzer=RuleBasedAnalyzer(),
+            result_cache=result_cache,
+            local_fallback=True,
+        )
+        analysis = {}
+    
+        cv_model = await service.process_content(FRENCH_CV.encode(), "cv.pdf", analysis=analysis)
+    
+        assert cv_model.full_name == "Jean-Pierre DUPONT"
+        assert analysis == {"mode": "fallback"}
+        assert result_cache.stats()["entries"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_no_fallback_when_disabled(self, make_cv_service):
+        """Test that LLM failures propagate without a fallback"""
+        service = make_cv_service(
+            analyze=AsyncMock(side_effect=AnalysisError("Azure OpenAI unavailable")),
+            local_analyzer=RuleBasedAnalyzer(),
+        )
+    
+        with pytest.raises(AnalysisError):
+            await service.process_content(FRENCH_CV.encode(), "cv.pdf")
+    
+    def test_fast_mode_endpoint(self, make_cv_service):
+        """Test that the endpoint reports the analysis mode in a header"""
+        app.dependency_overrides[get_cv_service] = lambda: make_cv_service(
+            analyze=AsyncMock(), local_analyzer=RuleBasedAnalyzer()
+        )
+        try:
+            response = TestClient(app).post(
+                "/api/extract/?mode=fast",
+                files={"file": ("cv.pdf", FRENCH_CV.encode(), "application/pdf")},
+            )
+        finally:
+            app.dependency_overrides.clear()
+    
+        assert response.status_code == 200
+        assert response.headers["X-Analysis-Mode"] == "fast"
+        assert response.json()["extracted_data"]["phone_number"] == "06 12 34 56 78"
@@ -0,0 +1,93 @@
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.core import settings
+from app.core.exceptions import ExtractionError
+from app.infrastructure.analyzers.openai_analyzer import OpenAIAnalyzer
+from app.utils.metrics import REGISTRY, STAGES, record_error
+
+
+def sample(name, **labels):
+    """Current value of a metric sample, 0 when not recorded yet"""
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+# Text of a two-page document
+TWO_PAGES = "Page one\fPage two"
+
+
+class TestPipelineMetrics:
+    """Tests for the stage histograms and counters recorded by the pipeline"""
+    
+    @pytest.mark.asyncio
+    async def test_records_stages_pages_and_characters(self, make_cv_service):
+        """Test that each stage is timed and extracted text is counted"""
+        before = {stage: sample("cv_stage_duration_seconds_count", stage=stage) for stage in STAGES}
+        pages = sample("cv_pages_extracted_total")
+        characters = sample("cv_characters_extracted_total")
+    
+        await make_cv_service(text=TWO_PAGES).process_content(b"%PDF", "cv.pdf")
+    
+        for stage in ("extract", "compact", "analyze"):
+            assert sample("cv_stage_duration_seconds_count", stage=stage) == before[stage] + 1
+        assert sample("cv_pages_extracted_total") == pages + 2
+        assert sample("cv_characters_extracted_total") == characters + len(TWO_PAGES)
+        assert sample("cv_requests_in_flight") == 0
+    
+    @pytest.mark.asyncio
+    async def test_counts_errors_by_type(self, make_cv_service):
+        """Test that failures are counted with a bounded type label"""
+        service = make_cv_service(text=TWO_PAGES)
+        service.extractors[0].extract_text.side_effect = ExtractionError("corrupt PDF")
+        extraction_errors = sample("cv_errors_total", type="ExtractionError")
+        other_errors = sample("cv_errors_total", type="other")
+    
+        with pytest.raises(ExtractionError):
+            await service.process_content(b"%PDF", "cv.pdf")
+        record_error(KeyError("unexpected"))
+    
+        assert sample("cv_errors_total", type="ExtractionError") == extraction_errors + 1
+        assert sample("cv_errors_total", type="other") == other_errors + 1
+        assert sample("cv_errors_total", type="KeyError") == 0
+    
+    @pytest.mark.asyncio
+    async def test_records_llm_stages_and_tokens(self):
+        """Test that the analyzer times its stages and counts reported tokens"""
+        with patch('app.infrastructure.analyzers.openai_analyzer.get_async_llm') as mock_get_llm:
+            analyzer = OpenAIAnalyzer()
+        response = MagicMock()
+        response.choices = [MagicMock()]
+        response.choices[0].message.content = json.dumps(
+            {"first_name": "John", "last_name": "Doe", "experiences": [], "trainings": []}
+        )
+        response.usage = SimpleNamespace(prompt_tokens=900, completion_tokens=120, total_tokens=1020)
+        analyzer.client = mock_get_llm.return_value
+        analyzer.client.chat.completions.create = AsyncMock(return_value=response)
+        before = {stage: sample("cv_stage_duration_seconds_count", stage=stage) for stage in STAGES}
+        prompt_tokens = sample("llm_tokens_total", kind="prompt")
+        completion_tokens = sample("llm_tokens_total", kind="completion")
+    
+        await analyzer.analyze("CV text")
+    
+        for stage in ("prompt", "queue", "llm", "parse"):
+            assert sample("cv_stage_duration_seconds_count", stage=stage) == before[stage] + 1
+        assert sample("llm_tokens_total", kind="prompt") == prompt_tokens + 900
+        assert sample("llm_tokens_total", kind="completion") == completion_tokens + 120
+    
+    def test_metrics_endpoint(self):
+        """Test that /metrics serves the Prometheus text format"""
+        response = TestClient(app).get("/metrics")
+    
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert "cv_stage_duration_seconds_bucket" in response.text
+        assert "cv_requests_in_flight" in response.text
+    
+    def test_metrics_endpoint_disabled(self, monkeypatch):
+        """Test that /metrics is not served when metrics are disabled"""
+        monkeypatch.setattr(settings, "METRICS_ENABLED", False)
+    
+        assert TestClient(app).get("/metrics").status_code == 404
@@ -1,3 +1,4 @@
+import json
 import pytest
 from app.domain.models.resume import CVModel, Experience, Training
 
@@ -93,3 +94,80 @@ class TestTraining:
         
         assert training.school == "University of Technology"
         assert training.field == "Computer Science"
+
+
+class TestJSONCodec:
+    """Tests for decoding and encoding CV models as JSON"""
+    
+    def test_from_json_builds_nested_models_in_one_pass(self):
+        """Test that a response decodes into cleaned, typed nested models"""
+        cv = CVModel.from_json(json.dumps({
+            "first_name": " John ",
+            "last_name": "Doe",
+            "email": " John.Doe@Example.com",
+            "phone_number": 612345678,
+            "experiences": [{"title": " Developer ", "description": "Code", "extra": "ignored"}],
+            "trainings": [{"school": "University", "level": "Master", "period": 2020}],
+        }))
+    
+        assert cv.first_name == "John"
+        assert cv.email == "john.doe@example.com"
+        assert cv.phone_number == "612345678"
+        assert isinstance(cv.experiences[0], Experience)
+        assert cv.experiences[0].title == "Developer"
+        assert cv.trainings[0] == Training(school="University", level="Master", period="2020")
+        assert cv.skills == []
+        assert cv.id
+    
+    def test_from_json_reads_null_text_fields_as_empty(self):
+        """Test that null names and descriptions, and missing descriptions, are accepted"""
+        cv = CVModel.from_json(json.dumps({
+            "first_name": "John",
+            "last_name": None,
+            "experiences": [
+                {"title": "Developer", "description": None},
+                {"title": "Intern", "company": "TechCorp"},
+            ],
+            "trainings": [{"school": "University", "level": None}],
+        }))
+    
+        assert cv.last_name == ""
+        assert cv.full_name == "John"
+        assert [experience.description for experience in cv.experiences] == ["", ""]
+        assert cv.trainings[0].level == ""
+        assert CVModel.from_json(cv.to_json()) == cv
+    
+    @pytest.mark.parametrize("content", [
+        "Invalid JSON",
+        '{"last_name": "Doe"}',
+        '{"first_name": "John", "last_name": "Doe", "experiences": [{"description": "Code"}]}',
+        '{"first_name": "John", "last_name": "Doe", "skills": "Python"}',
+    ])
+    def test_from_json_rejects_invalid_responses(self, content):
+        """Test that malformed JSON and missing or mistyped fields raise ValueError"""
+        with pytest.raises(ValueError):
+            CVModel.from_json(content)
+    
+    def test_json_and_dict_round_trip(self):
+        """Test that encoded models decode to equal models"""
+        cv = CVModel(
+            first_name="Jöhn",
+            last_name="Doe",
+            skills=["Python"],
+            experiences=[Experience(title="Developer", description="Code", company="TechCorp")],
+            trainings=[Training(school="University", level="Master", field="CS")],
+        )
+    
+        assert CVModel.from_json(cv.to_json()) == cv
+        assert CVModel.from_dict(cv.to_dict()) == cv
+        assert json.loads(cv.to_json()) == cv.to_dict()
+        assert cv.to_dict()["experiences"][0]["company"] == "TechCorp"
+    
+    def test_models_are_slotted(self):
+        """Test that models keep no per-instance attribute dictionary"""
+        cv = CVModel(first_name="John", last_name="Doe")
+    
+        for model in (cv, Experience(title="Developer", description=""), Training(school="University", level="")):
+            assert not hasattr(model, "__dict__")
+        with pytest.raises(AttributeError):
+            cv.nickname = "Johnny"
@@ -1,6 +1,6 @@
 import pytest
 import json
-from unittest.mock import patch, MagicMock
+from unittest.mock import patch, MagicMock, AsyncMock
 from app.infrastructure.analyzers.openai_analyzer import OpenAIAnalyzer
 from app.domain.models.resume import CVModel
 from app.core.exceptions import AnalysisError
@@ -12,9 +12,10 @@ class TestOpenAIAnalyzer:
     @pytest.fixture
     def openai_analyzer(self):
         """Create an OpenAI analyzer with mocked client"""
-        with patch('app.infrastructure.analyzers.openai_analyzer.AzureOpenAI') as mock_client:
+        with patch('app.infrastructure.analyzers.openai_analyzer.get_async_llm') as mock_get_llm:
             analyzer = OpenAIAnalyzer()
-            analyzer.client = mock_client.return_value
+            analyzer.client = mock_get_llm.return_value
+            analyzer.client.chat.completions.create = AsyncMock()
             return analyzer
     
     @pytest.mark.asyncio
@@ -76,3 +77,14 @@ class TestOpenAIAnalyzer:
         
         with pytest.raises(AnalysisError):
             await openai_analyzer.analyze("Sample CV text")
+
+    @pytest.mark.asyncio
+    async def test_analyze_uses_per_call_timeout(self, openai_analyzer):
+        """Test that the timeout option is forwarded to the client"""
+        openai_analyzer.client.chat.completions.create.side_effect = Exception("Timeout")
+        
+        with pytest.raises(AnalysisError):
+            await openai_analyzer.analyze("Sample CV text", {"timeout": 5})
+        
+        timeout = openai_analyzer.client.chat.completions.create.call_args.kwargs["timeout"]
+        assert timeout.read == 5
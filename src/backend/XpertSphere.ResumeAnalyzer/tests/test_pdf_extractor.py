@@ -25,14 +25,9 @@ class TestPDFExtractor:
     
     @pytest.mark.asyncio
     @patch('app.infrastructure.extractors.pdf_extractor.pdfplumber')
-    @patch('tempfile.NamedTemporaryFile')
-    @patch('os.unlink')
-    async def test_extract_text_success(self, mock_unlink, mock_temp_file, mock_pdfplumber, pdf_extractor):
+    async def test_extract_text_success(self, mock_pdfplumber, pdf_extractor):
         """Test successful text extraction from PDF"""
         # Setup mocks
-        mock_temp_file.return_value.__enter__.return_value.name = "/tmp/test.pdf"
-        mock_temp_file.return_value.__enter__.return_value.write = MagicMock()
-        
         mock_page = MagicMock()
         mock_page.extract_text.return_value = "Sample PDF text"
         
@@ -45,18 +40,15 @@ class TestPDFExtractor:
         
         # Assertions
         assert result == "Sample PDF text\n"
-        mock_unlink.assert_called_once()
+        mock_page.close.assert_called_once()
+        source = mock_pdfplumber.open.call_args.args[0]
+        assert source.closed
     
     @pytest.mark.asyncio
     @patch('app.infrastructure.extractors.pdf_extractor.pdfplumber')
-    @patch('tempfile.NamedTemporaryFile')
-    @patch('os.unlink')
-    async def test_extract_text_empty_pdf(self, mock_unlink, mock_temp_file, mock_pdfplumber, pdf_extractor):
+    async def test_extract_text_empty_pdf(self, mock_pdfplumber, pdf_extractor):
         """Test extraction from empty PDF raises error"""
         # Setup mocks
-        mock_temp_file.return_value.__enter__.return_value.name = "/tmp/test.pdf"
-        mock_temp_file.return_value.__enter__.return_value.write = MagicMock()
-        
         mock_page = MagicMock()
         mock_page.extract_text.return_value = ""
         
@@ -67,3 +59,47 @@ class TestPDFExtractor:
         # Test
         with pytest.raises(ExtractionError):
             await pdf_extractor.extract_text(b"fake pdf content", "test.pdf")
+
+    
+    @pytest.mark.asyncio
+    async def test_extract_text_multi_page_pdf(self, pdf_extractor, make_pdf):
+        """Test extraction of a real multi-page PDF without temporary files"""
+        content = make_pdf([["John Doe", "Developer"], "Second page"])
+        
+        with patch('tempfile.NamedTemporaryFile') as mock_temp_file:
+            result = await pdf_extractor.extract_text(content, "cv.pdf")
+        
+        assert result == "John Doe\nDeveloper\fSecond page\n"
+        mock_temp_file.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_extract_text_from_memoryview(self, pdf_extractor, make_pdf):
+        """Test extraction reads a memoryview in place and releases it"""
+        buffer = bytearray(make_pdf(["John Doe"]))
+        
+        result = await pdf_extractor.extract_text(memoryview(buffer), "cv.pdf")
+        
+        assert result == "John Doe\n"
+        # Resizing fails while any view of the buffer is still exported
+        buffer.extend(b"\n")
+    
+    @pytest.mark.asyncio
+    async def test_extract_text_stops_at_page_limit(self, make_pdf):
+        """Test that pages beyond max_pages are not extracted"""
+        extractor = PDFExtractor(max_pages=2)
+        
+        result = await extractor.extract_text(make_pdf(["One", "Two", "Three"]), "cv.pdf")
+        
+        assert result == "One\fTwo\n"
+
+
+class TestPDFUtils:
+    """Basic tests for PDF utilities"""
+    
+    def test_extract_text_from_pdf_bytes(self, make_pdf):
+        """Test extracting text directly from PDF bytes"""
+        from app.utils.pdf_utils import extract_text_from_pdf
+        
+        result = extract_text_from_pdf(make_pdf(["First", "Second"]))
+        
+        assert result == "FirstSecond"
@@ -0,0 +1,196 @@
+import asyncio
+import json
+import time
+import httpx
+import openai
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.core.exceptions import AnalysisError, ServiceOverloadedError
+from app.infrastructure.analyzers.openai_analyzer import OpenAIAnalyzer
+from app.utils import RateLimiter, backoff_delay, parse_retry_after
+
+
+def rate_limit_error(headers):
+    """Build the error raised by the SDK on a 429 response"""
+    request = httpx.Request("POST", "https://example.openai.azure.com/chat/completions")
+    response = httpx.Response(429, headers=headers, request=request)
+    return openai.RateLimitError("Too Many Requests", response=response, body=None)
+
+
+def completion(total_tokens=None):
+    """Build a completion returning an empty CV"""
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = json.dumps(
+        {"first_name": "John", "last_name": "Doe", "experiences": [], "trainings": []}
+    )
+    response.usage.total_tokens = total_tokens
+    return response
+
+
+class TestRetryAfter:
+    """Tests for reading the wait time of throttled responses"""
+    
+    def test_parses_retry_after_headers(self):
+        """Test the supported retry headers, in order of precedence"""
+        assert parse_retry_after({"retry-after-ms": "250", "retry-after": "3"}) == 0.25
+        assert parse_retry_after({"retry-after": "3"}) == 3.0
+        assert parse_retry_after({"x-ratelimit-reset-tokens": "6m0s", "x-ratelimit-reset-requests": "20ms"}) == 360.0
+        assert parse_retry_after({}) is None
+        assert parse_retry_after(None) is None
+    
+    def test_backoff_is_bounded(self):
+        """Test that the jittered delay stays below the exponential bound"""
+        delays = [backoff_delay(attempt, 0.5, 4.0) for attempt in range(10)]
+    
+        assert all(0 <= delay <= 4.0 for delay in delays)
+        assert backoff_delay(0, 0.5, 4.0) <= 0.5
+
+
+class TestRateLimiter:
+    """Tests for the request and token buckets"""
+    
+    @pytest.mark.asyncio
+    async def test_queues_calls_over_the_token_quota(self):
+        """Test that a call waits until the tokens it needs are refilled"""
+        # 100 tokens per second with a burst of 1000
+        limiter = RateLimiter(tokens_per_minute=6000)
+    
+        assert await limiter.acquire(1000) == 0
+        waited = await limiter.acquire(20)
+    
+        assert 0.1 < waited < 0.5
+        stats = limiter.stats()
+        assert (stats["calls"], stats["queued"]) == (2, 1)
+        assert stats["queue_wait_ms_max"] > 100
+    
+    @pytest.mark.asyncio
+    async def test_rejects_calls_beyond_max_wait(self):
+        """Test that a full queue is reported as overloaded"""
+        limiter = RateLimiter(requests_per_minute=6, max_wait=1.0)
+        await limiter.acquire(0)
+    
+        with pytest.raises(ServiceOverloadedError):
+            await limiter.acquire(0)
+        assert limiter.stats()["rejected"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_throttle_pauses_every_call(self):
+        """Test that a Retry-After delays the next calls without a quota"""
+        limiter = RateLimiter()
+        limiter.record_throttle(0.2)
+    
+        started = time.monotonic()
+        await asyncio.gather(limiter.acquire(10), limiter.acquire(10))
+    
+        assert time.monotonic() - started >= 0.2
+        assert limiter.stats()["throttled"] == 1
+    
+    def test_usage_and_headers_correct_the_buckets(self):
+        """Test that reported usage and remaining quotas adjust the levels"""
+        limiter = RateLimiter(requests_per_minute=600, tokens_per_minute=6000)
+        limiter.tokens.level = 500
+    
+        limiter.record_usage(estimated=300, actual=100)
+        assert limiter.tokens.level == pytest.approx(700, abs=1)
+    
+        limiter.observe({"x-ratelimit-remaining-requests": "0", "x-ratelimit-remaining-tokens": "50"})
+        assert limiter.requests.level == pytest.approx(0, abs=1)
+        assert limiter.tokens.level == pytest.approx(50, abs=1)
+
+
+class TestAnalyzerRetries:
+    """Tests for retries of throttled and failed Azure OpenAI calls"""
+    
+    @pytest.fixture
+    def analyzer(self):
+        """OpenAI analyzer with a mocked client and short retry delays"""
+        with patch('app.infrastructure.analyzers.openai_analyzer.get_async_llm') as mock_get_llm:
+            analyzer = OpenAIAnalyzer(rate_limiter=RateLimiter(tokens_per_minute=600000))
+        analyzer.client = mock_get_llm.return_value
+        analyzer.client.chat.completions.create = AsyncMock()
+        with patch('app.infrastructure.analyzers.openai_analyzer.settings.AZURE_OPENAI_RETRY_BASE_DELAY_SECONDS', 0.01):
+            yield analyzer
+    
+    @pytest.mark.asyncio
+    async def test_retries_after_throttling(self, analyzer):
+        """Test that a 429 is retried after its Retry-After"""
+        analyzer.client.chat.completions.create.side_effect = [
+            rate_limit_error({"retry-after-ms": "50"}),
+            completion(total_tokens=500),
+        ]
+    
+        started = time.monotonic()
+        cv_model = await analyzer.analyze("CV text")
+    
+        assert cv_model.first_name == "John"
+        assert time.monotonic() - started >= 0.05
+        stats = analyzer.rate_limiter.stats()
+        assert (stats["throttled"], stats["retries"], stats["calls"]) == (1, 1, 2)
+    
+    @pytest.mark.asyncio
+    async def test_retries_connection_errors(self, analyzer):
+        """Test that dropped connections are retried with backoff"""
+        request = httpx.Request("POST", "https://example.openai.azure.com")
+        analyzer.client.chat.completions.create.side_effect = [
+            openai.APITimeoutError(request),
+            openai.APIConnectionError(request=request),
+            completion(),
+        ]
+    
+        cv_model = await analyzer.analyze("CV text")
+    
+        assert cv_model.last_name == "Doe"
+        assert analyzer.client.chat.completions.create.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_gives_up_after_max_retries(self, analyzer):
+        """Test that the last failure becomes an analysis error"""
+        analyzer.client.chat.completions.create.side_effect = rate_limit_error({"retry-after-ms": "1"})
+    
+        with patch('app.infrastructure.analyzers.openai_analyzer.settings.AZURE_OPENAI_MAX_RETRIES', 2):
+            with pytest.raises(AnalysisError):
+                await analyzer.analyze("CV text")
+        assert analyzer.client.chat.completions.create.call_count == 3
+    
+    @pytest.mark.asyncio
+    async def test_does_not_retry_client_errors(self, analyzer):
+        """Test that errors other than transient ones fail at once"""
+        analyzer.client.chat.completions.create.side_effect = Exception("Invalid request")
+    
+        with pytest.raises(AnalysisError):
+            await analyzer.analyze("CV text")
+        assert analyzer.client.chat.completions.create.call_count == 1
+
+
+class TestQuotaHeaders:
+    """Tests for following the quota reported by successful responses"""
+    
+    @pytest.mark.asyncio
+    async def test_low_remaining_tokens_delay_the_next_call(self):
+        """Test that a 200 reporting an exhausted token quota makes the next call wait"""
+        def respond(request):
+            body = {
+                "id": "chatcmpl-1",
+                "object": "chat.completion",
+                "created": 0,
+                "model": "gpt-35-turbo",
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": json.dumps({"first_name": "John", "last_name": "Doe"})},
+                }],
+            }
+            return httpx.Response(200, json=body, headers={"x-ratelimit-remaining-tokens": "0"})
+        
+        limiter = RateLimiter(tokens_per_minute=60000)
+        http_client = httpx.AsyncClient(transport=httpx.MockTransport(respond))
+        analyzer = OpenAIAnalyzer(http_client=http_client, endpoint="https://example.openai.azure.com/", rate_limiter=limiter)
+        
+        cv_model = await analyzer.analyze("CV text")
+        waited = await limiter.acquire(100)
+        await http_client.aclose()
+        
+        assert cv_model.first_name == "John"
+        assert limiter.queued == 1
+        assert waited >= 0.05
@@ -0,0 +1,140 @@
+import pytest
+from io import BytesIO
+from unittest.mock import patch
+from fastapi import UploadFile
+from app.infrastructure.cache import ResultCache
+from app.domain.models.resume import Experience
+from app.utils import normalize_text
+
+
+class TestResultCache:
+    """Basic tests for the two-tier result cache"""
+    
+    @pytest.mark.asyncio
+    async def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted"""
+        cache = ResultCache(name="test", max_entries=2, ttl_seconds=60)
+        await cache.set("a", {"value": 1})
+        await cache.set("b", {"value": 2})
+        await cache.get("a")
+        await cache.set("c", {"value": 3})
+    
+        assert await cache.get("a") == {"value": 1}
+        assert await cache.get("b") is None
+        assert cache.stats()["evictions"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_expired_entries_are_misses(self):
+        """Test that entries past their TTL are not returned"""
+        cache = ResultCache(name="test", max_entries=10, ttl_seconds=60)
+    
+        with patch("app.infrastructure.cache.result_cache.time.time", return_value=1000):
+            await cache.set("a", {"value": 1})
+        with patch("app.infrastructure.cache.result_cache.time.time", return_value=1061):
+            assert await cache.get("a") is None
+    
+        assert cache.stats()["misses"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_disk_tier_survives_restart(self, tmp_path):
+        """Test that the SQLite tier serves entries to a new cache instance"""
+        db_path = str(tmp_path / "cache.db")
+        cache = ResultCache(name="test", max_entries=10, ttl_seconds=60, db_path=db_path)
+        await cache.set("a", {"value": 1}, tag="digest")
+        cache.close()
+    
+        restarted = ResultCache(name="test", max_entries=10, ttl_seconds=60, db_path=db_path)
+        assert await restarted.get("a") == {"value": 1}
+        assert await restarted.get("a") == {"value": 1}
+    
+        stats = restarted.stats()
+        assert stats["disk_hits"] == 1
+        assert stats["memory_hits"] == 1
+        restarted.close()
+    
+    @pytest.mark.asyncio
+    async def test_invalidate_by_tag(self, tmp_path):
+        """Test that invalidation removes entries from every tier"""
+        cache = ResultCache(name="test", max_entries=10, ttl_seconds=60, db_path=str(tmp_path / "cache.db"))
+        await cache.set("v1:digest", {"value": 1}, tag="digest")
+        await cache.set("v2:digest", {"value": 2}, tag="digest")
+        await cache.set("v1:other", {"value": 3}, tag="other")
+    
+        removed = await cache.invalidate("digest")
+    
+        assert removed == 2
+        assert await cache.get("v1:digest") is None
+        assert await cache.get("v1:other") == {"value": 3}
+        cache.close()
+
+
+class TestNormalizeText:
+    """Basic tests for text canonicalization"""
+    
+    def test_cosmetic_differences_are_removed(self):
+        """Test that exports differing only in layout glyphs compare equal"""
+        word_export = "John  Doe\n\n\u2022 Python \u2013 \u201cSenior\u201d\n\fPage 2"
+        canva_export = "John Doe\r\n- Python - \"Senior\"\nPage\u00a02\n"
+    
+        assert normalize_text(word_export) == normalize_text(canva_export)
+    
+    def test_content_differences_are_kept(self):
+        """Test that different text does not normalize to the same value"""
+        assert normalize_text("John Doe") != normalize_text("Jane Doe")
+
+
+class TestCVServiceCache:
+    """Tests for result caching in the CV service"""
+    
+    @pytest.mark.asyncio
+    async def test_same_file_is_analyzed_once(self, make_cv_service):
+        """Test that a re-submitted file skips extraction and analysis"""
+        cache = ResultCache(name="file", max_entries=10, ttl_seconds=60)
+        service = make_cv_service(text="CV text", result_cache=cache)
+        extractor = service.extractors[0]
+        analyzer = service.analyzer
+    
+        first = await service.process_cv(UploadFile(BytesIO(b"same pdf"), filename="a.pdf"))
+        second = await service.process_cv(UploadFile(BytesIO(b"same pdf"), filename="b.pdf"))
+    
+        assert extractor.extract_text.await_count == 1
+        assert analyzer.analyze.await_count == 1
+        assert second == first
+        assert isinstance(second.experiences[0], Experience)
+        assert cache.stats()["hits"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_same_text_in_different_file_is_analyzed_once(self, make_cv_service):
+        """Test that the text layer catches re-exports with different bytes"""
+        file_cache = ResultCache(name="file", max_entries=10, ttl_seconds=60)
+        text_cache = ResultCache(name="text", max_entries=10, ttl_seconds=60)
+        service = make_cv_service(text="CV text", result_cache=file_cache, text_cache=text_cache)
+        service.extractors[0].extract_text.side_effect = ["John  Doe\n\u2022 Python", "John Doe\n- Python\n"]
+    
+        await service.process_cv(UploadFile(BytesIO(b"word export"), filename="a.pdf"))
+        await service.process_cv(UploadFile(BytesIO(b"canva export"), filename="b.pdf"))
+    
+        assert service.extractors[0].extract_text.await_count == 2
+        assert service.analyzer.analyze.await_count == 1
+        assert file_cache.stats()["misses"] == 2
+        assert text_cache.stats()["hits"] == 1
+        assert text_cache.stats()["hit_rate"] == 0.5
+    
+    @pytest.mark.asyncio
+    async def test_settings_change_misses_the_cache(self, make_cv_service):
+        """Test that results built with other extraction or compaction settings are not served"""
+        file_cache = ResultCache(name="file", max_entries=10, ttl_seconds=60)
+        text_cache = ResultCache(name="text", max_entries=10, ttl_seconds=60)
+        options = {"text": "CV text", "result_cache": file_cache, "text_cache": text_cache}
+        services = [
+            make_cv_service(extraction_settings="pages=30", **options),
+            make_cv_service(extraction_settings="pages=5", **options),
+            make_cv_service(extraction_settings="pages=5", compaction_enabled=True, **options),
+        ]
+    
+        for service in services:
+            await service.process_cv(UploadFile(BytesIO(b"same pdf"), filename="a.pdf"))
+    
+        assert [service.analyzer.analyze.await_count for service in services] == [1, 1, 1]
+        assert file_cache.stats()["hits"] == 0
+        assert text_cache.stats()["hits"] == 0
@@ -0,0 +1,228 @@
+import asyncio
+import json
+import os
+import stat
+import threading
+import time
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from app.core import AnalysisError, settings
+from app.core.config import Settings
+from app.core.secrets import SECRET_FIELDS, KeyVaultSecrets
+from app.infrastructure.analyzers.openai_analyzer import OpenAIAnalyzer
+from app.services import ServiceContainer
+
+VAULT_URL = "https://vault.example"
+
+
+class FakeSecretClient:
+    """Secret client answering after a delay, failing for unknown secrets"""
+    
+    def __init__(self, values, delay=0.05):
+        self.values = dict(values)
+        self.delay = delay
+        self.calls = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+    
+    def get_secret(self, name):
+        with self._lock:
+            self.calls += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            time.sleep(self.delay)
+            if name not in self.values:
+                raise KeyError(name)
+            return SimpleNamespace(value=self.values[name])
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+def vault_values(**overrides):
+    """Secret values of every Key Vault secret"""
+    values = {name: f"{name}-value" for name in SECRET_FIELDS}
+    values["azure-openai-endpoint"] = "https://vault-openai.example/"
+    values["azure-openai-temperature"] = "0.2"
+    values.update(overrides)
+    return values
+
+
+class TestKeyVaultSecrets:
+    """Tests for fetching and snapshotting Key Vault secrets"""
+    
+    def test_secrets_are_fetched_concurrently(self):
+        """Test that all secrets are requested at once and converted"""
+        values = vault_values()
+        del values["azure-openai-api-version"]
+        client = FakeSecretClient(values)
+        vault = KeyVaultSecrets(VAULT_URL, client=client)
+    
+        started = time.perf_counter()
+        fetched = vault.fetch()
+        elapsed = time.perf_counter() - started
+    
+        assert client.max_in_flight == len(SECRET_FIELDS)
+        assert elapsed < client.delay * len(SECRET_FIELDS) / 2
+        assert fetched["AZURE_OPENAI_TEMPERATURE"] == 0.2
+        assert fetched["AZURE_OPENAI_ENDPOINT"] == "https://vault-openai.example/"
+        assert "AZURE_OPENAI_API_VERSION" not in fetched
+        assert vault.stats()["failed_secrets"] == 1
+        assert vault.stats()["source"] == "key_vault"
+    
+    def test_recent_snapshot_skips_key_vault(self, tmp_path):
+        """Test that a restart reads the owner-only snapshot instead of Key Vault"""
+        path = str(tmp_path / "secrets.json")
+        KeyVaultSecrets(VAULT_URL, snapshot_path=path, snapshot_max_age=60, client=FakeSecretClient(vault_values())).fetch()
+        client = FakeSecretClient(vault_values(), delay=0)
+        restarted = KeyVaultSecrets(VAULT_URL, snapshot_path=path, snapshot_max_age=60, client=client)
+    
+        loaded = restarted.load()
+    
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+        assert loaded["AZURE_OPENAI_API_KEY"] == "azure-openai-api-key-value"
+        assert client.calls == 0
+        assert restarted.stats()["source"] == "snapshot"
+    
+    def test_stale_or_foreign_snapshot_is_ignored(self, tmp_path):
+        """Test that old snapshots and snapshots of another vault are not used"""
+        path = tmp_path / "secrets.json"
+        path.write_text(json.dumps({
+            "vault_url": VAULT_URL, "fetched_at": time.time() - 120, "values": {"AZURE_OPENAI_API_KEY": "old"}
+        }))
+        client = FakeSecretClient(vault_values(), delay=0)
+    
+        assert KeyVaultSecrets(VAULT_URL, snapshot_path=str(path), snapshot_max_age=60, client=client).read_snapshot() is None
+        assert KeyVaultSecrets("https://other.example", snapshot_path=str(path), snapshot_max_age=600).read_snapshot() is None
+        loaded = KeyVaultSecrets(VAULT_URL, snapshot_path=str(path), snapshot_max_age=60, client=client).load()
+    
+        assert loaded["AZURE_OPENAI_API_KEY"] == "azure-openai-api-key-value"
+        assert client.calls == len(SECRET_FIELDS)
+    
+    def test_settings_apply_and_refresh_secrets(self):
+        """Test that settings load the secrets once and report rotated ones on refresh"""
+        production = Settings(ENVIRONMENT="production", KEY_VAULT_URL=VAULT_URL)
+        client = FakeSecretClient(vault_values(), delay=0)
+        production._key_vault = KeyVaultSecrets(VAULT_URL, client=client)
+    
+        production.load_secrets()
+        assert production.AZURE_OPENAI_ENDPOINT == "https://vault-openai.example/"
+    
+        client.values["azure-openai-api-key"] = "rotated"
+        changed = production.refresh_secrets()
+    
+        assert changed == ["AZURE_OPENAI_API_KEY"]
+        assert production.AZURE_OPENAI_API_KEY == "rotated"
+        assert production.refresh_secrets() == []
+
+
+def completion(first_name):
+    """Chat completion of a CV with the given first name"""
+    content = {
+        "first_name": first_name, "last_name": "Doe", "email": "", "phone_number": "", "profession": "",
+        "address": "", "languages": [], "skills": [], "experiences": [], "trainings": [],
+    }
+    response = MagicMock()
+    response.choices = [MagicMock()]
+    response.choices[0].message.content = json.dumps(content)
+    response.usage = None
+    return response
+
+
+class TestAnalyzerHotSwap:
+    """Tests for switching the Azure OpenAI configuration of a running analyzer"""
+    
+    @pytest.mark.asyncio
+    async def test_in_flight_calls_finish_on_the_previous_client(self):
+        """Test that a call started before a key rotation completes on its client"""
+        with patch("app.infrastructure.analyzers.openai_analyzer.get_async_llm", side_effect=lambda *args: MagicMock()):
+            analyzer = OpenAIAnalyzer()
+        release = asyncio.Event()
+    
+        async def slow_create(**kwargs):
+            await release.wait()
+            return completion("Old")
+    
+        old_client = analyzer.client
+        old_client.chat.completions.create = slow_create
+        in_flight = asyncio.create_task(analyzer.analyze("CV text"))
+        await asyncio.sleep(0.01)
+    
+        with patch("app.infrastructure.analyzers.openai_analyzer.get_async_llm", return_value=MagicMock()) as get_llm:
+            analyzer.reconfigure("new-deployment", "1", "https://new.example/", "rotated")
+        analyzer.client.chat.completions.create = AsyncMock(return_value=completion("New"))
+        new_result = await analyzer.analyze("CV text")
+        release.set()
+    
+        assert (await in_flight).first_name == "Old"
+        assert new_result.first_name == "New"
+        assert analyzer.client is not old_client
+        get_llm.assert_called_once_with(analyzer.http_client, "new-deployment", "https://new.example/", "rotated")
+        assert analyzer.client.chat.completions.create.call_args.kwargs["model"] == "new-deployment"
+    
+    def test_incomplete_configuration_is_rejected(self):
+        """Test that a configuration without API key keeps the current one"""
+        analyzer = OpenAIAnalyzer()
+        client = analyzer.client
+    
+        with pytest.raises(AnalysisError):
+            analyzer.reconfigure("new-deployment", None, "https://new.example/", None)
+    
+        assert analyzer.client is client
+        assert analyzer.api_key == settings.AZURE_OPENAI_API_KEY
+        assert analyzer.deployment == settings.current_deployment
+
+
+class TestSecretRefresher:
+    """Tests for the container's periodic secret refresh"""
+    
+    @pytest.mark.asyncio
+    async def test_rotated_key_is_applied_to_the_analyzer(self, monkeypatch):
+        """Test that a refresh changing the API key swaps the analyzer client"""
+        container = ServiceContainer()
+        container.startup()
+        client = container.llm_analyzer.client
+    
+        def refresh(self):
+            settings.AZURE_OPENAI_API_KEY = "rotated-key"
+            return ["AZURE_OPENAI_API_KEY"]
+    
+        monkeypatch.setattr(settings, "AZURE_OPENAI_API_KEY", settings.AZURE_OPENAI_API_KEY)
+        monkeypatch.setattr(Settings, "refresh_secrets", refresh)
+        task = asyncio.create_task(container._refresh_secrets(0, 3600))
+        for _ in range(100):
+            if container.secret_refreshes:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+    
+        assert container.secret_refreshes == 1
+        assert container.llm_analyzer.api_key == "rotated-key"
+        assert container.llm_analyzer.client is not client
+        assert container.llm_analyzer.client._client is container.http_client
+        await container.shutdown()
+    
+    @pytest.mark.asyncio
+    async def test_failed_refresh_keeps_current_secrets(self, monkeypatch):
+        """Test that a Key Vault error is counted and the analyzer left unchanged"""
+        container = ServiceContainer()
+        container.startup()
+        client = container.llm_analyzer.client
+    
+        def refresh(self):
+            raise ConnectionError("Key Vault unreachable")
+    
+        monkeypatch.setattr(Settings, "refresh_secrets", refresh)
+        task = asyncio.create_task(container._refresh_secrets(0, 3600))
+        for _ in range(100):
+            if container.secret_refresh_failures:
+                break
+            await asyncio.sleep(0.01)
+        task.cancel()
+    
+        assert container.secret_refresh_failures == 1
+        assert container.llm_analyzer.client is client
+        await container.shutdown()
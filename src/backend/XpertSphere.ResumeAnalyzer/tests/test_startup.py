@@ -0,0 +1,162 @@
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+import pytest
+from fastapi.testclient import TestClient
+from unittest.mock import patch
+from app.core import settings
+from app.core.config import LazySettings, Settings
+from app.main import app
+from app.services import ServiceContainer
+from benchmarks.cold_start import heaviest_imports, measure_import, service_environment
+
+PROJECT_ROOT = Path(__file__).parent.parent
+
+
+class TestLazyImports:
+    """Tests for keeping heavy dependencies out of the application import"""
+    
+    def test_app_import_skips_heavy_dependencies(self):
+        """Test that importing app.main loads neither the SDKs nor the PDF libraries"""
+        heavy = ["openai", "pdfplumber", "pypdfium2", "azure.identity", "azure.keyvault.secrets"]
+        output = subprocess.run(
+            [sys.executable, "-c", f"import sys, app.main; print([m for m in {heavy!r} if m in sys.modules])"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+    
+        assert output.strip().splitlines()[-1] == "[]"
+    
+    def test_app_import_does_not_build_settings(self):
+        """Test that importing app.main reads neither the environment nor the .env file"""
+        output = subprocess.run(
+            [sys.executable, "-c", "import app.main; from app.core import settings; print(settings._settings is None)"],
+            cwd=PROJECT_ROOT, capture_output=True, text=True, check=True,
+        ).stdout
+    
+        assert output.strip().splitlines()[-1] == "True"
+
+
+class TestLazySettings:
+    """Tests for settings built on first use"""
+    
+    def test_settings_are_built_once_on_first_access(self):
+        """Test that the environment is read on first access only"""
+        calls = []
+    
+        def factory():
+            calls.append(1)
+            return Settings()
+    
+        lazy = LazySettings(factory)
+        assert calls == []
+    
+        lazy.MAX_FILE_SIZE_MB = 7
+    
+        assert lazy.MAX_FILE_SIZE_MB == 7
+        assert lazy.current_deployment == Settings().current_deployment
+        assert calls == [1]
+    
+    def test_key_vault_is_read_when_secrets_are_loaded(self):
+        """Test that building settings does not reach Key Vault, loading secrets does once"""
+        with patch.object(Settings, "_load_from_keyvault") as load:
+            production = Settings(ENVIRONMENT="production", KEY_VAULT_URL="https://vault.example")
+            load.assert_not_called()
+    
+            production.load_secrets()
+            production.load_secrets()
+    
+        load.assert_called_once()
+
+
+def gated_startup(gate):
+    """ServiceContainer.startup waiting for an event before building the pipeline"""
+    startup = ServiceContainer.startup
+    
+    def wait_then_start(container):
+        assert gate.wait(timeout=10)
+        startup(container)
+    
+    return wait_then_start
+
+
+class TestBackgroundWarmUp:
+    """Tests for building the CV pipeline after the server accepts probes"""
+    
+    def test_probes_answer_while_warming_up(self, monkeypatch):
+        """Test that liveness answers and readiness fails until the pipeline is built"""
+        gate = threading.Event()
+        monkeypatch.setattr(settings, "STARTUP_BACKGROUND_WARM_UP", True)
+        monkeypatch.setattr(ServiceContainer, "startup", gated_startup(gate))
+    
+        with TestClient(app) as client:
+            assert client.get("/api/health/liveness").status_code == 200
+            readiness = client.get("/api/health/readiness")
+            assert readiness.status_code == 503
+            assert "warming up" in readiness.json()["detail"]
+    
+            gate.set()
+            for _ in range(200):
+                readiness = client.get("/api/health/readiness")
+                if readiness.status_code == 200:
+                    break
+                time.sleep(0.01)
+    
+            assert readiness.status_code == 200
+            assert readiness.json()["checks"]["warm_up_seconds"] > 0
+            assert client.get("/api/cache/stats").status_code == 200
+    
+    def test_requests_wait_for_warm_up(self, monkeypatch):
+        """Test that a request arriving during warm-up is served once it completes"""
+        gate = threading.Event()
+        monkeypatch.setattr(settings, "STARTUP_BACKGROUND_WARM_UP", True)
+        monkeypatch.setattr(ServiceContainer, "startup", gated_startup(gate))
+        threading.Timer(0.2, gate.set).start()
+    
+        with TestClient(app) as client:
+            response = client.get("/api/cache/stats")
+    
+            assert response.status_code == 200
+            assert app.state.container.ready
+    
+    @pytest.mark.asyncio
+    async def test_failed_warm_up_is_retried(self, monkeypatch):
+        """Test that a warm-up error is raised to waiters and the next start retries"""
+        startup = ServiceContainer.startup
+        failures = [RuntimeError("Key Vault unreachable")]
+    
+        def flaky_startup(container):
+            if failures:
+                raise failures.pop()
+            startup(container)
+    
+        monkeypatch.setattr(ServiceContainer, "startup", flaky_startup)
+        container = ServiceContainer()
+    
+        with pytest.raises(RuntimeError, match="Key Vault"):
+            await container.start()
+        assert not container.ready
+    
+        await container.start()
+    
+        assert container.ready
+        assert container.warm_up_seconds is not None
+        await container.shutdown()
+        assert not container.ready
+
+
+class TestColdStartBenchmark:
+    """Tests for the cold-start benchmark helpers"""
+    
+    def test_import_time_and_heaviest_imports(self):
+        """Test that the import of app.main is timed and broken down by module"""
+        env = service_environment(None, sync_startup=False)
+    
+        seconds = measure_import(env)
+        modules = heaviest_imports(env, top=5)
+    
+        assert 0 < seconds < 30
+        assert len(modules) == 5
+        assert "app.main" in {module["module"] for module in modules}
+        assert modules[0]["cumulative_us"] >= modules[-1]["cumulative_us"]
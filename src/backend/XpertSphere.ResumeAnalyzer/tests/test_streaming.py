@@ -0,0 +1,229 @@
+import json
+import pytest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.dependencies import get_cv_service
+from app.core.exceptions import AnalysisError
+from app.domain.interfaces import TextAnalyzer
+from app.domain.models.resume import CVModel, Experience
+from app.infrastructure.analyzers.openai_analyzer import OpenAIAnalyzer
+from app.utils.json_stream import IncrementalJSONParser
+
+CV_JSON = json.dumps({
+    "first_name": "John",
+    "last_name": "Doe",
+    "email": "John@Example.com",
+    "languages": ["English", "French"],
+    "trainings": [{"school": "University", "level": "Bachelor"}],
+    "skills": ["Python"],
+    "experiences": [
+        {"title": " Developer ", "description": "Coded stuff"},
+        {"title": "Lead", "description": "Led a team"},
+    ],
+})
+
+
+class FakeStream:
+    """Async stream of completion chunks carrying the given text pieces"""
+    
+    def __init__(self, pieces):
+        self.pieces = pieces
+        self.closed = False
+    
+    async def __aenter__(self):
+        return self
+    
+    async def __aexit__(self, *args):
+        self.closed = True
+    
+    async def __aiter__(self):
+        # Azure sends prompt filter results before any choice
+        yield SimpleNamespace(choices=[])
+        for piece in self.pieces:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+
+def split(text, size):
+    """Split text in pieces of the given size"""
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+class TestIncrementalJSONParser:
+    """Tests for the incremental JSON parser"""
+    
+    @pytest.mark.parametrize("size", [1, 3, 7, 1000])
+    def test_emits_fields_and_items_once_complete(self, size):
+        """Test that values are emitted whatever the chunk boundaries"""
+        parser = IncrementalJSONParser()
+        events = []
+        for piece in split(CV_JSON, size):
+            events.extend(parser.feed(piece))
+    
+        fields = {event.key: event.value for event in events if not event.is_item}
+        items = [(event.key, event.index) for event in events if event.is_item]
+    
+        assert parser.done
+        assert fields == json.loads(CV_JSON)
+        assert ("experiences", 1) in items
+        assert items.index(("trainings", 0)) < items.index(("experiences", 0))
+    
+    def test_text_joins_the_fed_chunks(self):
+        """Test that the fed text is kept across chunks, before and after the document ends"""
+        parser = IncrementalJSONParser()
+        pieces = split(CV_JSON, 5)
+        for piece in pieces[:10]:
+            parser.feed(piece)
+        assert parser.text == "".join(pieces[:10])
+    
+        for piece in pieces[10:]:
+            parser.feed(piece)
+        assert parser.text == CV_JSON
+    
+    def test_emits_field_before_document_ends(self):
+        """Test that a field is available as soon as its value is closed"""
+        parser = IncrementalJSONParser()
+    
+        assert parser.feed('{"first_name": "Jo') == []
+        events = parser.feed('hn", "last_name": "D')
+    
+        assert [(event.key, event.value) for event in events] == [("first_name", "John")]
+    
+    def test_handles_escapes_and_brackets_in_strings(self):
+        """Test that quotes and brackets inside strings do not end values"""
+        parser = IncrementalJSONParser()
+    
+        events = parser.feed('{"a": "x\\"}]", "b": [1, {"c": "]"}], "d": true}')
+    
+        assert [(event.key, event.value) for event in events if not event.is_item] == [
+            ("a", 'x"}]'), ("b", [1, {"c": "]"}]), ("d", True)
+        ]
+
+
+class TestOpenAIAnalyzerStreaming:
+    """Tests for streamed analysis with the OpenAI analyzer"""
+    
+    @pytest.fixture
+    def openai_analyzer(self):
+        """Create an OpenAI analyzer with mocked client"""
+        with patch('app.infrastructure.analyzers.openai_analyzer.get_async_llm') as mock_get_llm:
+            analyzer = OpenAIAnalyzer()
+            analyzer.client = mock_get_llm.return_value
+            analyzer.client.chat.completions.create = AsyncMock()
+            return analyzer
+    
+    @pytest.mark.asyncio
+    async def test_analyze_stream_yields_fields_then_result(self, openai_analyzer):
+        """Test that fields are yielded in order and post-processed"""
+        stream = FakeStream(split(CV_JSON, 5))
+        openai_analyzer.client.chat.completions.create.return_value = stream
+    
+        events = [event async for event in openai_analyzer.analyze_stream("CV text")]
+    
+        assert [event.name for event in events[:3]] == ["first_name", "last_name", "email"]
+        experiences = [event for event in events if event.name == "experiences"]
+        assert [event.index for event in experiences] == [0, 1]
+        assert isinstance(experiences[0].value, Experience)
+        assert experiences[0].value.title == "Developer"
+        assert events[-1].name == "result"
+        assert events[-1].value.email == "john@example.com"
+        assert stream.closed
+        assert openai_analyzer.client.chat.completions.create.call_args.kwargs["stream"] is True
+    
+    @pytest.mark.asyncio
+    async def test_analyze_stream_invalid_json(self, openai_analyzer):
+        """Test that a truncated response raises AnalysisError"""
+        openai_analyzer.client.chat.completions.create.return_value = FakeStream(['{"first_name": "Jo'])
+    
+        with pytest.raises(AnalysisError):
+            async for _ in openai_analyzer.analyze_stream("CV text"):
+                pass
+
+
+class StubAnalyzer(TextAnalyzer):
+    """Analyzer delegating to a mock, streaming through the default implementation"""
+    
+    version = "test"
+    
+    def __init__(self, analyze):
+        self.mock_analyze = analyze
+    
+    async def analyze(self, text, options=None):
+        return await self.mock_analyze(text, options)
+
+
+class TestStreamingEndpoint:
+    """Tests for the streaming extraction endpoint"""
+    
+    @pytest.fixture
+    def analyze(self):
+        """Analyzer mock returning a CV with one experience"""
+        return AsyncMock(return_value=CVModel(
+            first_name="John",
+            last_name="Doe",
+            experiences=[Experience(title="Developer", description="Coded stuff")],
+        ))
+    
+    @pytest.fixture
+    def client(self, analyze, make_cv_service):
+        """Create test client with a stubbed CV service"""
+        app.dependency_overrides[get_cv_service] = lambda: make_cv_service(
+            analyzer=StubAnalyzer(analyze), pdf_only=True
+        )
+        yield TestClient(app)
+        app.dependency_overrides.clear()
+    
+    def test_stream_sse(self, client):
+        """Test that fields are sent as Server-Sent Events"""
+        response = client.post(
+            "/api/extract/stream",
+            files={"file": ("cv.pdf", b"CV text", "application/pdf")},
+        )
+    
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        messages = [block.split("\n") for block in response.text.strip().split("\n\n")]
+        names = [lines[0].removeprefix("event: ") for lines in messages]
+    
+        assert names[0] == "field"
+        assert "experience" in names
+        assert names[-1] == "result"
+        result = json.loads(messages[-1][1].removeprefix("data: "))
+        assert result["extracted_data"]["first_name"] == "John"
+    
+    def test_stream_ndjson(self, client):
+        """Test that fields are sent as NDJSON lines"""
+        response = client.post(
+            "/api/extract/stream?format=ndjson",
+            files={"file": ("cv.pdf", b"CV text", "application/pdf")},
+        )
+    
+        lines = [json.loads(line) for line in response.text.splitlines()]
+    
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        assert lines[0] == {"event": "field", "name": "first_name", "value": "John"}
+        experience = next(line for line in lines if line["event"] == "experience")
+        assert experience["index"] == 0
+        assert experience["value"]["title"] == "Developer"
+    
+    def test_stream_reports_errors_as_events(self, client, analyze):
+        """Test that a failing analysis ends the stream with an error event"""
+        analyze.side_effect = AnalysisError("LLM down")
+    
+        response = client.post(
+            "/api/extract/stream?format=ndjson",
+            files={"file": ("cv.pdf", b"CV text", "application/pdf")},
+        )
+    
+        lines = [json.loads(line) for line in response.text.splitlines()]
+        assert lines == [{"event": "error", "error": {"type": "AnalysisError", "detail": "LLM down"}}]
+    
+    def test_stream_rejects_unsupported_format(self, client):
+        """Test that unsupported files fail before streaming starts"""
+        response = client.post(
+            "/api/extract/stream",
+            files={"file": ("cv.txt", b"CV text", "text/plain")},
+        )
+    
+        assert response.status_code == 400
@@ -0,0 +1,108 @@
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from app.domain.models.resume import CVModel
+from app.services import CVService
+from app.utils.text_compaction import (
+    TRUNCATION_MARKER,
+    compact_text,
+    estimate_tokens,
+    remove_repeated_edges,
+    truncate_to_budget,
+)
+
+
+class TestTextCompaction:
+    """Tests for compaction of extracted text"""
+    
+    def test_estimate_tokens(self):
+        """Test that the estimate grows with words, long words and punctuation"""
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("John Doe") == 2
+        assert estimate_tokens("internationalization") == 5
+        assert estimate_tokens("Python, C#") == 5
+    
+    def test_removes_repeated_headers_and_footers(self):
+        """Test that edge lines repeated across pages are kept only once"""
+        pages = [
+            ["John Doe - Engineer", f"Content {name}", f"Page {number} of 3"]
+            for number, name in enumerate(["one", "two", "three"], start=1)
+        ]
+    
+        compacted, removed = remove_repeated_edges(pages)
+    
+        assert compacted[0] == ["John Doe - Engineer", "Content one", "Page 1 of 3"]
+        assert compacted[1] == ["Content two"]
+        assert compacted[2] == ["Content three"]
+        assert removed == 4
+    
+    def test_keeps_dates_at_page_edges(self):
+        """Test that different dates ending and starting pages are not taken for a footer"""
+        pages = [
+            ["John Doe", "Senior Engineer, Acme", "2019 - 2021", "1/2"],
+            ["2015 - 2018", "Engineer, Initech", "Built billing systems", "2/2"],
+        ]
+    
+        compacted, removed = remove_repeated_edges(pages)
+    
+        assert compacted[0] == pages[0]
+        assert compacted[1] == ["2015 - 2018", "Engineer, Initech", "Built billing systems"]
+        assert removed == 1
+    
+    def test_collapses_whitespace_and_duplicate_lines(self):
+        """Test whitespace, bullet and duplicate line cleanup across page breaks"""
+        result = compact_text("John   Doe\n\n\n•  Python\fPython stuff\n\n")
+    
+        assert result.text == "John Doe\n- Python\nPython stuff"
+        assert result.truncated is False
+    
+    def test_truncates_low_priority_sections_first(self):
+        """Test that publications are trimmed before experiences"""
+        lines = (
+            ["John Doe", "john@example.com", "EXPERIENCE"]
+            + [f"Developer at company {index}" for index in range(5)]
+            + ["PUBLICATIONS"]
+            + [f"A long paper title about topic number {index}" for index in range(40)]
+        )
+    
+        compacted, truncated = truncate_to_budget(lines, max_tokens=80)
+    
+        assert truncated is True
+        assert compacted[:8] == lines[:8]
+        assert "PUBLICATIONS" in compacted
+        assert compacted[-1] == TRUNCATION_MARKER
+        assert estimate_tokens("\n".join(compacted)) <= 80
+    
+    def test_reports_tokens_saved(self):
+        """Test that the result reports tokens before and after compaction"""
+        text = "\f".join(f"Header line\nBody {index}\nFooter line" for index in range(4))
+    
+        result = compact_text(text, max_tokens=1000)
+    
+        assert result.compacted_tokens < result.original_tokens
+        assert result.tokens_saved == result.original_tokens - result.compacted_tokens
+
+
+class TestCVServiceCompaction:
+    """Tests for the compaction stage of the CV service"""
+    
+    @pytest.mark.asyncio
+    async def test_analyzer_receives_compacted_text(self):
+        """Test that compaction runs between extraction and analysis"""
+        extractor = MagicMock()
+        extractor.can_extract.return_value = True
+        extractor.extract_text = AsyncMock(return_value="John   Doe\fPage 2\n\nPython")
+        analyzer = MagicMock()
+        analyzer.version = "test"
+        analyzer.analyze = AsyncMock(return_value=CVModel(first_name="John", last_name="Doe"))
+        service = CVService(
+            extractors=[extractor],
+            analyzer=analyzer,
+            compaction_enabled=True,
+            compaction_max_tokens=100,
+        )
+        token_usage = {}
+    
+        await service.process_content(b"pdf", "cv.pdf", token_usage=token_usage)
+    
+        assert analyzer.analyze.call_args.args[0] == "John Doe\nPage 2\nPython"
+        assert set(token_usage) == {"original", "compacted", "saved"}
@@ -0,0 +1,110 @@
+import pytest
+from app.infrastructure.extractors import PDFExtractor
+from app.infrastructure.extractors.pdf_extractor import extract_pdf_pages
+from app.infrastructure.extractors.tiered_extraction import TierStats, score_page_text
+
+SINGLE_COLUMN = ["John Doe", "Developer at ACME", "Built services in Python and SQL"]
+TWO_COLUMNS = [("Experience at ACME", "Skills: Python")] + [
+    (f"Worked on project {index}", f"Tool number {index}") for index in range(6)
+]
+
+
+class TestPageScoring:
+    """Tests for the quality checks of text-layer output"""
+    
+    def test_accepts_regular_text(self):
+        """Test that ordinary prose passes every check"""
+        quality = score_page_text("Senior developer building data pipelines in Python at ACME " * 4)
+    
+        assert quality.acceptable
+    
+    def test_rejects_letter_spaced_text(self):
+        """Test that words broken into single letters fail the word-break check"""
+        quality = score_page_text(" ".join("Experienced software developer in Python"))
+    
+        assert quality.single_char_ratio > 0.5
+        assert not quality.acceptable
+    
+    def test_rejects_missing_spaces(self):
+        """Test that words glued together fail the word-break check"""
+        quality = score_page_text(" ".join(["Experiencedsoftwaredeveloperbuildingpipelines"] * 20))
+    
+        assert not quality.acceptable
+    
+    def test_rejects_unmapped_glyphs(self):
+        """Test that replacement characters fail the density check"""
+        quality = score_page_text("John Doe \ufffd\ufffd\ufffd\ufffd developer")
+    
+        assert not quality.acceptable
+    
+    def test_rejects_interleaved_columns(self):
+        """Test that a high column interleaving ratio fails the check"""
+        assert not score_page_text("John Doe", interleave_ratio=0.5).acceptable
+
+
+class TestTieredExtraction:
+    """Tests for text-layer extraction with layout escalation"""
+    
+    def test_single_column_served_by_text_layer(self, make_pdf):
+        """Test that clean pages skip layout analysis"""
+        pages, page_count, stats = extract_pdf_pages(
+            make_pdf([SINGLE_COLUMN, "Page two"]), "cv.pdf", tiered=True
+        )
+    
+        assert pages == ["\n".join(SINGLE_COLUMN), "Page two"]
+        assert page_count == 2
+        assert (stats.text_layer_pages, stats.layout_pages) == (2, 0)
+    
+    def test_two_columns_escalated_to_layout(self, make_pdf):
+        """Test that interleaved columns are re-read column by column"""
+        pages, _, stats = extract_pdf_pages(make_pdf([TWO_COLUMNS]), "cv.pdf", tiered=True)
+    
+        lines = pages[0].split("\n")
+        assert (stats.text_layer_pages, stats.layout_pages) == (0, 1)
+        assert lines[:2] == ["Experience at ACME", "Worked on project 0"]
+        assert lines.index("Tool number 5") > lines.index("Worked on project 5")
+    
+    def test_only_failing_pages_escalated(self, make_pdf):
+        """Test that escalation is decided page by page"""
+        content = make_pdf([SINGLE_COLUMN, TWO_COLUMNS, SINGLE_COLUMN])
+    
+        _, _, stats = extract_pdf_pages(content, "cv.pdf", tiered=True)
+    
+        assert (stats.text_layer_pages, stats.layout_pages) == (2, 1)
+    
+    def test_stops_at_character_budget(self, make_pdf):
+        """Test that tiered extraction stops once max_chars is reached"""
+        pages, page_count, _ = extract_pdf_pages(
+            make_pdf([SINGLE_COLUMN] * 5), "cv.pdf", max_chars=10, tiered=True
+        )
+    
+        assert len(pages) == 1
+        assert page_count == 5
+    
+    @pytest.mark.asyncio
+    async def test_extractor_reports_tier_stats(self, make_pdf):
+        """Test that the extractor accumulates hit rates across documents"""
+        extractor = PDFExtractor(tiered=True)
+    
+        await extractor.extract_text(make_pdf([SINGLE_COLUMN]), "one.pdf")
+        await extractor.extract_text(make_pdf([TWO_COLUMNS]), "two.pdf")
+    
+        tiers = extractor.stats()["tiers"]
+        assert tiers["pages"] == 2
+        assert tiers["text_layer_hit_rate"] == 0.5
+        assert tiers["layout_ms_per_page"] > 0
+    
+    def test_tier_stats_merge(self):
+        """Test that counters from shards add up"""
+        stats = TierStats(text_layer_pages=1, text_layer_seconds=0.002)
+    
+        stats.merge(TierStats(text_layer_pages=1, layout_pages=2, layout_seconds=0.04))
+    
+        assert stats.snapshot() == {
+            "pages": 4,
+            "text_layer_pages": 2,
+            "layout_pages": 2,
+            "text_layer_hit_rate": 0.5,
+            "text_layer_ms_per_page": 0.5,
+            "layout_ms_per_page": 20.0,
+        }
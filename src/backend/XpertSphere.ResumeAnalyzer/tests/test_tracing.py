@@ -0,0 +1,187 @@
+import io
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.dependencies import get_cv_service
+from app.domain.models.resume import CVModel
+from app.infrastructure.extractors.pdf_extractor import PDFExtractor
+from app.services import CVService
+from app.utils.tracing import (
+    ConsoleSpanExporter,
+    FileSpanExporter,
+    SpanExporter,
+    Tracer,
+    build_exporter,
+    configure_tracing,
+    current_span,
+    parse_traceparent,
+)
+
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+class MemorySpanExporter(SpanExporter):
+    """Exporter keeping finished spans in memory"""
+    
+    def __init__(self):
+        self.spans = []
+    
+    def export(self, span):
+        self.spans.append(span)
+
+
+class TestTraceContext:
+    """Tests for W3C traceparent parsing"""
+    
+    def test_parses_valid_header(self):
+        """Test that a valid header gives the remote parent context"""
+        context = parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01", "vendor=value")
+    
+        assert context.trace_id == TRACE_ID
+        assert context.span_id == PARENT_ID
+        assert context.sampled
+        assert context.tracestate == "vendor=value"
+        assert context.traceparent == f"00-{TRACE_ID}-{PARENT_ID}-01"
+    
+    @pytest.mark.parametrize("header", [
+        None,
+        "",
+        "garbage",
+        f"ff-{TRACE_ID}-{PARENT_ID}-01",
+        f"00-{'0' * 32}-{PARENT_ID}-01",
+        f"00-{TRACE_ID}-{'0' * 16}-01",
+        f"00-{TRACE_ID}-{PARENT_ID}-01-extra",
+    ])
+    def test_rejects_invalid_header(self, header):
+        """Test that missing or invalid headers start a new trace"""
+        assert parse_traceparent(header) is None
+    
+    def test_unsampled_parent_is_not_exported(self):
+        """Test that spans of an unsampled trace are not exported"""
+        exporter = MemorySpanExporter()
+        tracer = Tracer(exporter)
+    
+        with tracer.start_span("request", parent=parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00")):
+            pass
+    
+        assert exporter.spans == []
+
+
+class TestTracer:
+    """Tests for span nesting and exporters"""
+    
+    def test_nested_spans_share_the_trace(self):
+        """Test that child spans join the trace of the current span"""
+        exporter = MemorySpanExporter()
+        tracer = Tracer(exporter)
+    
+        with tracer.start_span("parent") as parent:
+            with tracer.start_span("child") as child:
+                assert current_span() is child
+            current_span().add_event("done")
+    
+        assert [span.name for span in exporter.spans] == ["child", "parent"]
+        assert child.context.trace_id == parent.context.trace_id
+        assert child.parent_id == parent.context.span_id
+        assert parent.parent_id is None
+        assert parent.events[0]["name"] == "done"
+    
+    def test_records_exceptions(self):
+        """Test that a failing block marks its span as failed"""
+        exporter = MemorySpanExporter()
+    
+        with pytest.raises(ValueError):
+            with Tracer(exporter).start_span("failing"):
+                raise ValueError("boom")
+    
+        span = exporter.spans[0]
+        assert span.status == "error"
+        assert span.events[0]["attributes"] == {"type": "ValueError", "message": "boom"}
+    
+    def test_disabled_tracer_records_nothing(self):
+        """Test that spans are no-ops without an exporter"""
+        with Tracer().start_span("ignored") as span:
+            span.set_attribute("key", "value")
+            assert current_span() is span
+            assert span.context is None
+    
+    def test_file_and_console_exporters(self, tmp_path):
+        """Test that spans are written as JSON lines"""
+        path = str(tmp_path / "traces" / "spans.jsonl")
+        stream = io.StringIO()
+        file_exporter = FileSpanExporter(path)
+        for exporter in (file_exporter, ConsoleSpanExporter(stream)):
+            with Tracer(exporter).start_span("offline", {"pages": 2}):
+                pass
+        file_exporter.shutdown()
+    
+        with open(path) as f:
+            written = [json.loads(line) for line in f]
+        printed = json.loads(stream.getvalue())
+        assert written[0]["name"] == printed["name"] == "offline"
+        assert written[0]["attributes"] == {"pages": 2}
+    
+    def test_build_exporter(self, tmp_path):
+        """Test that exporters are selected by name or import path"""
+        assert build_exporter("none") is None
+        assert isinstance(build_exporter("console"), ConsoleSpanExporter)
+        assert isinstance(build_exporter("file", str(tmp_path / "spans.jsonl")), FileSpanExporter)
+        assert isinstance(build_exporter("app.utils.tracing:ConsoleSpanExporter"), ConsoleSpanExporter)
+        with pytest.raises(ValueError):
+            build_exporter("jaeger")
+
+
+class TestRequestTracing:
+    """Tests for spans across the CV extraction pipeline"""
+    
+    @pytest.fixture
+    def exporter(self):
+        """Process-wide tracer exporting to memory"""
+        exporter = MemorySpanExporter()
+        configure_tracing(exporter)
+        yield exporter
+        configure_tracing(None)
+    
+    def test_request_joins_the_caller_trace(self, exporter, make_pdf):
+        """Test that pipeline spans nest under the caller's span with page events"""
+        analyzer = MagicMock()
+        analyzer.version = "llm"
+        analyzer.analyze = AsyncMock(return_value=CVModel(first_name="John", last_name="Doe"))
+        service = CVService(extractors=[PDFExtractor()], analyzer=analyzer)
+        app.dependency_overrides[get_cv_service] = lambda: service
+        try:
+            response = TestClient(app).post(
+                "/api/extract/",
+                files={"file": ("cv.pdf", make_pdf(["John Doe", "Experience"]), "application/pdf")},
+                headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+            )
+        finally:
+            app.dependency_overrides.clear()
+    
+        assert response.status_code == 200
+        spans = {span.name: span for span in exporter.spans}
+        assert set(spans) == {
+            "POST /api/extract/",
+            "extract_data_from_cv",
+            "CVService.process_cv",
+            "PDFExtractor.extract_text",
+        }
+        assert {span.context.trace_id for span in exporter.spans} == {TRACE_ID}
+        assert spans["POST /api/extract/"].parent_id == PARENT_ID
+        assert spans["POST /api/extract/"].attributes["http.status_code"] == 200
+        assert spans["CVService.process_cv"].parent_id == spans["extract_data_from_cv"].context.span_id
+        assert spans["PDFExtractor.extract_text"].parent_id == spans["CVService.process_cv"].context.span_id
+        pages = [event["attributes"] for event in spans["PDFExtractor.extract_text"].events]
+        assert [page["page"] for page in pages] == [0, 1]
+        assert all(page["duration_ms"] >= 0 and page["chars"] > 0 for page in pages)
+        assert response.headers["traceresponse"] == spans["POST /api/extract/"].context.traceparent
+    
+    def test_excluded_paths_are_not_traced(self, exporter):
+        """Test that health probes do not create spans"""
+        response = TestClient(app).get("/api/health/")
+    
+        assert "traceresponse" not in response.headers
+        assert exporter.spans == []
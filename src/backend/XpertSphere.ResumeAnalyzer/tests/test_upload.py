@@ -0,0 +1,124 @@
+import io
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+from fastapi import UploadFile
+from fastapi.testclient import TestClient
+from app.main import app
+from app.api.dependencies import get_cv_service
+from app.core.exceptions import FileTooLargeError
+from app.domain.models.resume import CVModel
+from app.utils.upload_utils import BufferReader, read_upload
+
+
+class TestUploadSizeLimit:
+    """Tests for upload size enforcement while the body streams in"""
+    
+    @pytest.fixture
+    def cv_service(self):
+        """Create a stubbed CV service"""
+        mock_service = MagicMock()
+        mock_service.process_cv = AsyncMock(return_value=CVModel(first_name="John", last_name="Doe"))
+        app.dependency_overrides[get_cv_service] = lambda: mock_service
+        yield mock_service
+        app.dependency_overrides.clear()
+    
+    @pytest.fixture
+    def client(self, cv_service):
+        """Create test client"""
+        return TestClient(app)
+    
+    def test_rejects_declared_content_length(self, client, cv_service):
+        """Test that an oversized Content-Length is rejected before reading"""
+        response = client.post(
+            "/api/extract/",
+            content=b"",
+            headers={
+                "Content-Type": "multipart/form-data; boundary=x",
+                "Content-Length": str(4 * 1024 * 1024),
+            },
+        )
+    
+        assert response.status_code == 400
+        assert "File too large" in response.json()["detail"]
+        cv_service.process_cv.assert_not_called()
+    
+    def test_rejects_chunked_body_past_limit(self, client, cv_service):
+        """Test that a chunked body is aborted once it passes the limit"""
+    
+        def body():
+            yield b"--x\r\nContent-Disposition: form-data; name=\"file\"; filename=\"cv.pdf\"\r\n\r\n"
+            for _ in range(64):
+                yield b"x" * (256 * 1024)
+            yield b"\r\n--x--\r\n"
+    
+        response = client.post(
+            "/api/extract/",
+            content=body(),
+            headers={"Content-Type": "multipart/form-data; boundary=x"},
+        )
+    
+        assert response.status_code == 400
+        assert "File too large" in response.json()["detail"]
+        cv_service.process_cv.assert_not_called()
+    
+    def test_accepts_upload_within_limit(self, client, cv_service):
+        """Test that uploads under the limit reach the endpoint"""
+        response = client.post(
+            "/api/extract/",
+            files={"file": ("cv.pdf", io.BytesIO(b"x" * (1024 * 1024)), "application/pdf")},
+        )
+    
+        assert response.status_code == 200
+        cv_service.process_cv.assert_called_once()
+
+
+class TestReadUpload:
+    """Tests for single-read upload ingestion"""
+    
+    @pytest.mark.asyncio
+    async def test_reads_known_size_into_one_buffer(self):
+        """Test that the content is returned as a view of one buffer"""
+        upload = UploadFile(io.BytesIO(b"pdf content"), size=11, filename="cv.pdf")
+    
+        content = await read_upload(upload, max_bytes=100)
+    
+        assert isinstance(content, memoryview)
+        assert bytes(content) == b"pdf content"
+    
+    @pytest.mark.asyncio
+    async def test_reads_unknown_size(self):
+        """Test reading an upload whose size was not reported"""
+        upload = UploadFile(io.BytesIO(b"pdf content"), filename="cv.pdf")
+    
+        content = await read_upload(upload, max_bytes=100)
+    
+        assert bytes(content) == b"pdf content"
+    
+    @pytest.mark.asyncio
+    async def test_rejects_oversized_upload(self):
+        """Test that reading stops once the limit is exceeded"""
+        upload = UploadFile(io.BytesIO(b"x" * 200), filename="cv.pdf")
+    
+        with pytest.raises(FileTooLargeError):
+            await read_upload(upload, max_bytes=100)
+    
+    @pytest.mark.asyncio
+    async def test_rejects_under_reported_size(self):
+        """Test that a wrong reported size does not bypass the limit"""
+        upload = UploadFile(io.BytesIO(b"x" * 200), size=10, filename="cv.pdf")
+    
+        with pytest.raises(FileTooLargeError):
+            await read_upload(upload, max_bytes=100)
+    
+    def test_buffer_reader_seeks_without_copying(self):
+        """Test that BufferReader reads and seeks over the buffer"""
+        buffer = bytearray(b"0123456789")
+        reader = BufferReader(memoryview(buffer))
+    
+        assert reader.read(3) == b"012"
+        reader.seek(-2, io.SEEK_END)
+        assert reader.read() == b"89"
+        assert reader.tell() == 10
+    
+        reader.close()
+        buffer.extend(b"!")